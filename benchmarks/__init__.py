@@ -0,0 +1 @@
+"""Benchmarks of the DataFrame construction hot paths, run them with python -m benchmarks"""
@@ -0,0 +1,51 @@
+"""Runs the benchmarks & compares them with the stored baseline
+
+    python -m benchmarks                       # small & medium payloads
+    python -m benchmarks --sizes large --cases timeseries
+    python -m benchmarks --save                # store the results as the new baseline
+    python -m benchmarks --check               # exit with 1 on a regression
+"""
+
+
+import argparse
+import logging
+import sys
+
+import pandas as pd
+
+from benchmarks.payloads import SIZES
+from benchmarks.runner import run, load_baseline, save_baseline, compare, \
+    BASELINE_PATH, DEFAULT_TOLERANCE
+
+
+def main() -> int:
+    """Parses the command line, runs the benchmarks & prints the comparison"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['small', 'medium'])
+    parser.add_argument('--cases', nargs='+', help='substrings of the case names to run')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case & size')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='relative slowdown or memory growth reported as a regression')
+    parser.add_argument('--save', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--check', action='store_true', help='exit with 1 on a regression')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    results = run(sizes=args.sizes, names=args.cases, repeat=args.repeat)
+    comparison = compare(results, load_baseline(args.baseline), tolerance=args.tolerance)
+    with pd.option_context('display.max_rows', None, 'display.width', 200,
+                           'display.float_format', '{:.4f}'.format):
+        print(comparison.to_string(index=False))
+
+    if args.save:
+        save_baseline(results, args.baseline)
+    if args.check and (comparison['status'] == 'regression').any():
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
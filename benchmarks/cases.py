@@ -0,0 +1,138 @@
+"""This module is meant to contain the benchmark cases, one per hot path"""
+
+
+import copy
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from benchmarks import payloads
+
+
+class Case:
+    """This class describes one benchmark.
+
+    prepare builds the input once per size, outside of the timings. When the
+    benchmarked function mutates its input, fresh makes every run work on a deep
+    copy made outside of the timings too. cleanup releases what prepare set up.
+    Cases that don't depend on the payload size set sized to False & run once.
+    """
+    def __init__(self, name: str, prepare: Callable[[Dict], Any], run: Callable[[Any], Any],
+                 fresh: bool = False, cleanup: Callable[[Any], None] = None, sized: bool = True):
+        self.name = name
+        self.prepare = prepare
+        self.run = run
+        self.fresh = fresh
+        self.cleanup = cleanup
+        self.sized = sized
+
+
+def flatten_run(responses: List[Dict]) -> List[Dict]:
+    """Flattens every asset metrics response"""
+    from messari.utils import convert_flatten  # pylint: disable=import-outside-toplevel
+    return [convert_flatten(response) for response in responses]
+
+
+def records_run(responses: List[Dict]):
+    """Flattens every asset metrics response into a DataFrame indexed by asset"""
+    from messari.utils import records_to_dataframe  # pylint: disable=import-outside-toplevel
+    return records_to_dataframe({f'asset-{i}': response for i, response in enumerate(responses)})
+
+
+def timeseries_run(response: Dict):
+    """Builds the multi asset timeseries DataFrame"""
+    from messari.messari.helpers import timeseries_to_dataframe  # pylint: disable=import-outside-toplevel
+    return timeseries_to_dataframe(response)
+
+
+def format_df_run(tvl_df):
+    """Indexes a DeFi Llama chart by date"""
+    from messari.defillama.helpers import format_df  # pylint: disable=import-outside-toplevel
+    return format_df(tvl_df)
+
+
+def protocol_run(protocol: Dict):
+    """Builds the TVL DataFrame of one protocol"""
+    from messari.defillama.helpers import protocol_to_dataframe  # pylint: disable=import-outside-toplevel
+    return protocol_to_dataframe(protocol)
+
+
+def protocol_tvl_prepare(size: Dict) -> SimpleNamespace:
+    """Serves the protocols from a FixtureServer & points DeFiLlama at it"""
+    # pylint: disable=import-outside-toplevel
+    from messari.defillama import DeFiLlama
+    from messari.defillama.defillama import DL_GET_PROTOCOL_TVL_URL
+    from messari.fixtureserver import FixtureServer
+
+    server = FixtureServer()
+    server.start()
+    slugs = payloads.protocol_slugs(size)
+    for slug in slugs:
+        server.add_response(DL_GET_PROTOCOL_TVL_URL.substitute(slug=slug),
+                            payloads.protocol_response(size, slug))
+    llama = DeFiLlama()
+    llama.set_transport(server.get_adapter())
+    return SimpleNamespace(server=server, llama=llama, slugs=slugs)
+
+
+def protocol_tvl_run(state: SimpleNamespace):
+    """Runs get_protocol_tvl_timeseries end to end, HTTP on localhost included"""
+    return state.llama.get_protocol_tvl_timeseries(state.slugs)
+
+
+def solscan_run(holders_df):
+    """Unpacks the dicts of a Solscan DataFrame into columns"""
+    from messari.blockexplorers.solscan.helpers import unpack_dataframe_of_dicts  # pylint: disable=import-outside-toplevel
+    return unpack_dataframe_of_dicts(holders_df)
+
+
+def deepdao_run(coalitions_df):
+    """Unpacks the lists of dicts of a DeepDAO DataFrame into rows"""
+    from messari.deepdao.helpers import unpack_dataframe_of_lists  # pylint: disable=import-outside-toplevel
+    return unpack_dataframe_of_lists(coalitions_df)
+
+
+def events_prepare(size: Dict) -> SimpleNamespace:
+    """Stands in for an EventMonitor holding size['events'] decoded events"""
+    from messari.eventmonitor import EventMonitor  # pylint: disable=import-outside-toplevel
+    return SimpleNamespace(get_events_df=EventMonitor.get_events_df,
+                           events_list=payloads.events_list(size))
+
+
+def events_run(monitor: SimpleNamespace):
+    """Builds the (block_number, log_index) indexed events DataFrame"""
+    return monitor.get_events_df(monitor)
+
+
+def import_run(statement: str) -> None:
+    """Runs an import statement in a fresh interpreter, interpreter start up included"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', statement], check=True,
+                   env=dict(os.environ, PYTHONPATH=root))
+
+
+CASES = [
+    Case('utils.convert_flatten', payloads.metrics_responses, flatten_run),
+    Case('utils.records_to_dataframe', payloads.metrics_responses, records_run),
+    Case('messari.timeseries_to_dataframe', payloads.timeseries_response, timeseries_run),
+    Case('defillama.format_df', payloads.tvl_dataframe, format_df_run, fresh=True),
+    Case('defillama.protocol_to_dataframe',
+         lambda size: payloads.protocol_response(size, 'protocol-0'), protocol_run, fresh=True),
+    Case('defillama.get_protocol_tvl_timeseries', protocol_tvl_prepare, protocol_tvl_run,
+         cleanup=lambda state: state.server.stop()),
+    Case('solscan.unpack_dataframe_of_dicts', payloads.solscan_holders_dataframe, solscan_run),
+    Case('deepdao.unpack_dataframe_of_lists', payloads.deepdao_coalitions_dataframe,
+         deepdao_run),
+    Case('eventmonitor.get_events_df', events_prepare, events_run),
+    Case('import messari.blockexplorers', lambda size: 'import messari.blockexplorers',
+         import_run, sized=False),
+    Case('import Etherscan', lambda size: 'from messari.blockexplorers import Etherscan',
+         import_run, sized=False),
+]
+
+
+def copy_input(case: Case, prepared: Any) -> Any:
+    """Returns the input of one run of case"""
+    return copy.deepcopy(prepared) if case.fresh else prepared
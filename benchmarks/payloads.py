@@ -0,0 +1,155 @@
+"""This module is meant to contain the generators of the payloads benchmarks run on.
+
+Payloads mirror the shape of the responses recorded from each API (field names,
+nesting, value types) at a configurable size. They are generated from a fixed
+seed so every run & every machine benchmarks the same data.
+"""
+
+
+import random
+from typing import Dict, List
+
+import pandas as pd
+
+SEED = 1234
+
+# Milliseconds & seconds timestamps of 2021-01-01
+START_MS = 1609459200000
+START_S = START_MS // 1000
+DAY_S = 86400
+
+# Size presets, every case picks the dimensions it needs
+SIZES = {
+    'small': {'assets': 5, 'points': 100, 'chains': 2, 'tokens': 5,
+              'accounts': 2, 'rows': 50, 'daos': 5, 'entries': 5, 'events': 500},
+    'medium': {'assets': 20, 'points': 500, 'chains': 4, 'tokens': 10,
+               'accounts': 5, 'rows': 200, 'daos': 20, 'entries': 10, 'events': 5000},
+    'large': {'assets': 50, 'points': 2016, 'chains': 8, 'tokens': 20,
+              'accounts': 10, 'rows': 1000, 'daos': 50, 'entries': 20, 'events': 50000},
+}
+
+
+def asset_metrics(rng: random.Random, slug: str) -> Dict:
+    """Messari /api/v1/assets/{slug}/metrics data"""
+    def values(*names: str) -> Dict:
+        return {name: rng.uniform(0, 1e9) for name in names}
+    return {
+        'id': f'{slug}-id', 'symbol': slug[:4].upper(), 'name': slug.title(), 'slug': slug,
+        'market_data': dict(values('price_usd', 'price_btc', 'volume_last_24_hours',
+                                   'real_volume_last_24_hours'),
+                            ohlcv_last_1_hour=values('open', 'high', 'low', 'close', 'volume'),
+                            ohlcv_last_24_hour=values('open', 'high', 'low', 'close', 'volume')),
+        'marketcap': values('rank', 'current_marketcap_usd', 'y_2050_marketcap_usd',
+                            'liquid_marketcap_usd', 'volume_turnover_last_24_hours_percent'),
+        'supply': values('y_2050', 'y_plus10', 'liquid', 'circulating', 'stock_to_flow'),
+        'blockchain_stats_24_hour': values('count_of_active_addresses', 'transaction_volume',
+                                           'adjusted_transaction_volume', 'sum_of_fees',
+                                           'median_tx_value', 'median_tx_fee'),
+        'all_time_high': dict(values('price', 'percent_down', 'breakeven_multiple'),
+                              at='2021-11-10T14:24:11Z', days_since=rng.randint(0, 500)),
+        'roi_data': values('percent_change_last_1_week', 'percent_change_last_1_month',
+                           'percent_change_last_3_months', 'percent_change_last_1_year'),
+        'risk_metrics': {'sharpe_ratios': values('last_30_days', 'last_90_days', 'last_1_year'),
+                         'volatility_stats': values('volatility_last_30_days',
+                                                    'volatility_last_90_days',
+                                                    'volatility_last_1_year')},
+    }
+
+
+def metrics_responses(size: Dict) -> List[Dict]:
+    """One Messari asset metrics response per asset, for convert_flatten"""
+    rng = random.Random(SEED)
+    return [asset_metrics(rng, f'asset-{i}') for i in range(size['assets'] * 20)]
+
+
+def timeseries_response(size: Dict) -> Dict:
+    """Messari timeseries data keyed by asset, for timeseries_to_dataframe"""
+    rng = random.Random(SEED)
+    columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+    response = {}
+    for i in range(size['assets']):
+        values = [[START_MS + day * DAY_S * 1000] + [rng.uniform(0, 1e5) for _ in columns[1:]]
+                  for day in range(size['points'])]
+        response[f'asset-{i}'] = {'parameters_columns': columns, 'values': values}
+    return response
+
+
+def tvl_chart(rng: random.Random, points: int) -> List[Dict]:
+    """DeFi Llama chart, dates are strings of unix seconds & the last day is repeated"""
+    chart = [{'date': str(START_S + day * DAY_S), 'totalLiquidityUSD': rng.uniform(0, 1e9)}
+             for day in range(points)]
+    return chart + chart[-1:]
+
+
+def tvl_dataframe(size: Dict) -> pd.DataFrame:
+    """DataFrame of a DeFi Llama chart, for format_df"""
+    return pd.DataFrame(tvl_chart(random.Random(SEED), size['points'] * 5))
+
+
+def token_chart(rng: random.Random, points: int, tokens: int) -> List[Dict]:
+    """DeFi Llama tokens or tokensInUsd timeseries"""
+    return [{'date': START_S + day * DAY_S,
+             'tokens': {f'TOKEN{j}': rng.uniform(0, 1e7) for j in range(tokens)}}
+            for day in range(points)]
+
+
+def protocol_response(size: Dict, slug: str) -> Dict:
+    """DeFi Llama /protocol/{slug} response, for protocol_to_dataframe"""
+    rng = random.Random(f'{SEED}-{slug}')
+    points, tokens = size['points'], size['tokens']
+    chains = [f'Chain{i}' for i in range(size['chains'])]
+    chain_tvls = {chain: {'tvl': tvl_chart(rng, points),
+                          'tokens': token_chart(rng, points, tokens),
+                          'tokensInUsd': token_chart(rng, points, tokens)}
+                  for chain in chains}
+    return {'id': slug, 'name': slug.title(), 'chains': chains, 'chainTvls': chain_tvls,
+            'tvl': tvl_chart(rng, points),
+            'tokens': token_chart(rng, points, tokens),
+            'tokensInUsd': token_chart(rng, points, tokens)}
+
+
+def protocol_slugs(size: Dict) -> List[str]:
+    """Slugs of the protocols get_protocol_tvl_timeseries is benchmarked on"""
+    return [f'protocol-{i}' for i in range(max(1, size['assets'] // 5))]
+
+
+def solscan_holders_dataframe(size: Dict) -> pd.DataFrame:
+    """Solscan token holders concatenated per token, every cell is a dict"""
+    rng = random.Random(SEED)
+    frames = {}
+    for i in range(size['accounts']):
+        holders = [{'address': f'{rng.getrandbits(160):040x}', 'amount': rng.randint(0, 10**12),
+                    'decimals': 6, 'owner': f'{rng.getrandbits(160):040x}', 'rank': rank + 1}
+                   for rank in range(size['rows'])]
+        frames[f'token-{i}'] = pd.DataFrame({'data': holders})
+    return pd.concat(frames, axis=1)
+
+
+def deepdao_coalitions_dataframe(size: Dict) -> pd.DataFrame:
+    """DeepDAO coalitions per DAO, every cell is a list of dicts"""
+    rng = random.Random(SEED)
+    frames = {}
+    for i in range(size['daos']):
+        frames[f'dao-{i}'] = pd.Series({
+            field: [{'address': f'0x{rng.getrandbits(160):040x}',
+                     'votingPower': rng.uniform(0, 1), 'proposals': rng.randint(0, 100)}
+                    for _ in range(size['entries'])]
+            for field in ('coalition', 'topVoters', 'topProposers')})
+    return pd.concat(frames.values(), keys=list(frames.keys()), axis=1)
+
+
+def events_list(size: Dict) -> List[Dict]:
+    """Decoded contract events as stored by EventMonitor, in arrival order"""
+    rng = random.Random(SEED)
+    events = []
+    for i in range(size['events']):
+        events.append({'block_number': 14000000 + rng.randint(0, size['events'] // 10),
+                       'log_index': rng.randint(0, 300),
+                       'transaction_hash': f'0x{rng.getrandbits(256):064x}',
+                       'address': f'0x{rng.getrandbits(160):040x}',
+                       'event': 'Transfer',
+                       'from': f'0x{rng.getrandbits(160):040x}',
+                       'to': f'0x{rng.getrandbits(160):040x}',
+                       'value': rng.randint(0, 10**21),
+                       'id': i})
+    return events
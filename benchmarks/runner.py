@@ -0,0 +1,157 @@
+"""This module is meant to contain the functions timing the benchmark cases
+& comparing them with a stored baseline"""
+
+
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Dict, List
+
+import pandas as pd
+
+from benchmarks.cases import CASES, Case, copy_input
+from benchmarks.payloads import SIZES
+
+# Baseline the results are compared with by default
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Relative slowdown or memory growth over the baseline reported as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Changes in seconds below which a time ratio is considered noise
+MIN_TIME_CHANGE = 0.005
+
+
+def measure(case: Case, size: str, repeat: int = 5) -> Dict:
+    """Times case on a size preset after an untimed warm up run,
+    then measures the peak memory of one more run
+
+    :param case: Case
+        Benchmark case
+    :param size: str
+        Key of payloads.SIZES (i.e. small), any for cases that aren't sized
+    :param repeat: int
+        Number of timed runs
+    :return: Dict with min, median & mean seconds and peak_bytes,
+        or the reason the case was skipped (i.e. a missing optional dependency)
+    """
+    try:
+        prepared = case.prepare(SIZES.get(size, {}))
+    except ImportError as e:
+        return {'skipped': str(e)}
+    try:
+        case.run(copy_input(case, prepared))
+        times = []
+        for _ in range(repeat):
+            run_input = copy_input(case, prepared)
+            gc.collect()
+            start = time.perf_counter()
+            case.run(run_input)
+            times.append(time.perf_counter() - start)
+
+        run_input = copy_input(case, prepared)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            case.run(run_input)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        if case.cleanup is not None:
+            case.cleanup(prepared)
+    return {'min': min(times), 'median': statistics.median(times),
+            'mean': statistics.mean(times), 'peak_bytes': peak, 'repeat': repeat}
+
+
+def run(sizes: List[str] = None, names: List[str] = None, repeat: int = 5) -> Dict:
+    """Runs every case matching names on every size
+
+    :param sizes: list
+        Size presets, default small & medium
+    :param names: list
+        Substrings of the case names to run, default every case
+    :param repeat: int
+        Number of timed runs per case & size
+    :return: Dict of {case name: {size: measurements}}
+    """
+    sizes = sizes or ['small', 'medium']
+    results: Dict = {}
+    for case in CASES:
+        if names and not any(name in case.name for name in names):
+            continue
+        for size in (sizes if case.sized else ['any']):
+            logging.info('Benchmarking %s on %s payloads', case.name, size)
+            results.setdefault(case.name, {})[size] = measure(case, size, repeat=repeat)
+    return results
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict:
+    """Returns the results stored in a baseline file, empty if there is none"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as baseline_file:
+        return json.load(baseline_file)['results']
+
+
+def save_baseline(results: Dict, path: str = BASELINE_PATH) -> None:
+    """Stores results as the baseline, merged over the results already stored
+
+    :param results: dict
+        Output of run
+    :param path: str
+        Baseline file
+    """
+    merged = load_baseline(path)
+    for name, sizes in results.items():
+        merged.setdefault(name, {}).update(
+            {size: result for size, result in sizes.items() if 'skipped' not in result})
+    baseline = {'python': platform.python_version(), 'pandas': pd.__version__,
+                'machine': platform.machine(), 'results': merged}
+    with open(path, 'w', encoding='utf-8') as baseline_file:
+        json.dump(baseline, baseline_file, indent=1, sort_keys=True)
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> pd.DataFrame:
+    """Compares results with a baseline
+
+    :param results: dict
+        Output of run
+    :param baseline: dict
+        Output of load_baseline
+    :param tolerance: float
+        Relative change of the fastest run or of the peak memory tolerated,
+        the fastest run being the least sensitive to noise from the rest of the machine
+    :return: DataFrame with one row per case & size and a status column
+        (ok, regression, improvement, new or skipped)
+    """
+    rows = []
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            row = {'case': name, 'size': size}
+            if 'skipped' in result:
+                rows.append(dict(row, status='skipped', note=result['skipped']))
+                continue
+            row.update(min_s=result['min'], median_s=result['median'],
+                       peak_mb=result['peak_bytes'] / 2**20)
+            reference = baseline.get(name, {}).get(size)
+            if reference is None:
+                rows.append(dict(row, status='new'))
+                continue
+            time_ratio = result['min'] / reference['min']
+            memory_ratio = result['peak_bytes'] / max(reference['peak_bytes'], 1)
+            if abs(result['min'] - reference['min']) < MIN_TIME_CHANGE:
+                time_ratio = 1.0
+            if time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance:
+                status = 'regression'
+            elif time_ratio < 1 / (1 + tolerance) or memory_ratio < 1 / (1 + tolerance):
+                status = 'improvement'
+            else:
+                status = 'ok'
+            rows.append(dict(row, time_ratio=time_ratio, memory_ratio=memory_ratio, status=status))
+    return pd.DataFrame(rows)
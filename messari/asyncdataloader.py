@@ -0,0 +1,377 @@
+"""This module is meant to contain the AsyncDataLoader class"""
+
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Awaitable, Callable, Hashable, List, Optional, Tuple, Union, Dict
+from aiohttp import ClientSession, ClientError, ClientTimeout, TCPConnector
+from messari.ratelimit import RateLimiter, run_blocking
+from messari.retry import RetryPolicy
+from messari.cache import ResponseCache
+from messari.metrics import MetricsExporter
+from messari.pagination import Paginator
+from messari.singleflight import AsyncSingleFlight
+from messari.profiling import phase
+from messari.transport import TransportRegistry, split_timeout
+from messari.loaderbase import LoaderBase, Attempts, HeldSlot
+from messari.deadline import Deadline, DeadlineExceededError, RequestCancelledError, get_deadline
+
+# Default number of requests an AsyncDataLoader keeps in flight at once
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+def to_query(params: Dict) -> List[Tuple[str, str]]:
+    """Convert a requests style params dict into a list of query pairs aiohttp accepts.
+
+    None values are dropped, lists are sent as repeated keys & everything else
+    is cast to str, matching how requests encodes the same dict.
+
+    :param params: dict
+        Dictionary of query parameters.
+    :return: List of (key, value) string tuples
+    """
+    query = []
+    if not params:
+        return query
+    for key, value in params.items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            query.append((str(key), str(item)))
+    return query
+
+
+def to_headers(headers: Dict) -> Dict:
+    """Drop headers without a value, requests does this silently but aiohttp raises
+
+    :param headers: dict
+        Dictionary of headers
+    :return: Dictionary of headers with str values
+    """
+    if not headers:
+        return {}
+    return {key: str(value) for key, value in headers.items() if value is not None}
+
+
+class AsyncDataLoader(LoaderBase):
+    """This class is the asyncio counterpart of DataLoader, a base wrapper
+    around a variety of different API's used as data sources.
+
+    Requests are made through a single aiohttp ClientSession that is created
+    lazily on first use, so instances can be built outside of an event loop.
+    Close the session with close() or use the loader as an async context manager.
+    """
+    def __init__(self, api_dict: Dict, taxonomy_dict: Dict,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None, fail_fast: bool = False,
+                 cache: ResponseCache = None, coalesce: bool = True,
+                 metrics: MetricsExporter = None, profile: bool = False,
+                 transport: TransportRegistry = None, adaptive: bool = False):
+        LoaderBase.__init__(self, api_dict, taxonomy_dict, rate_limiter=rate_limiter,
+                            retry_policy=retry_policy, fail_fast=fail_fast, cache=cache,
+                            coalesce=coalesce, metrics=metrics, profile=profile,
+                            transport=transport, adaptive=adaptive)
+        self.max_concurrency = max_concurrency
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the underlying aiohttp session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def get_session(self) -> ClientSession:
+        """Returns the aiohttp session, creating it on the running event loop if needed
+
+        :return: aiohttp ClientSession
+        """
+        if self.session is None or self.session.closed:
+            connector = TCPConnector(**self.transport.get_connector_kwargs(self.max_concurrency))
+            connect, read = split_timeout(self.transport.timeout)
+            self.session = ClientSession(connector=connector, headers=self.transport.get_headers(),
+                                         timeout=ClientTimeout(total=None, connect=connect,
+                                                               sock_read=read))
+        return self.session
+
+    def get_timeout(self, deadline: Deadline = None) -> Optional[ClientTimeout]:
+        """Returns the timeout of the next request, capped to the time left of deadline
+
+        :param deadline: Deadline
+            Budget of the running call
+        :return: aiohttp ClientTimeout, None to use the session's
+        """
+        remaining = deadline.remaining() if deadline is not None else None
+        if self.timeout is None and remaining is None:
+            return None
+        timeout = self.timeout if self.timeout is not None else self.transport.timeout
+        if deadline is not None:
+            timeout = deadline.cap(timeout)
+        connect, read = split_timeout(timeout)
+        return ClientTimeout(total=remaining, connect=connect, sock_read=read)
+
+    def set_max_concurrency(self, max_concurrency: int) -> None:
+        """Sets the number of requests kept in flight by fan_out
+
+        :param max_concurrency: int
+            Maximum number of concurrent requests, 1 runs items one at a time
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        self.max_concurrency = max_concurrency
+
+    def new_single_flight(self) -> AsyncSingleFlight:
+        """Returns a SingleFlight of this loader, futures belong to one event loop"""
+        return AsyncSingleFlight()
+
+    async def fan_out(self, func: Callable[[Hashable], Awaitable], items: List[Hashable],
+                      failed: Dict = None) -> Dict:
+        """Awaits func once for every item with at most max_concurrency in flight.
+
+        Duplicate items are only requested once. Results are keyed by item and
+        kept in the same order as the input list, like DataLoader.fan_out.
+        Failed items are skipped & recorded in failed & self.failed_items unless
+        fail_fast is set, coroutines fanning out concurrently should pass their own failed.
+        Items running out of the call's deadline or cancelled make the whole call raise.
+
+        :param func: Callable
+            Coroutine function taking a single item, usually wrapping self.get_response
+        :param items: list
+            List of items (slugs, addresses, ids) to run func on
+        :param failed: dict
+            Collects the {item: exception} failures of this call
+        :return: Dict of {item: await func(item)} in input order
+        """
+        unique_items = list(dict.fromkeys(items))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        deadline = get_deadline()
+
+        async def bounded(item: Hashable):
+            async with semaphore:
+                if deadline is not None:
+                    deadline.check()
+                return await func(item)
+
+        results = await asyncio.gather(*(bounded(item) for item in unique_items),
+                                       return_exceptions=not self.fail_fast)
+        for result in results:
+            if isinstance(result, (DeadlineExceededError, RequestCancelledError)) or \
+                    (isinstance(result, BaseException) and not isinstance(result, Exception)):
+                raise result
+        outcomes = [(None, result) if isinstance(result, Exception) else (result, None)
+                    for result in results]
+        return self.collect_results(unique_items, outcomes, failed)
+
+    async def get_response(self, endpoint_url: str, params: Dict = None,
+                           headers: Dict = None) -> Dict:
+        """Gets response from endpoint and checks for HTTP errors when requesting data.
+
+        :param endpoint_url: str
+            URL API string.
+        :param params: dict
+            Dictionary of query parameters.
+        :param headers: str:
+            Dictionary of headers
+        :return: JSON with requested data
+        :raises SystemError if HTTP error occurs
+        :raises QueryFailedError if the response is not 200 once retries are spent
+        """
+        ttl = self.get_cache_ttl(endpoint_url, params)
+        if ttl != 0:
+            cached = await run_blocking(self.cache.blocking, self.cache.get, endpoint_url,
+                                        params, headers)
+            if cached is not None:
+                return self.decode_cached(endpoint_url, params, cached)
+
+        if self.single_flight is None:
+            return await self.send_request(endpoint_url, params, headers, ttl)
+        return await self.single_flight.do(
+            self.get_flight_key(endpoint_url, params, headers),
+            lambda: self.send_request(endpoint_url, params, headers, ttl),
+            deadline=get_deadline())
+
+    async def acquire_slot(self, endpoint_url: str, deadline: Deadline = None) -> HeldSlot:
+        """Waits for the host's adaptive concurrency limit to allow another request
+
+        :param endpoint_url: str
+            URL about to be requested
+        :param deadline: Deadline
+            Budget of the running call
+        :return: (limit, slot) to hand back to release_slot, None without a controller
+        """
+        limit = self.get_adaptive_limit(endpoint_url)
+        if limit is None:
+            return None
+        return limit, await limit.acquire_async(deadline)
+
+    async def send_request(self, endpoint_url: str, params: Dict, headers: Dict,
+                           ttl: Optional[float]) -> Dict:
+        """Sends a request, retrying it per the retry policy & caching the response
+
+        :param endpoint_url: str
+            URL API string.
+        :param params: dict
+            Dictionary of query parameters.
+        :param headers: str:
+            Dictionary of headers
+        :param ttl: float
+            Seconds to cache the response for, 0 to skip the cache
+        :return: JSON with requested data
+        :raises SystemError if HTTP error occurs
+        :raises QueryFailedError if the response is not 200 once retries are spent
+        :raises DeadlineExceededError, RequestCancelledError when the call's deadline
+            runs out or is cancelled
+        """
+        attempts = Attempts(self, endpoint_url, params)
+        session = self.get_session()
+        deadline = get_deadline()
+        sleep = deadline.sleep_async if deadline is not None else asyncio.sleep
+        while True:
+            if deadline is not None:
+                deadline.check()
+            # Wait for a token from the host's rate limit, or from a key's when keys are pooled
+            key = None
+            send_params, send_headers = params, headers
+            with phase('throttle'):
+                if self.key_pool is not None:
+                    key = await self.key_pool.acquire_async(deadline)
+                    send_params, send_headers = self.key_pool.apply(key, params, headers)
+                if self.uses_host_limit(key):
+                    await self.rate_limiter.wait_async(endpoint_url, deadline,
+                                                       self.rate_limit_scope)
+                else:
+                    await run_blocking(self.rate_limiter.blocking, self.rate_limiter.record,
+                                       endpoint_url)
+                held = await self.acquire_slot(endpoint_url, deadline)
+
+            # Make request, the session's timeout applies unless this loader or the call sets one
+            timeout = self.get_timeout(deadline)
+            kwargs = {'timeout': timeout} if timeout is not None else {}
+            start = time.perf_counter()
+            try:
+                with phase('http'):
+                    response = await session.get(endpoint_url, params=to_query(send_params),
+                                                 headers=to_headers(send_headers), **kwargs)
+                async with response:
+                    with phase('read'):
+                        body = await response.read()
+                    attempts.record(held, response.status, time.perf_counter() - start,
+                                    len(body))
+                    held = None
+                    # Look at response code
+                    status_code = response.status
+                    if status_code == 200:
+                        with phase('decode'):
+                            text = body.decode(response.get_encoding())
+                            data = json.loads(text)
+                        if attempts.is_answer(key, data):
+                            if self.should_cache(ttl, data):
+                                await run_blocking(self.cache.blocking, self.cache.set,
+                                                   endpoint_url, params, headers, text, ttl)
+                            return data
+                        # Quota error reported in the body, retry with another key
+                        status_code = 429
+                    delay = attempts.status_delay(key, status_code,
+                                                  response.headers.get('Retry-After'))
+            except (ClientError, asyncio.TimeoutError) as e:
+                attempts.record(held, None, time.perf_counter() - start, 0)
+                held = None
+                delay = attempts.error_delay(e, deadline)
+            finally:
+                # Not the host's doing, free the slot without adapting the limit
+                if held is not None:
+                    held[0].cancel(held[1])
+            with phase('backoff'):
+                await sleep(delay)
+
+    async def iter_pages(self, endpoint_url: str, paginator: Paginator, params: Dict = None,
+                         headers: Dict = None, max_pages: int = None,
+                         prefetch: bool = False) -> AsyncIterator[Union[Dict, List]]:
+        """Lazily requests the pages of a paginated endpoint, one at a time.
+
+        With prefetch the next page is requested in a task while
+        the current one is being processed by the caller.
+
+        :param endpoint_url: str
+            URL API string.
+        :param paginator: Paginator
+            Describes how the endpoint pages (i.e. PagePaginator, OffsetPaginator)
+        :param params: dict
+            Dictionary of query parameters shared by every page.
+        :param headers: dict
+            Dictionary of headers
+        :param max_pages: int
+            Stop after this many pages, default is every page
+        :param prefetch: bool
+            Request the next page while the current one is processed
+        :return: Async iterator of JSON pages
+        """
+        page_params = paginator.first_params(params)
+        pending = None
+        pages = 0
+        try:
+            while self.has_next_page(page_params, pages, max_pages):
+                if pending is None:
+                    response = await self.get_response(endpoint_url, params=page_params,
+                                                       headers=headers)
+                else:
+                    response = await pending
+                    pending = None
+                pages += 1
+                page_params = paginator.next_params(page_params, paginator.get_records(response))
+                if prefetch and self.has_next_page(page_params, pages, max_pages):
+                    pending = asyncio.ensure_future(
+                        self.get_response(endpoint_url, params=page_params, headers=headers))
+                yield response
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def iter_records(self, endpoint_url: str, paginator: Paginator, params: Dict = None,
+                           headers: Dict = None, max_pages: int = None,
+                           prefetch: bool = False) -> AsyncIterator:
+        """Lazily yields the records of a paginated endpoint, see iter_pages
+
+        :return: Async iterator of records
+        """
+        async for response in self.iter_pages(endpoint_url, paginator, params=params,
+                                              headers=headers, max_pages=max_pages,
+                                              prefetch=prefetch):
+            for record in paginator.get_records(response):
+                yield record
+
+    async def fetch_all(self, endpoint_url: str, paginator: Paginator, params: Dict = None,
+                        headers: Dict = None, max_pages: int = None) -> List:
+        """Returns every record of a paginated endpoint, prefetching the next page
+        while the current one is being unpacked
+
+        :return: List of records
+        """
+        return [record async for record in self.iter_records(
+            endpoint_url, paginator, params=params, headers=headers,
+            max_pages=max_pages, prefetch=True)]
+
+    def run(self, coroutine: Awaitable):
+        """Runs a coroutine from synchronous code & closes the session afterwards
+
+        Thin sync wrapper for scripts that don't have an event loop of their own,
+        e.g. AsyncMessari().run(messari.get_asset(['bitcoin', 'ethereum']))
+
+        :param coroutine: Awaitable
+            Coroutine returned by one of the loader's async methods
+        :return: result of the coroutine
+        """
+        async def run_and_close():
+            try:
+                return await coroutine
+            finally:
+                await self.close()
+
+        return asyncio.run(run_and_close())
@@ -1,13 +1,26 @@
 """Module to handle initialization, imports, for scanner class"""
 
-from .scanner import *
+from messari.lazy import lazy_exports
 
-# Localize imports of Explorers
-from .etherscan import Etherscan
-from .snowtrace import SnowTrace
-from .bscscan import BSCscan
-from .ftmscan import FTMscan
-from .arbiscan import Arbiscan
-from .polygonscan import Polygonscan
-from .optimisticetherscan import OptimisticEtherscan
-from .solscan import Solscan
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'Scanner': '.scanner',
+    'AsyncScanner': '.asyncscanner',
+    'FinalizedStore': '.finalizedstore',
+    # Localize imports of Explorers
+    'Etherscan': '.etherscan',
+    'SnowTrace': '.snowtrace',
+    'BSCscan': '.bscscan',
+    'FTMscan': '.ftmscan',
+    'Arbiscan': '.arbiscan',
+    'Polygonscan': '.polygonscan',
+    'OptimisticEtherscan': '.optimisticetherscan',
+    'Solscan': '.solscan',
+    # Localize imports of async Explorers
+    'AsyncEtherscan': '.etherscan',
+    'AsyncSnowTrace': '.snowtrace',
+    'AsyncBSCscan': '.bscscan',
+    'AsyncFTMscan': '.ftmscan',
+    'AsyncArbiscan': '.arbiscan',
+    'AsyncPolygonscan': '.polygonscan',
+    'AsyncOptimisticEtherscan': '.optimisticetherscan',
+})
@@ -0,0 +1,129 @@
+"""This module is meant to contain the Asyncarbiscan class"""
+
+
+import pandas as pd
+from typing import Union, List
+from messari.blockexplorers import AsyncScanner
+from messari.utils import validate_input
+
+from .arbiscan import BASE_URL
+
+class AsyncArbiscan(AsyncScanner):
+    """This class is an asyncio wrapper around the arbiscan API
+    """
+
+    def __init__(self, api_key: Union[str, List[str]]=None):
+        AsyncScanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+
+    ##### Accounts
+    # NOTE: no changes
+
+    ##### Contracts
+    # NOTE: no changes
+
+    ##### Transactions
+    async def get_contract_execution_status(self, transactions_in: Union[str, List]) -> None:
+        """Override: return None
+        """
+        return None
+
+    ##### Blocks
+    async def get_block_reward(self, blocks_in: Union[int, List]) -> pd.DataFrame:
+        """Override: return None
+        """
+        return None
+
+    async def get_block_countdown(self, blocks_in: Union[int, List]) -> pd.DataFrame:
+        """Override: return None
+        """
+        return None
+
+    ##### Logs
+    # NOTE: no changes
+
+    ##### Geth/Parity Proxy
+    async def get_eth_block_number(self):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_block(self, blocks_in: Union[int, List]):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_uncle(self, block: int, index: int):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_block_transaction_count(self, blocks_in: Union[int, List]):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_transaction_by_hash(self, transactions_in: Union[str, List]):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_transaction_by_block_index(self, block: int, index: int):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_account_transaction_count(self, accounts_in: Union[str, List]):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_transaction_receipt(self, transactions_in: Union[str, List]):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_gas_price(self):
+        """Override: return None
+        """
+        return None
+
+    ##### Tokens
+    async def get_token_circulating_supply(self, tokens_in: Union[str, List]) -> pd.DataFrame:
+        """Get ERC20 Circulating Supply (For Arbitrum Cross Chain token Types) by ContractAddress
+
+        Parameters
+        ----------
+            tokens_in: str, List
+                single token address in or list of token addresses
+
+        Returns
+        -------
+            DataFrame
+                DataFrame containing total supply for token(s)
+        """
+        tokens = validate_input(tokens_in)
+
+        async def get_supply(token: str) -> str:
+            params = {'module': 'stats',
+                      'action': 'tokenCsupply',
+                      'contractaddress': token}
+            params.update(self.api_dict)
+            return (await self.get_response(self.base_url, params=params))['result']
+
+        supply_dict = await self.fan_out(get_supply, tokens)
+        supply_df = pd.Series(supply_dict).to_frame(name='supply')
+        return supply_df
+
+    ##### Gas Tracker
+    async def get_est_confirmation(self, gas_price: int):
+        """Override: return None
+        """
+        return None
+
+    async def get_gas_oracle(self) -> None:
+        """Override: return None
+        """
+        return None
+
+    ##### Stats
+    # NOTE: no changes
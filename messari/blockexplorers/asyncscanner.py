@@ -0,0 +1,263 @@
+"""This module is meant to contain the AsyncScanner class"""
+
+from typing import AsyncIterator, Union, List, Dict, Optional, Tuple
+import pandas as pd
+
+from messari.asyncdataloader import AsyncDataLoader
+from messari.keypool import first_key
+from messari.utils import validate_input, validate_int
+from .helpers import receipt_to_status, results_to_column, results_to_rows, results_to_frames, \
+    results_to_series, hex_results, transfers_to_dataframe, balances_to_dataframe
+from .scannerbase import ScannerBase
+
+# Refrence: https://docs.etherscan.io/
+class AsyncScanner(ScannerBase, AsyncDataLoader):
+    """This class is an asyncio wrapper around the blockexplorer APIs,
+    every method is a coroutine returning the same data as its Scanner counterpart
+    """
+
+    def __init__(self, base_url: str, api_key: Union[str, List[str]]=None):
+        api_dict = {'apikey': first_key(api_key)}
+        AsyncDataLoader.__init__(self, api_dict=api_dict, taxonomy_dict={})
+        ScannerBase.__init__(self, base_url, api_key)
+
+    async def get_result(self, params: Dict):
+        """See Scanner.get_result"""
+        return (await self.get_response(self.base_url, params=params))['result']
+
+    async def get_results(self, requests: Dict, stored: Dict = None) -> Dict:
+        """See Scanner.get_results"""
+        stored = stored or {}
+
+        async def get_result(item) -> Dict:
+            if item in stored:
+                return stored[item]
+            return await self.get_result(requests[item])
+
+        return await self.fan_out(get_result, list(requests))
+
+    async def get_finalized(self, kind: str, keys: List) -> Tuple[Dict, Optional[int]]:
+        """See Scanner.get_finalized"""
+        stored, missing = self.get_stored(kind, keys)
+        if not missing:
+            return stored, None
+        return stored, await self.get_eth_block_number() - self.confirmations
+
+    ##### Accounts
+    async def get_account_native_balance(self, accounts_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_account_native_balance"""
+        requests = self.account_requests(accounts_in, 'balance', tag='latest')
+        results = await self.get_results(requests)
+        return results_to_column(results, 'balances')
+
+    async def get_account_normal_transactions(self, accounts_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_account_normal_transactions"""
+        results = await self.get_results(self.account_requests(accounts_in, 'txlist'))
+        return results_to_frames(results)
+
+    async def iter_account_transactions(self, account: str, action: str = 'txlist',
+                                  page_size: int = 1000, ascending: bool = True,
+                                  prefetch: bool = True) -> AsyncIterator[Dict]:
+        """See Scanner.iter_account_transactions"""
+        params, paginator = self.account_transactions_params(account, action, ascending,
+                                                             page_size)
+        async for record in self.iter_records(self.base_url, paginator, params=params,
+                                              prefetch=prefetch):
+            yield record
+
+    async def get_account_internal_transactions(self,
+                                                accounts_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_account_internal_transactions"""
+        results = await self.get_results(self.account_requests(accounts_in, 'txlistinternal'))
+        return results_to_frames(results)
+
+    async def get_transaction_internal_transactions(self,
+                                              transactions_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_transaction_internal_transactions"""
+        results = await self.get_results(self.transaction_internal_requests(transactions_in))
+        return results_to_frames(results)
+
+    async def get_block_range_internal_transactions(self, start_block: int, end_block: int,
+                                                    page: int=0, offset: int=0,
+                                                    ascending:bool=True) -> pd.DataFrame:
+        """See Scanner.get_block_range_internal_transactions"""
+        # TODO check paging
+        params = self.block_range_internal_params(start_block, end_block, page, offset, ascending)
+        return pd.DataFrame(await self.get_result(params))
+
+    async def get_account_token_transfers(self, accounts_in: Union[str, List],
+                                    tokens_in: Union[str, List]=None,
+                                    start_block: int=None, end_block: int=None,
+                                    page:int=0, offset:int=0,
+                                    ascending:bool=True) -> pd.DataFrame:
+        """See Scanner.get_account_token_transfers"""
+        requests = self.transfers_requests('tokentx', accounts_in, tokens_in, start_block,
+                                           end_block, page, offset, ascending)
+        return transfers_to_dataframe(await self.get_results(requests))
+
+    async def get_account_nft_transfers(self, accounts_in: Union[str, List],
+                                  nfts_in: Union[str, List]=None,
+                                  start_block: int=None, end_block: int=None,
+                                  page:int=0, offset:int=0, ascending:bool=True) -> pd.DataFrame:
+        """See Scanner.get_account_nft_transfers"""
+        requests = self.transfers_requests('tokennfttx', accounts_in, nfts_in, start_block,
+                                           end_block, page, offset, ascending)
+        return transfers_to_dataframe(await self.get_results(requests))
+
+    # NOTE: this is the same as blocks validated on PoS chains
+    async def get_account_blocks_mined(self, accounts_in: Union[str, List], block_type:str='blocks',
+                                 page:int=0, offset:int=0) -> pd.DataFrame:
+        """See Scanner.get_account_blocks_mined"""
+        requests = self.account_requests(accounts_in, 'getminedblocks', blocktype=block_type,
+                                         page=page, offset=offset)
+        return results_to_frames(await self.get_results(requests))
+
+    ##### Contracts
+    async def get_contract_abi(self, contracts_in: Union[str, List]) -> Dict:
+        """See Scanner.get_contract_abi"""
+        return await self.get_results(self.contract_requests(contracts_in, 'getabi'))
+
+    async def get_contract_source_code(self, contracts_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_contract_source_code"""
+        results = await self.get_results(self.contract_requests(contracts_in, 'getsourcecode'))
+        return results_to_frames(results)
+
+    ##### Transactions
+    async def get_contract_execution_status(self,
+                                            transactions_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_contract_execution_status"""
+        requests = self.transaction_requests(transactions_in, 'transaction', 'getstatus')
+        return results_to_column(await self.get_results(requests), 'transactions')
+
+    async def get_transaction_execution_status(self, transactions_in: Union[str, List]
+                                               ) -> pd.DataFrame:
+        """See Scanner.get_transaction_execution_status"""
+        if self.finalized_store is not None:
+            # Receipts carry the status & the block needed to tell if it's final
+            receipts = await self.get_receipt_dict(validate_input(transactions_in))
+            statuses = {transaction: receipt_to_status(receipt)
+                        for transaction, receipt in receipts.items()}
+            return results_to_column(statuses, 'transactions')
+
+        requests = self.transaction_requests(transactions_in, 'transaction', 'gettxreceiptstatus')
+        return results_to_column(await self.get_results(requests), 'transactions')
+
+    ##### Blocks
+    # TODO, get pro
+    async def get_block_reward(self, blocks_in: Union[int, List]) -> pd.DataFrame:
+        """See Scanner.get_block_reward"""
+        results = await self.get_results(self.block_requests(blocks_in, 'getblockreward'))
+        return results_to_series(results)
+
+    async def get_block_countdown(self, blocks_in: Union[int, List]) -> pd.DataFrame:
+        """See Scanner.get_block_countdown"""
+        results = await self.get_results(self.block_requests(blocks_in, 'getblockcountdown'))
+        return results_to_rows(results)
+
+    async def get_block_by_timestamp(self, times_in: Union[int, List],
+                                     before: bool=True) -> pd.DataFrame:
+        """See Scanner.get_block_by_timestamp"""
+        results = await self.get_results(self.block_by_timestamp_requests(times_in, before))
+        return results_to_rows(results)
+
+    ##### Logs
+    async def get_logs(self, address: str,
+                 from_block: Union[int, str],
+                 to_block: Union[int, str]='latest',
+                 topic0: str=None, topic1: str=None,
+                 topic2: str=None, topic3: str=None,
+                 topic0_1_opr: str=None, topic1_2_opr: str=None,
+                 topic2_3_opr: str=None, topic0_2_opr: str=None,
+                 topic0_3_opr: str=None, topic1_3_opr: str=None) -> pd.DataFrame:
+        """See Scanner.get_logs"""
+        topics = {'topic0': topic0, 'topic1': topic1, 'topic2': topic2, 'topic3': topic3}
+        operators = {'topic0_1_opr': topic0_1_opr, 'topic1_2_opr': topic1_2_opr,
+                     'topic2_3_opr': topic2_3_opr, 'topic0_2_opr': topic0_2_opr,
+                     'topic0_3_opr': topic0_3_opr, 'topic1_3_opr': topic1_3_opr}
+        params = self.logs_params(address, from_block, to_block, topics, operators)
+        return pd.DataFrame(await self.get_result(params))
+
+    ##### Geth/Parity Proxy
+    async def get_eth_block_number(self) -> int:
+        """See Scanner.get_eth_block_number"""
+        block_num_hex = await self.get_result(self.make_params('proxy', 'eth_blockNumber'))
+        return int(block_num_hex, 16)
+
+    async def get_eth_block(self, blocks_in: Union[int, List]) -> pd.DataFrame:
+        """See Scanner.get_eth_block"""
+        blocks = validate_int(blocks_in)
+        stored, finalized = await self.get_finalized('block', blocks)
+        results = await self.get_results(self.eth_block_requests(blocks), stored)
+        self.store_results('block', results, stored, finalized)
+        return results_to_series(results)
+
+    async def get_eth_uncle(self, block: int, index: int) -> Dict:
+        """See Scanner.get_eth_uncle"""
+        params = self.block_index_params('eth_getUncleByBlockNumberAndIndex', block, index)
+        return await self.get_result(params)
+
+    async def get_eth_block_transaction_count(self, blocks_in: Union[int, List]) -> pd.DataFrame:
+        """See Scanner.get_eth_block_transaction_count"""
+        results = await self.get_results(self.block_transaction_count_requests(blocks_in))
+        return results_to_column(hex_results(results), 'transaction_count')
+
+    async def get_eth_transaction_by_hash(self, transactions_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_eth_transaction_by_hash"""
+        transactions = validate_input(transactions_in)
+        stored, finalized = await self.get_finalized('transaction', transactions)
+        requests = self.transaction_requests(transactions, 'proxy', 'eth_getTransactionByHash')
+        results = await self.get_results(requests, stored)
+        self.store_results('transaction', results, stored, finalized)
+        return results_to_series(results)
+
+    async def get_eth_transaction_by_block_index(self, block: int, index: int) -> pd.DataFrame:
+        """See Scanner.get_eth_transaction_by_block_index"""
+        params = self.block_index_params('eth_getTransactionByBlockNumberAndIndex', block, index)
+        return results_to_column(await self.get_result(params), 'transaction_info')
+
+    async def get_eth_account_transaction_count(self,
+                                                accounts_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_eth_account_transaction_count"""
+        results = await self.get_results(self.account_transaction_count_requests(accounts_in))
+        return results_to_column(hex_results(results), 'transaction_count')
+
+    async def get_eth_transaction_receipt(self, transactions_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_eth_transaction_receipt"""
+        receipts = await self.get_receipt_dict(validate_input(transactions_in))
+        return results_to_frames(receipts)
+
+    async def get_receipt_dict(self, transactions: List[str]) -> Dict:
+        """See Scanner.get_receipt_dict"""
+        stored, finalized = await self.get_finalized('receipt', transactions)
+        requests = self.transaction_requests(transactions, 'proxy', 'eth_getTransactionReceipt')
+        results = await self.get_results(requests, stored)
+        self.store_results('receipt', results, stored, finalized)
+        return results
+
+    async def get_eth_gas_price(self) -> int:
+        """See Scanner.get_eth_gas_price"""
+        gas_price_hex = await self.get_result(self.make_params('proxy', 'eth_gasPrice'))
+        return int(gas_price_hex, 16)
+
+    ##### Tokens
+    async def get_token_total_supply(self, tokens_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_token_total_supply"""
+        results = await self.get_results(self.token_supply_requests(tokens_in))
+        return results_to_column(results, 'supply')
+
+    async def get_token_account_balance(self, tokens_in: Union[str, List],
+                                  accounts_in: Union[str, List]) -> pd.DataFrame:
+        """See Scanner.get_token_account_balance"""
+        results = await self.get_results(self.token_balance_requests(tokens_in, accounts_in))
+        return balances_to_dataframe(results)
+
+    ##### Gas Tracker
+    async def get_est_confirmation(self, gas_price: int) -> int:
+        """See Scanner.get_est_confirmation"""
+        params = self.make_params('gastracker', 'gasestimate', gasprice=gas_price)
+        return int(await self.get_result(params))
+
+    async def get_gas_oracle(self) -> pd.DataFrame:
+        """See Scanner.get_gas_oracle"""
+        response = await self.get_result(self.make_params('gastracker', 'gasoracle'))
+        return results_to_column(response, 'gas_oracle')
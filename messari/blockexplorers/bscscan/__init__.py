@@ -1,3 +1,8 @@
 """Module to handle initialization, imports, for BSCscan class"""
 
-from .bscscan import *
+from messari.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'BSCscan': '.bscscan',
+    'AsyncBSCscan': '.asyncbscscan',
+})
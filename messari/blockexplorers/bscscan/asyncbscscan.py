@@ -0,0 +1,121 @@
+"""This module is meant to contain the AsyncBSCscan class"""
+
+
+import pandas as pd
+from typing import Union, List
+from messari.blockexplorers import AsyncScanner
+from messari.utils import validate_input
+
+from .bscscan import BASE_URL
+
+class AsyncBSCscan(AsyncScanner):
+    """This class is an asyncio wrapper around the BSCscan API
+    """
+
+    def __init__(self, api_key: Union[str, List[str]]=None):
+        AsyncScanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+
+    ##### Accounts
+    # NOTE: no changes
+
+    ##### Contracts
+    # NOTE: no changes
+
+    ##### Transactions
+    async def get_contract_execution_status(self, transactions_in: Union[str, List]):
+        """Override: return None
+        """
+        return None
+
+    ##### Blocks
+    # NOTE: no changes
+
+    ##### Logs
+    # NOTE: no changes
+
+    ##### Geth/Parity Proxy
+    async def get_eth_uncle(self, block: int, index: int):
+        """Override: return None
+        """
+        return None
+
+    ##### Tokens
+    async def get_token_circulating_supply(self, tokens_in: Union[str, List]) -> pd.DataFrame:
+        """Returns BEP-20 Token Circulating Supply
+
+        Parameters
+        ----------
+            tokens_in: str, List
+                single token address in or list of token addresses
+
+        Returns
+        -------
+            DataFrame
+                DataFrame containing total supply for token(s)
+        """
+        tokens = validate_input(tokens_in)
+
+        async def get_supply(token: str) -> str:
+            params = {'module': 'stats',
+                      'action': 'tokenCsupply',
+                      'contractaddress': token}
+            params.update(self.api_dict)
+            return (await self.get_response(self.base_url, params=params))['result']
+
+        supply_dict = await self.fan_out(get_supply, tokens)
+        supply_df = pd.Series(supply_dict).to_frame(name='supply')
+        return supply_df
+
+    ##### Gas Tracker
+    async def get_est_confirmation(self, gas_price: int):
+        """Override: return None
+        """
+        return None
+
+    ##### Stats
+    async def get_total_bnb_supply(self) -> int:
+        """Returns the current amount of bnb (Wei) in circulation.
+
+        Returns
+        -------
+            DataFrame
+                DataFrame with current amount of bnb circulating
+        """
+        params = {'module': 'stats',
+                  'action': 'bnbsupply'}
+        params.update(self.api_dict)
+        response = (await self.get_response(self.base_url, params=params))['result']
+        return int(response)
+
+    async def get_validators(self) -> pd.DataFrame:
+        """Returns the top 21 validators for the Binance Smart Chain
+
+        Returns
+        -------
+            DataFrame
+                DataFrame with top 21 validators
+        """
+        params = {'module': 'stats',
+                  'action': 'validators'}
+        params.update(self.api_dict)
+        response = (await self.get_response(self.base_url, params=params))['result']
+        return pd.DataFrame(response)
+
+    async def get_last_bnb_price(self) -> pd.DataFrame:
+        """Returns the latest price of 1 BNB in BTC & USD
+
+        Returns
+        -------
+            DataFrame
+                DataFrame with current bnb price
+        """
+        params = {'module': 'stats',
+                  'action': 'bnbprice'}
+        params.update(self.api_dict)
+        response = (await self.get_response(self.base_url, params=params))['result']
+        # yes, the respone really gives back 'ethusd' and 'btcusd'
+        bnbbtc = response['ethbtc']
+        bnbusd = response['ethusd']
+        price_dict = {'btc': bnbbtc, 'usd': bnbusd}
+        price_df = pd.Series(price_dict).to_frame(name='bnb_price')
+        return price_df
@@ -1,6 +1,6 @@
 """This module is meant to contain the Etherscan class"""
 
-from typing import Union
+from typing import Union, List
 import datetime
 import pandas as pd
 
@@ -14,7 +14,7 @@ class Etherscan(Scanner):
     """This class is a wrapper around the Etherscan API
     """
 
-    def __init__(self, api_key: str=None):
+    def __init__(self, api_key: Union[str, List[str]]=None):
         Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
 
     ##### Accounts
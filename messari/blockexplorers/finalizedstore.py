@@ -0,0 +1,102 @@
+"""This module is meant to contain the FinalizedStore class"""
+
+import json
+import sqlite3
+import threading
+from typing import Dict, Hashable, List, Optional
+
+# Blocks behind the chain head after which data is treated as final,
+# two epochs on Ethereum mainnet
+DEFAULT_CONFIRMATIONS = 64
+
+
+class FinalizedStore:
+    """This class is a persistent SQLite store for chain data that can no longer change.
+
+    Objects are keyed by chain (the explorer host), kind (block, transaction, receipt)
+    and block number or transaction hash. Nothing is ever evicted, only data buried
+    under enough confirmations should be written to it.
+    """
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self.lock, self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS finalized '
+                '(chain TEXT, kind TEXT, key TEXT, value TEXT, PRIMARY KEY (chain, kind, key))')
+
+    @staticmethod
+    def normalize_key(key: Hashable) -> str:
+        """Hashes are case insensitive & block numbers are stored as decimal strings"""
+        return str(key).lower()
+
+    def get(self, chain: str, kind: str, key: Hashable) -> Optional[Dict]:
+        """Returns a stored object, None if it isn't stored
+
+        :param chain: str
+            Chain the object belongs to
+        :param kind: str
+            Kind of object (block, transaction, receipt)
+        :param key: int, str
+            Block number or transaction hash
+        :return: JSON object or None
+        """
+        return self.get_many(chain, kind, [key]).get(key)
+
+    def get_many(self, chain: str, kind: str, keys: List[Hashable]) -> Dict:
+        """Returns the stored objects among keys
+
+        :param chain: str
+            Chain the objects belong to
+        :param kind: str
+            Kind of objects (block, transaction, receipt)
+        :param keys: list
+            Block numbers or transaction hashes
+        :return: Dict of {key: object} for the keys that are stored
+        """
+        normalized = {self.normalize_key(key): key for key in keys}
+        if not normalized:
+            return {}
+        placeholders = ','.join('?' * len(normalized))
+        with self.lock:
+            rows = self.connection.execute(
+                f'SELECT key, value FROM finalized WHERE chain = ? AND kind = ? '
+                f'AND key IN ({placeholders})', [chain, kind, *normalized]).fetchall()
+        return {normalized[key]: json.loads(value) for key, value in rows}
+
+    def set(self, chain: str, kind: str, key: Hashable, value: Dict) -> None:
+        """Stores a finalized object
+
+        :param chain: str
+            Chain the object belongs to
+        :param kind: str
+            Kind of object (block, transaction, receipt)
+        :param key: int, str
+            Block number or transaction hash
+        :param value: dict
+            JSON object
+        """
+        with self.lock, self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO finalized VALUES (?, ?, ?, ?)',
+                                    (chain, kind, self.normalize_key(key), json.dumps(value)))
+
+    def clear(self, chain: str = None) -> None:
+        """Removes every object, or only those of one chain
+
+        :param chain: str
+            Chain to clear, every chain by default
+        """
+        with self.lock, self.connection:
+            if chain is None:
+                self.connection.execute('DELETE FROM finalized')
+            else:
+                self.connection.execute('DELETE FROM finalized WHERE chain = ?', (chain,))
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM finalized').fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the SQLite connection"""
+        self.connection.close()
@@ -1,3 +1,8 @@
 """Module to handle initialization, imports, for FTMscan class"""
 
-from .ftmscan import *
+from messari.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'FTMscan': '.ftmscan',
+    'AsyncFTMscan': '.asyncftmscan',
+})
@@ -10,7 +10,7 @@ class FTMscan(Scanner):
     """This class is a wrapper around the FTMscan API
     """
 
-    def __init__(self, api_key: str=None):
+    def __init__(self, api_key: Union[str, List[str]]=None):
         Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
 
     ##### Accounts
@@ -1,6 +1,7 @@
 """This module is dedicated to helpers for the Scanners class"""
 
-from typing import List, Union
+from typing import Dict, List, Union
+import pandas as pd
 from messari.utils import validate_int
 
 def int_to_hex(ints_in: Union[int, List]) -> List[str]:
@@ -11,3 +12,61 @@ def int_to_hex(ints_in: Union[int, List]) -> List[str]:
     for int_in in ints:
         hex_out.append(hex(int_in))
     return hex_out
+
+def hex_to_int(hex_in: Union[str, None]) -> Union[int, None]:
+    """Converts a '0x' hex string to an integer, None stays None (i.e. pending blocks)
+    """
+    if hex_in is None:
+        return None
+    return int(hex_in, 16)
+
+def receipt_to_status(receipt: Union[Dict, None]) -> Dict:
+    """Converts a transaction receipt to the gettxreceiptstatus result,
+    status is '' for unknown transactions & pre-byzantium receipts
+    """
+    if not receipt or receipt.get('status') is None:
+        return {'status': ''}
+    return {'status': str(hex_to_int(receipt['status']))}
+
+def results_to_column(results: Dict, name: str) -> pd.DataFrame:
+    """Converts {key: result} to a single column DataFrame indexed by key
+    """
+    return pd.Series(results).to_frame(name=name)
+
+def results_to_rows(results: Dict) -> pd.DataFrame:
+    """Converts {key: result} to a DataFrame with one row per result
+    """
+    return pd.DataFrame(list(results.values()))
+
+def results_to_frames(results: Dict) -> pd.DataFrame:
+    """Converts {key: list of records} to a DataFrame with the records of each key
+    under their own top level column
+    """
+    return pd.concat({key: pd.DataFrame(result) for key, result in results.items()}, axis=1)
+
+def results_to_series(results: Dict) -> pd.DataFrame:
+    """Converts {key: dict} to a DataFrame with one column per key
+    """
+    return pd.concat({key: pd.Series(result) for key, result in results.items()}, axis=1)
+
+def hex_results(results: Dict) -> Dict:
+    """Converts '0x' hex string results to integers
+    """
+    return {key: int(result, 16) for key, result in results.items()}
+
+def transfers_to_dataframe(results: Dict) -> pd.DataFrame:
+    """Converts {(account, contract): transfers} to a DataFrame of the transfers of each
+    account, every contract filter included
+    """
+    transfers = {}
+    for (account, _), result in results.items():
+        transfers.setdefault(account, []).extend(result)
+    return results_to_frames(transfers)
+
+def balances_to_dataframe(results: Dict) -> pd.DataFrame:
+    """Converts {(account, token): balance} to a DataFrame of tokens by accounts
+    """
+    balances = {}
+    for (account, token), balance in results.items():
+        balances.setdefault(account, {})[token] = balance
+    return pd.DataFrame(balances)
@@ -0,0 +1,169 @@
+"""This module is meant to contain the AsyncOptimisticEtherscan class"""
+
+from typing import Union, List
+import pandas as pd
+
+from messari.blockexplorers import AsyncScanner
+from messari.utils import validate_input
+
+from .optimisticetherscan import BASE_URL
+
+# Reference: https://optimistic.etherscan.io/apis
+class AsyncOptimisticEtherscan(AsyncScanner):
+    """This class is an asyncio wrapper around the OptimisticEtherscan API
+    """
+
+    def __init__(self, api_key: Union[str, List[str]]=None):
+        AsyncScanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+
+    ##### Accounts
+    async def get_account_l1_deposits(self, accounts_in: Union[str, List],
+                                ascending:bool=True) -> pd.DataFrame:
+        accounts = validate_input(accounts_in)
+        sort = 'asc' if ascending else 'desc'
+
+        async def get_deposits(account: str) -> pd.DataFrame:
+            params = {'module': 'account',
+                      'action': 'getdeposittx',
+                      'address': account,
+                      'sortorder': sort}
+            params.update(self.api_dict)
+            response = (await self.get_response(self.base_url, params=params))['result']
+            return pd.DataFrame(response)
+
+        df_dict = await self.fan_out(get_deposits, accounts)
+        deposits_df = pd.concat(df_dict, axis=1)
+        return deposits_df
+
+    async def get_account_l2_withdrawals(self, accounts_in: Union[str, List], ascending:bool=True) -> pd.DataFrame:
+        accounts = validate_input(accounts_in)
+        # NOTE: sort may not be an argument
+        sort = 'asc' if ascending else 'desc'
+
+        async def get_withdrawals(account: str) -> pd.DataFrame:
+            params = {'module': 'account',
+                      'action': 'getwithdrawaltx',
+                      'address': account,
+                      'sortorder': sort}
+            params.update(self.api_dict)
+            response = (await self.get_response(self.base_url, params=params))['result']
+            return pd.DataFrame(response)
+
+        df_dict = await self.fan_out(get_withdrawals, accounts)
+        deposits_df = pd.concat(df_dict, axis=1)
+        return deposits_df
+
+    #TODO: missing a lot?
+
+    ##### Contracts
+    # NOTE: no changes
+
+    ##### Transactions
+    async def get_contract_execution_status(self, transactions_in: Union[str, List]) -> pd.DataFrame:
+        """Override: return None
+        """
+        return None
+
+    async def get_transaction_execution_status(self, transactions_in: Union[str, List]) -> pd.DataFrame:
+        """Override: return None
+        """
+        return None
+
+    ##### Blocks
+    async def get_block_reward(self, blocks_in: Union[int, List]) -> pd.DataFrame:
+        """Override: return None
+        """
+        return None
+
+    async def get_block_countdown(self, blocks_in: Union[int, List]) -> pd.DataFrame:
+        """Override: return None
+        """
+        return None
+
+    async def get_block_by_timestamp(self, times_in: Union[int, List], before: bool=True) -> pd.DataFrame:
+        """Override: return None
+        """
+        return None
+
+    ##### Logs
+    async def get_logs(self, address: str,
+                 from_block: Union[int, str],
+                 to_block: Union[int, str]='latest',
+                 topic0: str=None, topic1: str=None,
+                 topic2: str=None, topic3: str=None,
+                 topic0_1_opr: str=None, topic1_2_opr: str=None,
+                 topic2_3_opr: str=None, topic0_2_opr: str=None,
+                 topic0_3_opr: str=None, topic1_3_opr: str=None) -> pd.DataFrame:
+        """Override: return None
+        """
+        return None
+
+    ##### Geth/Parity Proxy
+    async def get_eth_block_number(self):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_block(self, blocks_in: Union[int, List]):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_uncle(self, block: int, index: int):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_block_transaction_count(self, blocks_in: Union[int, List]):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_transaction_by_hash(self, transactions_in: Union[str, List]):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_transaction_by_block_index(self, block: int, index: int):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_account_transaction_count(self, accounts_in: Union[str, List]):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_transaction_receipt(self, transactions_in: Union[str, List]):
+        """Override: return None
+        """
+        return None
+
+    async def get_eth_gas_price(self):
+        """Override: return None
+        """
+        return None
+
+    ##### Tokens
+    # NOTE: no changes
+
+    ##### Gas Tracker
+    async def get_est_confirmation(self, gas_price: int):
+        """Override: return None
+        """
+        return None
+
+    async def get_gas_oracle(self):
+        """Override: return None
+        """
+        return None
+
+    ##### Stats
+    async def get_total_eth_supply(self) -> int:
+        """Returns the current amount of ETH (Wei) in circulation on optimism
+        """
+        params = {'module': 'stats',
+                  'action': 'optimismsupply'}
+        params.update(self.api_dict)
+        response = (await self.get_response(self.base_url, params=params))['result']
+        return int(response)
@@ -12,7 +12,7 @@ class OptimisticEtherscan(Scanner):
     """This class is a wrapper around the OptimisticEtherscan API
     """
 
-    def __init__(self, api_key: str=None):
+    def __init__(self, api_key: Union[str, List[str]]=None):
         Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
 
     ##### Accounts
@@ -20,34 +20,36 @@ class OptimisticEtherscan(Scanner):
                                 ascending:bool=True) -> pd.DataFrame:
         accounts = validate_input(accounts_in)
         sort = 'asc' if ascending else 'desc'
-        df_list=[]
-        for account in accounts:
+
+        def get_deposits(account: str) -> pd.DataFrame:
             params = {'module': 'account',
                       'action': 'getdeposittx',
                       'address': account,
                       'sortorder': sort}
             params.update(self.api_dict)
-            response = self.get_response(self.BASE_URL, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        deposits_df = pd.concat(df_list, keys=accounts, axis=1)
+            response = self.get_response(self.base_url, params=params)['result']
+            return pd.DataFrame(response)
+
+        df_dict = self.fan_out(get_deposits, accounts)
+        deposits_df = pd.concat(df_dict, axis=1)
         return deposits_df
 
     def get_account_l2_withdrawals(self, accounts_in: Union[str, List], ascending:bool=True) -> pd.DataFrame:
         accounts = validate_input(accounts_in)
         # NOTE: sort may not be an argument
         sort = 'asc' if ascending else 'desc'
-        df_list=[]
-        for account in accounts:
+
+        def get_withdrawals(account: str) -> pd.DataFrame:
             params = {'module': 'account',
                       'action': 'getwithdrawaltx',
                       'address': account,
                       'sortorder': sort}
             params.update(self.api_dict)
-            response = self.get_response(self.BASE_URL, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        deposits_df = pd.concat(df_list, keys=accounts, axis=1)
+            response = self.get_response(self.base_url, params=params)['result']
+            return pd.DataFrame(response)
+
+        df_dict = self.fan_out(get_withdrawals, accounts)
+        deposits_df = pd.concat(df_dict, axis=1)
         return deposits_df
 
     #TODO: missing a lot?
@@ -162,5 +164,5 @@ class OptimisticEtherscan(Scanner):
         params = {'module': 'stats',
                   'action': 'optimismsupply'}
         params.update(self.api_dict)
-        response = self.get_response(self.BASE_URL, params=params)['result']
+        response = self.get_response(self.base_url, params=params)['result']
         return int(response)
@@ -11,7 +11,7 @@ class Polygonscan(Scanner):
     """This class is a wrapper around the Polygonscan API
     """
 
-    def __init__(self, api_key: str=None):
+    def __init__(self, api_key: Union[str, List[str]]=None):
         Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
 
     ##### Accounts
@@ -53,14 +53,15 @@ class Polygonscan(Scanner):
                 DataFrame containing total supply for token(s)
         """
         tokens = validate_input(tokens_in)
-        supply_dict = {}
-        for token in tokens:
+
+        def get_supply(token: str) -> str:
             params = {'module': 'stats',
                       'action': 'tokenCsupply',
                       'contractaddress': token}
             params.update(self.api_dict)
-            supply = self.get_response(self.base_url, params=params)['result']
-            supply_dict[token] = supply
+            return self.get_response(self.base_url, params=params)['result']
+
+        supply_dict = self.fan_out(get_supply, tokens)
         supply_df = pd.Series(supply_dict).to_frame(name='supply')
         return supply_df
 
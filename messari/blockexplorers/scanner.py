@@ -1,21 +1,70 @@
 """This module is meant to contain the Scanner class"""
 
-from typing import Union, List, Dict
+from typing import Iterator, Union, List, Dict, Optional, Tuple
 import pandas as pd
 
 from messari.dataloader import DataLoader
+from messari.keypool import first_key
 from messari.utils import validate_input, validate_int
-from .helpers import int_to_hex
+from .helpers import receipt_to_status, results_to_column, results_to_rows, results_to_frames, \
+    results_to_series, hex_results, transfers_to_dataframe, balances_to_dataframe
+from .scannerbase import ScannerBase
+# Limits are defined with the shared ScannerBase, kept importable from here
+from .scannerbase import RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD, DAILY_QUOTA, \
+    CONTRACT_CACHE_PARAMS  # pylint: disable=unused-import
 
 # Refrence: https://docs.etherscan.io/
-class Scanner(DataLoader):
-    """This class is a wrapper around the blockexplorer APIs
+class Scanner(ScannerBase, DataLoader):
+    """This class is a wrapper around the blockexplorer APIs,
+    the requests it sends are built by ScannerBase
     """
 
-    def __init__(self, base_url: str, api_key: str=None):
-        self.base_url = base_url
-        api_dict = {'apikey': api_key}
+    def __init__(self, base_url: str, api_key: Union[str, List[str]]=None):
+        api_dict = {'apikey': first_key(api_key)}
         DataLoader.__init__(self, api_dict=api_dict, taxonomy_dict={})
+        ScannerBase.__init__(self, base_url, api_key)
+
+    def get_result(self, params: Dict):
+        """Queries the explorer & returns the result of the response
+
+        :param params: dict
+            Query parameters built by ScannerBase
+        :return: result field of the JSON response
+        """
+        return self.get_response(self.base_url, params=params)['result']
+
+    def get_results(self, requests: Dict, stored: Dict = None) -> Dict:
+        """Queries the explorer for every request, see fan_out
+
+        :param requests: dict
+            Query parameters built by ScannerBase keyed by item
+        :param stored: dict
+            Results of items already in the finalized store, not requested again
+        :return: Dict of {item: result} in the order of requests
+        """
+        stored = stored or {}
+
+        def get_result(item) -> Dict:
+            if item in stored:
+                return stored[item]
+            return self.get_result(requests[item])
+
+        return self.fan_out(get_result, list(requests))
+
+    def get_finalized(self, kind: str, keys: List) -> Tuple[Dict, Optional[int]]:
+        """Looks keys up in the finalized store
+
+        :param kind: str
+            Kind of object (block, transaction, receipt)
+        :param keys: list
+            Block numbers or transaction hashes
+        :return: Dict of the stored objects & the most recent final block number,
+            None if there is no store or every key was stored
+        """
+        stored, missing = self.get_stored(kind, keys)
+        if not missing:
+            return stored, None
+        return stored, self.get_eth_block_number() - self.confirmations
 
     ##### Accounts
     def get_account_native_balance(self, accounts_in: Union[str, List]) -> pd.DataFrame:
@@ -31,18 +80,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame containing accounts_in native (sol) balance
         """
-        accounts = validate_input(accounts_in)
-        balance_dict={}
-        for account in accounts:
-            params = {'module': 'account',
-                      'action': 'balance',
-                      'address': account,
-                      'tag': 'latest'}
-            params.update(self.api_dict)
-            balance = self.get_response(self.base_url, params=params)['result']
-            balance_dict[account] = balance
-        balances_df = pd.Series(balance_dict).to_frame(name='balances')
-        return balances_df
+        results = self.get_results(self.account_requests(accounts_in, 'balance', tag='latest'))
+        return results_to_column(results, 'balances')
 
     def get_account_normal_transactions(self, accounts_in: Union[str, List]) -> pd.DataFrame:
         """Returns the list of transactions performed by an address, with optional pagination
@@ -57,19 +96,39 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame containing accounts_in normal transactions
         """
-        # TODO paging
-        accounts = validate_input(accounts_in)
-        df_list=[]
-        for account in accounts:
-            params = {'module': 'account',
-                      'action': 'txlist',
-                      'address': account}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        account_transactions_df = pd.concat(df_list, keys=accounts, axis=1)
-        return account_transactions_df
+        results = self.get_results(self.account_requests(accounts_in, 'txlist'))
+        return results_to_frames(results)
+
+    def iter_account_transactions(self, account: str, action: str = 'txlist',
+                                  page_size: int = 1000, ascending: bool = True,
+                                  prefetch: bool = True) -> Iterator[Dict]:
+        """Lazily yields every transaction of an address, page by page
+
+        Explorers only serve the first 10,000 results of a query (page * page_size),
+        narrow longer histories down with get_block_range_internal_transactions or get_logs.
+
+        Parameters
+        ----------
+            account: str
+                single account in
+            action: str
+                txlist (normal), txlistinternal (internal), tokentx (ERC-20)
+                or tokennfttx (ERC-721) transactions
+            page_size: int
+                Number of transactions requested per page
+            ascending: bool
+                Walk from the oldest to the newest transaction
+            prefetch: bool
+                Request the next page while the current one is being consumed
+
+        Returns
+        -------
+            Iterator
+                Transaction dictionaries
+        """
+        params, paginator = self.account_transactions_params(account, action, ascending,
+                                                             page_size)
+        yield from self.iter_records(self.base_url, paginator, params=params, prefetch=prefetch)
 
     def get_account_internal_transactions(self, accounts_in: Union[str, List]) -> pd.DataFrame:
         """Returns the list of internal transactions performed by an address
@@ -84,19 +143,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with internal transactions performed in given account(s)
         """
-        # TODO paging
-        accounts = validate_input(accounts_in)
-        df_list=[]
-        for account in accounts:
-            params = {'module': 'account',
-                      'action': 'txlistinternal',
-                      'address': account}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        account_transactions_df = pd.concat(df_list, keys=accounts, axis=1)
-        return account_transactions_df
+        results = self.get_results(self.account_requests(accounts_in, 'txlistinternal'))
+        return results_to_frames(results)
 
     def get_transaction_internal_transactions(self,
                                               transactions_in: Union[str, List]) -> pd.DataFrame:
@@ -111,18 +159,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with internal transactions performed in given transaction(s)
         """
-        transactions = validate_input(transactions_in)
-        df_list=[]
-        for transaction in transactions:
-            params = {'module': 'account',
-                      'action': 'txlistinternal',
-                      'txhash': transaction}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        transactions_df = pd.concat(df_list, keys=transactions, axis=1)
-        return transactions_df
+        results = self.get_results(self.transaction_internal_requests(transactions_in))
+        return results_to_frames(results)
 
     def get_block_range_internal_transactions(self, start_block: int, end_block: int, page: int=0,
                                               offset: int=0, ascending:bool=True) -> pd.DataFrame:
@@ -146,18 +184,8 @@ class Scanner(DataLoader):
                 DataFrame with internal transactions for a given block range
         """
         # TODO check paging
-        sort = 'asc' if ascending else 'desc'
-        params = {'module': 'account',
-                  'action': 'txlistinternal',
-                  'startblock': start_block,
-                  'endblock': end_block,
-                  'page': page,
-                  'offset': offset,
-                  'sort': sort}
-        params.update(self.api_dict)
-        response = self.get_response(self.base_url, params=params)['result']
-        transactions_df = pd.DataFrame(response)
-        return transactions_df
+        params = self.block_range_internal_params(start_block, end_block, page, offset, ascending)
+        return pd.DataFrame(self.get_result(params))
 
     def get_account_token_transfers(self, accounts_in: Union[str, List],
                                     tokens_in: Union[str, List]=None,
@@ -189,37 +217,9 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with token transfers for given account(s)
         """
-        sort = 'asc' if ascending else 'desc'
-        accounts = validate_input(accounts_in)
-        df_list=[]
-        for account in accounts:
-            params = {'module': 'account',
-                      'action': 'tokentx',
-                      'sort': sort,
-                      'page': page,
-                      'offset': offset,
-                      'address': account}
-            if start_block:
-                params.update({'startblock': str(start_block)})
-            if end_block:
-                params.update({'endblock': str(start_block)})
-            params.update(self.api_dict)
-
-
-            # iterate through optional token filters
-            response=[]
-            if tokens_in:
-                tokens = validate_input(tokens_in)
-                for token in tokens:
-                    params['contractaddress'] = token
-                    response += self.get_response(self.base_url, params=params)['result']
-            else:
-                response = self.get_response(self.base_url, params=params)['result']
-
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        token_transfers_df = pd.concat(df_list, keys=accounts, axis=1)
-        return token_transfers_df
+        requests = self.transfers_requests('tokentx', accounts_in, tokens_in, start_block,
+                                           end_block, page, offset, ascending)
+        return transfers_to_dataframe(self.get_results(requests))
 
     def get_account_nft_transfers(self, accounts_in: Union[str, List],
                                   nfts_in: Union[str, List]=None,
@@ -250,38 +250,9 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with NFT transfers for given account(s)
         """
-        sort = 'asc' if ascending else 'desc'
-        accounts = validate_input(accounts_in)
-        df_list=[]
-        for account in accounts:
-            params = {'module': 'account',
-                      'action': 'tokennfttx',
-                      'sort': sort,
-                      'page': page,
-                      'offset': offset,
-                      'address': account}
-            if start_block:
-                params.update({'startblock': start_block})
-            if end_block:
-                params.update({'endblock': start_block})
-            params.update(self.api_dict)
-
-
-            # iterate through optional token filters
-            response=[]
-            if nfts_in:
-                nfts = validate_input(nfts_in)
-                for nft in nfts:
-                    params['contractaddress'] = nft
-                    response += self.get_response(self.base_url, params=params)['result']
-            else:
-                response = self.get_response(self.base_url, params=params)['result']
-
-
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        nft_transfers_df = pd.concat(df_list, keys=accounts, axis=1)
-        return nft_transfers_df
+        requests = self.transfers_requests('tokennfttx', accounts_in, nfts_in, start_block,
+                                           end_block, page, offset, ascending)
+        return transfers_to_dataframe(self.get_results(requests))
 
     # NOTE: this is the same as blocks validated on PoS chains
     def get_account_blocks_mined(self, accounts_in: Union[str, List], block_type:str='blocks',
@@ -302,21 +273,9 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with blocks mined by given account(s)
         """
-        accounts = validate_input(accounts_in)
-        df_list=[]
-        for account in accounts:
-            params = {'module': 'account',
-                      'action': 'getminedblocks',
-                      'blocktype': block_type,
-                      'page': page,
-                      'offset': offset,
-                      'address': account}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        blocks_mined_df = pd.concat(df_list, keys=accounts, axis=1)
-        return blocks_mined_df
+        requests = self.account_requests(accounts_in, 'getminedblocks', blocktype=block_type,
+                                         page=page, offset=offset)
+        return results_to_frames(self.get_results(requests))
 
     ##### Contracts
     def get_contract_abi(self, contracts_in: Union[str, List]) -> Dict:
@@ -332,16 +291,7 @@ class Scanner(DataLoader):
             Dict
                 Dictionary with {contract: contract_abi}
         """
-        contracts = validate_input(contracts_in)
-        abi_dict = {}
-        for contract in contracts:
-            params = {'module': 'contract',
-                      'action': 'getabi',
-                      'address': contract}
-            params.update(self.api_dict)
-            abi = self.get_response(self.base_url, params=params)['result']
-            abi_dict[contract] = abi
-        return abi_dict
+        return self.get_results(self.contract_requests(contracts_in, 'getabi'))
 
     def get_contract_source_code(self, contracts_in: Union[str, List]) -> pd.DataFrame:
         """Returns the Solidity source code of a verified smart contract
@@ -356,18 +306,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with contract source code
         """
-        contracts = validate_input(contracts_in)
-        df_list=[]
-        for contract in contracts:
-            params = {'module': 'contract',
-                      'action': 'getsourcecode',
-                      'address': contract}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        source_df = pd.concat(df_list, keys=contracts, axis=1)
-        return source_df
+        results = self.get_results(self.contract_requests(contracts_in, 'getsourcecode'))
+        return results_to_frames(results)
 
     ##### Transactions
     def get_contract_execution_status(self, transactions_in: Union[str, List]) -> pd.DataFrame:
@@ -383,17 +323,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with contract execution status
         """
-        transactions = validate_input(transactions_in)
-        transactions_dict={}
-        for transaction in transactions:
-            params = {'module': 'transaction',
-                      'action': 'getstatus',
-                      'txhah': transaction}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            transactions_dict[transaction] = response
-        transactions_df = pd.Series(transactions_dict).to_frame(name='transactions')
-        return transactions_df
+        requests = self.transaction_requests(transactions_in, 'transaction', 'getstatus')
+        return results_to_column(self.get_results(requests), 'transactions')
 
     def get_transaction_execution_status(self, transactions_in: Union[str, List]) -> pd.DataFrame:
         """Returns the status code of a transaction execution.
@@ -408,17 +339,15 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with transaction execution status
         """
-        transactions = validate_input(transactions_in)
-        transactions_dict={}
-        for transaction in transactions:
-            params = {'module': 'transaction',
-                      'action': 'gettxreceiptstatus',
-                      'txhah': transaction}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            transactions_dict[transaction] = response
-        transactions_df = pd.Series(transactions_dict).to_frame(name='transactions')
-        return transactions_df
+        if self.finalized_store is not None:
+            # Receipts carry the status & the block needed to tell if it's final
+            receipts = self.get_receipt_dict(validate_input(transactions_in))
+            statuses = {transaction: receipt_to_status(receipt)
+                        for transaction, receipt in receipts.items()}
+            return results_to_column(statuses, 'transactions')
+
+        requests = self.transaction_requests(transactions_in, 'transaction', 'gettxreceiptstatus')
+        return results_to_column(self.get_results(requests), 'transactions')
 
     ##### Blocks
     # TODO, get pro
@@ -435,18 +364,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with block reward(s)
         """
-        blocks = validate_int(blocks_in)
-        series_list = []
-        for block in blocks:
-            params = {'module': 'block',
-                      'action': 'getblockreward',
-                      'blockno': block}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            block_reward_series = pd.Series(response)
-            series_list.append(block_reward_series)
-        reward_df = pd.concat(series_list, keys=blocks, axis=1)
-        return reward_df
+        results = self.get_results(self.block_requests(blocks_in, 'getblockreward'))
+        return results_to_series(results)
 
     def get_block_countdown(self, blocks_in: Union[int, List]) -> pd.DataFrame:
         """Returns the estimated time remaining, in seconds, until a certain block is mined
@@ -461,17 +380,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with time(s) remaining until block confirmation
         """
-        blocks = validate_int(blocks_in)
-        countdown_list=[]
-        for block in blocks:
-            params = {'module': 'block',
-                      'action': 'getblockcountdown',
-                      'blockno': block}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            countdown_list.append(response)
-        countdown_df = pd.DataFrame(countdown_list)
-        return countdown_df
+        results = self.get_results(self.block_requests(blocks_in, 'getblockcountdown'))
+        return results_to_rows(results)
 
     def get_block_by_timestamp(self, times_in: Union[int, List], before: bool=True) -> pd.DataFrame:
         """Returns the block number that was mined at a certain timestamp (in unix)
@@ -488,19 +398,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with block number(s) closest to times_in
         """
-        closest = 'before' if before else 'after'
-        times = validate_int(times_in)
-        blocks_list=[]
-        for time in times:
-            params = {'module': 'block',
-                     'action': 'getblocknobytime',
-                     'timestamp': time,
-                     'closest': closest}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            blocks_list.append(response)
-        blocks_df = pd.DataFrame(blocks_list)
-        return blocks_df
+        results = self.get_results(self.block_by_timestamp_requests(times_in, before))
+        return results_to_rows(results)
 
     ##### Logs
     def get_logs(self, address: str,
@@ -514,42 +413,12 @@ class Scanner(DataLoader):
         """This function is a wrapper around the Etherscan API which is a wrapper
         around the native eth_getLogs. Please check out their documentation for a
         more in depth explanation: https://docs.etherscan.io/api-endpoints/logs"""
-
-        params = {'module': 'logs',
-                  'action': 'getlogs',
-                  'toBlock': to_block,
-                  'fromBlock': from_block,
-                  'address': address}
-        params.update(self.api_dict)
-
-        # topics
-        if topic0:
-            params['topic0'] = topic0
-        if topic1:
-            params['topic1'] = topic1
-        if topic2:
-            params['topic2'] = topic2
-        if topic3:
-            params['topic3'] = topic3
-
-        # operators
-        valid = ['and', 'or']
-        if topic0_1_opr in valid:
-            params['topic0_1_opr'] = topic0_1_opr
-        if topic1_2_opr in valid:
-            params['topic1_2_opr'] = topic1_2_opr
-        if topic2_3_opr in valid:
-            params['topic2_3_opr'] = topic2_3_opr
-        if topic0_2_opr in valid:
-            params['topic0_2_opr'] = topic0_2_opr
-        if topic0_3_opr in valid:
-            params['topic0_3_opr'] = topic0_3_opr
-        if topic1_3_opr in valid:
-            params['topic1_3_opr'] = topic1_3_opr
-
-        logs = self.get_response(self.base_url, params=params)['result']
-        logs_df = pd.DataFrame(logs)
-        return logs_df
+        topics = {'topic0': topic0, 'topic1': topic1, 'topic2': topic2, 'topic3': topic3}
+        operators = {'topic0_1_opr': topic0_1_opr, 'topic1_2_opr': topic1_2_opr,
+                     'topic2_3_opr': topic2_3_opr, 'topic0_2_opr': topic0_2_opr,
+                     'topic0_3_opr': topic0_3_opr, 'topic1_3_opr': topic1_3_opr}
+        params = self.logs_params(address, from_block, to_block, topics, operators)
+        return pd.DataFrame(self.get_result(params))
 
     ##### Geth/Parity Proxy
     def get_eth_block_number(self) -> int:
@@ -560,12 +429,8 @@ class Scanner(DataLoader):
             int
                 Number of the most recent block
         """
-        params = {'module': 'proxy',
-                  'action': 'eth_blockNumber'}
-        params.update(self.api_dict)
-        block_num_hex = self.get_response(self.base_url, params=params)['result']
-        block_num = int(block_num_hex, 16)
-        return block_num
+        block_num_hex = self.get_result(self.make_params('proxy', 'eth_blockNumber'))
+        return int(block_num_hex, 16)
 
     def get_eth_block(self, blocks_in: Union[int, List]) -> pd.DataFrame:
         """Returns information about a block by block number
@@ -581,20 +446,10 @@ class Scanner(DataLoader):
                 DataFrame containing information about block(s)
         """
         blocks = validate_int(blocks_in)
-        blocks_hex = int_to_hex(blocks)
-
-        series_list = []
-        for block in blocks_hex:
-            params = {'module': 'proxy',
-                      'action': 'eth_getBlockByNumber',
-                      'tag': block,
-                      'boolean': 'true'}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            block_series = pd.Series(response)
-            series_list.append(block_series)
-        series_df = pd.concat(series_list, keys=blocks, axis=1)
-        return series_df
+        stored, finalized = self.get_finalized('block', blocks)
+        results = self.get_results(self.eth_block_requests(blocks), stored)
+        self.store_results('block', results, stored, finalized)
+        return results_to_series(results)
 
     def get_eth_uncle(self, block: int, index: int) -> Dict:
         """Returns information about an uncle by block number and index
@@ -611,18 +466,8 @@ class Scanner(DataLoader):
             Dict
                 Information about an uncle by block number and index
         """
-        block_hex = int_to_hex(block)[0]
-        index_hex = int_to_hex(index)[0]
-
-        params = {'module': 'proxy',
-                  'action': 'eth_getUncleByBlockNumberAndIndex',
-                  'tag': block_hex,
-                  'index': index_hex}
-        #print(params)
-        params.update(self.api_dict)
-
-        response = self.get_response(self.base_url, params=params)['result']
-        return response
+        params = self.block_index_params('eth_getUncleByBlockNumberAndIndex', block, index)
+        return self.get_result(params)
 
     def get_eth_block_transaction_count(self, blocks_in: Union[int, List]) -> pd.DataFrame:
         """Returns the number of transactions in a block
@@ -637,19 +482,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame containing transaction count(s) for the given block(s)
         """
-        blocks = validate_int(blocks_in)
-        blocks_hex = int_to_hex(blocks)
-        count_dict={}
-        for block in blocks_hex:
-            params = {'module': 'proxy',
-                      'action': 'eth_getBlockTransactionCountByNumber',
-                      'tag': block}
-            params.update(self.api_dict)
-            count = self.get_response(self.base_url, params=params)['result']
-            count_int = int(count, 16)
-            count_dict[block] = count_int
-        count_df = pd.Series(count_dict).to_frame(name='transaction_count')
-        return count_df
+        results = self.get_results(self.block_transaction_count_requests(blocks_in))
+        return results_to_column(hex_results(results), 'transaction_count')
 
     def get_eth_transaction_by_hash(self, transactions_in: Union[str, List]) -> pd.DataFrame:
         """Returns the information about a transaction requested by transaction hash
@@ -665,17 +499,11 @@ class Scanner(DataLoader):
                 DataFrame containing transaction details
         """
         transactions = validate_input(transactions_in)
-        series_list=[]
-        for transaction in transactions:
-            params = {'module': 'proxy',
-                      'action': 'eth_getTransactionByHash',
-                      'txhash': transaction}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_series = pd.Series(response)
-            series_list.append(tmp_series)
-        transactions_df = pd.concat(series_list, keys=transactions, axis=1)
-        return transactions_df
+        stored, finalized = self.get_finalized('transaction', transactions)
+        requests = self.transaction_requests(transactions, 'proxy', 'eth_getTransactionByHash')
+        results = self.get_results(requests, stored)
+        self.store_results('transaction', results, stored, finalized)
+        return results_to_series(results)
 
     def get_eth_transaction_by_block_index(self, block: int, index: int) -> pd.DataFrame:
         """Returns information about a transaction by block number and transaction index position
@@ -690,18 +518,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame containing transaction details
         """
-        block_hex = int_to_hex(block)[0]
-        index_hex = int_to_hex(index)[0]
-
-        params = {'module': 'proxy',
-                  'action': 'eth_getTransactionByBlockNumberAndIndex',
-                  'tag': block_hex,
-                  'index': index_hex}
-        params.update(self.api_dict)
-
-        response = self.get_response(self.base_url, params=params)['result']
-        txn_df = pd.Series(response).to_frame(name='transaction_info')
-        return txn_df
+        params = self.block_index_params('eth_getTransactionByBlockNumberAndIndex', block, index)
+        return results_to_column(self.get_result(params), 'transaction_info')
 
     def get_eth_account_transaction_count(self, accounts_in: Union[str, List]) -> pd.DataFrame:
         """Returns the number of transactions performed by an address
@@ -716,19 +534,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame containing transaction count(s) for the given account(s)
         """
-        accounts = validate_input(accounts_in)
-        count_dict={}
-        for account in accounts:
-            params = {'module': 'proxy',
-                      'action': 'eth_getTransactionCount',
-                      'address': account,
-                      'tag': 'latest'}
-            params.update(self.api_dict)
-            count = self.get_response(self.base_url, params=params)['result']
-            count_int = int(count, 16)
-            count_dict[account] = count_int
-        count_df = pd.Series(count_dict).to_frame(name='transaction_count')
-        return count_df
+        results = self.get_results(self.account_transaction_count_requests(accounts_in))
+        return results_to_column(hex_results(results), 'transaction_count')
 
     def get_eth_transaction_receipt(self, transactions_in: Union[str, List]) -> pd.DataFrame:
         """Returns the receipt of a transaction by transaction hash
@@ -743,18 +550,27 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame with transaction receipts
         """
-        transactions = validate_input(transactions_in)
-        df_list=[]
-        for transaction in transactions:
-            params = {'module': 'proxy',
-                      'action': 'eth_getTransactionReceipt',
-                      'txhash': transaction}
-            params.update(self.api_dict)
-            response = self.get_response(self.base_url, params=params)['result']
-            tmp_df = pd.DataFrame(response)
-            df_list.append(tmp_df)
-        transactions_df = pd.concat(df_list, keys=transactions, axis=1)
-        return transactions_df
+        receipts = self.get_receipt_dict(validate_input(transactions_in))
+        return results_to_frames(receipts)
+
+    def get_receipt_dict(self, transactions: List[str]) -> Dict:
+        """Returns raw transaction receipts, from the finalized store when possible
+
+        Parameters
+        ----------
+            transactions: List
+                list of transaction hashes
+
+        Returns
+        -------
+            Dict
+                Dictionary of receipts keyed by transaction hash
+        """
+        stored, finalized = self.get_finalized('receipt', transactions)
+        requests = self.transaction_requests(transactions, 'proxy', 'eth_getTransactionReceipt')
+        results = self.get_results(requests, stored)
+        self.store_results('receipt', results, stored, finalized)
+        return results
 
     def get_eth_gas_price(self) -> int:
         """Returns the current price per gas in wei
@@ -764,12 +580,8 @@ class Scanner(DataLoader):
             int
                 Current price per gas in wei
         """
-        params = {'module': 'proxy',
-                  'action': 'eth_gasPrice'}
-        params.update(self.api_dict)
-        response = self.get_response(self.base_url, params=params)['result']
-        gas_price = int(response, 16)
-        return gas_price
+        gas_price_hex = self.get_result(self.make_params('proxy', 'eth_gasPrice'))
+        return int(gas_price_hex, 16)
 
     ##### Tokens
     def get_token_total_supply(self, tokens_in: Union[str, List]) -> pd.DataFrame:
@@ -785,17 +597,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame containing total supply for token(s)
         """
-        tokens = validate_input(tokens_in)
-        supply_dict = {}
-        for token in tokens:
-            params = {'module': 'stats',
-                      'action': 'tokensupply',
-                      'contractaddress': token}
-            params.update(self.api_dict)
-            supply = self.get_response(self.base_url, params=params)['result']
-            supply_dict[token] = supply
-        supply_df = pd.Series(supply_dict).to_frame(name='supply')
-        return supply_df
+        results = self.get_results(self.token_supply_requests(tokens_in))
+        return results_to_column(results, 'supply')
 
     def get_token_account_balance(self, tokens_in: Union[str, List],
                                   accounts_in: Union[str, List]) -> pd.DataFrame:
@@ -813,24 +616,8 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame containing token balance(s) for given account(s)
         """
-        tokens = validate_input(tokens_in)
-        accounts = validate_input(accounts_in)
-        series_list = []
-        for account in accounts:
-            token_dict = {}
-            for token in tokens:
-                params = {'module': 'account',
-                          'action': 'tokenbalance',
-                          'contractaddress': token,
-                          'address': account,
-                          'tag': 'latest'}
-                params.update(self.api_dict)
-                balance = self.get_response(self.base_url, params=params)['result']
-                token_dict[token] = balance
-            token_series = pd.Series(token_dict)
-            series_list.append(token_series)
-        balances_df = pd.concat(series_list, keys=accounts, axis=1)
-        return balances_df
+        results = self.get_results(self.token_balance_requests(tokens_in, accounts_in))
+        return balances_to_dataframe(results)
 
     ##### Gas Tracker
     def get_est_confirmation(self, gas_price: int) -> int:
@@ -848,12 +635,8 @@ class Scanner(DataLoader):
             int
                 The estimated time (in seconds) for a transaction to be confirmed
         """
-        params = {'module': 'gastracker',
-                  'action': 'gasestimate',
-                  'gasprice': gas_price}
-        params.update(self.api_dict)
-        response = self.get_response(self.base_url, params=params)['result']
-        return int(response)
+        params = self.make_params('gastracker', 'gasestimate', gasprice=gas_price)
+        return int(self.get_result(params))
 
     def get_gas_oracle(self) -> pd.DataFrame:
         """Returns the current Safe, Proposed and Fast gas prices
@@ -863,9 +646,5 @@ class Scanner(DataLoader):
             DataFrame
                 DataFrame containing the current Safe, Proposed and Fast gas prices
         """
-        params = {'module': 'gastracker',
-                  'action': 'gasoracle'}
-        params.update(self.api_dict)
-        response = self.get_response(self.base_url, params=params)['result']
-        oracle_df = pd.Series(response).to_frame(name='gas_oracle')
-        return oracle_df
+        response = self.get_result(self.make_params('gastracker', 'gasoracle'))
+        return results_to_column(response, 'gas_oracle')
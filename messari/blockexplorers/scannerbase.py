@@ -0,0 +1,305 @@
+"""This module is meant to contain the ScannerBase class"""
+
+from typing import Union, List, Dict, Optional, Tuple
+
+from messari.pagination import PagePaginator
+from messari.metrics import split_endpoint
+from messari.ratelimit import get_host
+from messari.keypool import make_key_pool
+from messari.utils import validate_input, validate_int
+from .finalizedstore import FinalizedStore, DEFAULT_CONFIRMATIONS
+from .helpers import int_to_hex, hex_to_int
+
+# Free tier limit shared by the Etherscan family of explorers: 5 calls per second
+RATE_LIMIT_CALLS = 5
+RATE_LIMIT_PERIOD = 1
+# Free tier keys are allowed 100,000 calls per day
+DAILY_QUOTA = 100000
+
+# Verified contract ABIs & source code never change, cache them without expiry
+CONTRACT_CACHE_PARAMS = [{'module': 'contract', 'action': 'getabi'},
+                         {'module': 'contract', 'action': 'getsourcecode'}]
+
+# Log topic operators explorers accept
+TOPIC_OPERATORS = ['and', 'or']
+
+
+class ScannerBase:  # pylint: disable=no-member
+    """This class holds what Scanner & AsyncScanner share: their configuration,
+    the finalized store & the query parameters of every explorer action.
+
+    Subclasses only send the requests it builds, parsing the results with the
+    helpers module, so both tiers return the same data.
+    """
+
+    def __init__(self, base_url: str, api_key: Union[str, List[str]]=None):
+        """Configures an explorer once the loader is initialized
+
+        :param base_url: str
+            API URL of the explorer, every action is a query of it
+        :param api_key: str, list
+            Key or keys of the explorer
+        """
+        self.base_url = base_url
+        self.chain = get_host(base_url)
+        self.finalized_store = None
+        self.confirmations = DEFAULT_CONFIRMATIONS
+        self.rate_limiter.set_default(base_url, RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
+        # A list of keys is rotated, each key getting the free tier limit
+        self.set_key_pool(make_key_pool(api_key, 'apikey', calls=RATE_LIMIT_CALLS,
+                                        period=RATE_LIMIT_PERIOD, quota=DAILY_QUOTA))
+        if self.key_pool is None:
+            self.rate_limiter.set_quota(base_url, DAILY_QUOTA)
+        for params in CONTRACT_CACHE_PARAMS:
+            self.set_cache_ttl(base_url, None, params=params)
+
+    def is_cacheable(self, response: Dict) -> bool:
+        """Explorers report errors (rate limits, unverified contracts) with a 200,
+        only cache responses that succeeded
+
+        :param response: dict
+            JSON response
+        :return: bool
+        """
+        return response.get('status') != '0' and 'error' not in response
+
+    def is_quota_error(self, response: Dict) -> bool:
+        """Explorers report exhausted rate limits with a 200 & status 0
+
+        :param response: dict
+            JSON response
+        :return: bool
+        """
+        return response.get('status') == '0' and \
+            'rate limit' in str(response.get('result', '')).lower()
+
+    def get_metrics_labels(self, endpoint_url: str, params: Dict = None) -> Tuple[str, str]:
+        """Every explorer call shares one URL, label metrics with the action as well
+
+        :param endpoint_url: str
+            URL API string.
+        :param params: dict
+            Dictionary of query parameters.
+        :return: (host, endpoint) tuple
+        """
+        host, endpoint = split_endpoint(endpoint_url)
+        if params and 'action' in params:
+            endpoint = f"{endpoint}?action={params['action']}"
+        return host, endpoint
+
+    def set_finalized_store(self, finalized_store: FinalizedStore,
+                            confirmations: int = DEFAULT_CONFIRMATIONS) -> None:
+        """Sets the store finalized blocks, transactions & receipts are kept in.
+        get_eth_block, get_eth_transaction_by_hash, get_eth_transaction_receipt
+        & get_transaction_execution_status check it before querying the explorer
+
+        :param finalized_store: FinalizedStore
+            Persistent store, None disables it
+        :param confirmations: int
+            Number of blocks behind the chain head after which data is stored
+        """
+        self.finalized_store = finalized_store
+        self.confirmations = confirmations
+
+    def get_stored(self, kind: str, keys: List) -> Tuple[Dict, bool]:
+        """Looks keys up in the finalized store
+
+        :param kind: str
+            Kind of object (block, transaction, receipt)
+        :param keys: list
+            Block numbers or transaction hashes
+        :return: Dict of the stored objects & whether some keys have to be requested
+            with a store, needing the chain head to tell what became final
+        """
+        if self.finalized_store is None:
+            return {}, False
+        stored = self.finalized_store.get_many(self.chain, kind, keys)
+        return stored, len(stored) < len(set(keys))
+
+    def store_finalized(self, kind: str, key: Union[int, str], value: Dict,
+                        block_number: Optional[int], finalized: Optional[int]) -> None:
+        """Stores an object if its block is buried under enough confirmations
+
+        :param kind: str
+            Kind of object (block, transaction, receipt)
+        :param key: int, str
+            Block number or transaction hash
+        :param value: dict
+            JSON object returned by the explorer
+        :param block_number: int
+            Block the object was included in, None if it is still pending
+        :param finalized: int
+            Most recent final block number returned by get_finalized
+        """
+        if finalized is None or value is None or block_number is None:
+            return
+        if block_number <= finalized:
+            self.finalized_store.set(self.chain, kind, key, value)
+
+    def store_results(self, kind: str, results: Dict, stored: Dict,
+                      finalized: Optional[int]) -> None:
+        """Stores the requested objects that are final
+
+        :param kind: str
+            Kind of object (block, transaction, receipt)
+        :param results: dict
+            Objects keyed by block number or transaction hash
+        :param stored: dict
+            Objects returned by get_finalized, already in the store
+        :param finalized: int
+            Most recent final block number returned by get_finalized
+        """
+        for key, value in results.items():
+            if key in stored:
+                continue
+            if kind == 'block':
+                block_number = key
+            else:
+                block_number = hex_to_int(value.get('blockNumber')) if value else None
+            self.store_finalized(kind, key, value, block_number, finalized)
+
+    def make_params(self, module: str, action: str, **params) -> Dict:
+        """Returns the query parameters of an explorer action, API key included
+
+        :param module: str
+            Explorer module (account, contract, proxy...)
+        :param action: str
+            Action of the module
+        :return: dict
+        """
+        params = {'module': module, 'action': action, **params}
+        params.update(self.api_dict)
+        return params
+
+    ##### Accounts
+    def account_requests(self, accounts_in: Union[str, List], action: str, **params) -> Dict:
+        """Returns the query parameters of an account action, keyed by account"""
+        return {account: self.make_params('account', action, address=account, **params)
+                for account in validate_input(accounts_in)}
+
+    def account_transactions_params(self, account: str, action: str,
+                                    ascending: bool, page_size: int) -> Tuple[Dict, PagePaginator]:
+        """Returns the query parameters & paginator of iter_account_transactions"""
+        params = self.make_params('account', action, address=account,
+                                  sort='asc' if ascending else 'desc')
+        paginator = PagePaginator(records_key='result', page_size=page_size,
+                                  size_param='offset')
+        return params, paginator
+
+    def transaction_internal_requests(self, transactions_in: Union[str, List]) -> Dict:
+        """Returns the query parameters of internal transactions, keyed by transaction"""
+        return {transaction: self.make_params('account', 'txlistinternal', txhash=transaction)
+                for transaction in validate_input(transactions_in)}
+
+    def block_range_internal_params(self, start_block: int, end_block: int, page: int,
+                                    offset: int, ascending: bool) -> Dict:
+        """Returns the query parameters of get_block_range_internal_transactions"""
+        return self.make_params('account', 'txlistinternal', startblock=start_block,
+                                endblock=end_block, page=page, offset=offset,
+                                sort='asc' if ascending else 'desc')
+
+    def transfers_requests(self, action: str, accounts_in: Union[str, List],
+                           contracts_in: Union[str, List], start_block: int, end_block: int,
+                           page: int, offset: int, ascending: bool) -> Dict:
+        """Returns the query parameters of token transfers, keyed by (account, contract),
+        contract being None when transfers aren't filtered
+        """
+        accounts = validate_input(accounts_in)
+        # iterate through optional contract filters
+        contracts = validate_input(contracts_in) if contracts_in else [None]
+        requests = {}
+        for account in accounts:
+            for contract in contracts:
+                params = {'sort': 'asc' if ascending else 'desc', 'page': page,
+                          'offset': offset, 'address': account}
+                if start_block:
+                    params['startblock'] = start_block
+                if end_block:
+                    params['endblock'] = end_block
+                if contract:
+                    params['contractaddress'] = contract
+                requests[(account, contract)] = self.make_params('account', action, **params)
+        return requests
+
+    def token_balance_requests(self, tokens_in: Union[str, List],
+                               accounts_in: Union[str, List]) -> Dict:
+        """Returns the query parameters of token balances, keyed by (account, token)"""
+        tokens = validate_input(tokens_in)
+        return {(account, token): self.make_params('account', 'tokenbalance',
+                                                   contractaddress=token, address=account,
+                                                   tag='latest')
+                for account in validate_input(accounts_in) for token in tokens}
+
+    ##### Contracts
+    def contract_requests(self, contracts_in: Union[str, List], action: str) -> Dict:
+        """Returns the query parameters of a contract action, keyed by contract"""
+        return {contract: self.make_params('contract', action, address=contract)
+                for contract in validate_input(contracts_in)}
+
+    ##### Transactions
+    def transaction_requests(self, transactions_in: Union[str, List], module: str,
+                             action: str) -> Dict:
+        """Returns the query parameters of a transaction action, keyed by transaction"""
+        return {transaction: self.make_params(module, action, txhash=transaction)
+                for transaction in validate_input(transactions_in)}
+
+    ##### Blocks
+    def block_requests(self, blocks_in: Union[int, List], action: str) -> Dict:
+        """Returns the query parameters of a block action, keyed by block"""
+        return {block: self.make_params('block', action, blockno=block)
+                for block in validate_int(blocks_in)}
+
+    def block_by_timestamp_requests(self, times_in: Union[int, List], before: bool) -> Dict:
+        """Returns the query parameters of get_block_by_timestamp, keyed by time"""
+        closest = 'before' if before else 'after'
+        return {time: self.make_params('block', 'getblocknobytime', timestamp=time,
+                                       closest=closest)
+                for time in validate_int(times_in)}
+
+    ##### Logs
+    def logs_params(self, address: str, from_block: Union[int, str], to_block: Union[int, str],
+                    topics: Dict[str, Optional[str]], operators: Dict[str, Optional[str]]) -> Dict:
+        """Returns the query parameters of get_logs, dropping unset topics & invalid operators
+
+        :param topics: dict
+            {topic0: topic} of the topics to filter logs by
+        :param operators: dict
+            {topic0_1_opr: operator} of the operators between topics
+        :return: dict
+        """
+        params = self.make_params('logs', 'getlogs', toBlock=to_block, fromBlock=from_block,
+                                  address=address)
+        params.update({name: topic for name, topic in topics.items() if topic})
+        params.update({name: operator for name, operator in operators.items()
+                       if operator in TOPIC_OPERATORS})
+        return params
+
+    ##### Geth/Parity Proxy
+    def eth_block_requests(self, blocks_in: Union[int, List]) -> Dict:
+        """Returns the query parameters of full blocks, keyed by block"""
+        return {block: self.make_params('proxy', 'eth_getBlockByNumber',
+                                        tag=int_to_hex(block)[0], boolean='true')
+                for block in validate_int(blocks_in)}
+
+    def block_index_params(self, action: str, block: int, index: int) -> Dict:
+        """Returns the query parameters of an uncle or transaction by block & index"""
+        return self.make_params('proxy', action, tag=int_to_hex(block)[0],
+                                index=int_to_hex(index)[0])
+
+    def block_transaction_count_requests(self, blocks_in: Union[int, List]) -> Dict:
+        """Returns the query parameters of block transaction counts, keyed by hex block"""
+        return {block: self.make_params('proxy', 'eth_getBlockTransactionCountByNumber',
+                                        tag=block)
+                for block in int_to_hex(validate_int(blocks_in))}
+
+    def account_transaction_count_requests(self, accounts_in: Union[str, List]) -> Dict:
+        """Returns the query parameters of account transaction counts, keyed by account"""
+        return {account: self.make_params('proxy', 'eth_getTransactionCount', address=account,
+                                          tag='latest')
+                for account in validate_input(accounts_in)}
+
+    ##### Tokens
+    def token_supply_requests(self, tokens_in: Union[str, List]) -> Dict:
+        """Returns the query parameters of token supplies, keyed by token"""
+        return {token: self.make_params('stats', 'tokensupply', contractaddress=token)
+                for token in validate_input(tokens_in)}
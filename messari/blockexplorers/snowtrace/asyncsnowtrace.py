@@ -0,0 +1,54 @@
+"""This module is meant to contain the AsyncSnowTrace class"""
+
+from typing import Union, List
+from messari.blockexplorers import AsyncScanner
+
+from .snowtrace import BASE_URL
+
+class AsyncSnowTrace(AsyncScanner):
+    """This class is an asyncio wrapper around the SnowTrace API
+    """
+
+    def __init__(self, api_key: Union[str, List[str]]=None):
+        AsyncScanner.__init__(self, base_url=BASE_URL, api_key=api_key)
+
+    ##### Accounts
+    # NOTE: no changes
+
+    ##### Contracts
+    # NOTE: no changes
+
+    ##### Transactions
+    async def get_contract_execution_status(self, transactions_in: Union[str, List]) -> None:
+        """Override: return None
+        """
+        return None
+
+    ##### Blocks
+    # NOTE: no changes
+
+    ##### Logs
+    # NOTE: no changes
+
+    ##### Geth/Parity Proxy
+    async def get_eth_uncle(self, block: int, index: int):
+        """Override: return None
+        """
+        return None
+
+    ##### Tokens
+    # NOTE: no changes
+
+    ##### Gas Tracker
+    async def get_est_confirmation(self, gas_price: int) -> None:
+        """Override: return None
+        """
+        return None
+
+    async def get_gas_oracle(self) -> None:
+        """Override: return None
+        """
+        return None
+
+    ##### Stats
+    # NOTE: see SnowTrace, total AVAX supply is not available
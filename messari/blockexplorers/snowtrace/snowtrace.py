@@ -8,7 +8,7 @@ class SnowTrace(Scanner):
     """This class is a wrapper around the SnowTrace API
     """
 
-    def __init__(self, api_key: str=None):
+    def __init__(self, api_key: Union[str, List[str]]=None):
         Scanner.__init__(self, base_url=BASE_URL, api_key=api_key)
 
     ##### Accounts
@@ -1,4 +1,7 @@
 """Module to handle initialization, imports, for Solscan class"""
 
+from messari.lazy import lazy_exports
 
-from .solscan import *
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'Solscan': '.solscan',
+})
@@ -2,6 +2,10 @@
 
 import pandas as pd
 
+from messari.profiling import timed
+
+
+@timed('normalize')
 def unpack_dataframe_of_dicts(df_in: pd.DataFrame) -> pd.DataFrame:
     """Unpacks a dataframe where all entries are dicts
 
@@ -1,19 +1,21 @@
 """This module is meant to contain the Solscan class"""
 
 from messari.dataloader import DataLoader
+from messari.profiling import profiled
+from messari.pagination import OffsetPaginator
 from messari.utils import validate_input
-from string import Template
-from typing import Union, List, Dict
+from messari.metrics import url_template
+from typing import Iterator, Union, List, Dict
 from .helpers import unpack_dataframe_of_dicts
 import pandas as pd
 
 #### Block
 BLOCK_LAST_URL = 'https://public-api.solscan.io/block/last'
 BLOCK_TRANSACTIONS_URL = 'https://public-api.solscan.io/block/transactions'
-BLOCK_BLOCK_URL = Template('https://public-api.solscan.io/block/$block')
+BLOCK_BLOCK_URL = url_template('https://public-api.solscan.io/block/$block')
 #### Transaction
 TRANSACTION_LAST_URL = 'https://public-api.solscan.io/transaction/last'
-TRANSACTION_SIGNATURE_URL = Template('https://public-api.solscan.io/transaction/$signature')
+TRANSACTION_SIGNATURE_URL = url_template('https://public-api.solscan.io/transaction/$signature')
 #### Account
 ACCOUNT_TOKENS_URL = 'https://public-api.solscan.io/account/tokens'
 ACCOUNT_TRANSACTIONS_URL = 'https://public-api.solscan.io/account/transactions'
@@ -21,16 +23,20 @@ ACCOUNT_STAKE_URL = 'https://public-api.solscan.io/account/stakeAccounts'
 ACCOUNT_SPL_TXNS_URL = 'https://public-api.solscan.io/account/splTransfers'
 ACCOUNT_SOL_TXNS_URL = 'https://public-api.solscan.io/account/solTransfers'
 ACCOUNT_EXPORT_TXNS_URL = 'https://public-api.solscan.io/account/exportTransactions'
-ACCOUNT_ACCOUNT_URL = Template('https://public-api.solscan.io/account/$account')
+ACCOUNT_ACCOUNT_URL = url_template('https://public-api.solscan.io/account/$account')
 #### Token
 TOKEN_HOLDERS_URL = 'https://public-api.solscan.io/token/holders'
 TOKEN_META_URL = 'https://public-api.solscan.io/token/meta'
 TOKEN_LIST_URL = 'https://public-api.solscan.io/token/list'
 #### Market
-MARKET_INFO_URL = Template('https://public-api.solscan.io/market/token/$tokenAddress')
+MARKET_INFO_URL = url_template('https://public-api.solscan.io/market/token/$tokenAddress')
 #### Chain Information
 CHAIN_INFO_URL = 'https://public-api.solscan.io/chaininfo'
 
+# Public API limit: 150 requests every 30 seconds
+RATE_LIMIT_CALLS = 150
+RATE_LIMIT_PERIOD = 30
+
 #TODO max this clean/ not hardcoded? look into how this works
 HEADERS={'accept': 'application/json', 'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.45 Safari/537.36'} # pylint: disable=line-too-long
 
@@ -40,9 +46,11 @@ class Solscan(DataLoader):
 
     def __init__(self):
         DataLoader.__init__(self, api_dict=None, taxonomy_dict=None)
+        self.rate_limiter.set_default(CHAIN_INFO_URL, RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
 
     #################
     # Block endpoints
+    @profiled
     def get_last_blocks(self, num_blocks=1) -> pd.DataFrame:
         """returns info for last blocks (default is 1, limit is 20)
 
@@ -72,6 +80,7 @@ class Solscan(DataLoader):
 
         return last_blocks_df
 
+    @profiled
     def get_block_last_transactions(self, blocks_in: Union[str, List],
                                offset=0, num_transactions=10) -> pd.DataFrame:
         """get last num_transactions of given block numbers
@@ -90,21 +99,22 @@ class Solscan(DataLoader):
         """
         blocks = validate_input(blocks_in)
 
-        df_list = []
-        for block in blocks:
+        def get_transactions(block: str) -> pd.DataFrame:
             params = {'block': block,
                       'offset': offset,
                       'limit': num_transactions}
             txns = self.get_response(BLOCK_TRANSACTIONS_URL,
-                                         params=params,
-                                         headers=HEADERS)
-            txns_df = pd.DataFrame(txns)
-            df_list.append(txns_df)
-        fin_df = pd.concat(df_list, keys=blocks, axis=1)
+                                     params=params,
+                                     headers=HEADERS)
+            return pd.DataFrame(txns)
+
+        df_dict = self.fan_out(get_transactions, blocks)
+        fin_df = pd.concat(df_dict, axis=1)
         fin_df = unpack_dataframe_of_dicts(fin_df)
 
         return fin_df
 
+    @profiled
     def get_block(self, blocks_in: Union[str, List]) -> pd.DataFrame:
         """Return information of given block(s)
 
@@ -120,21 +130,23 @@ class Solscan(DataLoader):
         """
         blocks = validate_input(blocks_in)
 
-        df_list = []
-        for block in blocks:
+        def get_block_info(block: str) -> pd.DataFrame:
             endpoint_url = BLOCK_BLOCK_URL.substitute(block=block)
             response = self.get_response(endpoint_url,
                                          headers=HEADERS)
             df = pd.DataFrame(response)
             df.drop('currentSlot', axis=1)
-            df_list.append(df)
-        fin_df = pd.concat(df_list, keys=blocks, axis=1)
+            return df
+
+        df_dict = self.fan_out(get_block_info, blocks)
+        fin_df = pd.concat(df_dict, axis=1)
         fin_df = fin_df.xs('result', axis=1, level=1)
         return fin_df
 
 
     #######################
     # Transaction endpoints
+    @profiled
     def get_last_transactions(self, num_transactions=10) -> pd.DataFrame:
         """Return last num_transactions transactions
 
@@ -159,6 +171,7 @@ class Solscan(DataLoader):
         return fin_df
 
 
+    @profiled
     def get_transaction(self, signatures_in: Union[str, List]) -> pd.DataFrame:
         """Return information of given transaction signature(s)
 
@@ -174,19 +187,19 @@ class Solscan(DataLoader):
         """
         signatures = validate_input(signatures_in)
 
-        series_list = []
-        for signature in signatures:
+        def get_transaction_info(signature: str) -> pd.Series:
             endpoint_url = TRANSACTION_SIGNATURE_URL.substitute(signature=signature)
             response = self.get_response(endpoint_url,
-                                        headers=HEADERS)
-            #print(response)
-            series = pd.Series(response)
-            series_list.append(series)
-        fin_df = pd.concat(series_list, keys=signatures, axis=1)
+                                         headers=HEADERS)
+            return pd.Series(response)
+
+        series_dict = self.fan_out(get_transaction_info, signatures)
+        fin_df = pd.concat(series_dict, axis=1)
         return fin_df
 
     ###################
     # Account endpoints
+    @profiled
     def get_account_tokens(self, accounts_in: Union[str, List]) -> pd.DataFrame:
         """Return token balances of the given account(s)
 
@@ -202,17 +215,18 @@ class Solscan(DataLoader):
         """
         accounts = validate_input(accounts_in)
 
-        df_list=[]
-        for account in accounts:
+        def get_tokens(account: str) -> pd.DataFrame:
             params={'account':account}
             response = self.get_response(ACCOUNT_TOKENS_URL,
                                          params=params,
                                          headers=HEADERS)
-            df = pd.DataFrame(response)
-            df_list.append(df)
-        fin_df = pd.concat(df_list, keys=accounts, axis=1)
+            return pd.DataFrame(response)
+
+        df_dict = self.fan_out(get_tokens, accounts)
+        fin_df = pd.concat(df_dict, axis=1)
         return fin_df
 
+    @profiled
     def get_account_transactions(self, accounts_in: Union[str,List]) -> pd.DataFrame:
         """Return DataFrame of transactions of the given account(s)
 
@@ -228,17 +242,18 @@ class Solscan(DataLoader):
         """
         accounts = validate_input(accounts_in)
 
-        df_list=[]
-        for account in accounts:
+        def get_transactions(account: str) -> pd.DataFrame:
             params={'account':account}
             response = self.get_response(ACCOUNT_TRANSACTIONS_URL,
                                          params=params,
                                          headers=HEADERS)
-            df = pd.DataFrame(response)
-            df_list.append(df)
-        fin_df = pd.concat(df_list, keys=accounts, axis=1)
+            return pd.DataFrame(response)
+
+        df_dict = self.fan_out(get_transactions, accounts)
+        fin_df = pd.concat(df_dict, axis=1)
         return fin_df
 
+    @profiled
     def get_account_stake(self, accounts_in: Union[str, List]) -> pd.DataFrame:
         """Get staking accounts of the given account(s)
 
@@ -254,17 +269,18 @@ class Solscan(DataLoader):
         """
         accounts = validate_input(accounts_in)
 
-        df_list=[]
-        for account in accounts:
+        def get_stake(account: str) -> pd.DataFrame:
             params={'account':account}
             response = self.get_response(ACCOUNT_STAKE_URL,
                                          params=params,
                                          headers=HEADERS)
-            df = pd.DataFrame(response)
-            df_list.append(df)
-        fin_df = pd.concat(df_list, keys=accounts, axis=1)
+            return pd.DataFrame(response)
+
+        df_dict = self.fan_out(get_stake, accounts)
+        fin_df = pd.concat(df_dict, axis=1)
         return fin_df
 
+    @profiled
     def get_account_spl_transactions(self, accounts_in: Union[str, List],
                                      from_time: int=None,
                                      to_time: int=None,
@@ -292,8 +308,7 @@ class Solscan(DataLoader):
         """
         accounts = validate_input(accounts_in)
 
-        df_list=[]
-        for account in accounts:
+        def get_transfers(account: str) -> pd.DataFrame:
             params={'account':account,
                     'toTime': to_time,
                     'fromTime': from_time,
@@ -304,11 +319,44 @@ class Solscan(DataLoader):
                                          headers=HEADERS)
             df = pd.DataFrame(response)
             df.drop('total', axis=1)
-            df_list.append(df)
-        fin_df = pd.concat(df_list, keys=accounts, axis=1)
+            return df
+
+        df_dict = self.fan_out(get_transfers, accounts)
+        fin_df = pd.concat(df_dict, axis=1)
         fin_df = unpack_dataframe_of_dicts(fin_df)
         return fin_df
 
+    def iter_account_spl_transactions(self, account: str, from_time: int=None,
+                                      to_time: int=None, page_size: int=50,
+                                      prefetch: bool=True) -> Iterator[Dict]:
+        """Lazily yields every SPL transfer of an account, page by page
+
+        Parameters
+        ----------
+            account: str
+                single account in
+            from_time: int
+                unix time to start transaction history
+            to_time: int
+                unix time to end transaction history
+            page_size: int
+                Number of transfers requested per page
+            prefetch: bool
+                Request the next page while the current one is being consumed
+
+        Returns
+        -------
+            Iterator
+                SPL transfer dictionaries
+        """
+        params = {'account': account,
+                  'toTime': to_time,
+                  'fromTime': from_time}
+        paginator = OffsetPaginator(records_key='data', page_size=page_size)
+        yield from self.iter_records(ACCOUNT_SPL_TXNS_URL, paginator, params=params,
+                                     headers=HEADERS, prefetch=prefetch)
+
+    @profiled
     def get_account_sol_transactions(self, accounts_in: Union[str, List],
                                      from_time: int=None,
                                      to_time: int=None,
@@ -336,8 +384,7 @@ class Solscan(DataLoader):
         """
         accounts = validate_input(accounts_in)
 
-        df_list=[]
-        for account in accounts:
+        def get_transfers(account: str) -> pd.DataFrame:
             params={'account':account,
                     'toTime': to_time,
                     'fromTime': from_time,
@@ -346,12 +393,14 @@ class Solscan(DataLoader):
             response = self.get_response(ACCOUNT_SOL_TXNS_URL,
                                          params=params,
                                          headers=HEADERS)
-            df = pd.DataFrame(response)
-            df_list.append(df)
-        fin_df = pd.concat(df_list, keys=accounts, axis=1)
+            return pd.DataFrame(response)
+
+        df_dict = self.fan_out(get_transfers, accounts)
+        fin_df = pd.concat(df_dict, axis=1)
         fin_df = unpack_dataframe_of_dicts(fin_df)
         return fin_df
 
+    @profiled
     def get_account_export_transactions(self, accounts_in: Union[str, List],
                                         type_in: str, from_time: int, to_time: int) -> List[str]:
         """Export transactions to CSV style string
@@ -376,18 +425,21 @@ class Solscan(DataLoader):
                 list of strings to make csv document
         """
         accounts = validate_input(accounts_in)
-        csv_list=[]
-        for account in accounts:
+
+        def get_export(account: str) -> str:
             params={'account': account,
                     'type': type_in,
                     'fromTime': from_time,
                     'toTime': to_time}
             # NOTE: need to do this to not return json
+            self.rate_limiter.wait(ACCOUNT_EXPORT_TXNS_URL)
             response = self.session.get(ACCOUNT_EXPORT_TXNS_URL, params=params, headers=HEADERS)
-            csv = response.content.decode('utf-8')
-            csv_list.append(csv)
+            return response.content.decode('utf-8')
+
+        csv_list = list(self.fan_out(get_export, accounts).values())
         return csv_list
 
+    @profiled
     def get_account(self, accounts_in: Union[str, List]) -> pd.DataFrame:
         """Return overall account(s) information, including program account,
         NFT metadata information
@@ -402,18 +454,20 @@ class Solscan(DataLoader):
                 DataFrame with account info
         """
         accounts = validate_input(accounts_in)
-        series_list = []
-        for account in accounts:
+
+        def get_account_info(account: str) -> pd.Series:
             endpoint_url = ACCOUNT_ACCOUNT_URL.substitute(account=account)
             response = self.get_response(endpoint_url,
                                          headers=HEADERS)
-            series = pd.Series(response)
-            series_list.append(series)
-        fin_df = pd.concat(series_list, keys=accounts, axis=1)
+            return pd.Series(response)
+
+        series_dict = self.fan_out(get_account_info, accounts)
+        fin_df = pd.concat(series_dict, axis=1)
         return fin_df
 
     #################
     # Token endpoints
+    @profiled
     def get_token_holders(self, tokens_in: Union[str, List],
                           limit: int=10, offset: int=0) -> pd.DataFrame:
         """Return top token holders for given token(s)
@@ -434,8 +488,7 @@ class Solscan(DataLoader):
         """
         tokens = validate_input(tokens_in)
 
-        df_list = []
-        for token in tokens:
+        def get_holders(token: str) -> pd.DataFrame:
             params={'tokenAddress': token,
                     'limit': limit,
                     'offset': offset}
@@ -444,11 +497,37 @@ class Solscan(DataLoader):
                                          headers=HEADERS)
             df = pd.DataFrame(response)
             df.drop('total', axis=1)
-            df_list.append(df)
-        fin_df = pd.concat(df_list, keys=tokens, axis=1)
+            return df
+
+        df_dict = self.fan_out(get_holders, tokens)
+        fin_df = pd.concat(df_dict, axis=1)
         fin_df = unpack_dataframe_of_dicts(fin_df)
         return fin_df
 
+    def iter_token_holders(self, token: str, page_size: int=50,
+                           prefetch: bool=True) -> Iterator[Dict]:
+        """Lazily yields every holder of a token, page by page
+
+        Parameters
+        ----------
+            token: str
+                single token address in
+            page_size: int
+                Number of holders requested per page
+            prefetch: bool
+                Request the next page while the current one is being consumed
+
+        Returns
+        -------
+            Iterator
+                Token holder dictionaries
+        """
+        params = {'tokenAddress': token}
+        paginator = OffsetPaginator(records_key='data', page_size=page_size)
+        yield from self.iter_records(TOKEN_HOLDERS_URL, paginator, params=params,
+                                     headers=HEADERS, prefetch=prefetch)
+
+    @profiled
     def get_token_meta(self, tokens_in: Union[str, List]) -> pd.DataFrame:
         """Return metadata of given token(s)
 
@@ -464,17 +543,18 @@ class Solscan(DataLoader):
         """
         tokens = validate_input(tokens_in)
 
-        series_list = []
-        for token in tokens:
+        def get_meta(token: str) -> pd.Series:
             params={'tokenAddress': token}
             response = self.get_response(TOKEN_META_URL,
                                          params=params,
                                          headers=HEADERS)
-            series = pd.Series(response)
-            series_list.append(series)
-        fin_df = pd.concat(series_list, keys=tokens, axis=1)
+            return pd.Series(response)
+
+        series_dict = self.fan_out(get_meta, tokens)
+        fin_df = pd.concat(series_dict, axis=1)
         return fin_df
 
+    @profiled
     def get_token_list(self, sort_by: str='market_cap', ascending: bool=True,
                        limit: int=10, offset: int=0) -> pd.DataFrame:
         """Returns DataFrame of tokens
@@ -519,6 +599,7 @@ class Solscan(DataLoader):
 
     ##################
     # Market endpoints
+    @profiled
     def get_market_info(self, tokens_in: Union[str, List]) -> pd.DataFrame:
         """Get market information of the given token
 
@@ -534,19 +615,20 @@ class Solscan(DataLoader):
         """
         tokens = validate_input(tokens_in)
 
-        market_info_list = []
-        for token in tokens:
+        def get_token_market_info(token: str) -> pd.Series:
             endpoint_url = MARKET_INFO_URL.substitute(tokenAddress=token)
             market_info = self.get_response(endpoint_url,
                                             headers=HEADERS)
-            market_info_series = pd.Series(market_info)
-            market_info_list.append(market_info_series)
-        market_info_df = pd.concat(market_info_list, keys=tokens, axis=1)
+            return pd.Series(market_info)
+
+        market_info_dict = self.fan_out(get_token_market_info, tokens)
+        market_info_df = pd.concat(market_info_dict, axis=1)
         return market_info_df
 
 
     #############################
     # Chain Information endpoints
+    @profiled
     def get_chain_info(self) -> Dict:
         """Return Blockchain overall information
 
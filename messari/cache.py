@@ -0,0 +1,387 @@
+"""This module is meant to contain the ResponseCache class & its storage backends"""
+
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Query parameters & headers that carry credentials, never part of a cache key
+SECRET_KEYS = ('apikey', 'api_key', 'api-key', 'key', 'token', 'authorization',
+               'x-messari-api-key', 'x-api-key', 'x-cg-pro-api-key', 'coinglasssecret')
+
+# Headers that don't change the body of a response
+IGNORED_HEADERS = ('user-agent', 'accept-encoding', 'connection', 'cookie')
+
+# Default number of seconds a response is kept
+DEFAULT_TTL = 300
+
+# Default number of responses kept before the least recently used are evicted
+DEFAULT_MAX_ENTRIES = 1024
+
+# TTL rule: (url, params that must match, ttl, whether url is a prefix)
+TTLRule = Tuple[str, Dict, Optional[float], bool]
+
+
+def is_secret(name: str) -> bool:
+    """Returns whether a param or header name holds a credential
+
+    :param name: str
+        Param or header name
+    :return: bool
+    """
+    name = name.lower()
+    return name in SECRET_KEYS or name.endswith('api-key') or name.endswith('api_key')
+
+
+def make_cache_key(url: str, params: Dict = None, headers: Dict = None,
+                   keep_secrets: bool = False) -> str:
+    """Builds a stable key for a request, leaving out credentials
+
+    :param url: str
+        URL API string
+    :param params: dict
+        Dictionary of query parameters
+    :param headers: dict
+        Dictionary of headers
+    :param keep_secrets: bool
+        Tell requests made with different credentials apart
+    :return: hex digest identifying the request
+    """
+    query = []
+    for name, value in (params or {}).items():
+        if value is None or (is_secret(name) and not keep_secrets):
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        query.extend((str(name), str(item)) for item in values)
+    relevant_headers = sorted(
+        (name.lower(), str(value)) for name, value in (headers or {}).items()
+        if value is not None and (keep_secrets or not is_secret(name))
+        and name.lower() not in IGNORED_HEADERS)
+    raw = json.dumps([url, sorted(query), relevant_headers])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def match_ttl(rules: List[TTLRule], url: str, params: Dict = None):
+    """Finds the ttl of the most specific rule matching a request
+
+    Rules match when the url is theirs (or starts with it for prefix rules) & every
+    param they name has the same value in the request. Exact urls beat prefixes,
+    longer prefixes beat shorter ones & more params are more specific.
+
+    :param rules: list
+        List of (url, params, ttl, prefix) tuples
+    :param url: str
+        URL API string
+    :param params: dict
+        Dictionary of query parameters
+    :return: (True, ttl) if a rule matched, (False, None) otherwise
+    """
+    params = params or {}
+    best_rank: Optional[Tuple[bool, int, int]] = None
+    best_ttl: Optional[float] = None
+    for rule_url, rule_params, ttl, prefix in rules:
+        if not (url.startswith(rule_url) if prefix else url == rule_url):
+            continue
+        if any(str(params.get(name)) != str(value) for name, value in rule_params.items()):
+            continue
+        rank = (not prefix, len(rule_url), len(rule_params))
+        if best_rank is None or rank >= best_rank:
+            best_rank, best_ttl = rank, ttl
+    if best_rank is None:
+        return False, None
+    return True, best_ttl
+
+
+class CacheBackend:
+    """This class is the interface every response cache storage implements.
+
+    Values are the raw JSON text of a response, expires is an epoch timestamp
+    or None for entries that never expire.
+    Backends with blocking set to True do I/O, AsyncDataLoader calls them off the event loop.
+    """
+    blocking = False
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the value stored for key, None if missing or expired"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, expires: Optional[float]) -> None:
+        """Stores value under key until expires"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Removes key"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Removes every entry"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """This class is a thread safe in-memory LRU cache backend"""
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, expires: Optional[float]) -> None:
+        with self.lock:
+            self.entries[key] = (value, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class SQLiteCache(CacheBackend):
+    """This class is an LRU cache backend stored in a single SQLite file,
+    it can be shared by several processes
+    """
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self.lock, self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses '
+                '(key TEXT PRIMARY KEY, value TEXT, expires REAL, accessed REAL)')
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                'SELECT value, expires FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires = row
+            if expires is not None and expires <= now:
+                self.connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return None
+            self.connection.execute(
+                'UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+            return value
+
+    def set(self, key: str, value: str, expires: Optional[float]) -> None:
+        with self.lock, self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)',
+                (key, value, expires, time.time()))
+            self.connection.execute(
+                'DELETE FROM responses WHERE key IN (SELECT key FROM responses '
+                'ORDER BY accessed DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+
+    def delete(self, key: str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def clear(self) -> None:
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM responses')
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the SQLite connection"""
+        self.connection.close()
+
+
+class DiskCache(CacheBackend):
+    """This class is an LRU cache backend storing one JSON file per response in a directory.
+
+    Recency is tracked with file modification times so the cache survives restarts
+    & can be inspected or wiped with regular file tools.
+    """
+    blocking = True
+
+    def __init__(self, directory: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def get_path(self, key: str) -> str:
+        """Returns the file a key is stored in"""
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.get_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if entry['expires'] is not None and entry['expires'] <= time.time():
+            self.delete(key)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry['value']
+
+    def set(self, key: str, value: str, expires: Optional[float]) -> None:
+        with self.lock:
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(handle, 'w', encoding='utf-8') as cache_file:
+                json.dump({'value': value, 'expires': expires}, cache_file)
+            os.replace(temp_path, self.get_path(key))
+            self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used files above max_entries"""
+        paths = [entry.path for entry in os.scandir(self.directory)
+                 if entry.name.endswith('.json')]
+        if len(paths) <= self.max_entries:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.get_path(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        with self.lock:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.json'):
+                    os.remove(entry.path)
+
+    def __len__(self) -> int:
+        return sum(1 for entry in os.scandir(self.directory) if entry.name.endswith('.json'))
+
+
+class ResponseCache:
+    """This class caches successful API responses for DataLoader.get_response.
+
+    Requests are keyed on their URL, sorted params & relevant headers with credentials
+    left out, so the same query made with different API keys shares an entry.
+    TTLs are looked up per endpoint: rules set on the cache with set_ttl win over the
+    defaults connectors register, which win over default_ttl.
+    A ttl of 0 disables caching for an endpoint & None keeps responses forever.
+    """
+    def __init__(self, backend: CacheBackend = None, default_ttl: Optional[float] = DEFAULT_TTL):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.default_ttl = default_ttl
+        self.ttl_rules: List[TTLRule] = []
+
+    @property
+    def blocking(self) -> bool:
+        """Whether reading & writing responses does I/O on the backend"""
+        return self.backend.blocking
+
+    def set_ttl(self, url: str, ttl: Optional[float], params: Dict = None,
+                prefix: bool = False) -> None:
+        """Sets the TTL of every request to url matching params
+
+        :param url: str
+            URL of the endpoint (i.e. https://api.llama.fi/protocols)
+        :param ttl: float
+            Seconds to keep responses, 0 disables caching & None never expires
+        :param params: dict
+            Query parameters the request must have, to target one action of a shared URL
+        :param prefix: bool
+            Apply the TTL to every URL starting with url
+        """
+        self.ttl_rules.append((url, dict(params or {}), ttl, prefix))
+
+    def get_ttl(self, url: str, params: Dict = None,
+                default_rules: List[TTLRule] = None) -> Optional[float]:
+        """Returns the TTL a request is cached with
+
+        :param url: str
+            URL API string
+        :param params: dict
+            Dictionary of query parameters
+        :param default_rules: list
+            TTL rules registered by the connector making the request
+        :return: Seconds to keep the response, 0 if it shouldn't be cached, None to keep forever
+        """
+        found, ttl = match_ttl(self.ttl_rules, url, params)
+        if found:
+            return ttl
+        found, ttl = match_ttl(default_rules or [], url, params)
+        if found:
+            return ttl
+        return self.default_ttl
+
+    def get(self, url: str, params: Dict = None, headers: Dict = None) -> Optional[str]:
+        """Returns the cached JSON text of a request, None on a miss
+
+        :param url: str
+            URL API string
+        :param params: dict
+            Dictionary of query parameters
+        :param headers: dict
+            Dictionary of headers
+        :return: JSON text or None
+        """
+        return self.backend.get(make_cache_key(url, params, headers))
+
+    def set(self, url: str, params: Dict, headers: Dict, value: str,
+            ttl: Optional[float]) -> None:
+        """Caches the JSON text of a request
+
+        :param url: str
+            URL API string
+        :param params: dict
+            Dictionary of query parameters
+        :param headers: dict
+            Dictionary of headers
+        :param value: str
+            JSON text of the response
+        :param ttl: float
+            Seconds to keep the response, None to keep it forever
+        """
+        if ttl is not None and ttl <= 0:
+            return
+        expires = None if ttl is None else time.time() + ttl
+        self.backend.set(make_cache_key(url, params, headers), value, expires)
+
+    def clear(self) -> None:
+        """Removes every cached response"""
+        self.backend.clear()
@@ -1,4 +1,8 @@
 """Module to handle initialization, imports, for CoinGecko class"""
 
+from messari.lazy import lazy_exports
 
-from .coingecko import *
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'CoinGecko': '.coingecko',
+    'AsyncCoinGecko': '.asynccoingecko',
+})
@@ -0,0 +1,205 @@
+"""
+This module is meant to contain the AsyncCoinGecko class
+Ref: https://www.coingecko.com/en/api/documentation
+"""
+
+
+import pandas as pd
+
+from messari.asyncdataloader import AsyncDataLoader
+
+# Local imports
+from .helpers import format_market_chart, format_ohlc, format_exchange_volume, \
+    format_global_history, to_column
+from .coingeckobase import CoinGeckoBase, page_params, COINS_LIST_URL, ASSET_PLATFORMS_URL, \
+    CATEGORIES_LIST_URL, CATEGORIES_URL, EXCHANGES_URL, EXCHANGES_LIST_URL, INDEXES_URL, \
+    INDEXES_LIST_URL, DERIVATIVES_URL, DERIVATIVES_EXCHANGES_LIST_URL, EXCHANGE_RATES_URL, \
+    GLOBAL_URL, GLOBAL_HISTORY_URL, GLOBAL_DEFI_URL, HEADERS, RETRY_POLICY
+
+
+class AsyncCoinGecko(CoinGeckoBase, AsyncDataLoader):
+    """This class is an asyncio wrapper around the CoinGecko API,
+    every method is a coroutine returning the same data as its CoinGecko counterpart
+    """
+
+    def __init__(self):
+        AsyncDataLoader.__init__(self, api_dict=None, taxonomy_dict=None,
+                                 retry_policy=RETRY_POLICY)
+        CoinGeckoBase.__init__(self)
+
+    ## Coins
+    async def get_coin_list(self) -> pd.DataFrame:
+        """See CoinGecko.get_coin_list"""
+        response = await self.get_response(COINS_LIST_URL)
+        return pd.DataFrame(response)
+
+    async def get_coin_markets(self, category: str=None, order: str=None, per_page: int=10,
+                               page: int=1) -> pd.DataFrame:
+        """See CoinGecko.get_coin_markets"""
+        request = self.coin_markets_request(category, order, per_page, page)
+        response = await self.get_response(*request)
+        return pd.DataFrame(response)
+
+    async def get_coin(self, coin_id: str) -> pd.DataFrame:
+        """See CoinGecko.get_coin"""
+        response = await self.get_response(*self.coin_request(coin_id))
+        return to_column(response, coin_id)
+
+    async def get_coin_tickers(self, coin_id: str, page: int=1) -> pd.DataFrame:
+        """See CoinGecko.get_coin_tickers"""
+        response = await self.get_response(*self.coin_tickers_request(coin_id, page))
+        return pd.DataFrame(response['tickers'])
+
+    async def get_coin_history(self, coin_id: str, date: str) -> pd.DataFrame:
+        """See CoinGecko.get_coin_history"""
+        response = await self.get_response(*self.coin_history_request(coin_id, date))
+        return to_column(response, coin_id)
+
+    async def get_coin_chart(self, coin_id: str, interval: int = 'daily',
+                             days: str='max') -> pd.DataFrame:
+        """See CoinGecko.get_coin_chart"""
+        response = await self.get_response(*self.coin_chart_request(coin_id, interval, days))
+        return format_market_chart(response)
+
+    async def get_coin_range(self, coin_id: str, _from: int, to: int) -> pd.DataFrame:
+        """See CoinGecko.get_coin_range"""
+        response = await self.get_response(*self.coin_range_request(coin_id, _from, to))
+        return format_market_chart(response)
+
+    async def get_coin_ohlc(self, coin_id: str, days: int=7):
+        """See CoinGecko.get_coin_ohlc"""
+        response = await self.get_response(*self.coin_ohlc_request(coin_id, days))
+        return format_ohlc(response)
+
+    ## Contract
+    async def get_contract(self, asset_platform: str, contract_address: str) -> pd.DataFrame:
+        """See CoinGecko.get_contract"""
+        response = await self.get_response(*self.contract_request(asset_platform, contract_address))
+        return to_column(response, f'{asset_platform}_{contract_address}')
+
+    async def get_contract_market(self, asset_platform: str, contract_address: str,
+                                  days: str='max') -> pd.DataFrame:
+        """See CoinGecko.get_contract_market"""
+        request = self.contract_market_request(asset_platform, contract_address, days)
+        response = await self.get_response(*request)
+        return format_market_chart(response)
+
+    async def get_contract_range(self, asset_platform: str, contract_address: str, _from: int,
+                                 to: int) -> pd.DataFrame:
+        """See CoinGecko.get_contract_range"""
+        request = self.contract_range_request(asset_platform, contract_address, _from, to)
+        response = await self.get_response(*request)
+        return format_market_chart(response)
+
+    ## Asset Platforms
+    async def get_asset_platforms(self) -> pd.DataFrame:
+        """See CoinGecko.get_asset_platforms"""
+        response = await self.get_response(ASSET_PLATFORMS_URL)
+        return pd.DataFrame(response)
+
+    ## Categories
+    async def get_categories_list(self) -> pd.DataFrame:
+        """See CoinGecko.get_categories_list"""
+        response = await self.get_response(CATEGORIES_LIST_URL)
+        return pd.DataFrame(response)
+
+    async def get_categories(self) -> pd.DataFrame:
+        """See CoinGecko.get_categories"""
+        response = await self.get_response(CATEGORIES_URL)
+        return pd.DataFrame(response)
+
+    ## Exchanges
+    async def get_exchanges(self, per_page: int=10, page: int=1) -> pd.DataFrame:
+        """See CoinGecko.get_exchanges"""
+        response = await self.get_response(EXCHANGES_URL, params=page_params(per_page, page))
+        return pd.DataFrame(response)
+
+    async def get_exchanges_list(self) -> pd.DataFrame:
+        """See CoinGecko.get_exchanges_list"""
+        response = await self.get_response(EXCHANGES_LIST_URL)
+        return pd.DataFrame(response)
+
+    async def get_exchange(self, exchange_id: str) -> pd.DataFrame:
+        """See CoinGecko.get_exchange"""
+        response = await self.get_response(*self.exchange_request(exchange_id))
+        return to_column(response, exchange_id)
+
+    async def get_exchange_tickers(self, exchange_id: str, page:int=1) -> pd.DataFrame:
+        """See CoinGecko.get_exchange_tickers"""
+        response = await self.get_response(*self.exchange_tickers_request(exchange_id, page))
+        return pd.DataFrame(response['tickers'])
+
+    async def get_exchange_volume(self, exchange_id: str, days: int=7) -> pd.DataFrame:
+        """See CoinGecko.get_exchange_volume"""
+        response = await self.get_response(*self.exchange_volume_request(exchange_id, days))
+
+        # Call `get_coin_chart` to get bitcoin price on that day
+        # Omit the last partial date of price data
+        btc_prices = (await self.get_coin_chart('bitcoin', 'daily', days))['prices'][:-1]
+        return format_exchange_volume(response, btc_prices)
+
+    ## indexes
+    async def get_index(self) -> str:
+        """See CoinGecko.get_index"""
+        return 'what is happening here?'
+
+    async def get_indexes(self, per_page:int=10, page:int=1) -> pd.DataFrame:
+        """See CoinGecko.get_indexes"""
+        response = await self.get_response(INDEXES_URL, params=page_params(per_page, page))
+        return pd.DataFrame(response)
+
+    async def get_indexes_list(self) -> pd.DataFrame:
+        """See CoinGecko.get_indexes_list"""
+        response = await self.get_response(INDEXES_LIST_URL)
+        return pd.DataFrame(response)
+
+    ## derivatives
+    async def get_derivatives(self) -> pd.DataFrame:
+        """See CoinGecko.get_derivatives"""
+        response = await self.get_response(DERIVATIVES_URL)
+        return pd.DataFrame(response)
+
+    async def get_derivatives_exchange(self, _id: str) -> pd.DataFrame:
+        """See CoinGecko.get_derivatives_exchange"""
+        response = await self.get_response(*self.derivatives_exchange_request(_id))
+        return to_column(response, _id)
+
+    async def get_derivatives_exchanges(self, per_page:int=10, page:int=1,
+                                        order:str=None) -> pd.DataFrame:
+        """See CoinGecko.get_derivatives_exchanges"""
+        request = self.derivatives_exchanges_request(per_page, page, order)
+        response = await self.get_response(*request)
+        return pd.DataFrame(response)
+
+    async def get_derivatives_exchanges_list(self) -> pd.DataFrame:
+        """See CoinGecko.get_derivatives_exchanges_list"""
+        response = await self.get_response(DERIVATIVES_EXCHANGES_LIST_URL)
+        return pd.DataFrame(response)
+
+    ## Exchange rates
+    async def get_exchange_rates(self) -> pd.DataFrame:
+        """See CoinGecko.get_exchange_rates"""
+        response = await self.get_response(EXCHANGE_RATES_URL)
+        return to_column(response['rates'], 'rates')
+
+    ## Global
+    async def get_global(self) -> pd.DataFrame:
+        """See CoinGecko.get_global"""
+        response = await self.get_response(GLOBAL_URL)
+        return to_column(response['data'], 'global')
+
+    async def get_global_history(self) -> pd.DataFrame:
+        """See CoinGecko.get_global_history"""
+        response = await self.get_response(GLOBAL_HISTORY_URL, headers=HEADERS)
+        return format_global_history(response)
+
+    async def get_global_defi(self) -> pd.DataFrame:
+        """See CoinGecko.get_global_defi"""
+        response = await self.get_response(GLOBAL_DEFI_URL)
+        return to_column(response['data'], 'global_defi')
+
+    ## Companies (beta)
+    async def get_companies(self, coin_id: str='bitcoin') -> pd.DataFrame:
+        """See CoinGecko.get_companies"""
+        response = await self.get_response(*self.companies_request(coin_id))
+        return pd.DataFrame(response['companies'])
@@ -0,0 +1,217 @@
+"""This module is meant to contain the CoinGeckoBase class"""
+
+from typing import Dict, Optional, Tuple
+
+from messari.metrics import url_template
+from messari.retry import RetryPolicy
+
+##########################
+# URL Endpoints
+##########################
+BASE_URL = 'https://api.coingecko.com/api/v3'
+
+## Coins
+COINS_LIST_URL = f'{BASE_URL}/coins/list'
+COINS_MARKETS_URL = f'{BASE_URL}/coins/markets'
+COIN_URL = url_template(f'{BASE_URL}/coins/$coin_id')
+COIN_TICKERS_URL = url_template(f'{BASE_URL}/coins/$coin_id/tickers')
+COIN_HISTORY_URL = url_template(f'{BASE_URL}/coins/$coin_id/history')
+COIN_CHART_URL = url_template(f'{BASE_URL}/coins/$coin_id/market_chart')
+COIN_RANGE_URL = url_template(f'{BASE_URL}/coins/$coin_id/market_chart/range')
+COIN_OHLC_URL = url_template(f'{BASE_URL}/coins/$coin_id/ohlc')
+## Contract
+CONTRACT_URL = url_template(f'{BASE_URL}/coins/$asset_platform/contract/$contract_address')
+CONTRACT_CHART_URL = url_template(
+    f'{BASE_URL}/coins/$asset_platform/contract/$contract_address/market_chart')
+CONTRACT_RANGE_URL = url_template(
+    f'{BASE_URL}/coins/$asset_platform/contract/$contract_address/market_chart/range')
+## Asset Platforms
+ASSET_PLATFORMS_URL = f'{BASE_URL}/asset_platforms'
+## Categories
+CATEGORIES_LIST_URL = f'{BASE_URL}/coins/categories/list'
+CATEGORIES_URL = f'{BASE_URL}/coins/categories'
+## Exchanges
+EXCHANGES_URL = f'{BASE_URL}/exchanges'
+EXCHANGES_LIST_URL = f'{BASE_URL}/exchanges/list'
+EXCHANGE_URL = url_template(f'{BASE_URL}/exchanges/$exchange_id')
+EXCHANGE_TICKERS_URL = url_template(f'{BASE_URL}/exchanges/$exchange_id/tickers')
+EXCHANGE_VOLUME_URL = url_template(f'{BASE_URL}/exchanges/$exchange_id/volume_chart')
+## Indexes
+INDEXES_URL = f'{BASE_URL}/indexes'
+INDEXES_LIST_URL = f'{BASE_URL}/indexes/list'
+## Derivatives
+DERIVATIVES_URL = f'{BASE_URL}/derivatives'
+DERIVATIVES_EXCHANGE_URL = url_template(f'{BASE_URL}/derivatives/exchanges/$exchange_id')
+DERIVATIVES_EXCHANGES_URL = f'{BASE_URL}/derivatives/exchanges/'
+DERIVATIVES_EXCHANGES_LIST_URL = f'{BASE_URL}/derivatives/exchanges/list'
+## Exchange rates
+EXCHANGE_RATES_URL = f'{BASE_URL}/exchange_rates'
+## Global
+GLOBAL_URL = f'{BASE_URL}/global'
+# Ref: https://www.coingecko.com/en/global_charts
+GLOBAL_HISTORY_URL = \
+    'https://www.coingecko.com/market_cap/total_charts_data?locale=en&vs_currency=usd'
+GLOBAL_DEFI_URL = f'{BASE_URL}/global/decentralized_finance_defi'
+## Companies (beta)
+COMPANIES_URL = url_template(f'{BASE_URL}/companies/public_treasury/$coin_id')
+
+# Public API limit: 30 calls per minute
+RATE_LIMIT_CALLS = 30
+RATE_LIMIT_PERIOD = 60
+
+# The public API answers bursts with 429s for the rest of the minute,
+# so back off for longer & spend more of the budget on 429s
+RETRY_POLICY = RetryPolicy(max_retries=6, backoff_factor=2.0, max_backoff=60.0,
+                           status_retries={429: 6, 500: 2, 502: 3, 503: 3, 504: 3})
+
+# The coin list changes a few times a day at most
+COIN_LIST_CACHE_TTL = 86400
+
+HEADERS = {
+        'Content-Type': 'application/json',
+        'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.45 Safari/537.36',
+        }
+
+# endpoint_url & params arguments of get_response
+Request = Tuple[str, Optional[Dict]]
+
+
+class CoinGeckoBase:  # pylint: disable=no-member
+    """This class holds what CoinGecko & AsyncCoinGecko share: their configuration
+    & the URL & query parameters of every endpoint.
+
+    Subclasses only send the requests it builds, parsing the responses with the
+    helpers module, so both tiers return the same data.
+    """
+
+    def __init__(self):
+        """Configures the client once the loader is initialized"""
+        self.set_cache_ttl(COINS_LIST_URL, COIN_LIST_CACHE_TTL)
+        self.rate_limiter.set_default(BASE_URL, RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
+
+    ## Coins
+    @staticmethod
+    def coin_markets_request(category: Optional[str], order: Optional[str], per_page: int,
+                             page: int) -> Request:
+        """Returns the request of get_coin_markets"""
+        parameters = {
+                'vs_currency': 'usd',
+                'per_page': per_page,
+                'page': page
+                }
+        if order:
+            parameters['order'] = order
+        if category:
+            parameters['category'] = category
+        return COINS_MARKETS_URL, parameters
+
+    @staticmethod
+    def coin_request(coin_id: str) -> Request:
+        """Returns the request of get_coin"""
+        return COIN_URL.substitute(coin_id=coin_id), None
+
+    @staticmethod
+    def coin_tickers_request(coin_id: str, page: int) -> Request:
+        """Returns the request of get_coin_tickers"""
+        return COIN_TICKERS_URL.substitute(coin_id=coin_id), {'page': page, 'depth': 'true'}
+
+    @staticmethod
+    def coin_history_request(coin_id: str, date: str) -> Request:
+        """Returns the request of get_coin_history"""
+        return COIN_HISTORY_URL.substitute(coin_id=coin_id), {'date': date}
+
+    @staticmethod
+    def coin_chart_request(coin_id: str, interval: str, days: str) -> Request:
+        """Returns the request of get_coin_chart"""
+        parameters = {
+                'vs_currency': 'usd',
+                'interval': interval,
+                'days': days
+                }
+        return COIN_CHART_URL.substitute(coin_id=coin_id), parameters
+
+    @staticmethod
+    def coin_range_request(coin_id: str, _from: int, to: int) -> Request:
+        """Returns the request of get_coin_range"""
+        return COIN_RANGE_URL.substitute(coin_id=coin_id), range_params(_from, to)
+
+    @staticmethod
+    def coin_ohlc_request(coin_id: str, days: int) -> Request:
+        """Returns the request of get_coin_ohlc"""
+        return COIN_OHLC_URL.substitute(coin_id=coin_id), {'vs_currency': 'usd', 'days': days}
+
+    ## Contract
+    @staticmethod
+    def contract_request(asset_platform: str, contract_address: str) -> Request:
+        """Returns the request of get_contract"""
+        return CONTRACT_URL.substitute(asset_platform=asset_platform,
+                                       contract_address=contract_address), None
+
+    @staticmethod
+    def contract_market_request(asset_platform: str, contract_address: str,
+                                days: str) -> Request:
+        """Returns the request of get_contract_market"""
+        url = CONTRACT_CHART_URL.substitute(asset_platform=asset_platform,
+                                            contract_address=contract_address)
+        return url, {'vs_currency': 'usd', 'days': days}
+
+    @staticmethod
+    def contract_range_request(asset_platform: str, contract_address: str, _from: int,
+                               to: int) -> Request:
+        """Returns the request of get_contract_range"""
+        url = CONTRACT_RANGE_URL.substitute(asset_platform=asset_platform,
+                                            contract_address=contract_address)
+        return url, range_params(_from, to)
+
+    ## Exchanges
+    @staticmethod
+    def exchange_request(exchange_id: str) -> Request:
+        """Returns the request of get_exchange"""
+        return EXCHANGE_URL.substitute(exchange_id=exchange_id), None
+
+    @staticmethod
+    def exchange_tickers_request(exchange_id: str, page: int) -> Request:
+        """Returns the request of get_exchange_tickers"""
+        return EXCHANGE_TICKERS_URL.substitute(exchange_id=exchange_id), {'page': page}
+
+    @staticmethod
+    def exchange_volume_request(exchange_id: str, days: int) -> Request:
+        """Returns the request of get_exchange_volume"""
+        return EXCHANGE_VOLUME_URL.substitute(exchange_id=exchange_id), {'days': days}
+
+    ## Derivatives
+    @staticmethod
+    def derivatives_exchange_request(_id: str) -> Request:
+        """Returns the request of get_derivatives_exchange"""
+        return DERIVATIVES_EXCHANGE_URL.substitute(exchange_id=_id), None
+
+    @staticmethod
+    def derivatives_exchanges_request(per_page: int, page: int, order: Optional[str]) -> Request:
+        """Returns the request of get_derivatives_exchanges"""
+        parameters = page_params(per_page, page)
+        if order:
+            parameters['order'] = order
+        return DERIVATIVES_EXCHANGES_URL, parameters
+
+    ## Companies (beta)
+    @staticmethod
+    def companies_request(coin_id: str) -> Request:
+        """Returns the request of get_companies"""
+        return COMPANIES_URL.substitute(coin_id=coin_id), None
+
+
+def range_params(_from: int, to: int) -> Dict:
+    """Returns the query parameters of a market chart between two unix timestamps"""
+    return {
+            'vs_currency': 'usd',
+            'from': _from,
+            'to': to
+            }
+
+
+def page_params(per_page: int, page: int) -> Dict:
+    """Returns the query parameters of a paged listing"""
+    return {
+            'per_page': per_page,
+            'page': page
+            }
@@ -1 +1,139 @@
 """This module is dedicated to helpers for the CoinGecko class"""
+
+
+from typing import Dict, List
+
+import pandas as pd
+
+
+def format_market_chart(response: Dict) -> pd.DataFrame:
+    """format a CoinGecko market chart response, index by timestamp & keep values only
+
+    Parameters
+    ----------
+       response: dict
+           market chart response with prices, market_caps & total_volumes
+
+    Returns
+    -------
+       DataFrame
+           timeseries DataFrame with prices, market_caps & total_volumes
+    """
+    df = pd.DataFrame(response)
+    df.index = df['prices'].apply(lambda x: x[0])
+    df.index = pd.to_datetime(df.index, unit='ms')
+
+    df['prices'] = df['prices'].apply(lambda x: x[1])
+    df['market_caps'] = df['market_caps'].apply(lambda x: x[1])
+    df['total_volumes'] = df['total_volumes'].apply(lambda x: x[1])
+    return df
+
+
+def format_ohlc(response: List) -> pd.DataFrame:
+    """format a CoinGecko ohlc response
+
+    Parameters
+    ----------
+       response: list
+           list of [timestamp, open, high, low, close] candles
+
+    Returns
+    -------
+       DataFrame
+           timeseries DataFrame with open, high, low & close columns
+    """
+    df = pd.DataFrame(response).set_index(0)
+    rename_dict = {
+            1:'open',
+            2:'high',
+            3:'low',
+            4:'close'
+            }
+    df.rename(columns=rename_dict,inplace=True)
+    df.index = pd.to_datetime(df.index,unit='ms')
+    return df
+
+
+def format_exchange_volume(response: List, btc_prices: pd.Series) -> pd.DataFrame:
+    """format a CoinGecko exchange volume chart in both BTC & USD terms
+
+    Parameters
+    ----------
+       response: list
+           list of [timestamp, btc volume] pairs
+       btc_prices: pd.Series
+           daily bitcoin prices indexed by timestamp
+
+    Returns
+    -------
+       DataFrame
+           DataFrame of daily exchange volume in BTC & USD, most recent first
+    """
+    exchange_volume_column_name = 'exchange_volume.btc'
+
+    # Get exchange volume for the exchange in BTC terms
+    df_exchange_volume = pd.DataFrame(response).set_index(0)
+
+    # Convert timestamp to datetime and rename column to represent units
+    df_exchange_volume.index = pd.to_datetime(df_exchange_volume.index, unit='ms')
+    df_exchange_volume.rename(columns={1: exchange_volume_column_name},inplace=True)
+
+    df_exchange_volume.index.name = 'timestamp'
+    df_exchange_volume.reset_index(inplace=True)
+
+    # Convert datettime to date for use in groupby
+    df_exchange_volume['timestamp'] = df_exchange_volume['timestamp'].dt.date
+    df_exchange_volume[exchange_volume_column_name] = \
+        df_exchange_volume[exchange_volume_column_name].astype(float)
+
+    # Get the last recorded exchange volume for that day
+    df_exchange_volume = pd.DataFrame(
+        df_exchange_volume.groupby(df_exchange_volume['timestamp'])[exchange_volume_column_name]
+        .last())
+
+    btc_prices.index = pd.to_datetime(btc_prices.index, unit='ms')
+
+    # Join volume and price data to get exchange volume in both USD and BTC terms
+    df_joined = df_exchange_volume.join(btc_prices)
+    df_joined['exchange_volume.usd'] = df_joined[exchange_volume_column_name] * df_joined['prices']
+    df_joined.drop('prices', axis=1, inplace=True)
+
+    return df_joined.sort_index(ascending=False)
+
+
+def format_global_history(response: Dict) -> pd.DataFrame:
+    """format the CoinGecko global market cap chart, index by date
+
+    Parameters
+    ----------
+       response: dict
+           total charts data response with [timestamp, market cap] stats
+
+    Returns
+    -------
+       DataFrame
+           DataFrame of total market cap in USD indexed by date
+    """
+    df = pd.DataFrame(response['stats']).set_index(0)
+    df.rename(columns={1:'mktcap.usd'},inplace=True)
+    df.index = pd.to_datetime(df.index, unit='ms')
+    df.index = df.index.date
+    return df
+
+
+def to_column(response: Dict, name: str) -> pd.DataFrame:
+    """format a single CoinGecko object as a one column DataFrame
+
+    Parameters
+    ----------
+       response: dict
+           JSON object (coin, contract, exchange...)
+       name: str
+           name of the column, usually the id of the object
+
+    Returns
+    -------
+       DataFrame
+           DataFrame with a row per field of the object
+    """
+    return pd.Series(response).to_frame(name=name)
@@ -1,7 +1,6 @@
 """This module is meant to contain the coinglass class"""
 
 import pandas as pd
-import requests
 
 from messari.dataloader import DataLoader
 
@@ -17,7 +16,7 @@ class coinglass(DataLoader):
         
     def get_symbols(self) -> List:
         url = 'https://fapi.coinglass.com/api/support/symbol'
-        response = requests.get(url).json()
+        response = self.get_response(url)
         symbols = response.get('data')
         return symbols
         
@@ -28,7 +27,7 @@ class coinglass(DataLoader):
             'interval': interval,
         }
         url = 'https://fapi.coinglass.com/api/fundingRate/v2/history/chart'
-        response = requests.get(url, params=parameters).json()
+        response = self.get_response(url, params=parameters)
         df = pd.DataFrame(response['data']['frDataMap'])
         df['price'] = response['data']['priceList']
         df.index = response['data']['dateList']
@@ -45,7 +44,7 @@ class coinglass(DataLoader):
         }
         url = 'https://fapi.coinglass.com/api/openInterest/v3/chart?symbol=BTC&timeType=0&exchangeName=&currency=USD&type=0'
         url = 'https://fapi.coinglass.com/api/openInterest/v3/chart'
-        response = requests.get(url, params=parameters).json()
+        response = self.get_response(url, params=parameters)
         df = pd.DataFrame(response['data']['dataMap'])
         df['price'] = response['data']['priceList']
         df.index = response['data']['dateList']
@@ -54,7 +53,7 @@ class coinglass(DataLoader):
 
     def get_liquidations(self, slug: str) -> pd.DataFrame:
         url = 'https://fapi.coinglass.com/api/futures/liquidation/chart?symbol=BTC'
-        response = requests.get(url).json()
+        response = self.get_response(url)
         df = pd.DataFrame(response['data'])
 
 
@@ -0,0 +1,269 @@
+"""This module is meant to contain the AdaptiveLimit & ConcurrencyController classes"""
+
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+
+from messari.ratelimit import get_host
+
+# Requests a host may have in flight before its limit has adapted,
+# DataLoader's default number of workers so default fan outs are unchanged
+DEFAULT_INITIAL_LIMIT = 8
+
+# Bounds of the in-flight limit of a host
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 64
+
+# The limit grows by this much every `limit` healthy responses, roughly once per round trip
+DEFAULT_INCREASE = 1.0
+
+# The limit is multiplied by this on a 429, a 5xx, a connection error or a latency spike
+DEFAULT_DECREASE_FACTOR = 0.5
+
+# A response slower than this many times the host's usual latency is a spike
+DEFAULT_LATENCY_TOLERANCE = 3.0
+
+# Weight of a new sample in the host's usual latency
+LATENCY_SMOOTHING = 0.1
+
+# Seconds between deadline checks of a caller waiting for a slot
+POLL_INTERVAL = 0.1
+
+# (time the slot was taken, requests in flight once it was)
+Slot = Tuple[float, int]
+
+
+def is_overloaded(status_code: Optional[int]) -> bool:
+    """Returns whether a response says the host is over capacity
+
+    :param status_code: int
+        HTTP status, None for connection errors & timeouts
+    :return: bool
+    """
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+class AdaptiveLimit:
+    """This class is an AIMD limit on the requests in flight to one host.
+
+    Every healthy response additively raises the limit, by `increase` per
+    `limit` responses, as long as the limit is actually being used. 429s, 5xx,
+    connection errors & latency spikes multiply it by decrease_factor, once per
+    round trip: failures of requests sent before the last decrease are ignored.
+    Threads & coroutines wait for a slot once the limit is reached.
+    """
+    def __init__(self, initial: int = DEFAULT_INITIAL_LIMIT, min_limit: int = DEFAULT_MIN_LIMIT,
+                 max_limit: int = DEFAULT_MAX_LIMIT, increase: float = DEFAULT_INCREASE,
+                 decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+                 latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+                 clock: Callable[[], float] = time.monotonic):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError('limits must satisfy 1 <= min_limit <= max_limit')
+        if not 0 < decrease_factor < 1:
+            raise ValueError('decrease_factor must be between 0 & 1')
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.clock = clock
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.last_decrease = float('-inf')
+        self.condition = threading.Condition()
+        self.async_waiters: deque = deque()
+
+    def get_limit(self) -> int:
+        """Returns the number of requests currently allowed in flight"""
+        return max(self.min_limit, int(self.limit))
+
+    def try_acquire(self) -> Optional[Slot]:
+        """Takes a slot if one is free, call with the condition held"""
+        if self.in_flight >= self.get_limit():
+            return None
+        self.in_flight += 1
+        return self.clock(), self.in_flight
+
+    def acquire(self, deadline=None) -> Slot:
+        """Blocks until a request can be sent
+
+        :param deadline: messari.deadline.Deadline
+            Budget of the call, raises once it runs out while waiting
+        :return: Slot to hand back to release
+        """
+        with self.condition:
+            while True:
+                slot = self.try_acquire()
+                if slot is not None:
+                    return slot
+                if deadline is not None:
+                    deadline.check()
+                self.condition.wait(POLL_INTERVAL if deadline is not None else None)
+
+    async def acquire_async(self, deadline=None) -> Slot:
+        """Waits on the event loop until a request can be sent, see acquire"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.condition:
+                slot = self.try_acquire()
+                if slot is not None:
+                    return slot
+                waiter = loop.create_future()
+                self.async_waiters.append((loop, waiter))
+            if deadline is not None:
+                deadline.check()
+            try:
+                await asyncio.wait_for(waiter, POLL_INTERVAL if deadline is not None else None)
+            except asyncio.TimeoutError:
+                with self.condition:
+                    if (loop, waiter) in self.async_waiters:
+                        self.async_waiters.remove((loop, waiter))
+
+    def release(self, slot: Slot, status_code: Optional[int], latency: float) -> None:
+        """Frees a slot & adapts the limit to the outcome of its request
+
+        :param slot: Slot
+            Slot returned by acquire
+        :param status_code: int
+            HTTP status, None for connection errors & timeouts
+        :param latency: float
+            Seconds the request took
+        """
+        started, in_flight = slot
+        with self.condition:
+            self.in_flight -= 1
+            overloaded = is_overloaded(status_code)
+            spike = (self.latency is not None and
+                     latency > self.latency * self.latency_tolerance)
+            if not overloaded and status_code < 400:
+                # Spikes count towards the usual latency too, so a lasting slowdown
+                # becomes the new normal instead of cutting the limit for good
+                self.latency = latency if self.latency is None else \
+                    self.latency + LATENCY_SMOOTHING * (latency - self.latency)
+            if overloaded or spike:
+                if started >= self.last_decrease:
+                    self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+                    self.last_decrease = self.clock()
+            elif status_code < 400:
+                # Only grow a limit that is being used, idle hosts keep theirs
+                if in_flight * 2 >= self.get_limit():
+                    self.limit = min(float(self.max_limit),
+                                     self.limit + self.increase / self.limit)
+            self.wake()
+
+    def cancel(self, slot: Slot) -> None:  # pylint: disable=unused-argument
+        """Frees a slot without adapting the limit, for attempts that failed on our side
+
+        :param slot: Slot
+            Slot returned by acquire
+        """
+        with self.condition:
+            self.in_flight -= 1
+            self.wake()
+
+    def wake(self) -> None:
+        """Wakes up as many waiting threads & coroutines as there are free slots,
+        call with the condition held"""
+        free = self.get_limit() - self.in_flight
+        if free <= 0:
+            return
+        self.condition.notify(free)
+        while free > 0 and self.async_waiters:
+            loop, waiter = self.async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(set_done, waiter)
+            except RuntimeError:
+                # The waiter's event loop is closed
+                continue
+            free -= 1
+
+
+def set_done(waiter: asyncio.Future) -> None:
+    """Resolves a waiter unless it already timed out"""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ConcurrencyController:
+    """This class is a registry of AdaptiveLimits keyed by host.
+
+    Loaders take a slot from the host's limit around every HTTP attempt, so the
+    requests in flight to each provider track what it can take: fan outs speed
+    up against hosts answering fast & back off from hosts returning 429s or
+    slowing down. The limit of every host is reported to the loader's metrics.
+    Worker threads still cap a sync loader's fan out, raise max_workers to let
+    limits grow past it.
+    Loaders only use a controller when built with adaptive=True (DEFAULT_CONCURRENCY)
+    or given one with set_concurrency, their fan outs are otherwise bounded by their
+    max_workers or max_concurrency alone.
+    """
+    def __init__(self, initial: int = DEFAULT_INITIAL_LIMIT, min_limit: int = DEFAULT_MIN_LIMIT,
+                 max_limit: int = DEFAULT_MAX_LIMIT, **kwargs):
+        """
+        :param initial: int
+            Starting limit of every host
+        :param min_limit: int
+            Lowest limit of every host
+        :param max_limit: int
+            Highest limit of every host
+        :param kwargs:
+            increase, decrease_factor, latency_tolerance or clock of every AdaptiveLimit
+        """
+        self.settings = dict(kwargs, initial=initial, min_limit=min_limit, max_limit=max_limit)
+        self.host_settings: Dict[str, Dict] = {}
+        self.limits: Dict[str, AdaptiveLimit] = {}
+        self.lock = threading.Lock()
+
+    def configure(self, url: str, **kwargs) -> None:
+        """Overrides the settings of one host, resetting its limit
+
+        :param url: str
+            URL or host (i.e. https://api.solscan.io)
+        :param kwargs:
+            initial, min_limit, max_limit, increase, decrease_factor or latency_tolerance
+        """
+        host = get_host(url)
+        with self.lock:
+            self.host_settings[host] = dict(self.host_settings.get(host, {}), **kwargs)
+            self.limits.pop(host, None)
+
+    def get_limit(self, url: str) -> AdaptiveLimit:
+        """Returns the limit of url's host, creating it on first use
+
+        :param url: str
+            URL or host
+        :return: AdaptiveLimit
+        """
+        host = get_host(url)
+        limit = self.limits.get(host)
+        if limit is None:
+            with self.lock:
+                limit = self.limits.get(host)
+                if limit is None:
+                    settings = dict(self.settings, **self.host_settings.get(host, {}))
+                    limit = self.limits[host] = AdaptiveLimit(**settings)
+        return limit
+
+    def get_limits(self) -> Dict[str, Dict[str, int]]:
+        """Returns the current limit & requests in flight of every host
+
+        :return: Dict of {host: {'limit': int, 'in_flight': int}}
+        """
+        with self.lock:
+            limits = dict(self.limits)
+        return {host: {'limit': limit.get_limit(), 'in_flight': limit.in_flight}
+                for host, limit in limits.items()}
+
+    def reset(self) -> None:
+        """Drops every adapted limit, hosts start over from their initial limit"""
+        with self.lock:
+            self.limits.clear()
+
+
+# Process wide controller shared by every DataLoader & AsyncDataLoader built with adaptive=True,
+# so every such loader & fan out thread hitting a host adapts the same limit
+DEFAULT_CONCURRENCY = ConcurrencyController()
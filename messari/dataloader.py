@@ -1,39 +1,151 @@
 """This module is meant to contain the DataLoader class"""
 
 
-from typing import List, Union, Dict
+import time
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Iterator, List, Optional, Union, Dict
 import requests
-from messari.utils import validate_input
+from messari.ratelimit import RateLimiter
+from messari.retry import RetryPolicy
+from messari.cache import ResponseCache
+from messari.metrics import MetricsExporter
+from messari.pagination import Paginator
+from messari.singleflight import SingleFlight, DEFAULT_SINGLE_FLIGHT
+from messari.profiling import phase, is_profiling
+from messari.replay import CassetteAdapter, get_env_cassette
+from messari.transport import TransportRegistry, Timeout
+from messari.loaderbase import LoaderBase, Attempts, HeldSlot
+from messari.deadline import Deadline, DeadlineExceededError, RequestCancelledError, get_deadline
 
+# Default number of worker threads used by DataLoader.fan_out
+DEFAULT_MAX_WORKERS = 8
 
-class DataLoader:
+
+class DataLoader(LoaderBase):
     """This class is meant to represent a base wrapper around
     a variety of different API's used as data sources
     """
-    def __init__(self, api_dict: Dict, taxonomy_dict: Dict):
-        self.api_dict = api_dict
-        self.taxonomy_dict = taxonomy_dict
-        self.session = requests.Session()
+    def __init__(self, api_dict: Dict, taxonomy_dict: Dict,
+                 max_workers: int = DEFAULT_MAX_WORKERS, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None, fail_fast: bool = False,
+                 cache: ResponseCache = None, coalesce: bool = True,
+                 metrics: MetricsExporter = None, profile: bool = False,
+                 transport: TransportRegistry = None, adaptive: bool = False):
+        LoaderBase.__init__(self, api_dict, taxonomy_dict, rate_limiter=rate_limiter,
+                            retry_policy=retry_policy, fail_fast=fail_fast, cache=cache,
+                            coalesce=coalesce, metrics=metrics, profile=profile,
+                            transport=transport, adaptive=adaptive)
+        self.max_workers = max_workers
+        self.transport.reserve(max_workers)
+        self.adapter = self.transport.new_adapter()
+        self.session = self.transport.configure_session(requests.Session(), self.adapter)
+        cassette = get_env_cassette()
+        if cassette is not None:
+            self.set_transport(CassetteAdapter(cassette, self.adapter))
 
     def __del__(self):
         self.session.close()
+        # The adapter isn't mounted anymore when set_transport replaced it
+        self.adapter.close()
+
+
+    def set_transport(self, adapter: Optional[requests.adapters.BaseAdapter]) -> None:
+        """Sets the requests transport adapter every request is sent through,
+        i.e. messari.replay.CassetteAdapter or messari.fixtureserver.FixtureServer.get_adapter()
 
+        :param adapter: requests.adapters.BaseAdapter
+            Transport adapter, None restores the loader's messari.transport.PooledAdapter
+        """
+        if adapter is None:
+            adapter = self.adapter
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
-    def set_api_dict(self, api_dict: Dict) -> None:
-        """Sets a new dictionary to be used as an API key pair
+    def get_timeout(self, deadline: Deadline = None) -> Timeout:
+        """Returns the timeout of the next request, capped to the time left of deadline
 
-        :param api_dict: Dict
-            New API dictionary
+        :param deadline: Deadline
+            Budget of the running call
+        :return: Seconds or (connect, read) seconds
         """
-        self.api_dict = api_dict
+        timeout = self.timeout if self.timeout is not None else self.transport.timeout
+        if deadline is not None:
+            timeout = deadline.cap(timeout)
+        return timeout
 
-    def set_taxonomy_dict(self, taxonomy_dict: Dict) -> None:
-        """Sets a new dictionary to be used for taxonomy translations
+    def set_max_workers(self, max_workers: int) -> None:
+        """Sets the number of worker threads used to fan out per-item requests
 
-        :param taxonomy_dict: Dict
-            New taxonomy dictionary
+        :param max_workers: int
+            Maximum number of concurrent requests, 1 disables concurrency
         """
-        self.taxonomy_dict = taxonomy_dict
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+        self.transport.reserve(max_workers)
+        self.max_workers = max_workers
+
+    def new_single_flight(self) -> SingleFlight:
+        """Returns the process wide SingleFlight, so every loader shares in-flight requests"""
+        return DEFAULT_SINGLE_FLIGHT
+
+    def fan_out(self, func: Callable, items: List[Hashable], failed: Dict = None) -> Dict:
+        """Runs func once for every item on a bounded pool of worker threads.
+
+        Duplicate items are only requested once. Results are keyed by item and
+        kept in the same order as the input list, so they can be passed straight
+        to pd.concat or pd.Series.
+
+        Unless fail_fast is set, an item that raises is logged, left out of the
+        results & recorded so the rest of the batch survives. Failures go to the
+        failed dict of the call when one is passed, calls running concurrently or
+        nested in func should pass their own, and self.failed_items is set to the
+        failures of the call once it is done. If every item fails the first error
+        is raised. When the deadline of the call runs out or is cancelled (see
+        messari.deadline) queued items are dropped & the whole call raises.
+
+        :param func: Callable
+            Function taking a single item, usually wrapping self.get_response
+        :param items: list
+            List of items (slugs, addresses, ids) to run func on
+        :param failed: dict
+            Collects the {item: exception} failures of this call
+        :return: Dict of {item: func(item)} in input order
+        """
+        unique_items = list(dict.fromkeys(items))
+        deadline = get_deadline()
+
+        def run_item(item: Hashable):
+            if deadline is not None:
+                deadline.check()
+            if self.fail_fast:
+                return func(item), None
+            try:
+                return func(item), None
+            except (DeadlineExceededError, RequestCancelledError):
+                # The whole call is abandoned, not just this item
+                raise
+            except Exception as e:  # pylint: disable=broad-except
+                return None, e
+
+        if self.max_workers <= 1 or len(unique_items) <= 1:
+            results = [run_item(item) for item in unique_items]
+        else:
+            workers = min(self.max_workers, len(unique_items))
+            # Each worker runs in a copy of this context so its phases & deadline
+            # land in the calling context
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(copy_context().run, run_item, item)
+                           for item in unique_items]
+                try:
+                    results = [future.result() for future in futures]
+                except BaseException:
+                    # Drop queued items so their workers & connections are released
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        return self.collect_results(unique_items, results, failed)
 
     def get_response(self, endpoint_url: str, params: Dict = None, headers: Dict = None) -> Dict:
         """Gets response from endpoint and checks for HTTP errors when requesting data.
@@ -46,39 +158,173 @@ class DataLoader:
             Dictionary of headers
         :return: JSON with requested data
         :raises SystemError if HTTP error occurs
+        :raises QueryFailedError if the response is not 200 once retries are spent
         """
-        # Make request
+        ttl = self.get_cache_ttl(endpoint_url, params)
+        if ttl != 0:
+            cached = self.cache.get(endpoint_url, params, headers)
+            if cached is not None:
+                return self.decode_cached(endpoint_url, params, cached)
+
+        if self.single_flight is None:
+            return self.send_request(endpoint_url, params, headers, ttl)
+        return self.single_flight.do(
+            self.get_flight_key(endpoint_url, params, headers),
+            lambda: self.send_request(endpoint_url, params, headers, ttl),
+            deadline=get_deadline())
+
+    def acquire_slot(self, endpoint_url: str, deadline: Deadline = None) -> HeldSlot:
+        """Waits for the host's adaptive concurrency limit to allow another request
+
+        :param endpoint_url: str
+            URL about to be requested
+        :param deadline: Deadline
+            Budget of the running call
+        :return: (limit, slot) to hand back to release_slot, None without a controller
+        """
+        limit = self.get_adaptive_limit(endpoint_url)
+        if limit is None:
+            return None
+        return limit, limit.acquire(deadline)
+
+    def send_request(self, endpoint_url: str, params: Dict, headers: Dict,
+                     ttl: Optional[float]) -> Dict:
+        """Sends a request, retrying it per the retry policy & caching the response
+
+        :param endpoint_url: str
+            URL API string.
+        :param params: dict
+            Dictionary of query parameters.
+        :param headers: str:
+            Dictionary of headers
+        :param ttl: float
+            Seconds to cache the response for, 0 to skip the cache
+        :return: JSON with requested data
+        :raises SystemError if HTTP error occurs
+        :raises QueryFailedError if the response is not 200 once retries are spent
+        :raises DeadlineExceededError, RequestCancelledError when the call's deadline
+            runs out or is cancelled
+        """
+        attempts = Attempts(self, endpoint_url, params)
+        deadline = get_deadline()
+        sleep = deadline.sleep if deadline is not None else time.sleep
+        while True:
+            if deadline is not None:
+                deadline.check()
+            # Wait for a token from the host's rate limit, or from a key's when keys are pooled
+            key = None
+            send_params, send_headers = params, headers
+            with phase('throttle'):
+                if self.key_pool is not None:
+                    key = self.key_pool.acquire(deadline)
+                    send_params, send_headers = self.key_pool.apply(key, params, headers)
+                if self.uses_host_limit(key):
+                    self.rate_limiter.wait(endpoint_url, deadline, self.rate_limit_scope)
+                else:
+                    self.rate_limiter.record(endpoint_url)
+
+                held = self.acquire_slot(endpoint_url, deadline)
+
+            # Make request, when profiling stream it so the body read is timed on its own
+            start = time.perf_counter()
+            try:
+                with phase('http'):
+                    response = self.session.get(endpoint_url, params=send_params,
+                                                headers=send_headers, stream=is_profiling(),
+                                                timeout=self.get_timeout(deadline))
+                with phase('read'):
+                    size = len(response.content)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                attempts.record(held, None, time.perf_counter() - start, 0)
+                delay = attempts.error_delay(e, deadline)
+                with phase('backoff'):
+                    sleep(delay)
+                continue
+            except requests.exceptions.HTTPError as e:
+                self.release_slot(attempts.host, held, None, time.perf_counter() - start)
+                raise SystemError(e) from e
+            except BaseException:
+                # Not the host's doing, free the slot without adapting the limit
+                if held is not None:
+                    held[0].cancel(held[1])
+                raise
+            attempts.record(held, response.status_code, time.perf_counter() - start, size)
+
+            # Look at response code
+            status_code = response.status_code
+            if status_code == 200:
+                with phase('decode'):
+                    data = response.json()
+                if attempts.is_answer(key, data):
+                    if self.should_cache(ttl, data):
+                        self.cache.set(endpoint_url, params, headers, response.text, ttl)
+                    return data
+                # Quota error reported in the body, retry with another key
+                status_code = 429
+            delay = attempts.status_delay(key, status_code, response.headers.get('Retry-After'))
+            with phase('backoff'):
+                sleep(delay)
+
+    def iter_pages(self, endpoint_url: str, paginator: Paginator, params: Dict = None,
+                   headers: Dict = None, max_pages: int = None,
+                   prefetch: bool = False) -> Iterator[Union[Dict, List]]:
+        """Lazily requests the pages of a paginated endpoint, one at a time.
+
+        With prefetch the next page is requested on a background thread while
+        the current one is being processed by the caller.
+
+        :param endpoint_url: str
+            URL API string.
+        :param paginator: Paginator
+            Describes how the endpoint pages (i.e. PagePaginator, OffsetPaginator)
+        :param params: dict
+            Dictionary of query parameters shared by every page.
+        :param headers: dict
+            Dictionary of headers
+        :param max_pages: int
+            Stop after this many pages, default is every page
+        :param prefetch: bool
+            Request the next page while the current one is processed
+        :return: Iterator of JSON pages
+        """
+        page_params = paginator.first_params(params)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        pending = None
+        pages = 0
         try:
-            response = self.session.get(endpoint_url, params=params, headers=headers)
-        except requests.exceptions.HTTPError as e:
-            raise SystemError(e) from e
+            while self.has_next_page(page_params, pages, max_pages):
+                if pending is None:
+                    response = self.get_response(endpoint_url, params=page_params, headers=headers)
+                else:
+                    response = pending.result()
+                    pending = None
+                pages += 1
+                page_params = paginator.next_params(page_params, paginator.get_records(response))
+                if executor and self.has_next_page(page_params, pages, max_pages):
+                    pending = executor.submit(copy_context().run, self.get_response, endpoint_url,
+                                              params=page_params, headers=headers)
+                yield response
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
 
-        # Look at response code
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f'Query Failed - code: {response.status_code}')
+    def iter_records(self, endpoint_url: str, paginator: Paginator, params: Dict = None,
+                     headers: Dict = None, max_pages: int = None,
+                     prefetch: bool = False) -> Iterator:
+        """Lazily yields the records of a paginated endpoint, see iter_pages
 
-    def translate(self, input_slugs: Union[str, List]) -> Union[List, None]:
-        """Wrapper around messari.utils.validate_input,
-        validate input & check if it's supported by DeFi Llama
+        :return: Iterator of records
+        """
+        for response in self.iter_pages(endpoint_url, paginator, params=params, headers=headers,
+                                        max_pages=max_pages, prefetch=prefetch):
+            yield from paginator.get_records(response)
 
-        Parameters
-        ----------
-           input_slugs: str, list
-               Single input slug string or list of input slugs (i.e. bitcoin)
+    def fetch_all(self, endpoint_url: str, paginator: Paginator, params: Dict = None,
+                  headers: Dict = None, max_pages: int = None) -> List:
+        """Returns every record of a paginated endpoint, prefetching the next page
+        while the current one is being unpacked
 
-        Returns
-        -------
-           List
-               list of validated & translated slugs
+        :return: List of records
         """
-        slugs = validate_input(input_slugs)
-
-        translated_slugs = []
-        for slug in slugs:
-            if slug in self.taxonomy_dict.keys():
-                translated_slugs.append(self.taxonomy_dict[slug])
-            else:
-                translated_slugs.append(slug)
-        return translated_slugs
+        return list(self.iter_records(endpoint_url, paginator, params=params, headers=headers,
+                                      max_pages=max_pages, prefetch=True))
@@ -0,0 +1,140 @@
+"""This module is meant to contain the Deadline class & the deadline context manager"""
+
+
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from messari.transport import Timeout, split_timeout
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a call runs out of its time budget"""
+
+
+class RequestCancelledError(Exception):
+    """Raised when a call is abandoned with Deadline.cancel"""
+
+
+class Deadline:
+    """This class is the time budget & cancellation flag shared by every sub-request of a call.
+
+    Loaders check it before every attempt, cap each request's connect & read timeouts
+    to the time left & give up on backoffs that would outlast it. Cancelling it stops
+    queued fan out items & retries straight away, requests in flight end within their
+    capped timeouts & give their connection back to the pool.
+    A deadline nested in another never outlives it & is cancelled with it.
+    """
+    def __init__(self, timeout: Optional[float] = None, parent: 'Deadline' = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.expires = clock() + timeout if timeout is not None else None
+        if parent is not None and parent.expires is not None:
+            self.expires = parent.expires if self.expires is None else min(self.expires,
+                                                                           parent.expires)
+        self.event = threading.Event()
+        self.children = weakref.WeakSet()
+        if parent is not None:
+            parent.children.add(self)
+            if parent.cancelled:
+                self.event.set()
+
+    def cancel(self) -> None:
+        """Cancels the call & every deadline nested in it, safe to call from any thread"""
+        self.event.set()
+        for child in list(self.children):
+            child.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel was called"""
+        return self.event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Returns the seconds left, None if the budget is unlimited"""
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - self.clock())
+
+    def check(self) -> None:
+        """Raises if the call was cancelled or is out of time
+
+        :raises RequestCancelledError if cancel was called
+        :raises DeadlineExceededError if the budget is spent
+        """
+        if self.cancelled:
+            raise RequestCancelledError('Request cancelled')
+        if self.expires is not None and self.clock() >= self.expires:
+            raise DeadlineExceededError('Deadline exceeded')
+
+    def cap(self, timeout: Timeout) -> Timeout:
+        """Caps a requests timeout to the time left
+
+        :param timeout: float, tuple
+            Seconds or (connect, read) seconds, None waits forever
+        :return: (connect, read) seconds
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        remaining = max(remaining, 0.001)
+        return tuple(remaining if value is None else min(value, remaining)
+                     for value in split_timeout(timeout))
+
+    def sleep(self, delay: float) -> None:
+        """Sleeps delay seconds, waking up if the call is cancelled
+
+        :param delay: float
+            Seconds to sleep
+        :raises DeadlineExceededError if the call would run out of time while sleeping
+        :raises RequestCancelledError if the call is cancelled
+        """
+        self.check_delay(delay)
+        if self.event.wait(delay):
+            self.check()
+
+    async def sleep_async(self, delay: float) -> None:
+        """Sleeps on the event loop for delay seconds, see sleep"""
+        self.check_delay(delay)
+        await asyncio.sleep(delay)
+        self.check()
+
+    def check_delay(self, delay: float) -> None:
+        """Raises if the call is cancelled or would run out of time waiting delay seconds"""
+        self.check()
+        remaining = self.remaining()
+        if remaining is not None and delay > remaining:
+            raise DeadlineExceededError(f'Deadline exceeded, {remaining:.3f}s left '
+                                        f'to wait {delay:.3f}s')
+
+
+# Deadline of the running call, copied into fan out threads & asyncio tasks
+CURRENT_DEADLINE: ContextVar[Optional[Deadline]] = ContextVar('messari_deadline', default=None)
+
+
+def get_deadline() -> Optional[Deadline]:
+    """Returns the deadline of the running call, None outside of a deadline block"""
+    return CURRENT_DEADLINE.get()
+
+
+@contextmanager
+def deadline(timeout: Optional[float] = None) -> Iterator[Deadline]:
+    """Gives every request made in the block, fan out threads included, a shared time budget
+
+    e.g. with deadline(30) as budget: messari.get_asset_metrics(slugs)
+    budget.cancel() from another thread abandons the call.
+
+    :param timeout: float
+        Seconds the whole block may take, None for cancellation only
+    :return: Deadline
+    """
+    budget = Deadline(timeout, parent=CURRENT_DEADLINE.get())
+    token = CURRENT_DEADLINE.set(budget)
+    try:
+        yield budget
+    finally:
+        CURRENT_DEADLINE.reset(token)
@@ -1,14 +1,18 @@
 """This module is meant to contain the Deep DAO class"""
 
-import requests
-from string import Template
-from typing import Union, List
+from typing import Dict, Optional, Union, List
 import json
+import logging
+import os
+import threading
+import time
 import pandas as pd
 import numpy as np
 
 from messari.dataloader import DataLoader
+from messari.cache import CacheBackend, DiskCache
 from messari.utils import validate_input
+from messari.metrics import url_template
 from .helpers import unpack_dataframe_of_lists, unpack_dataframe_of_dicts
 
 ##########################
@@ -17,14 +21,24 @@ from .helpers import unpack_dataframe_of_lists, unpack_dataframe_of_dicts
 ## DAOs
 ORGANIZATIONS_URL = 'https://golden-gate-server.deepdao.io/dashboard/organizations'
 DASHBOARD_URL = 'https://golden-gate-server.deepdao.io/dashboard/ksdf3ksa-937slj3'
-DAO_URL = Template('https://golden-gate-server.deepdao.io/organization/ksdf3ksa-937slj3/$dao_id')
+DAO_URL = url_template(
+    'https://golden-gate-server.deepdao.io/organization/ksdf3ksa-937slj3/$dao_id')
 
 ## People
 #PEOPLE_URL = 'https://golden-gate-server.deepdao.io/people/top'
 PEOPLE_URL = 'https://golden-gate-server.deepdao.io/people/top'
-USER_URL = Template('https://golden-gate-server.deepdao.io/user/2/$user') #user is 0xpubkey
-USER_PROPOSALS_URL = Template('https://golden-gate-server.deepdao.io/user/2/$user/proposals')
-USER_VOTES_URL = Template('https://golden-gate-server.deepdao.io/user/2/$user/votes')
+USER_URL = url_template('https://golden-gate-server.deepdao.io/user/2/$user') #user is 0xpubkey
+USER_PROPOSALS_URL = url_template('https://golden-gate-server.deepdao.io/user/2/$user/proposals')
+USER_VOTES_URL = url_template('https://golden-gate-server.deepdao.io/user/2/$user/votes')
+
+# Seconds the DAO & member lookup tables are reused before being rebuilt
+TAXONOMY_TTL = 24 * 60 * 60
+
+# Directory the lookup tables are persisted in by default
+TAXONOMY_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'messari', 'deepdao')
+
+# Groups of lookup tables, each built from one API call
+TAXONOMY_KINDS = ('members', 'daos')
 
 HEADERS = {
     "accept": "application/json",
@@ -37,36 +51,120 @@ class DeepDAO(DataLoader):
     """This class is a wrapper around the DeepDAO API
     """
 
-    def __init__(self):
-        # Need to init DataLoader first to have get_respone work in rest of __init__
+    def __init__(self, taxonomy_cache: CacheBackend = None,
+                 taxonomy_ttl: Optional[float] = TAXONOMY_TTL):
+        """
+        Parameters
+        ----------
+            taxonomy_cache: CacheBackend
+                Where the DAO & member lookup tables are persisted between processes,
+                default a DiskCache in TAXONOMY_CACHE_DIR
+            taxonomy_ttl: float
+                Seconds the persisted lookup tables are reused, None to keep them forever
+        """
         DataLoader.__init__(self, api_dict=None, taxonomy_dict=None)
+        self.taxonomy_cache = taxonomy_cache
+        self.taxonomy_ttl = taxonomy_ttl
+        self.taxonomy_lock = threading.Lock()
+        # Lookup tables, built on first use by load_taxonomy
+        self.taxonomies: Dict[str, Dict[str, Dict]] = {}
 
-        people = self.get_top_members(count=100000)
-        people_dict={}
-        address_dict={}
-        # TODO, do this without unused variable 'index'
-        for index, person in people.iterrows(): # pylint: disable=unused-variable
-            people_dict[person['address']] = person['name']
-            address_dict[person['name']] = person['address']
+    ####### Class helpers
+    def get_taxonomy_cache(self) -> Optional[CacheBackend]:
+        """Returns the backend the lookup tables are persisted in, None if it can't be created"""
+        if self.taxonomy_cache is None:
+            try:
+                self.taxonomy_cache = DiskCache(TAXONOMY_CACHE_DIR)
+            except OSError as e:
+                logging.warning('Not persisting DeepDAO lookup tables: %s', e)
+        return self.taxonomy_cache
+
+    def build_taxonomy(self, kind: str) -> Dict[str, Dict]:
+        """Fetches & builds the lookup tables of kind
 
-        # get person
-        self.people_tax = people_dict
-        # get address
-        self.address_tax = address_dict
+        Parameters
+        ----------
+            kind: str
+                members for the people & address tables, daos for the name & id tables
 
+        Returns
+        -------
+           dict
+               Dictionary of {table name: table}
+        """
+        if kind == 'members':
+            people = self.get_top_members(count=100000)
+            names = people['name'].astype(object).where(people['name'].notna(), None)
+            named = people.dropna(subset=['name'])
+            return {'people': dict(zip(people['address'], names)),
+                    'address': dict(zip(named['name'], named['address']))}
         summary = self.get_summary()
-        name_dict={}
-        id_dict={}
-        for index, dao in summary.iterrows():
-            name_dict[dao['organizationId']] = dao['daoName']
-            id_dict[dao['daoName']] = dao['organizationId']
+        return {'name': dict(zip(summary['organizationId'], summary['daoName'])),
+                'id': dict(zip(summary['daoName'], summary['organizationId']))}
 
-        # get name
-        self.name_tax = name_dict
-        # get id
-        self.id_tax = id_dict
+    def load_taxonomy(self, kind: str, refresh: bool = False) -> Dict[str, Dict]:
+        """Returns the lookup tables of kind, read from the local cache while they are
+        fresh & built from the API otherwise
+
+        Parameters
+        ----------
+            kind: str
+                members or daos, see build_taxonomy
+            refresh: bool
+                Rebuild the tables from the API even if they are cached
+
+        Returns
+        -------
+           dict
+               Dictionary of {table name: table}
+        """
+        tables = self.taxonomies.get(kind)
+        if tables is not None and not refresh:
+            return tables
+        with self.taxonomy_lock:
+            tables = None if refresh else self.taxonomies.get(kind)
+            if tables is not None:
+                return tables
+            cache = self.get_taxonomy_cache()
+            key = f'deepdao-{kind}'
+            cached = cache.get(key) if cache is not None and not refresh else None
+            if cached is not None:
+                tables = json.loads(cached)
+            else:
+                tables = self.build_taxonomy(kind)
+                if cache is not None:
+                    expires = None
+                    if self.taxonomy_ttl is not None:
+                        expires = time.time() + self.taxonomy_ttl
+                    cache.set(key, json.dumps(tables), expires)
+            self.taxonomies[kind] = tables
+            return tables
+
+    def refresh_taxonomy(self) -> None:
+        """Rebuilds the DAO & member lookup tables from the API"""
+        for kind in TAXONOMY_KINDS:
+            self.load_taxonomy(kind, refresh=True)
+
+    @property
+    def people_tax(self) -> Dict:
+        """Dictionary of {member address: member name}"""
+        return self.load_taxonomy('members')['people']
+
+    @property
+    def address_tax(self) -> Dict:
+        """Dictionary of {member name: member address}"""
+        return self.load_taxonomy('members')['address']
+
+    @property
+    def name_tax(self) -> Dict:
+        """Dictionary of {organization id: DAO name}"""
+        return self.load_taxonomy('daos')['name']
+
+    @property
+    def id_tax(self) -> Dict:
+        """Dictionary of {DAO name: organization id}"""
+        return self.load_taxonomy('daos')['id']
 
-    ####### Class helpers
     def get_dao_list(self) -> List:
         """Returns list of DAOs tracked by Deep DAO
         Returns
@@ -95,7 +193,7 @@ class DeepDAO(DataLoader):
            DataFrame
                pandas DataFrame of Deep DAO organizations info
         """
-        organizations = requests.get(ORGANIZATIONS_URL, headers=HEADERS).json()
+        organizations = self.get_response(ORGANIZATIONS_URL, headers=HEADERS)
         organizations_df = pd.DataFrame(organizations)
         return organizations_df
 
@@ -106,7 +204,7 @@ class DeepDAO(DataLoader):
            DataFrame
                pandas DataFrame of Deep DAO organizations summaries
         """
-        response = requests.get(DASHBOARD_URL, headers=HEADERS).json()
+        response = self.get_response(DASHBOARD_URL, headers=HEADERS)
         summary = response['daosSummary']
         summary_df = pd.DataFrame(summary)
         summary_df.drop('daosArr', axis=1, inplace=True, errors='ignore')
@@ -119,7 +217,7 @@ class DeepDAO(DataLoader):
            DataFrame
                pandas DataFrame of DAO ecosystem overview
         """
-        response = requests.get(DASHBOARD_URL, headers=HEADERS).json()
+        response = self.get_response(DASHBOARD_URL, headers=HEADERS)
         overview = response['daoEcosystemOverview']
         dict_list = []
         count=0
@@ -155,7 +253,7 @@ class DeepDAO(DataLoader):
            DataFrame
                pandas DataFrame of Deep DAO organizations rankings
         """
-        response = requests.get(DASHBOARD_URL, headers=HEADERS).json()
+        response = self.get_response(DASHBOARD_URL, headers=HEADERS)
         rankings = response['daoEcosystemOverview']['daoRankings']
         rankings_df = pd.DataFrame(rankings)
         rankings_df.drop('date', axis=1, inplace=True)
@@ -168,7 +266,7 @@ class DeepDAO(DataLoader):
            DataFrame
                pandas DataFrame with token utilization
         """
-        response = requests.get(DASHBOARD_URL, headers=HEADERS).json()
+        response = self.get_response(DASHBOARD_URL, headers=HEADERS)
         tokens = response['daoTokens']
         tokens_df = pd.DataFrame(tokens)
         return tokens_df
@@ -190,8 +288,7 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
+        def get_dao_series(slug: str) -> pd.Series:
             # TODO swap w/ validate
             if slug in self.id_tax:
                 dao_id = self.id_tax[slug]
@@ -200,9 +297,10 @@ class DeepDAO(DataLoader):
             endpoint_url = DAO_URL.substitute(dao_id=dao_id)
             dao_info = self.get_response(endpoint_url, headers=HEADERS)['data']
             dao_info_series = pd.Series(dao_info)
-            dao_info_list.append(dao_info_series)
+            return dao_info_series
 
-        dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
+        dao_info_dict = self.fan_out(get_dao_series, slugs)
+        dao_info_df = pd.concat(dao_info_dict, axis=1)
         dao_info_df.drop(['rankings', 'indices', 'proposals', 'members', 'votersCoalition', 'financial'], inplace=True, errors='ignore')
         return dao_info_df
 
@@ -219,8 +317,8 @@ class DeepDAO(DataLoader):
                pandas DataFrame with DAO activity
         """
         slugs = validate_input(dao_slugs)
-        dao_info_list = []
-        for slug in slugs:
+
+        def get_dao_df(slug: str) -> pd.DataFrame:
             # TODO swap w/ validate
             if slug in self.id_tax:
                 dao_id = self.id_tax[slug]
@@ -231,8 +329,10 @@ class DeepDAO(DataLoader):
             dao_df = pd.DataFrame(dao_info)
             dao_df.set_index('createdAt', inplace=True)
             dao_df.index = pd.to_datetime(dao_df.index)
-            dao_info_list.append(dao_df)
-        dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
+            return dao_df
+
+        dao_info_dict = self.fan_out(get_dao_df, slugs)
+        dao_info_df = pd.concat(dao_info_dict, axis=1)
         return dao_info_df
 
 
@@ -252,8 +352,7 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
+        def get_dao_series(slug: str) -> pd.Series:
             # TODO swap w/ validate
             if slug in self.id_tax:
                 dao_id = self.id_tax[slug]
@@ -262,9 +361,10 @@ class DeepDAO(DataLoader):
             endpoint_url = DAO_URL.substitute(dao_id=dao_id) + '/governance/decisions'
             dao_info = self.get_response(endpoint_url, headers=HEADERS)
             dao_info_series = pd.Series(dao_info)
-            dao_info_list.append(dao_info_series)
+            return dao_info_series
 
-        dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
+        dao_info_dict = self.fan_out(get_dao_series, slugs)
+        dao_info_df = pd.concat(dao_info_dict, axis=1)
         proposals = dao_info_df.loc['decisions']
 
         proposals_list = []
@@ -272,7 +372,7 @@ class DeepDAO(DataLoader):
             data = json.loads(proposal)
             data_series = pd.Series(data)
             proposals_list.append(data_series)
-        proposals_df = pd.concat(proposals_list, keys=slugs, axis=1)
+        proposals_df = pd.concat(proposals_list, keys=list(dao_info_dict.keys()), axis=1)
 
         proposals_df = unpack_dataframe_of_dicts(proposals_df)
 
@@ -295,8 +395,7 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
+        def get_dao_df(slug: str) -> pd.DataFrame:
             # TODO swap w/ validate
             if slug in self.id_tax:
                 dao_id = self.id_tax[slug]
@@ -305,9 +404,10 @@ class DeepDAO(DataLoader):
             endpoint_url = DAO_URL.substitute(dao_id=dao_id) + '/top-shareholders'
             dao_info = self.get_response(endpoint_url, headers=HEADERS)['shareholders']
             dao_info_df = pd.DataFrame(dao_info)
-            dao_info_list.append(dao_info_df)
+            return dao_info_df
 
-        dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
+        dao_info_dict = self.fan_out(get_dao_df, slugs)
+        dao_info_df = pd.concat(dao_info_dict, axis=1)
         return dao_info_df
 
     def get_dao_voter_coalitions(self, dao_slugs: Union[str, List]) -> pd.DataFrame:
@@ -326,8 +426,7 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
+        def get_dao_series(slug: str) -> pd.Series:
             # TODO swap w/ validate
             if slug in self.id_tax:
                 dao_id = self.id_tax[slug]
@@ -336,9 +435,10 @@ class DeepDAO(DataLoader):
             endpoint_url = DAO_URL.substitute(dao_id=dao_id)
             dao_info = self.get_response(endpoint_url, headers=HEADERS)
             dao_info_series = pd.Series(dao_info)
-            dao_info_list.append(dao_info_series)
+            return dao_info_series
 
-        dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
+        dao_info_dict = self.fan_out(get_dao_series, slugs)
+        dao_info_df = pd.concat(dao_info_dict, axis=1)
         coalitions = dao_info_df.loc['votersCoalition']
 
         coalitions_list = []
@@ -347,7 +447,7 @@ class DeepDAO(DataLoader):
             data_series = pd.Series(data)
             coalitions_list.append(data_series)
 
-        coalitions_df = pd.concat(coalitions_list, keys=slugs, axis=1)
+        coalitions_df = pd.concat(coalitions_list, keys=list(dao_info_dict.keys()), axis=1)
 
 
         coalitions_df = unpack_dataframe_of_lists(coalitions_df)
@@ -374,8 +474,7 @@ class DeepDAO(DataLoader):
 
         slugs = validate_input(dao_slugs)
 
-        dao_info_list = []
-        for slug in slugs:
+        def get_dao_series(slug: str) -> pd.Series:
             # TODO swap w/ validate
             if slug in self.id_tax:
                 dao_id = self.id_tax[slug]
@@ -384,16 +483,17 @@ class DeepDAO(DataLoader):
             endpoint_url = DAO_URL.substitute(dao_id=dao_id) + '/currencies'
             dao_info = self.get_response(endpoint_url, headers=HEADERS)['currencies']
             dao_info_series = pd.Series(dao_info)
-            dao_info_list.append(dao_info_series)
+            return dao_info_series
 
-        dao_info_df = pd.concat(dao_info_list, keys=slugs, axis=1)
+        dao_info_dict = self.fan_out(get_dao_series, slugs)
+        dao_info_df = pd.concat(dao_info_dict, axis=1)
 
         # TODO, should handle this in top loop
         df_list = []
-        for slug in slugs:
+        for slug in dao_info_dict:
             sub_df = pd.DataFrame(dao_info_df[slug].dropna().tolist())
             df_list.append(sub_df)
-        fin_df = pd.concat(df_list, axis=1, keys=slugs)
+        fin_df = pd.concat(df_list, axis=1, keys=list(dao_info_dict.keys()))
         return fin_df
 
     ####### Members
@@ -432,17 +532,19 @@ class DeepDAO(DataLoader):
                pandas DataFrame with member information
         """
         users = validate_input(pubkeys)
-        user_info_list = []
-        for user in users:
+
+        def get_user_series(user: str) -> pd.Series:
             if user in self.address_tax:
                 user_address = self.address_tax[user]
             else:
                 user_address = user
             endpoint_url = USER_URL.substitute(user=user_address)
-            user_info = requests.get(endpoint_url, headers=HEADERS).json()
+            user_info = self.get_response(endpoint_url, headers=HEADERS)
             user_info_series = pd.Series(user_info)
-            user_info_list.append(user_info_series)
-        users_info_df = pd.concat(user_info_list, keys=users, axis=1)
+            return user_info_series
+
+        user_info_dict = self.fan_out(get_user_series, users)
+        users_info_df = pd.concat(user_info_dict, axis=1)
         return users_info_df
 
     def get_member_votes(self, pubkeys: Union[str, List]) -> pd.DataFrame:
@@ -458,8 +560,8 @@ class DeepDAO(DataLoader):
                pandas DataFrame with member voting history
         """
         users = validate_input(pubkeys)
-        votes_info_list = []
-        for user in users:
+
+        def get_votes_series(user: str) -> pd.Series:
             if user in self.address_tax:
                 user_address = self.address_tax[user]
             else:
@@ -468,9 +570,10 @@ class DeepDAO(DataLoader):
             print(endpoint_url)
             votes_info = self.get_response(endpoint_url, headers=HEADERS)
             votes_info_series = pd.Series(votes_info)
-            votes_info_list.append(votes_info_series)
+            return votes_info_series
 
-        votes_info_df = pd.concat(votes_info_list, keys=users, axis=1)
+        votes_info_dict = self.fan_out(get_votes_series, users)
+        votes_info_df = pd.concat(votes_info_dict, axis=1)
 
         old_index = votes_info_df.index
         new_index = []
@@ -1,4 +1,8 @@
 """Module to handle initialization, imports, for DeFiLlama class"""
 
+from messari.lazy import lazy_exports
 
-from .defillama import *
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'DeFiLlama': '.defillama',
+    'AsyncDeFiLlama': '.asyncdefillama',
+})
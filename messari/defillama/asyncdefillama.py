@@ -0,0 +1,204 @@
+"""This module is meant to contain the AsyncDeFiLlama class"""
+
+# Global imports
+import datetime
+from typing import Union, List, Dict
+
+import pandas as pd
+
+from messari.asyncdataloader import AsyncDataLoader
+from messari.profiling import profiled, phase
+# Local imports
+from messari.utils import validate_input, time_filter_df
+from messari.taxonomy import get_taxonomy
+from .helpers import format_df, protocol_to_dataframe
+from .defillama import DL_PROTOCOLS_URL, DL_GLOBAL_TVL_URL, DL_CURRENT_PROTOCOL_TVL_URL, \
+    DL_CHAIN_TVL_URL, DL_GET_PROTOCOL_TVL_URL, DL_CHAINS_URL, PROTOCOLS_CACHE_TTL
+
+
+class AsyncDeFiLlama(AsyncDataLoader):
+    """This class is an asyncio wrapper around the DeFi Llama API,
+    every method is a coroutine returning the same data as its DeFiLlama counterpart
+    """
+
+    def __init__(self):
+        messari_to_dl = get_taxonomy("messari_to_dl.json")
+        AsyncDataLoader.__init__(self, api_dict=None, taxonomy_dict=messari_to_dl)
+        self.set_cache_ttl(DL_PROTOCOLS_URL, PROTOCOLS_CACHE_TTL)
+
+    @profiled
+    async def get_protocol_tvl_timeseries(self, asset_slugs: Union[str, List],
+                                          start_date: Union[str, datetime.datetime] = None,
+                                          end_date: Union[str, datetime.datetime] = None) \
+            -> pd.DataFrame:
+        """Returns times TVL of a protocol with token amounts as a pandas DataFrame.
+        Returned DataFrame is indexed by df[protocol][chain][asset].
+
+        Parameters
+        ----------
+           asset_slugs: str, list
+               Single asset slug string or list of asset slugs (i.e. bitcoin)
+
+           start_date: str, datetime.datetime
+               Optional start date to set filter for tvl timeseries ("YYYY-MM-DD")
+
+           end_date: str, datetime.datetime
+               Optional end date to set filter for tvl timeseries ("YYYY-MM-DD")
+
+        Returns
+        -------
+           DataFrame
+               pandas DataFrame of protocol TVL, indexed by df[protocol][chain][asset]
+        """
+        slugs = self.translate(asset_slugs)
+
+        async def get_protocol_df(slug: str) -> pd.DataFrame:
+            endpoint_url = DL_GET_PROTOCOL_TVL_URL.substitute(slug=slug)
+            protocol = await self.get_response(endpoint_url)
+            return protocol_to_dataframe(protocol)
+
+        slug_df_dict = await self.fan_out(get_protocol_df, slugs)
+        with phase('assemble'):
+            total_slugs_df = pd.concat(slug_df_dict, axis=1)
+            total_slugs_df.sort_index(inplace=True)
+
+        total_slugs_df = time_filter_df(total_slugs_df, start_date=start_date, end_date=end_date)
+        return total_slugs_df
+
+    @profiled
+    async def get_global_tvl_timeseries(self, start_date: Union[str, datetime.datetime] = None,
+                                        end_date: Union[str, datetime.datetime] = None) \
+            -> pd.DataFrame:
+        """Returns timeseries TVL from total of all Defi Llama supported protocols
+
+        Parameters
+        ----------
+           start_date: str, datetime.datetime
+               Optional start date to set filter for tvl timeseries ("YYYY-MM-DD")
+
+           end_date: str, datetime.datetime
+               Optional end date to set filter for tvl timeseries ("YYYY-MM-DD")
+
+        Returns
+        -------
+           DataFrame
+               DataFrame containing timeseries tvl data for every protocol
+        """
+        global_tvl = await self.get_response(DL_GLOBAL_TVL_URL)
+        global_tvl_df = pd.DataFrame(global_tvl)
+        global_tvl_df = format_df(global_tvl_df)
+        global_tvl_df = time_filter_df(global_tvl_df, start_date=start_date, end_date=end_date)
+        return global_tvl_df
+
+    @profiled
+    async def get_chain_tvl_timeseries(self, chains_in: Union[str, List],
+                                       start_date: Union[str, datetime.datetime] = None,
+                                       end_date: Union[str, datetime.datetime] = None) \
+            -> pd.DataFrame:
+        """Retrive timeseries TVL for a given chain
+
+        Parameters
+        ----------
+           chains_in: str, list
+               Single chain name string or list of chain names
+
+           start_date: str, datetime.datetime
+               Optional start date to set filter for tvl timeseries ("YYYY-MM-DD")
+
+           end_date: str, datetime.datetime
+               Optional end date to set filter for tvl timeseries ("YYYY-MM-DD")
+
+        Returns
+        -------
+           DataFrame
+               DataFrame containing timeseries tvl data for each chain
+        """
+        chains = validate_input(chains_in)
+
+        async def get_chain_df(chain: str) -> pd.DataFrame:
+            endpoint_url = DL_CHAIN_TVL_URL.substitute(chain=chain)
+            response = await self.get_response(endpoint_url)
+            chain_df = pd.DataFrame(response)
+            return format_df(chain_df)
+
+        chain_df_dict = await self.fan_out(get_chain_df, chains)
+
+        # Join DataFrames from each chain & return
+        with phase('assemble'):
+            chains_df = pd.concat(chain_df_dict.values(), axis=1)
+
+        # If chains_df is empty, return an empty DataFrame
+        if chains_df.empty:
+            return pd.DataFrame()
+
+        chains_df.columns = list(chain_df_dict.keys())
+        chains_df = time_filter_df(chains_df, start_date=start_date, end_date=end_date)
+        return chains_df
+
+    @profiled
+    async def get_current_tvl(self, asset_slugs: Union[str, List]) -> Dict:
+        """Retrive current protocol tvl for an asset
+
+        Parameters
+        ----------
+           asset_slugs: str, list
+               Single asset slug string or list of asset slugs (i.e. bitcoin)
+
+        Returns
+        -------
+           DataFrame
+               Pandas Series for tvl indexed by each slug {slug: tvl, ...}
+        """
+        slugs = validate_input(asset_slugs)
+
+        async def get_tvl(slug: str) -> Union[float, Dict]:
+            endpoint_url = DL_CURRENT_PROTOCOL_TVL_URL.substitute(slug=slug)
+            return await self.get_response(endpoint_url)
+
+        tvl_dict = {}
+        for slug, tvl in (await self.fan_out(get_tvl, slugs)).items():
+            if isinstance(tvl, float):
+                tvl_dict[slug] = tvl
+            else:
+                print(f"ERROR: slug={slug}, MESSAGE: {tvl['message']}")
+
+        tvl_series = pd.Series(tvl_dict)
+        tvl_df = tvl_series.to_frame("tvl")
+        return tvl_df
+
+    @profiled
+    async def get_protocols(self) -> pd.DataFrame:
+        """Returns basic information on all listed protocols, their current TVL
+        and the changes to it in the last hour/day/week
+
+        Returns
+        -------
+        DataFrame
+           DataFrame with one column per DeFi Llama supported protocol
+        """
+        protocols = await self.get_response(DL_PROTOCOLS_URL)
+
+        protocol_dict = {}
+        for protocol in protocols:
+            protocol_dict[protocol["slug"]] = protocol
+
+        protocols_df = pd.DataFrame(protocol_dict)
+        return protocols_df
+
+    @profiled
+    async def get_chains(self) -> List[str]:
+        """Get the names of all chains supported by Defi Llama
+
+        Returns
+        -------
+        List
+            List of chain name strings
+        """
+        chains = await self.get_response(DL_CHAINS_URL)
+
+        chain_names = [chain['name'] for chain in chains]
+
+        # Sort chain name results to ensure consistent order
+        chain_names = sorted(chain_names)
+
+        return chain_names
@@ -2,35 +2,42 @@
 
 # Global imports
 import datetime
-from string import Template
 from typing import Union, List, Dict
 
 import pandas as pd
 
 from messari.dataloader import DataLoader
+from messari.profiling import profiled, phase
 # Local imports
-from messari.utils import validate_input, get_taxonomy_dict, time_filter_df
-from .helpers import format_df
+from messari.utils import validate_input, time_filter_df
+from messari.taxonomy import get_taxonomy
+from messari.metrics import url_template
+from .helpers import format_df, protocol_to_dataframe
 
 ##########################
 # URL Endpoints
 ##########################
 DL_PROTOCOLS_URL = "https://api.llama.fi/protocols"
 DL_GLOBAL_TVL_URL = "https://api.llama.fi/charts/"
-DL_CURRENT_PROTOCOL_TVL_URL = Template("https://api.llama.fi/tvl/$slug")
-DL_CHAIN_TVL_URL = Template("https://api.llama.fi/charts/$chain")
-DL_GET_PROTOCOL_TVL_URL = Template("https://api.llama.fi/protocol/$slug")
+DL_CURRENT_PROTOCOL_TVL_URL = url_template("https://api.llama.fi/tvl/$slug")
+DL_CHAIN_TVL_URL = url_template("https://api.llama.fi/charts/$chain")
+DL_GET_PROTOCOL_TVL_URL = url_template("https://api.llama.fi/protocol/$slug")
 DL_CHAINS_URL = "https://api.llama.fi/chains/"
 
+# The protocol list only changes when a protocol is listed, cache it for an hour
+PROTOCOLS_CACHE_TTL = 3600
+
 
 class DeFiLlama(DataLoader):
     """This class is a wrapper around the DeFi Llama API
     """
 
     def __init__(self):
-        messari_to_dl_dict = get_taxonomy_dict("messari_to_dl.json")
-        DataLoader.__init__(self, api_dict=None, taxonomy_dict=messari_to_dl_dict)
+        messari_to_dl = get_taxonomy("messari_to_dl.json")
+        DataLoader.__init__(self, api_dict=None, taxonomy_dict=messari_to_dl)
+        self.set_cache_ttl(DL_PROTOCOLS_URL, PROTOCOLS_CACHE_TTL)
 
+    @profiled
     def get_protocol_tvl_timeseries(self, asset_slugs: Union[str, List],
                                     start_date: Union[str, datetime.datetime] = None,
                                     end_date: Union[str, datetime.datetime] = None) -> pd.DataFrame:
@@ -58,102 +65,20 @@ class DeFiLlama(DataLoader):
         """
         slugs = self.translate(asset_slugs)
 
-        slug_df_list: List = []
-        for slug in slugs:
+        def get_protocol_df(slug: str) -> pd.DataFrame:
             endpoint_url = DL_GET_PROTOCOL_TVL_URL.substitute(slug=slug)
             protocol = self.get_response(endpoint_url)
+            return protocol_to_dataframe(protocol)
 
-            ###########################
-            # This portion is basically grabbing tvl metrics on a per chain basis
-
-            # TODO this is gonna be difficult
-            chain_tvls = protocol["chainTvls"]
-            chains = protocol["chains"]
-            chain_list = []
-            chain_df_list = []
-            for chain in chains:
-                chain_list.append(chain)
-
-                # get timeseries
-                chain_tvl = chain_tvls[chain]["tvl"]
-                chain_tvl_tokens = chain_tvls[chain]["tokens"]
-                chain_tvl_tokens_usd = chain_tvls[chain]["tokensInUsd"]
-
-                # convert tokens & tokensInUsd
-                for token in chain_tvl_tokens:
-                    for key, value in token["tokens"].items():
-                        token[key] = value
-                    token.pop("tokens", None)
-
-                for token in chain_tvl_tokens_usd:
-                    for key, value in token["tokens"].items():
-                        token[key] = value
-                    token.pop("tokens", None)
-
-                # convert to df
-                chain_tvl_df = pd.DataFrame(chain_tvl)
-                chain_tvl_tokens_df = pd.DataFrame(chain_tvl_tokens)
-                chain_tvl_tokens_usd_df = pd.DataFrame(chain_tvl_tokens_usd)
-
-                # fix indexes
-                chain_tvl_df = format_df(chain_tvl_df)
-                chain_tvl_tokens_df = format_df(chain_tvl_tokens_df)
-                chain_tvl_tokens_usd_df = format_df(chain_tvl_tokens_usd_df)
-                chain_tvl_tokens_usd_df = chain_tvl_tokens_usd_df.add_suffix("_usd")
-
-                # concat tokens and tokensInUsd
-                joint_tokens_df = pd.concat([chain_tvl_tokens_df, chain_tvl_tokens_usd_df], axis=1)
-                # Join total chain TVL w/ token TVL
-                chain_df = chain_tvl_df.join(joint_tokens_df)
-                chain_df_list.append(chain_df)
-
-            ###########################
-            # This portion is basically grabbing tvl metrics for all chains combined
-
-            ######################################
-            # Get protocol token balances
-
-            ## tokens in native amount
-            tokens = protocol["tokens"]
-            for token in tokens:
-                for key, value in token["tokens"].items():
-                    token[key] = value
-                token.pop("tokens", None)
-            tokens_df = pd.DataFrame(tokens)
-            tokens_df = format_df(tokens_df)
-
-            ## tokens in USD
-            tokens_usd = protocol["tokensInUsd"]
-            for token in tokens_usd:
-                for key, value in token["tokens"].items():
-                    token[key] = value
-                token.pop("tokens", None)
-            tokens_usd_df = pd.DataFrame(tokens_usd)
-            tokens_usd_df = format_df(tokens_usd_df)
-            tokens_usd_df = tokens_usd_df.add_suffix("_usd")
-
-            # Get total tvl across chains
-            tvl = protocol["tvl"]
-            total_tvl_df = pd.DataFrame(tvl)
-            total_tvl_df = format_df(total_tvl_df)
-
-            # Working
-            joint_tokens_df = pd.concat([tokens_df, tokens_usd_df], axis=1)
-            total_df = total_tvl_df.join(joint_tokens_df)
-
-            # Now create multi index
-            chain_list.append("all")
-            chain_df_list.append(total_df)
-
-            slug_df = pd.concat(chain_df_list, keys=chain_list, axis=1)
-            slug_df_list.append(slug_df)
-
-        total_slugs_df = pd.concat(slug_df_list, keys=slugs, axis=1)
-        total_slugs_df.sort_index(inplace=True)
+        slug_df_dict = self.fan_out(get_protocol_df, slugs)
+        with phase('assemble'):
+            total_slugs_df = pd.concat(slug_df_dict, axis=1)
+            total_slugs_df.sort_index(inplace=True)
 
         total_slugs_df = time_filter_df(total_slugs_df, start_date=start_date, end_date=end_date)
         return total_slugs_df
 
+    @profiled
     def get_global_tvl_timeseries(self, start_date: Union[str, datetime.datetime] = None,
                                   end_date: Union[str, datetime.datetime] = None) -> pd.DataFrame:
         """Returns timeseries TVL from total of all Defi Llama supported protocols
@@ -177,6 +102,7 @@ class DeFiLlama(DataLoader):
         global_tvl_df = time_filter_df(global_tvl_df, start_date=start_date, end_date=end_date)
         return global_tvl_df
 
+    @profiled
     def get_chain_tvl_timeseries(self, chains_in: Union[str, List],
                                  start_date: Union[str, datetime.datetime] = None,
                                  end_date: Union[str, datetime.datetime] = None) -> pd.DataFrame:
@@ -200,25 +126,27 @@ class DeFiLlama(DataLoader):
         """
         chains = validate_input(chains_in)
 
-        chain_df_list = []
-        for chain in chains:
+        def get_chain_df(chain: str) -> pd.DataFrame:
             endpoint_url = DL_CHAIN_TVL_URL.substitute(chain=chain)
             response = self.get_response(endpoint_url)
             chain_df = pd.DataFrame(response)
-            chain_df = format_df(chain_df)
-            chain_df_list.append(chain_df)
+            return format_df(chain_df)
+
+        chain_df_dict = self.fan_out(get_chain_df, chains)
 
         # Join DataFrames from each chain & return
-        chains_df = pd.concat(chain_df_list, axis=1)
+        with phase('assemble'):
+            chains_df = pd.concat(chain_df_dict.values(), axis=1)
 
         # If chains_df is empty, return an empty DataFrame
         if chains_df.empty:
             return pd.DataFrame()
 
-        chains_df.columns = chains
+        chains_df.columns = list(chain_df_dict.keys())
         chains_df = time_filter_df(chains_df, start_date=start_date, end_date=end_date)
         return chains_df
 
+    @profiled
     def get_current_tvl(self, asset_slugs: Union[str, List]) -> Dict:
         """Retrive current protocol tvl for an asset
 
@@ -234,10 +162,12 @@ class DeFiLlama(DataLoader):
         """
         slugs = validate_input(asset_slugs)
 
-        tvl_dict = {}
-        for slug in slugs:
+        def get_tvl(slug: str) -> Union[float, Dict]:
             endpoint_url = DL_CURRENT_PROTOCOL_TVL_URL.substitute(slug=slug)
-            tvl = self.get_response(endpoint_url)
+            return self.get_response(endpoint_url)
+
+        tvl_dict = {}
+        for slug, tvl in self.fan_out(get_tvl, slugs).items():
             if isinstance(tvl, float):
                 tvl_dict[slug] = tvl
             else:
@@ -247,6 +177,7 @@ class DeFiLlama(DataLoader):
         tvl_df = tvl_series.to_frame("tvl")
         return tvl_df
 
+    @profiled
     def get_protocols(self) -> pd.DataFrame:
         """Returns basic information on all listed protocols, their current TVL
         and the changes to it in the last hour/day/week
@@ -265,6 +196,7 @@ class DeFiLlama(DataLoader):
         protocols_df = pd.DataFrame(protocol_dict)
         return protocols_df
 
+    @profiled
     def get_chains(self) -> List[str]:
         """Get the names of all chains supported by Defi Llama
 
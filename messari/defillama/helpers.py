@@ -1,9 +1,14 @@
 """This module is dedicated to helpers for the DeFiLlama class"""
 
 
+from typing import Dict
+
 import pandas as pd
 
+from messari.profiling import timed
+
 
+@timed("assemble")
 def format_df(df_in: pd.DataFrame) -> pd.DataFrame:
     """format a typical DF from DL, replace date & drop duplicates
 
@@ -20,14 +25,115 @@ def format_df(df_in: pd.DataFrame) -> pd.DataFrame:
 
     # set date to index
     df_new = df_in
-    if 'date' in df_in.columns:
-        df_new.set_index('date', inplace=True)
-        df_new.index = pd.to_datetime(df_new.index, unit='s', origin='unix')
+    if "date" in df_in.columns:
+        df_new.set_index("date", inplace=True)
+        # /charts sends dates as strings of unix seconds, /protocol as ints
+        df_new.index = pd.to_datetime(pd.to_numeric(df_new.index), unit="s", origin="unix")
         df_new.index = df_new.index.date
 
     # drop duplicates
     # NOTE: sometimes DeFi Llama has duplicate dates, choosing to just keep the last
     # NOTE: Data for duplicates is not the same
     # TODO: Investigate which data should be kept (currently assuming last is more recent
-    df_new = df_new[~df_new.index.duplicated(keep='last')]
+    df_new = df_new[~df_new.index.duplicated(keep="last")]
     return df_new
+
+
+@timed("assemble")
+def protocol_to_dataframe(protocol: Dict) -> pd.DataFrame:
+    """convert a DL protocol response into a DataFrame indexed by df[chain][asset]
+
+    Parameters
+    ----------
+       protocol: dict
+           response from the DL protocol endpoint
+
+    Returns
+    -------
+       DataFrame
+           pandas DataFrame of protocol TVL, total across all chains is under chain='all'
+    """
+    ###########################
+    # This portion is basically grabbing tvl metrics on a per chain basis
+
+    # TODO this is gonna be difficult
+    chain_tvls = protocol["chainTvls"]
+    chains = protocol["chains"]
+    chain_list = []
+    chain_df_list = []
+    for chain in chains:
+        chain_list.append(chain)
+
+        # get timeseries
+        chain_tvl = chain_tvls[chain]["tvl"]
+        chain_tvl_tokens = chain_tvls[chain]["tokens"]
+        chain_tvl_tokens_usd = chain_tvls[chain]["tokensInUsd"]
+
+        # convert tokens & tokensInUsd
+        for token in chain_tvl_tokens:
+            for key, value in token["tokens"].items():
+                token[key] = value
+            token.pop("tokens", None)
+
+        for token in chain_tvl_tokens_usd:
+            for key, value in token["tokens"].items():
+                token[key] = value
+            token.pop("tokens", None)
+
+        # convert to df
+        chain_tvl_df = pd.DataFrame(chain_tvl)
+        chain_tvl_tokens_df = pd.DataFrame(chain_tvl_tokens)
+        chain_tvl_tokens_usd_df = pd.DataFrame(chain_tvl_tokens_usd)
+
+        # fix indexes
+        chain_tvl_df = format_df(chain_tvl_df)
+        chain_tvl_tokens_df = format_df(chain_tvl_tokens_df)
+        chain_tvl_tokens_usd_df = format_df(chain_tvl_tokens_usd_df)
+        chain_tvl_tokens_usd_df = chain_tvl_tokens_usd_df.add_suffix("_usd")
+
+        # concat tokens and tokensInUsd
+        joint_tokens_df = pd.concat([chain_tvl_tokens_df, chain_tvl_tokens_usd_df], axis=1)
+        # Join total chain TVL w/ token TVL
+        chain_df = chain_tvl_df.join(joint_tokens_df)
+        chain_df_list.append(chain_df)
+
+    ###########################
+    # This portion is basically grabbing tvl metrics for all chains combined
+
+    ######################################
+    # Get protocol token balances
+
+    ## tokens in native amount
+    tokens = protocol["tokens"]
+    for token in tokens:
+        for key, value in token["tokens"].items():
+            token[key] = value
+        token.pop("tokens", None)
+    tokens_df = pd.DataFrame(tokens)
+    tokens_df = format_df(tokens_df)
+
+    ## tokens in USD
+    tokens_usd = protocol["tokensInUsd"]
+    for token in tokens_usd:
+        for key, value in token["tokens"].items():
+            token[key] = value
+        token.pop("tokens", None)
+    tokens_usd_df = pd.DataFrame(tokens_usd)
+    tokens_usd_df = format_df(tokens_usd_df)
+    tokens_usd_df = tokens_usd_df.add_suffix("_usd")
+
+    # Get total tvl across chains
+    tvl = protocol["tvl"]
+    total_tvl_df = pd.DataFrame(tvl)
+    total_tvl_df = format_df(total_tvl_df)
+
+    # Working
+    joint_tokens_df = pd.concat([tokens_df, tokens_usd_df], axis=1)
+    total_df = total_tvl_df.join(joint_tokens_df)
+
+    # Now create multi index
+    chain_list.append("all")
+    chain_df_list.append(total_df)
+
+    slug_df = pd.concat(chain_df_list, keys=chain_list, axis=1)
+    return slug_df
@@ -0,0 +1,225 @@
+"""This module is meant to contain the FixtureServer class"""
+
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from messari.pagination import Paginator
+from messari.replay import Cassette, get_body, request_key, split_url
+
+# Upstream scheme assumed when a local URL is mapped back to the API it stands in for
+UPSTREAM_SCHEME = 'https'
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Answers requests with the responses of the FixtureServer it is bound to"""
+    fixtures: 'FixtureServer' = None
+    # Keep connections open between requests like the real APIs
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a GET request"""
+        status, headers, body = self.fixtures.handle('GET', self.path)
+        try:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting, i.e. it timed out
+            self.close_connection = True
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep output quiet"""
+
+
+class FixtureAdapter(HTTPAdapter):
+    """This class is a requests transport adapter sending every request to a FixtureServer.
+
+    Mount it on a DataLoader with DataLoader.set_transport(server.get_adapter()).
+    """
+    def __init__(self, fixtures: 'FixtureServer'):
+        super().__init__()
+        self.fixtures = fixtures
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:  # pylint: disable=arguments-differ
+        request = request.copy()
+        request.url = self.fixtures.local_url(request.url)
+        return super().send(request, **kwargs)
+
+
+class FixtureServer:
+    """This class is a local stand-in for the APIs wrapped by the connectors.
+
+    A request for https://api.llama.fi/protocols is served at
+    http://127.0.0.1:<port>/api.llama.fi/protocols, either by mounting get_adapter()
+    on a DataLoader or by rewriting URLs with local_url. Responses come from routes
+    added with add_response & add_records first, then from the cassette.
+
+    Latency is added to every response, rate_limit answers requests over the limit
+    of a host with a 429 & a Retry-After header, like the real providers.
+    """
+    def __init__(self, cassette: Cassette = None, latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit: Tuple[int, float] = None, host: str = '127.0.0.1', port: int = 0,
+                 rng: random.Random = None):
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.host = host
+        self.port = port
+        self.rng = rng if rng is not None else random.Random()
+        self.lock = threading.Lock()
+        self.responses: Dict[str, List[Tuple[int, Dict, bytes]]] = {}
+        self.played: Dict[str, int] = {}
+        self.paged: Dict[str, Tuple[List, Paginator]] = {}
+        self.windows: Dict[str, deque] = {}
+        self.requests: List[str] = []
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.url: Optional[str] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.stop()
+
+    def start(self) -> None:
+        """Starts serving on a background thread"""
+        handler = type('BoundFixtureHandler', (FixtureHandler,), {'fixtures': self})
+        self.server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.server.daemon_threads = True
+        self.url = f'http://{self.host}:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stops the server"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def local_url(self, url: str) -> str:
+        """Rewrites an API URL to the matching URL on this server
+
+        :param url: str
+            API URL (i.e. https://api.llama.fi/protocols?a=1)
+        :return: str (i.e. http://127.0.0.1:<port>/api.llama.fi/protocols?a=1)
+        """
+        if url.startswith(self.url):
+            return url
+        parts = urlsplit(url)
+        local = f'{self.url}/{parts.netloc}{parts.path}'
+        return f'{local}?{parts.query}' if parts.query else local
+
+    def get_adapter(self) -> FixtureAdapter:
+        """Returns a requests transport adapter sending requests to this server"""
+        return FixtureAdapter(self)
+
+    def add_response(self, url: str, body: Union[Dict, List, str, bytes], status: int = 200,
+                     headers: Dict = None) -> None:
+        """Adds a response to a request, responses added for the same request are
+        served in order, the last one being repeated
+
+        :param url: str
+            API URL including the query string, credentials are ignored
+        :param body: dict, list, str, bytes
+            JSON payload or raw body
+        :param status: int
+            HTTP status
+        :param headers: dict
+            Response headers
+        """
+        headers = dict(headers or {})
+        if not isinstance(body, (str, bytes)):
+            body = json.dumps(body)
+            headers.setdefault('Content-Type', 'application/json')
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        with self.lock:
+            self.responses.setdefault(request_key('GET', url), []).append((status, headers, body))
+
+    def add_records(self, url: str, records: List, paginator: Paginator) -> None:
+        """Serves records page by page, whatever the query string
+
+        :param url: str
+            API URL without query string
+        :param records: list
+            Every record of the endpoint
+        :param paginator: Paginator
+            How the endpoint pages (i.e. PagePaginator(records_key='data', page_size=500))
+        """
+        address, _ = split_url(url)
+        with self.lock:
+            self.paged[address] = (records, paginator)
+
+    def throttle(self, upstream: str) -> Optional[float]:
+        """Counts a request against the rate limit of its host
+
+        :return: Seconds until the next request is allowed or None if this one is
+        """
+        if self.rate_limit is None:
+            return None
+        calls, period = self.rate_limit
+        now = time.monotonic()
+        with self.lock:
+            window = self.windows.setdefault(upstream, deque())
+            while window and now - window[0] >= period:
+                window.popleft()
+            if len(window) >= calls:
+                return window[0] + period - now
+            window.append(now)
+            return None
+
+    def handle(self, method: str, path: str) -> Tuple[int, Dict, bytes]:
+        """Builds the response to a request received by the server
+
+        :param method: str
+            HTTP method
+        :param path: str
+            Request path, /<api host>/<api path>?<query>
+        :return: (status, headers, body) tuple
+        """
+        url = f'{UPSTREAM_SCHEME}:/{path}'
+        address, params = split_url(url)
+        with self.lock:
+            self.requests.append(url)
+
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+
+        retry_after = self.throttle(address.split('/', 1)[0])
+        if retry_after is not None:
+            return 429, {'Retry-After': f'{retry_after:.3f}'}, b'{"error": "rate limited"}'
+
+        with self.lock:
+            paged = self.paged.get(address)
+            key = request_key(method, url)
+            responses = self.responses.get(key)
+            if responses:
+                index = self.played.get(key, 0)
+                self.played[key] = index + 1
+                return responses[min(index, len(responses) - 1)]
+        if paged is not None:
+            records, paginator = paged
+            first, last = paginator.get_bounds(params)
+            body = json.dumps(paginator.make_page(records[first:last])).encode('utf-8')
+            return 200, {'Content-Type': 'application/json'}, body
+        if self.cassette is not None:
+            entry = self.cassette.find(method, url)
+            if entry is not None:
+                return entry['status'], dict(entry.get('headers', {})), get_body(entry)
+        return 404, {'Content-Type': 'application/json'}, b'{"error": "no fixture"}'
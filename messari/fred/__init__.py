@@ -1,5 +1,8 @@
 """Module to handle initialization, imports, for FRED class"""
 
+from messari.lazy import lazy_exports
 
-
-from .fred import *
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'FRED': '.fred',
+    'AsyncFRED': '.asyncfred',
+})
@@ -0,0 +1,208 @@
+"""This module is meant to contain the AsyncFRED class"""
+
+from typing import Union, List, Dict
+import pandas as pd
+
+from messari.asyncdataloader import AsyncDataLoader
+from messari.keypool import first_key
+from .fredbase import FREDBase
+from .helpers import records_to_dataframe, responses_to_dataframe, observations_to_dataframe
+from .fred import category_url, category_children_url, category_related_url, \
+    category_series_url, category_tags_url, category_related_tags_url, releases_url, \
+    releases_dates_url, release_url, release_date_url, release_series_url, release_sources_url, \
+    release_tags_url, release_related_tags_url, series_url, series_categories_url, \
+    series_observations_url, series_release_url, series_tags_url, series_updates_url, \
+    series_vintagedates_url, sources_url, source_url, source_releases_url, tags_url, \
+    related_tags_url, tags_series_url
+
+
+class AsyncFRED(FREDBase, AsyncDataLoader):
+    """This class is an asyncio wrapper around the FRED API,
+    every method is a coroutine returning the same data as its FRED counterpart
+    """
+    def __init__(self, api_key: Union[str, List[str]] = None):
+        fred_api_key = {'api_key': first_key(api_key)}
+        AsyncDataLoader.__init__(self, api_dict=fred_api_key, taxonomy_dict=None)
+        FREDBase.__init__(self, api_key)
+
+    async def get_responses(self, endpoint_url: str, requests: Dict) -> Dict:
+        """See FRED.get_responses"""
+        return await self.fan_out(
+            lambda _id: self.get_response(endpoint_url, params=requests[_id]), list(requests))
+
+    #######################
+    # Categories
+    #######################
+    async def get_category(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_category"""
+        responses = await self.get_responses(category_url, self.id_requests(ids_in, 'category_id'))
+        return pd.DataFrame([response['categories'][0] for response in responses.values()])
+
+    async def get_category_children(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_category_children"""
+        requests = self.id_requests(ids_in, 'category_id')
+        return responses_to_dataframe(await self.get_responses(category_children_url, requests),
+                                      'categories')
+
+    async def get_category_related(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_category_related"""
+        requests = self.id_requests(ids_in, 'category_id')
+        return responses_to_dataframe(await self.get_responses(category_related_url, requests),
+                                      'categories')
+
+    async def get_category_series(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_category_series"""
+        requests = self.id_requests(ids_in, 'category_id')
+        return responses_to_dataframe(await self.get_responses(category_series_url, requests),
+                                      'seriess', drop_realtime=True)
+
+    async def get_category_tags(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_category_tags"""
+        requests = self.id_requests(ids_in, 'category_id')
+        return responses_to_dataframe(await self.get_responses(category_tags_url, requests), 'tags')
+
+    async def get_category_related_tags(self, ids_in: Union[str,List],
+                                        tags_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_category_related_tags"""
+        requests = self.id_requests(ids_in, 'category_id', **self.tags_params(tags_in))
+        return responses_to_dataframe(await self.get_responses(category_related_tags_url, requests),
+                                      'tags')
+
+    #######################
+    # Releases
+    #######################
+    async def get_releases(self) -> pd.DataFrame:
+        """See FRED.get_releases"""
+        releases = await self.fetch_all(releases_url, self.make_paginator('releases'),
+                                    params=self.make_params())
+        return records_to_dataframe({'releases': releases}, 'releases', drop_realtime=True)
+
+    async def get_releases_dates(self) -> pd.DataFrame:
+        """See FRED.get_releases_dates"""
+        paginator = self.make_paginator('release_dates')
+        release_dates = await self.fetch_all(releases_dates_url, paginator,
+                                         params=self.make_params())
+        return pd.DataFrame(release_dates)
+
+    async def get_release(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_release"""
+        requests = self.id_requests(ids_in, 'release_id')
+        return responses_to_dataframe(await self.get_responses(release_url, requests), 'releases',
+                                      drop_realtime=True)
+
+    async def get_release_dates(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_release_dates"""
+        requests = self.id_requests(ids_in, 'release_id')
+        return responses_to_dataframe(await self.get_responses(release_date_url, requests),
+                                      'release_dates')
+
+    async def get_release_series(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_release_series"""
+        requests = self.id_requests(ids_in, 'release_id')
+        return responses_to_dataframe(await self.get_responses(release_series_url, requests),
+                                      'seriess')
+
+    async def get_release_sources(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_release_sources"""
+        requests = self.id_requests(ids_in, 'release_id')
+        return responses_to_dataframe(await self.get_responses(release_sources_url, requests),
+                                      'sources', drop_realtime=True)
+
+    async def get_release_tags(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_release_tags"""
+        requests = self.id_requests(ids_in, 'release_id')
+        return responses_to_dataframe(await self.get_responses(release_tags_url, requests), 'tags')
+
+    async def get_release_related_tags(self, ids_in: Union[str,List],
+                                       tags_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_release_related_tags"""
+        requests = self.id_requests(ids_in, 'release_id', **self.tags_params(tags_in))
+        return responses_to_dataframe(await self.get_responses(release_related_tags_url, requests),
+                                      'tags')
+
+    #######################
+    # Series
+    #######################
+    async def get_series(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_series"""
+        requests = self.id_requests(ids_in, 'series_id')
+        return responses_to_dataframe(await self.get_responses(series_url, requests), 'seriess',
+                                      drop_realtime=True)
+
+    async def get_series_categories(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_series_categories"""
+        requests = self.id_requests(ids_in, 'series_id')
+        return responses_to_dataframe(await self.get_responses(series_categories_url, requests),
+                                      'categories')
+
+    async def get_series_observations(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_series_observations"""
+        requests = self.id_requests(ids_in, 'series_id')
+        responses = await self.get_responses(series_observations_url, requests)
+        return observations_to_dataframe(responses)
+
+    async def get_series_release(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_series_release"""
+        requests = self.id_requests(ids_in, 'series_id')
+        return responses_to_dataframe(await self.get_responses(series_release_url, requests),
+                                      'releases', drop_realtime=True)
+
+    async def get_series_tags(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_series_tags"""
+        requests = self.id_requests(ids_in, 'series_id')
+        return responses_to_dataframe(await self.get_responses(series_tags_url, requests), 'tags')
+
+    async def get_series_updates(self, start_date: str=None, end_date: str=None) -> pd.DataFrame:
+        """See FRED.get_series_updates"""
+        params = self.updates_params(start_date, end_date)
+        response = await self.get_response(series_updates_url, params=params)
+        return records_to_dataframe(response, 'seriess')
+
+    async def get_series_vintagedates(self, ids_in: Union[str,List]) -> pd.DataFrame:
+        """See FRED.get_series_vintagedates"""
+        requests = self.id_requests(ids_in, 'series_id')
+        responses = await self.get_responses(series_vintagedates_url, requests)
+        return pd.concat({_id: pd.Series(response['vintage_dates'])
+                          for _id, response in responses.items()}, axis=1)
+
+    #######################
+    # Sources
+    #######################
+    async def get_sources(self) -> pd.DataFrame:
+        """See FRED.get_sources"""
+        sources = await self.fetch_all(sources_url, self.make_paginator('sources'),
+                                   params=self.make_params())
+        return records_to_dataframe({'sources': sources}, 'sources', drop_realtime=True)
+
+    async def get_source(self, sources_in: Union[List, str]) -> pd.DataFrame:
+        """See FRED.get_source"""
+        requests = self.id_requests(sources_in, 'source_id')
+        return responses_to_dataframe(await self.get_responses(source_url, requests), 'sources',
+                                      drop_realtime=True)
+
+    async def get_source_releases(self, sources_in: Union[List, str]) -> pd.DataFrame:
+        """See FRED.get_source_releases"""
+        requests = self.id_requests(sources_in, 'source_id')
+        return responses_to_dataframe(await self.get_responses(source_releases_url, requests),
+                                      'releases', drop_realtime=True)
+
+    #######################
+    # Tags
+    #######################
+    async def get_tags(self) -> pd.DataFrame:
+        """See FRED.get_tags"""
+        paginator = self.make_paginator('tags')
+        tags = await self.fetch_all(tags_url, paginator, params=self.make_params())
+        return pd.DataFrame(tags)
+
+    async def get_related_tags(self, tags_in: Union[List, str]) -> pd.DataFrame:
+        """See FRED.get_related_tags"""
+        params = self.make_params(**self.tags_params(tags_in))
+        response = await self.get_response(related_tags_url, params=params)
+        return records_to_dataframe(response, 'tags')
+
+    async def get_tags_series(self, tags_in: Union[List, str]) -> pd.DataFrame:
+        """See FRED.get_tags_series"""
+        params = self.make_params(**self.tags_params(tags_in))
+        response = await self.get_response(tags_series_url, params=params)
+        return records_to_dataframe(response, 'seriess', drop_realtime=True)
@@ -0,0 +1,88 @@
+"""This module is meant to contain the FREDBase class"""
+
+from typing import Union, List, Dict
+
+from messari.keypool import make_key_pool
+from messari.pagination import OffsetPaginator
+from messari.utils import validate_input
+
+# Max number of results FRED returns per request
+PAGE_SIZE = 1000
+
+# FRED allows 120 requests per minute per API key
+RATE_LIMIT_CALLS = 120
+RATE_LIMIT_PERIOD = 60
+
+json_dict = {'file_type':'json'}
+
+
+class FREDBase:  # pylint: disable=no-member
+    """This class holds what FRED & AsyncFRED share: their configuration
+    & the query parameters of every endpoint.
+
+    Subclasses only send the requests it builds, parsing the responses with the
+    helpers module, so both tiers return the same data.
+    """
+    def __init__(self, api_key: Union[str, List[str]] = None):
+        """Configures the client once the loader is initialized
+
+        :param api_key: str, list
+            FRED key or keys
+        """
+        # A list of keys is rotated, each key getting FRED's limit
+        self.set_key_pool(make_key_pool(api_key, 'api_key', calls=RATE_LIMIT_CALLS,
+                                        period=RATE_LIMIT_PERIOD))
+
+    def make_params(self, **params) -> Dict:
+        """Returns the query parameters of a request, API key & file type included
+
+        :return: dict
+        """
+        return dict(self.api_dict, **json_dict, **params)
+
+    def id_requests(self, ids_in: Union[str, List], id_param: str, **params) -> Dict:
+        """Returns the query parameters of a request per id, keyed by id
+
+        :param ids_in: str, list
+            Single id or list of ids (category, release, series or source)
+        :param id_param: str
+            Query parameter the id is sent in (i.e. series_id)
+        :return: dict
+        """
+        return {_id: self.make_params(**params, **{id_param: _id})
+                for _id in validate_input(ids_in)}
+
+    def tags_params(self, tags_in: Union[str, List]) -> Dict:
+        """Returns the tag_names parameter of a list of tags
+
+        :param tags_in: str, list
+            Single tag or list of tags
+        :return: dict
+        """
+        return {'tag_names': ';'.join(validate_input(tags_in))}
+
+    def updates_params(self, start_date: str = None, end_date: str = None) -> Dict:
+        """Returns the query parameters of get_series_updates
+
+        :param start_date: str
+            Start of the real-time period ('YYYY-MM-dd')
+        :param end_date: str
+            End of the real-time period ('YYYY-MM-dd')
+        :return: dict
+        """
+        params = self.make_params()
+        if start_date:
+            params['realtime_start'] = start_date
+        if end_date:
+            params['realtime_end'] = end_date
+        return params
+
+    @staticmethod
+    def make_paginator(records_key: str) -> OffsetPaginator:
+        """Returns the paginator of an endpoint listing every record under records_key
+
+        :param records_key: str
+            Key of the records in the response (i.e. releases)
+        :return: OffsetPaginator
+        """
+        return OffsetPaginator(records_key=records_key, page_size=PAGE_SIZE)
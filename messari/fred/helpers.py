@@ -1,11 +1,13 @@
-"""This module is dedicated to helpers for the Messari class"""
+"""This module is dedicated to helpers for the FRED class"""
 
 
-import logging
 from typing import Union, List, Dict
 import pandas as pd
+import numpy as np
 
 from messari.utils import validate_input, validate_asset_fields_list_order, find_and_update_asset_field
+# Single timeseries builder shared with the Messari helpers
+from messari.messari.helpers import timeseries_to_dataframe  # pylint: disable=unused-import
 
 
 def fields_payload(asset_fields: Union[str, List],
@@ -43,25 +45,54 @@ def fields_payload(asset_fields: Union[str, List],
     return ','.join(asset_fields)
 
 
-def timeseries_to_dataframe(response: Dict) -> pd.DataFrame:
-    """Convert timeseries data to pandas dataframe
+
+def records_to_dataframe(response: Dict, records_key: str,
+                         drop_realtime: bool = False) -> pd.DataFrame:
+    """Returns the records of a FRED response as a DataFrame
 
     :param response: dict
-        Dictionary of asset time series data keyed by symbol
-    :return: pandas dataframe
+        JSON response
+    :param records_key: str
+        Key of the records in the response (i.e. seriess)
+    :param drop_realtime: bool
+        Drop the realtime_start & realtime_end columns
+    :return: DataFrame
+    """
+    records_df = pd.DataFrame(response[records_key])
+    if drop_realtime:
+        records_df.drop(['realtime_end', 'realtime_start'], axis=1, inplace=True)
+    return records_df
+
+
+def responses_to_dataframe(responses: Dict, records_key: str,
+                           drop_realtime: bool = False) -> pd.DataFrame:
+    """Returns the records of FRED responses keyed by id, with one top level column per id
+
+    :param responses: dict
+        JSON responses keyed by id
+    :param records_key: str
+        Key of the records in the responses
+    :param drop_realtime: bool
+        Drop the realtime_start & realtime_end columns
+    :return: DataFrame
+    """
+    return pd.concat({_id: records_to_dataframe(response, records_key, drop_realtime)
+                      for _id, response in responses.items()}, axis=1)
+
+
+def observations_to_dataframe(responses: Dict) -> pd.DataFrame:
+    """Returns the values of series observations keyed by series id, indexed by date
+
+    :param responses: dict
+        JSON responses of series/observations keyed by series id
+    :return: DataFrame
     """
-    df_list, key_list = [], []
-    for key, value in response.items():
-        key_list.append(key)
-        if isinstance(value['values'], list):
-            df_columns=[f'{name}' for name in value['parameters_columns']]
-            values_df = pd.DataFrame.from_records(value['values'], columns=df_columns)
-            values_df.set_index('timestamp', inplace=True)
-            values_df.index = pd.to_datetime(values_df.index, unit='ms', origin='unix')  # noqa
-            df_list.append(values_df)
-        else:
-            logging.warning('Missing timeseries data for %s', key)
-            continue
-    # Create multindex DataFrame using list of dataframes & keys
-    metric_data_df = pd.concat(df_list, keys=key_list, axis=1)
-    return metric_data_df
+    df_dict = {}
+    for _id, response in responses.items():
+        tmp_df = records_to_dataframe(response, 'observations', drop_realtime=True)
+        tmp_df.set_index('date', inplace=True)
+        tmp_df.index = pd.to_datetime(tmp_df.index, format='%Y-%m-%d', errors='coerce')
+        df_dict[_id] = tmp_df
+    observations_df = pd.concat(df_dict, axis=1).xs('value', axis=1, level=1)
+    observations_df.replace('.', np.nan, inplace=True)
+    return observations_df
@@ -0,0 +1,260 @@
+"""This module is meant to contain the APIKey & KeyPool classes"""
+
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from messari.ratelimit import RateLimiter, DEFAULT_RATE_LIMITER, run_blocking
+from messari.retry import parse_retry_after
+
+# Seconds a key is benched after a quota error when the API doesn't say how long
+DEFAULT_BENCH_TIME = 60.0
+
+# Seconds a key the API rejects (revoked, wrong plan) is benched
+DEFAULT_INVALID_BENCH_TIME = 3600.0
+
+# Statuses meaning a key is over its quota
+QUOTA_STATUSES = (429,)
+
+# Statuses meaning a key is rejected
+INVALID_STATUSES = (401, 403)
+
+# Where a credential is sent
+LOCATIONS = ('params', 'headers')
+
+
+def get_limit_id(value: str) -> str:
+    """Returns the name a key is rate limited under, a hash so the key isn't exposed
+
+    :param value: str
+        API key
+    :return: str
+    """
+    return f"apikey-{hashlib.sha256(value.encode('utf-8')).hexdigest()[:16]}"
+
+
+class APIKey:
+    """This class tracks the usage & health of one key of a KeyPool"""
+    def __init__(self, value: str):
+        self.value = value
+        # Name of the key's rate limit, the key itself never leaves the pool
+        self.limit_id = get_limit_id(value)
+        self.requests = 0
+        self.quota_errors = 0
+        self.invalid_errors = 0
+        self.benched_until = 0.0
+
+    def __repr__(self) -> str:
+        return f'APIKey(...{self.value[-4:]})'
+
+
+class KeyPool:
+    """This class spreads the requests of a loader across several API keys.
+
+    Every request goes to the healthy key able to send soonest under its own rate
+    limit, so throughput adds up across keys. Per key limits live in a RateLimiter,
+    the process wide one by default, so loaders sharing a key share its limit.
+    A key answering with a quota error (429, or a connector specific error body)
+    is benched for Retry-After or bench_time seconds & a rejected key (401, 403)
+    for an hour, while the other keys carry on.
+    """
+    def __init__(self, keys: List[str], name: str, location: str = 'params',
+                 template: str = '{key}', calls: float = None, period: float = 1.0,
+                 quota: int = None, rate_limiter: RateLimiter = None,
+                 bench_time: float = DEFAULT_BENCH_TIME,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param keys: list
+            API keys, duplicates & empty keys are dropped
+        :param name: str
+            Query parameter or header the key is sent in (i.e. apikey)
+        :param location: str
+            params or headers
+        :param template: str
+            Format of the credential (i.e. Bearer {key})
+        :param calls: float
+            Calls allowed per key every period, None leaves throttling to the host limit
+        :param period: float
+            Length of the period in seconds
+        :param quota: int
+            Calls allowed per key every UTC day, reported by get_stats
+        :param rate_limiter: RateLimiter
+            Where per key limits are kept, default the process wide limiter
+        :param bench_time: float
+            Seconds a key is benched after a quota error without Retry-After
+        """
+        if location not in LOCATIONS:
+            raise ValueError(f'location must be one of {LOCATIONS}')
+        values = list(dict.fromkeys(key for key in keys if key))
+        if not values:
+            raise ValueError('A KeyPool needs at least one key')
+        self.keys = [APIKey(value) for value in values]
+        self.name = name
+        self.location = location
+        self.template = template
+        self.calls = calls
+        self.period = period
+        self.bench_time = bench_time
+        self.clock = clock
+        self.rate_limiter = rate_limiter if rate_limiter is not None else DEFAULT_RATE_LIMITER
+        for key in self.keys:
+            if calls is not None:
+                self.rate_limiter.set_default(key.limit_id, calls, period)
+            if quota is not None:
+                self.rate_limiter.set_quota(key.limit_id, quota)
+        self.lock = threading.Lock()
+        self.turn = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def throttled(self) -> bool:
+        """Whether keys have their own rate limit, replacing the host's"""
+        return self.calls is not None
+
+    def get_credential(self, key: APIKey) -> Dict[str, str]:
+        """Returns the {name: credential} dictionary of a key"""
+        return {self.name: self.template.format(key=key.value)}
+
+    def apply(self, key: APIKey, params: Optional[Dict],
+              headers: Optional[Dict]) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Returns copies of params & headers carrying key's credential
+
+        :param key: APIKey
+            Key returned by acquire
+        :param params: dict
+            Query parameters of the request
+        :param headers: dict
+            Headers of the request
+        :return: (params, headers) tuple
+        """
+        if self.location == 'params':
+            params = dict(params or {}, **self.get_credential(key))
+        else:
+            headers = dict(headers or {}, **self.get_credential(key))
+        return params, headers
+
+    def get_wait(self, key: APIKey) -> float:
+        """Returns how long a request with key would wait for its rate limit"""
+        bucket = self.rate_limiter.get_limit(key.limit_id) if self.throttled else None
+        return bucket.peek() if bucket is not None else 0.0
+
+    def choose(self) -> Tuple[Optional[APIKey], float]:
+        """Reserves a request on the healthy key able to send soonest
+
+        :return: (key, seconds to wait before sending) tuple,
+            (None, seconds until a key is back) when every key is benched
+        """
+        with self.lock:
+            now = self.clock()
+            healthy = [key for key in self.keys if key.benched_until <= now]
+            if not healthy:
+                return None, min(key.benched_until for key in self.keys) - now
+            # Rotate the starting key so ties spread evenly
+            start = self.turn % len(healthy)
+            self.turn += 1
+            key = min(healthy[start:] + healthy[:start], key=self.get_wait)
+            key.requests += 1
+            if self.throttled:
+                return key, self.rate_limiter.reserve(key.limit_id)
+            self.rate_limiter.record(key.limit_id)
+            return key, 0.0
+
+    def acquire(self, deadline=None) -> APIKey:
+        """Returns the key to send the next request with, once its rate limit allows it
+
+        :param deadline: messari.deadline.Deadline
+            Budget of the call, raises instead of waiting past it
+        :return: APIKey
+        """
+        sleep = deadline.sleep if deadline is not None else time.sleep
+        while True:
+            key, delay = self.choose()
+            if delay > 0:
+                sleep(delay)
+            if key is not None:
+                return key
+
+    async def acquire_async(self, deadline=None) -> APIKey:
+        """Sleeps on the event loop until a key can send the next request, see acquire"""
+        sleep = deadline.sleep_async if deadline is not None else asyncio.sleep
+        while True:
+            key, delay = await run_blocking(self.rate_limiter.blocking, self.choose)
+            if delay > 0:
+                await sleep(delay)
+            if key is not None:
+                return key
+
+    def bench(self, key: APIKey, seconds: float) -> None:
+        """Stops using a key for a while
+
+        :param key: APIKey
+            Key to bench
+        :param seconds: float
+            Seconds until the key is used again
+        """
+        with self.lock:
+            key.benched_until = max(key.benched_until, self.clock() + seconds)
+        logging.warning('Benching %r for %.0f seconds', key, seconds)
+
+    def report(self, key: APIKey, status_code: int, retry_after: str = None) -> bool:
+        """Records the outcome of a request sent with key, benching it on quota & auth errors
+
+        :param key: APIKey
+            Key the request was sent with
+        :param status_code: int
+            HTTP status, 429 for quota errors reported in the body
+        :param retry_after: str
+            Raw Retry-After header
+        :return: True if the key was benched & another key can take the retry right away
+        """
+        if status_code in QUOTA_STATUSES:
+            key.quota_errors += 1
+            delay = parse_retry_after(retry_after)
+            self.bench(key, delay if delay else self.bench_time)
+        elif status_code in INVALID_STATUSES:
+            key.invalid_errors += 1
+            self.bench(key, DEFAULT_INVALID_BENCH_TIME)
+        else:
+            return False
+        now = self.clock()
+        return any(other.benched_until <= now for other in self.keys)
+
+    def get_stats(self) -> List[Dict]:
+        """Returns the usage & health of every key, keys shown by their last 4 characters,
+        with the calls made today & the daily quota left (see RateLimiter.get_quota)
+
+        :return: List of dicts
+        """
+        now = self.clock()
+        return [{'key': repr(key), 'requests': key.requests, 'quota_errors': key.quota_errors,
+                 'invalid_errors': key.invalid_errors,
+                 'benched_for': max(0.0, key.benched_until - now),
+                 **self.rate_limiter.get_quota(key.limit_id)} for key in self.keys]
+
+
+def make_key_pool(api_key, name: str, location: str = 'params', template: str = '{key}',
+                  calls: float = None, period: float = 1.0,
+                  quota: int = None) -> Optional[KeyPool]:
+    """Builds the KeyPool of a connector taking either one key or a list of keys
+
+    :param api_key: str, list
+        Key or keys passed to the connector
+    :return: KeyPool, None for a single key or no key
+    """
+    if not isinstance(api_key, (list, tuple, set)):
+        return None
+    return KeyPool(list(api_key), name, location=location, template=template,
+                   calls=calls, period=period, quota=quota)
+
+
+def first_key(api_key) -> Optional[str]:
+    """Returns the key connectors put in api_dict, the first one of a list"""
+    if isinstance(api_key, (list, tuple, set)):
+        return next(iter(api_key), None)
+    return api_key
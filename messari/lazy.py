@@ -0,0 +1,48 @@
+"""This module is meant to contain the helper packages use to import their classes lazily"""
+
+
+import importlib
+import importlib.util
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable, List[str]]:
+    """Builds the module level __getattr__ & __dir__ (PEP 562) of a package whose
+    classes are only imported, with their dependencies, the first time they are accessed
+
+    Other public names of the modules (i.e. URL constants), which used to be star
+    imported, are still found by importing the modules until one has the name.
+
+    :param package: str
+        __name__ of the package
+    :param exports: dict
+        Dictionary of {name: module relative to the package (i.e. .etherscan)}
+    :return: (__getattr__, __dir__, __all__) tuple to assign in the package
+    """
+    modules = list(dict.fromkeys(exports.values()))
+
+    def find(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is not None:
+            return getattr(importlib.import_module(module_name, package), name)
+        if name.startswith('_'):
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+        if importlib.util.find_spec(f'{package}.{name}') is not None:
+            return importlib.import_module(f'{package}.{name}')
+        for module_name in modules:
+            module = importlib.import_module(module_name, package)
+            if hasattr(module, name):
+                return getattr(module, name)
+        raise AttributeError(f'module {package!r} has no attribute {name!r}')
+
+    def __getattr__(name: str) -> Any:
+        value = find(name)
+        # Later accesses find the name in the package without going through __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__, list(exports)
@@ -0,0 +1,439 @@
+"""This module is meant to contain the LoaderBase & Attempts classes"""
+
+
+import json
+import logging
+from typing import Hashable, List, Optional, Tuple, Union, Dict
+import pandas as pd
+from messari.utils import validate_input
+from messari.ratelimit import RateLimiter, DEFAULT_RATE_LIMITER
+from messari.retry import RetryPolicy, QueryFailedError, DEFAULT_RETRY_POLICY
+from messari.cache import ResponseCache, TTLRule, make_cache_key
+from messari.metrics import MetricsExporter, DEFAULT_METRICS, split_endpoint
+from messari.profiling import Profiler, phase
+from messari.taxonomy import as_taxonomy
+from messari.transport import TransportRegistry, Timeout, DEFAULT_TRANSPORT
+from messari.keypool import APIKey, KeyPool, INVALID_STATUSES
+from messari.concurrency import ConcurrencyController, AdaptiveLimit, Slot, \
+    DEFAULT_CONCURRENCY
+from messari.deadline import Deadline
+
+# (limit, slot) taken by acquire_slot
+HeldSlot = Optional[Tuple[AdaptiveLimit, Slot]]
+
+
+class LoaderBase:
+    """This class holds what DataLoader & AsyncDataLoader share: their configuration
+    & every decision made around a request (caching, retries, key pool, metrics).
+
+    Subclasses only wait & do the I/O, blocking or awaited, so both tiers behave the same.
+    """
+    def __init__(self, api_dict: Dict, taxonomy_dict: Dict, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None, fail_fast: bool = False,
+                 cache: ResponseCache = None, coalesce: bool = True,
+                 metrics: MetricsExporter = None, profile: bool = False,
+                 transport: TransportRegistry = None, adaptive: bool = False):
+        self.api_dict = api_dict
+        self.taxonomy_dict = as_taxonomy(taxonomy_dict)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else DEFAULT_RATE_LIMITER
+        self.retry_policy = retry_policy if retry_policy is not None else DEFAULT_RETRY_POLICY
+        self.fail_fast = fail_fast
+        self.failed_items: Dict = {}
+        self.cache = cache
+        self.cache_ttls: List[TTLRule] = []
+        self.metrics = metrics if metrics is not None else DEFAULT_METRICS
+        self.single_flight = self.new_single_flight() if coalesce else None
+        self.profiler = Profiler() if profile else None
+        self.transport = transport if transport is not None else DEFAULT_TRANSPORT
+        self.timeout: Timeout = None
+        self.key_pool: Optional[KeyPool] = None
+        # Scope of the provider default limits this loader is throttled by, see RateLimiter
+        self.rate_limit_scope: Optional[str] = None
+        # Adaptive limits are opt in, they can throttle a fan out below the loader's width
+        self.concurrency = DEFAULT_CONCURRENCY if adaptive else None
+
+    def set_api_dict(self, api_dict: Dict) -> None:
+        """Sets a new dictionary to be used as an API key pair
+
+        :param api_dict: Dict
+            New API dictionary
+        """
+        self.api_dict = api_dict
+
+    def set_taxonomy_dict(self, taxonomy_dict: Dict) -> None:
+        """Sets a new dictionary to be used for taxonomy translations
+
+        :param taxonomy_dict: Dict
+            New taxonomy dictionary or messari.taxonomy.Taxonomy
+        """
+        self.taxonomy_dict = as_taxonomy(taxonomy_dict)
+
+    def set_key_pool(self, key_pool: Optional[KeyPool]) -> None:
+        """Spreads requests across several API keys, see messari.keypool.KeyPool
+
+        :param key_pool: KeyPool
+            Pool of keys, None sends every request with api_dict again
+        """
+        self.key_pool = key_pool
+
+    def set_timeout(self, timeout: Timeout) -> None:
+        """Sets the connect & read timeouts of this loader's requests,
+        overriding the transport's default
+
+        :param timeout: float, tuple
+            Seconds or (connect, read) seconds, None restores the transport's default
+        """
+        self.timeout = timeout
+
+    def set_rate_limit(self, url: str, calls: float, period: float = 1.0, burst: int = 1) -> None:
+        """Sets the number of requests allowed to a host, overriding the provider default
+
+        :param url: str
+            URL or host to limit (i.e. https://api.etherscan.io/api)
+        :param calls: float
+            Number of calls allowed every period
+        :param period: float
+            Length of the period in seconds
+        :param burst: int
+            Number of calls that can be made back to back before throttling kicks in
+        """
+        self.rate_limiter.set_limit(url, calls, period=period, burst=burst)
+
+    def set_retry_policy(self, retry_policy: RetryPolicy) -> None:
+        """Sets the policy used to retry failed requests
+
+        :param retry_policy: RetryPolicy
+            New retry policy, messari.retry.NO_RETRY_POLICY disables retries
+        """
+        self.retry_policy = retry_policy
+
+    def set_fail_fast(self, fail_fast: bool) -> None:
+        """Sets whether one failed item aborts a whole fan out
+
+        :param fail_fast: bool
+            True to raise on the first failed item, False to skip failed items
+            and record them in failed_items
+        """
+        self.fail_fast = fail_fast
+
+    def set_cache(self, cache: ResponseCache) -> None:
+        """Sets the cache successful responses are stored in
+
+        :param cache: ResponseCache
+            Response cache, None disables caching
+        """
+        self.cache = cache
+
+    def set_coalesce(self, coalesce: bool) -> None:
+        """Sets whether concurrent identical requests share a single upstream call
+
+        :param coalesce: bool
+            True to coalesce identical in-flight requests
+        """
+        self.single_flight = self.new_single_flight() if coalesce else None
+
+    def new_single_flight(self):
+        """Returns the SingleFlight identical requests are coalesced with"""
+        raise NotImplementedError
+
+    def set_concurrency(self, concurrency: Optional[ConcurrencyController]) -> None:
+        """Sets the controller adapting the requests in flight to each host,
+        see messari.concurrency.ConcurrencyController
+
+        :param concurrency: ConcurrencyController
+            Controller, None leaves concurrency to the loader's width alone
+        """
+        self.concurrency = concurrency
+
+    def set_metrics(self, metrics: MetricsExporter) -> None:
+        """Sets the exporter request metrics are reported to
+
+        :param metrics: MetricsExporter
+            Exporter, a bare MetricsExporter() discards every metric
+        """
+        self.metrics = metrics
+
+    def set_profiling(self, profile: bool) -> None:
+        """Sets whether method calls are profiled, the time each call spends
+        throttled, waiting on HTTP, reading & decoding the body, normalizing and
+        building DataFrames is then available from get_profile
+
+        :param profile: bool
+            True to profile calls, False to stop & drop the recorded calls
+        """
+        if not profile:
+            self.profiler = None
+        elif self.profiler is None:
+            self.profiler = Profiler()
+
+    def get_profile(self, calls: bool = False) -> Union[pd.DataFrame, List[Dict]]:
+        """Returns the phase breakdown of the calls profiled so far
+
+        :param calls: bool
+            True for the breakdown of every call, False for totals per method
+        :return: DataFrame of seconds per phase indexed by method or list of calls
+        :raises RuntimeError if profiling is off
+        """
+        if self.profiler is None:
+            raise RuntimeError('Profiling is off, enable it with set_profiling(True)')
+        return self.profiler.get_calls() if calls else self.profiler.summary()
+
+    def get_metrics_labels(self, endpoint_url: str,
+                           params: Dict = None) -> Tuple[str, str]:  # pylint: disable=unused-argument
+        """Returns the host & endpoint a request's metrics are recorded under,
+        connectors serving several actions from one URL override this
+
+        :param endpoint_url: str
+            URL API string.
+        :param params: dict
+            Dictionary of query parameters.
+        :return: (host, endpoint) tuple
+        """
+        return split_endpoint(endpoint_url)
+
+    def set_cache_ttl(self, url: str, ttl: Optional[float], params: Dict = None,
+                      prefix: bool = False) -> None:
+        """Sets how long responses from an endpoint are cached by this loader,
+        TTLs set on the ResponseCache itself take precedence
+
+        :param url: str
+            URL of the endpoint (i.e. https://api.llama.fi/protocols)
+        :param ttl: float
+            Seconds to keep responses, 0 disables caching & None never expires
+        :param params: dict
+            Query parameters the request must have, to target one action of a shared URL
+        :param prefix: bool
+            Apply the TTL to every URL starting with url
+        """
+        self.cache_ttls.append((url, dict(params or {}), ttl, prefix))
+
+    def get_cache_ttl(self, endpoint_url: str, params: Dict = None) -> Optional[float]:
+        """Returns how long a response is cached for, 0 when it isn't
+
+        :param endpoint_url: str
+            URL API string.
+        :param params: dict
+            Dictionary of query parameters.
+        :return: Seconds, None for responses that never expire
+        """
+        if self.cache is None:
+            return 0
+        return self.cache.get_ttl(endpoint_url, params, self.cache_ttls)
+
+    def decode_cached(self, endpoint_url: str, params: Optional[Dict], cached: str) -> Dict:
+        """Records a cache hit & decodes the cached response
+
+        :param endpoint_url: str
+            URL API string.
+        :param params: dict
+            Dictionary of query parameters.
+        :param cached: str
+            Raw JSON text returned by the cache
+        :return: JSON with requested data
+        """
+        self.metrics.record_cache_hit(*self.get_metrics_labels(endpoint_url, params))
+        with phase('decode'):
+            return json.loads(cached)
+
+    @staticmethod
+    def get_flight_key(endpoint_url: str, params: Optional[Dict],
+                       headers: Optional[Dict]) -> str:
+        """Returns the key identical in-flight requests are coalesced under"""
+        # Credentials are part of the key so callers with different keys don't share errors
+        return make_cache_key(endpoint_url, params, headers, keep_secrets=True)
+
+    def is_cacheable(self, response: Dict) -> bool:  # pylint: disable=unused-argument
+        """Returns whether a successful response can be cached,
+        connectors whose APIs report errors with a 200 override this
+
+        :param response: dict
+            JSON response
+        :return: bool
+        """
+        return True
+
+    def is_quota_error(self, response: Dict) -> bool:  # pylint: disable=unused-argument
+        """Returns whether a 200 response reports that the API key is over its quota,
+        connectors whose APIs report quota errors in the body override this
+
+        :param response: dict
+            JSON response
+        :return: bool
+        """
+        return False
+
+    def should_cache(self, ttl: Optional[float], response: Dict) -> bool:
+        """Returns whether a successful response is stored in the cache"""
+        return ttl != 0 and self.is_cacheable(response)
+
+    def uses_host_limit(self, key: Optional[APIKey]) -> bool:
+        """Returns whether a request waits for the host's rate limit, not only for its key's"""
+        return key is None or not self.key_pool.throttled
+
+    def get_adaptive_limit(self, endpoint_url: str) -> Optional[AdaptiveLimit]:
+        """Returns the adaptive concurrency limit of a URL's host, None without a controller"""
+        if self.concurrency is None:
+            return None
+        return self.concurrency.get_limit(endpoint_url)
+
+    def release_slot(self, host: str, held: HeldSlot, status_code: Optional[int],
+                     latency: float) -> None:
+        """Hands a slot back, adapting the host's limit to the outcome of the attempt
+
+        :param host: str
+            Host the metrics are recorded under
+        :param held: tuple
+            Returned by acquire_slot
+        :param status_code: int
+            HTTP status, None for connection errors & timeouts
+        :param latency: float
+            Seconds the attempt took
+        """
+        if held is None:
+            return
+        limit, slot = held
+        limit.release(slot, status_code, latency)
+        self.metrics.record_concurrency(host, limit.get_limit(), limit.in_flight)
+
+    def collect_results(self, items: List[Hashable], outcomes: List[Tuple],
+                        failed: Optional[Dict]) -> Dict:
+        """Keys the results of a fan out by item & records its failures
+
+        :param items: list
+            Unique items of the fan out
+        :param outcomes: list
+            (result, exception or None) of every item, in order
+        :param failed: dict
+            Collects the {item: exception} failures of the call
+        :return: Dict of {item: result} of the items that didn't fail
+        :raises the first failure if every item failed
+        """
+        failures = {}
+        response_data = {}
+        for item, (result, error) in zip(items, outcomes):
+            if error is None:
+                response_data[item] = result
+            else:
+                logging.warning('Failed to get data for %s: %s', item, error)
+                failures[item] = error
+        if failed is not None:
+            failed.update(failures)
+        self.failed_items = failures
+        if items and not response_data:
+            raise next(iter(failures.values()))
+        return response_data
+
+    @staticmethod
+    def has_next_page(page_params: Optional[Dict], pages: int, max_pages: Optional[int]) -> bool:
+        """Returns whether iter_pages requests another page"""
+        return page_params is not None and (max_pages is None or pages < max_pages)
+
+    def translate(self, input_slugs: Union[str, List]) -> Union[List, None]:
+        """Wrapper around messari.utils.validate_input,
+        validate input & translate slugs with the taxonomy dictionary
+
+        Parameters
+        ----------
+           input_slugs: str, list
+               Single input slug string or list of input slugs (i.e. bitcoin)
+
+        Returns
+        -------
+           List
+               list of validated & translated slugs
+        """
+        slugs = validate_input(input_slugs)
+
+        return [self.taxonomy_dict.translate(slug) for slug in slugs]
+
+    def reverse_translate(self, input_ids: Union[str, List]) -> List:
+        """Maps ids of the API back to Messari slugs with the taxonomy dictionary
+
+        Parameters
+        ----------
+           input_ids: str, list
+               Single id string or list of ids used by the API (i.e. uniswap)
+
+        Returns
+        -------
+           List
+               list of Messari slugs, ids that aren't mapped are returned as is
+        """
+        ids = validate_input(input_ids)
+        return [self.taxonomy_dict.to_messari(api_id) or api_id for api_id in ids]
+
+
+class Attempts:
+    """This class tracks the attempts of one request & decides how long to back off
+    after each failed one, raising once the retry policy gives up
+    """
+    def __init__(self, loader: LoaderBase, endpoint_url: str, params: Optional[Dict]):
+        self.loader = loader
+        self.endpoint_url = endpoint_url
+        self.host, self.endpoint = loader.get_metrics_labels(endpoint_url, params)
+        self.budget = loader.retry_policy.new_budget()
+        self.key_retried = False
+
+    def record(self, held: HeldSlot, status_code: Optional[int], latency: float,
+               size: int) -> None:
+        """Hands the slot of an attempt back & records its metrics
+
+        :param held: tuple
+            Returned by acquire_slot
+        :param status_code: int
+            HTTP status, None for connection errors & timeouts
+        :param latency: float
+            Seconds the attempt took
+        :param size: int
+            Bytes of the response body
+        """
+        self.loader.release_slot(self.host, held, status_code, latency)
+        self.loader.metrics.record_request(self.host, self.endpoint, status_code, latency, size)
+
+    def is_answer(self, key: Optional[APIKey], response: Dict) -> bool:
+        """Returns whether a 200 response is the answer rather than a quota error of key"""
+        return key is None or not self.loader.is_quota_error(response)
+
+    def error_delay(self, error: Exception, deadline: Deadline = None) -> float:
+        """Returns the backoff after a connection error or timeout
+
+        :param error: Exception
+            Error raised by the HTTP client
+        :param deadline: Deadline
+            Budget of the running call
+        :return: Seconds to wait before the next attempt
+        :raises SystemError once retries are spent
+        """
+        if deadline is not None:
+            deadline.check()
+        delay = self.budget.next_delay()
+        if delay is None:
+            raise SystemError(error) from error
+        self.loader.metrics.record_retry(self.host, self.endpoint, None)
+        return delay
+
+    def status_delay(self, key: Optional[APIKey], status_code: int,
+                     retry_after: Optional[str]) -> float:
+        """Returns the backoff after an error status, benching key if it is to blame
+
+        :param key: APIKey
+            Key the request was sent with, None without a key pool
+        :param status_code: int
+            HTTP status, 429 for quota errors reported in the body
+        :param retry_after: str
+            Raw Retry-After header
+        :return: Seconds to wait before the next attempt
+        :raises QueryFailedError once retries are spent
+        """
+        key_pool = self.loader.key_pool
+        switched = key is not None and key_pool.report(key, status_code, retry_after)
+        if switched and status_code in INVALID_STATUSES and not self.key_retried:
+            # The policy doesn't retry auth errors, give another key one try
+            self.key_retried = True
+            delay = 0.0
+        else:
+            delay = self.budget.next_delay(status_code, '0' if switched else retry_after)
+            if delay is None:
+                raise QueryFailedError(status_code, self.endpoint_url)
+        self.loader.metrics.record_retry(self.host, self.endpoint, status_code)
+        return delay
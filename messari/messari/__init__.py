@@ -1,4 +1,9 @@
 """Module to handle initialization, imports, for Messari class"""
 
+from messari.lazy import lazy_exports
 
-from .messari import *
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    'Messari': '.messari',
+    'AsyncMessari': '.asyncmessari',
+    'TimeseriesStore': '.timeseriesstore',
+})
@@ -0,0 +1,395 @@
+"""This module is meant to contain the AsyncMessari class"""
+
+from typing import AsyncIterator, Union, List, Dict, Tuple
+import pandas as pd
+
+from messari.asyncdataloader import AsyncDataLoader
+from messari.keypool import make_key_pool, first_key, get_limit_id
+from messari.metrics import url_template
+from messari.profiling import profiled
+from messari.pagination import PagePaginator
+from messari.utils import validate_input, flatten_record, records_to_dataframe, \
+    unpack_list_of_dicts
+from .helpers import fields_payload, all_assets_payload, get_timeseries_windows, \
+    collect_timeseries, metric_timeseries_to_dataframe, metrics_timeseries_to_dataframe
+from .timeseriesstore import TimeseriesStore
+from .messari import BASE_URL, BASE_URL_V1, BASE_URL_V2, BASE_URL_MARKETS, \
+    RATE_LIMIT_CALLS, RATE_LIMIT_CALLS_API_KEY, RATE_LIMIT_PERIOD, MAX_PAGE_SIZE
+
+
+class AsyncMessari(AsyncDataLoader):
+    """This class is an asyncio wrapper around the Messari API,
+    every method is a coroutine returning the same data as its Messari counterpart
+    """
+    def __init__(self, api_key: Union[str, List[str]] = None):
+        messari_api_key = {'x-messari-api-key': first_key(api_key)}
+        AsyncDataLoader.__init__(self, api_dict=messari_api_key, taxonomy_dict=None)
+        self.timeseries_store = None
+        # Keyed & keyless instances are allowed different limits, keep every key's apart
+        key = first_key(api_key)
+        self.rate_limit_scope = get_limit_id(key) if key else None
+        calls = RATE_LIMIT_CALLS_API_KEY if key else RATE_LIMIT_CALLS
+        self.rate_limiter.set_default(BASE_URL, calls, RATE_LIMIT_PERIOD,
+                                      scope=self.rate_limit_scope)
+        # A list of keys is rotated, each key getting the API key limit
+        self.set_key_pool(make_key_pool(api_key, 'x-messari-api-key', location='headers',
+                                        calls=RATE_LIMIT_CALLS_API_KEY, period=RATE_LIMIT_PERIOD))
+
+    #######################
+    # markets
+    #######################
+    @profiled
+    async def get_all_markets(self, page: int = 1, limit: int = 20,
+                              to_dataframe: bool = True) -> Union[List[Dict], pd.DataFrame]:
+        """Get the list of all exchanges and pairs that our
+        WebSocket-based market real-time market data API supports.
+
+        Parameters
+        ----------
+            page: int
+                Page number starting at 1. Increment value to paginate through results.
+            limit: int
+                Limit of assets to return. Default is 20, max value is 500.
+            to_dataframe: bool
+                Return data as DataFrame or list of dictionaries. Default is set to DataFrame.
+
+        Returns
+        -------
+            list, DataFrame
+                List of dictionaries or pandas DataFrame of markets indexed by exchange slug.
+        """
+        payload = {'page': page, 'limit': limit}
+        response_data = await self.get_response(BASE_URL_MARKETS, params=payload,
+                                                headers=self.api_dict)
+        if to_dataframe:
+            return pd.DataFrame(response_data['data']).set_index('exchange_slug')
+        return response_data['data']
+
+    async def iter_all_markets(self, page_size: int = MAX_PAGE_SIZE,
+                         prefetch: bool = True) -> AsyncIterator[Dict]:
+        """Lazily yields every market, walking all the pages of get_all_markets.
+
+        Parameters
+        ----------
+            page_size: int
+                Number of markets requested per page. Default & max value is 500.
+            prefetch: bool
+                Request the next page while the current one is being consumed.
+
+        Returns
+        -------
+            AsyncIterator
+                Market dictionaries
+        """
+        paginator = PagePaginator(records_key='data', page_size=page_size)
+        async for record in self.iter_records(BASE_URL_MARKETS, paginator, params={},
+                                              headers=self.api_dict, prefetch=prefetch):
+            yield record
+
+    #######################
+    # assets
+    #######################
+    @profiled
+    async def get_all_assets(self, page: int = 1, limit: int = 20,
+                             asset_fields: Union[str, List] = None,
+                             asset_metric: str = None, asset_profile_metric: str = None,
+                             to_dataframe: bool = None) -> Union[Dict, pd.DataFrame]:
+        """Get the paginated list of all assets including metrics and profile.
+
+        See Messari.get_all_assets for the available fields & metrics.
+
+        Parameters
+        ----------
+            page: int
+                Page number starting at 1. Increment value to paginate through results.
+            limit: int
+                Limit of assets to return. Default is 20, max value is 500.
+            asset_fields: str, list
+                Single filter string or list of fields to filter data.
+            asset_metric: str
+                Single metric string to filter metric data.
+            asset_profile_metric: str
+                Single profile metric string to filter profile data.
+            to_dataframe: bool
+                Return data as pandas DataFrame or JSON. Default is set to JSON.
+
+        Returns
+        -------
+            dict, DataFrame
+                Dictionary or pandas DataFrame of asset data.
+        """
+        payload = all_assets_payload(page=page, limit=limit, asset_fields=asset_fields,
+                                     asset_metric=asset_metric,
+                                     asset_profile_metric=asset_profile_metric,
+                                     to_dataframe=to_dataframe)
+        response_data = await self.get_response(BASE_URL_V2, params=payload,
+                                                headers=self.api_dict)
+        response_data = unpack_list_of_dicts(response_data['data'])
+        if to_dataframe:
+            return records_to_dataframe(response_data)
+        return response_data
+
+    async def iter_all_assets(self, asset_fields: Union[str, List] = None,
+                        asset_metric: str = None, asset_profile_metric: str = None,
+                        page_size: int = MAX_PAGE_SIZE, prefetch: bool = True) -> AsyncIterator[Dict]:
+        """Lazily yields every asset, walking all the pages of get_all_assets
+        without holding more than two pages in memory.
+
+        Parameters
+        ----------
+            asset_fields: str, list
+                Single filter string or list of fields to filter data.
+            asset_metric: str
+                Single metric string to filter metric data.
+            asset_profile_metric: str
+                Single profile metric string to filter profile data.
+            page_size: int
+                Number of assets requested per page. Default & max value is 500.
+            prefetch: bool
+                Request the next page while the current one is being consumed.
+
+        Returns
+        -------
+            AsyncIterator
+                Asset dictionaries
+        """
+        payload = all_assets_payload(page=1, limit=page_size, asset_fields=asset_fields,
+                                     asset_metric=asset_metric,
+                                     asset_profile_metric=asset_profile_metric)
+        paginator = PagePaginator(records_key='data', page_size=page_size)
+        async for record in self.iter_records(BASE_URL_V2, paginator, params=payload,
+                                              headers=self.api_dict, prefetch=prefetch):
+            yield record
+
+    @profiled
+    async def get_asset(self, asset_slugs: Union[str, List], asset_fields: Union[str, List] = None,
+                        to_dataframe: bool = True) -> Union[Dict, pd.DataFrame]:
+        """Get basic metadata for an asset.
+
+        Parameters
+        ----------
+        asset_slugs: str, list
+            Single asset slug string or list of asset slugs (i.e. bitcoin).
+        asset_fields: str, list
+            Single filter string or list of fields to filter data.
+        to_dataframe: bool
+            Return data as DataFrame or JSON. Default is set to DataFrame.
+
+        Returns
+        -------
+        dict, DataFrame
+            Dictionary or pandas DataFrame with asset metadata.
+        """
+        asset_slugs = validate_input(asset_slugs)
+        payload = {}
+        if asset_fields:
+            payload['fields'] = fields_payload(asset_fields=asset_fields)
+        base_url_template = url_template(f'{BASE_URL_V1}/$asset_key')
+
+        async def get_asset_data(asset: str) -> Dict:
+            url = base_url_template.substitute(asset_key=asset)
+            response = await self.get_response(url, params=payload, headers=self.api_dict)
+            return response['data']
+
+        response_data = await self.fan_out(get_asset_data, asset_slugs)
+
+        if to_dataframe:
+            return records_to_dataframe(response_data)
+        return {asset: flatten_record(data) for asset, data in response_data.items()}
+
+    @profiled
+    async def get_asset_profile(self, asset_slugs: Union[str, List],
+                                asset_profile_metric: str = None) -> Dict:
+        """Get all the qualitative information for an asset.
+
+        Parameters
+        ----------
+            asset_slugs: str, list
+                Single asset slug string or list of asset slugs (i.e. bitcoin).
+            asset_profile_metric: str
+                Single profile metric string to filter profile data.
+
+        Returns
+        -------
+            dict
+                Dictionary with asset profile data
+        """
+        asset_slugs = validate_input(asset_slugs)
+        payload = {}
+        if asset_profile_metric:
+            payload['fields'] = fields_payload(asset_fields='id',
+                                               asset_profile_metric=asset_profile_metric)
+        base_url_template = url_template(f'{BASE_URL_V2}/$asset_key/profile')
+
+        async def get_profile_data(asset: str) -> Dict:
+            url = base_url_template.substitute(asset_key=asset)
+            response = await self.get_response(url, params=payload, headers=self.api_dict)
+            return flatten_record(response['data'])
+
+        return await self.fan_out(get_profile_data, asset_slugs)
+
+    @profiled
+    async def get_asset_metrics(self, asset_slugs: Union[str, List],
+                                asset_metric: str = None,
+                                to_dataframe: bool = True) -> Union[Dict, pd.DataFrame]:
+        """Get all the quantitative metrics for an asset.
+
+        Parameters
+        ----------
+            asset_slugs: str, list
+                Single asset slug string or list of asset slugs (i.e. bitcoin).
+            asset_metric: str
+                Single metric string to filter metric data.
+            to_dataframe: bool
+                Return data as DataFrame or JSON. Default is set to DataFrame.
+
+        Returns
+        -------
+            dict, DataFrame
+                Dictionary or pandas DataFrame with asset metric data.
+        """
+        asset_slugs = validate_input(asset_slugs)
+        payload = {}
+        if asset_metric:
+            payload['fields'] = f'id,symbol,{asset_metric}'
+        base_url_template = url_template(f'{BASE_URL_V1}/$asset_key/metrics')
+
+        async def get_metrics_data(asset: str) -> Dict:
+            url = base_url_template.substitute(asset_key=asset)
+            response = await self.get_response(url, params=payload, headers=self.api_dict)
+            return response['data']
+
+        response_data = await self.fan_out(get_metrics_data, asset_slugs)
+        if to_dataframe:
+            return records_to_dataframe(response_data)
+        return {asset: flatten_record(data) for asset, data in response_data.items()}
+
+    @profiled
+    async def get_asset_market_data(self, asset_slugs: Union[str, List],
+                                    to_dataframe: bool = True) -> Union[Dict, pd.DataFrame]:
+        """Get the latest market data for an asset.
+
+        Parameters
+        ----------
+            asset_slugs: str, list
+                Single asset slug string or list of asset slugs (i.e. bitcoin).
+            to_dataframe: bool
+                Return data as DataFrame or JSON. Default is set to DataFrame.
+
+        Returns
+        -------
+            dict, DataFrame
+                Dictionary or pandas DataFrame with asset market data.
+        """
+        return await self.get_asset_metrics(asset_slugs=asset_slugs,
+                                            asset_metric='market_data',
+                                            to_dataframe=to_dataframe)
+
+    ##############################
+    # timeseries
+    ##############################
+    def set_timeseries_store(self, timeseries_store: TimeseriesStore) -> None:
+        """Sets the store metric timeseries are kept in. get_metric_timeseries then
+        only fetches the part of a start/end range missing from it
+
+        :param timeseries_store: TimeseriesStore
+            Persistent store, None disables it
+        """
+        self.timeseries_store = timeseries_store
+
+    @profiled
+    async def get_metric_timeseries(self, asset_slugs: Union[str, List], asset_metric: str,
+                                    start: str = None, end: str = None, interval: str = '1d',
+                                    to_dataframe: bool = True) -> Union[Dict, pd.DataFrame]:
+        """Retrieve historical timeseries data for an asset.
+
+        See Messari.get_metric_timeseries for the available metrics & intervals,
+        ranges longer than 2016 points are fetched in windows & stitched together.
+
+        Parameters
+        ----------
+            asset_slugs: str, list
+                Single asset slug string or list of asset slugs (i.e. bitcoin).
+            asset_metric: str
+                Single metric string to filter timeseries data.
+            start: str
+                Starting date string for timeseries data.
+            end: str
+                Ending date string for timeseries data.
+            interval: str
+                Interval of timeseries data. Default value is set to 1d.
+            to_dataframe: bool
+                Return data as DataFrame or JSON. Default is set to DataFrame.
+
+        Returns
+        -------
+            dict, DataFrame
+                Dictionary or pandas DataFrame of asset data.
+        """
+        asset_slugs = validate_input(asset_slugs)
+        response_data = (await self.get_metrics_timeseries(
+            asset_slugs, asset_metric, start=start, end=end, interval=interval,
+            to_dataframe=False))[asset_metric]
+
+        if not to_dataframe:
+            return response_data
+        return metric_timeseries_to_dataframe(response_data, asset_metric)
+
+    @profiled
+    async def get_metrics_timeseries(self, asset_slugs: Union[str, List],
+                                     asset_metrics: Union[str, List], start: str = None,
+                                     end: str = None, interval: str = '1d',
+                                     to_dataframe: bool = True,
+                                     wide: bool = True) -> Union[Dict, pd.DataFrame]:
+        """Retrieve historical timeseries data for several metrics & assets at once.
+
+        See Messari.get_metrics_timeseries, every window of every asset & metric
+        is requested concurrently under the rate limiter.
+
+        Parameters
+        ----------
+            asset_slugs: str, list
+                Single asset slug string or list of asset slugs (i.e. bitcoin).
+            asset_metrics: str, list
+                Single metric string or list of metrics (i.e. price, real.vol).
+            start: str
+                Starting date string for timeseries data.
+            end: str
+                Ending date string for timeseries data.
+            interval: str
+                Interval of timeseries data. Default value is set to 1d.
+            to_dataframe: bool
+                Return data as DataFrame or JSON. Default is set to DataFrame.
+            wide: bool
+                Return a frame with (asset, metric) columns or a long frame.
+                Default is set to wide.
+
+        Returns
+        -------
+            dict, DataFrame
+                Dictionary of asset data keyed by metric & asset or pandas DataFrame.
+        """
+        asset_slugs = validate_input(asset_slugs)
+        asset_metrics = validate_input(asset_metrics)
+        store = self.timeseries_store
+        windows = get_timeseries_windows(asset_slugs, asset_metrics, start=start, end=end,
+                                         interval=interval, store=store)
+        base_url_template = url_template(f'{BASE_URL}/$asset_key/metrics/$metric/time-series')
+
+        async def get_timeseries_data(item: Tuple[str, str, int]) -> Dict:
+            metric, asset, window = item
+            url = base_url_template.substitute(asset_key=asset, metric=metric)
+            response = await self.get_response(url, params=windows[metric][asset][window],
+                                               headers=self.api_dict)
+            return flatten_record(response['data'])
+
+        items = [(metric, asset, window) for metric, metric_windows in windows.items()
+                 for asset, asset_windows in metric_windows.items()
+                 for window in range(len(asset_windows))]
+        results = await self.fan_out(get_timeseries_data, items) if items else {}
+        response_data = collect_timeseries(results, windows, start=start, end=end,
+                                           interval=interval, store=store)
+
+        if not to_dataframe:
+            return response_data
+        return metrics_timeseries_to_dataframe(response_data, wide=wide)
@@ -2,10 +2,22 @@
 
 
 import logging
-from typing import Union, List, Dict
+from itertools import zip_longest
+from typing import Union, List, Dict, Hashable, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 from messari.utils import validate_input, validate_asset_fields_list_order, find_and_update_asset_field
+from messari.profiling import timed
+
+# Max number of points the metric timeseries endpoint returns per request
+MAX_TIMESERIES_POINTS = 2016
+
+# Length of every timeseries interval
+INTERVAL_DELTAS = {'1m': pd.Timedelta(minutes=1), '5m': pd.Timedelta(minutes=5),
+                   '15m': pd.Timedelta(minutes=15), '30m': pd.Timedelta(minutes=30),
+                   '1h': pd.Timedelta(hours=1), '1hr': pd.Timedelta(hours=1),
+                   '1d': pd.Timedelta(days=1), '1w': pd.Timedelta(weeks=1)}
 
 
 def fields_payload(asset_fields: Union[str, List],
@@ -43,26 +55,456 @@ def fields_payload(asset_fields: Union[str, List],
     return ','.join(asset_fields)
 
 
+def all_assets_payload(page: int, limit: int, asset_fields: Union[str, List] = None,
+                       asset_metric: str = None, asset_profile_metric: str = None,
+                       to_dataframe: bool = None) -> Dict:
+    """Returns query parameters for the all assets endpoint.
+
+    A DataFrame can only be returned when metric data is requested, so the
+    fields are narrowed down to metrics when to_dataframe is set.
+
+    :param page: int
+        Page number starting at 1.
+    :param limit: int
+        Limit of assets to return.
+    :param asset_fields: str, list
+        List of asset fields.
+    :param asset_metric: str
+        Single metric string to filter metric data.
+    :param asset_profile_metric: str
+        Single profile metric string to filter profile data.
+    :param to_dataframe: bool
+        Whether the response will be returned as a DataFrame.
+    :return: Dictionary of query parameters.
+    :raises ValueError if a DataFrame is requested for non metric data
+    """
+    payload = {'page': page, 'limit': limit}
+    if asset_fields:
+        payload['fields'] = fields_payload(asset_fields=asset_fields, asset_metric=asset_metric,
+                                           asset_profile_metric=asset_profile_metric)
+    if not to_dataframe:
+        return payload
+
+    # DataFrame can't be returned because profile data has been requested.
+    if asset_profile_metric:
+        raise ValueError('Profile data can only be returned as JSON. '
+                         'Only asset metric data can be returned as DataFrame.')
+
+    # DataFrame can be returned because only metrics has been requested
+    if asset_metric and not asset_fields:
+        asset_fields = ['metrics']
+        payload['fields'] = fields_payload(asset_fields=asset_fields,
+                                           asset_metric=asset_metric)
+    # DataFrame can be returned because only metrics has been requested
+    elif asset_fields and all(elem == 'metrics' for elem in asset_fields):
+        # If asset metric is supplied, filter data based on metric
+        if asset_metric:
+            payload['fields'] = fields_payload(asset_fields=asset_fields,
+                                               asset_metric=asset_metric)
+        # Else return all metrics
+        else:
+            payload['fields'] = fields_payload(asset_fields=asset_fields)
+    else:
+        raise ValueError(
+            'Only asset metrics can be returned as DataFrame. Make sure only '
+            'metrics is specified in asset fields.')
+    return payload
+
+
+def timeseries_payload(start: str = None, end: str = None, interval: str = '1d') -> Dict:
+    """Returns query parameters for the metric timeseries endpoint.
+
+    :param start: str
+        Starting date string for timeseries data.
+    :param end: str
+        Ending date string for timeseries data.
+    :param interval: str
+        Interval of timeseries data.
+    :return: Dictionary of query parameters.
+    :raises ValueError if start is given without end
+    """
+    payload = {'interval': interval}
+    if start:
+        if not end:
+            raise ValueError('End date must be provided')
+        payload['start'] = start
+        payload['end'] = end
+    return payload
+
+
+def to_utc(date: str) -> pd.Timestamp:
+    """Parses a date string into a naive UTC timestamp"""
+    timestamp = pd.Timestamp(date)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return timestamp
+
+
+def format_timestamp(timestamp: pd.Timestamp, dates_only: bool) -> str:
+    """Formats a window boundary the way the timeseries endpoint expects it"""
+    if dates_only:
+        return timestamp.strftime('%Y-%m-%d')
+    return timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def split_timeseries_payload(start: str = None, end: str = None, interval: str = '1d',
+                             max_points: int = MAX_TIMESERIES_POINTS) -> List[Dict]:
+    """Returns the query parameters of every window a timeseries range is split into,
+    each window spanning at most max_points intervals.
+
+    Windows are inclusive of both boundaries, so consecutive windows start one
+    interval apart & every point of the range is requested exactly once.
+    Ranges without a start or with an unknown interval are requested in one go.
+
+    :param start: str
+        Starting date string for timeseries data.
+    :param end: str
+        Ending date string for timeseries data.
+    :param interval: str
+        Interval of timeseries data.
+    :param max_points: int
+        Max number of points of a window.
+    :return: List of query parameter dictionaries, in chronological order.
+    :raises ValueError if start is given without end
+    """
+    payload = timeseries_payload(start=start, end=end, interval=interval)
+    step = INTERVAL_DELTAS.get(interval)
+    if not start or step is None:
+        return [payload]
+
+    first, last = to_utc(start), to_utc(end)
+    dates_only = all(value.normalize() == value for value in (first, last)) and \
+        step >= pd.Timedelta(days=1)
+    span = step * (max_points - 1)
+    payloads = []
+    window_start = first
+    while window_start <= last:
+        window_end = min(window_start + span, last)
+        payloads.append(timeseries_payload(start=format_timestamp(window_start, dates_only),
+                                           end=format_timestamp(window_end, dates_only),
+                                           interval=interval))
+        window_start = window_end + step
+    return payloads or [payload]
+
+
+def merge_timeseries(chunks: List[Dict]) -> Dict:
+    """Stitches the flattened responses of consecutive windows of one asset's timeseries.
+
+    Points are de-duplicated on their timestamp, the latest window winning,
+    and sorted in chronological order.
+
+    :param chunks: list
+        Flattened timeseries data of each window, in chronological order
+    :return: Flattened timeseries data of the whole range
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+    points = {}
+    for chunk in chunks:
+        for point in chunk.get('values') or []:
+            points[point[0]] = point
+    merged = dict(chunks[0])
+    merged['values'] = [points[timestamp] for timestamp in sorted(points)] if points else None
+    if 'parameters_end' in chunks[-1]:
+        merged['parameters_end'] = chunks[-1]['parameters_end']
+    return merged
+
+
+def stitch_timeseries(results: Dict[Tuple[str, int], Dict]) -> Dict[str, Dict]:
+    """Groups the windows fetched for every asset & merges them
+
+    :param results: dict
+        Flattened timeseries data keyed by (asset, window index), in order
+    :return: Flattened timeseries data keyed by asset
+    """
+    chunks: Dict[Hashable, List[Dict]] = {}
+    for (asset, _), chunk in results.items():
+        chunks.setdefault(asset, []).append(chunk)
+    return {asset: merge_timeseries(asset_chunks) for asset, asset_chunks in chunks.items()}
+
+
+def get_timeseries_windows(asset_slugs: List[str], asset_metrics: List[str], start: str = None,
+                           end: str = None, interval: str = '1d',
+                           store=None) -> Dict[str, Dict[str, List[Dict]]]:
+    """Returns the query parameters of every window to fetch for every metric & asset.
+
+    With a store, only the head & tail of the range missing from it are fetched.
+
+    :param asset_slugs: list
+        Asset slugs
+    :param asset_metrics: list
+        Metric ids
+    :param start: str
+        Starting date string for timeseries data.
+    :param end: str
+        Ending date string for timeseries data.
+    :param interval: str
+        Interval of timeseries data.
+    :param store: messari.messari.TimeseriesStore
+        Store the timeseries are kept in, None to fetch every window
+    :return: Dict of {metric: {asset: [query parameters]}}
+    :raises ValueError if start is given without end
+    """
+    # Checks the range before a store turns it into windows
+    timeseries_payload(start=start, end=end, interval=interval)
+    if store is not None and store.is_storable(start, interval):
+        return {metric: store.get_windows(asset_slugs, metric, start, end, interval)
+                for metric in asset_metrics}
+    payloads = split_timeseries_payload(start=start, end=end, interval=interval)
+    return {metric: {asset: payloads for asset in asset_slugs} for metric in asset_metrics}
+
+
+def collect_timeseries(results: Dict[Tuple[str, str, int], Dict],
+                       windows: Dict[str, Dict[str, List[Dict]]], start: str = None,
+                       end: str = None, interval: str = '1d',
+                       store=None) -> Dict[str, Dict[str, Dict]]:
+    """Stitches the windows fetched for every metric & asset, storing them if a store is set.
+
+    An asset some windows failed for is left out rather than returned with a gap,
+    like assets whose every window failed. Without a store it is logged & dropped,
+    the failed windows are in the loader's failed_items.
+
+    :param results: dict
+        Flattened timeseries data keyed by (metric, asset, window index), in order
+    :param windows: dict
+        Windows returned by get_timeseries_windows
+    :param start: str
+        Starting date string for timeseries data.
+    :param end: str
+        Ending date string for timeseries data.
+    :param interval: str
+        Interval of timeseries data.
+    :param store: messari.messari.TimeseriesStore
+        Store the timeseries are kept in, None if they aren't
+    :return: Flattened timeseries data keyed by metric & asset
+    """
+    metric_results: Dict[str, Dict[Tuple[str, int], Dict]] = {metric: {} for metric in windows}
+    for (metric, asset, window), data in results.items():
+        metric_results[metric][(asset, window)] = data
+    if store is not None and store.is_storable(start, interval):
+        return {metric: store.update(metric, start, end, interval, windows[metric],
+                                     metric_results[metric])
+                for metric in windows}
+    return {metric: stitch_complete(metric, windows[metric], metric_results[metric])
+            for metric in windows}
+
+
+def stitch_complete(metric: str, windows: Dict[str, List[Dict]],
+                    results: Dict[Tuple[str, int], Dict]) -> Dict[str, Dict]:
+    """Stitches the assets every window of which was fetched
+
+    :param metric: str
+        Metric id, for logging
+    :param windows: dict
+        Windows of every asset, returned by get_timeseries_windows
+    :param results: dict
+        Flattened timeseries data keyed by (asset, window index), in order
+    :return: Flattened timeseries data keyed by asset
+    """
+    stitched = stitch_timeseries(results)
+    response_data = {}
+    for asset, data in stitched.items():
+        received = sum(1 for key in results if key[0] == asset)
+        if received == len(windows[asset]):
+            response_data[asset] = data
+        else:
+            logging.warning('Dropping the %s timeseries of %s, %d of its %d windows failed',
+                            metric, asset, len(windows[asset]) - received, len(windows[asset]))
+    return response_data
+
+
+def decode_timeseries(value: Dict) -> Optional[Tuple[List[str], np.ndarray, List[List]]]:
+    """Decodes the timestamps of a flattened timeseries into a NumPy array
+
+    :param value: dict
+        Flattened timeseries data of one asset
+    :return: (value column names, int64 unix milliseconds, raw values),
+        None if the data is missing
+    """
+    values = value.get('values')
+    if not isinstance(values, list) or not values:
+        return None
+    timestamps = np.fromiter((point[0] for point in values), dtype='int64', count=len(values))
+    return list(value['parameters_columns'][1:]), timestamps, values
+
+
+def decode_column(column: Tuple) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    """Decodes one value column with the dtype DataFrame.from_records would give it,
+    NumPy reads numbers (numbers mixed with booleans are read as numbers), pandas the rest
+    """
+    points = np.array(column)
+    if points.dtype.kind in 'bif':
+        return points
+    # None in a numeric column becomes NaN, text & mixed values stay as they are
+    return pd.Series(column).array
+
+
+def decode_points(values: List[List], width: int) -> List:
+    """Decodes the first width value columns of a timeseries, one column at a time.
+
+    Int columns stay int, None becomes NaN in numeric columns & short rows are padded
+    with None, like DataFrame.from_records.
+
+    :param values: list
+        Raw [timestamp, value, ...] points
+    :param width: int
+        Number of value columns
+    :return: List of width arrays
+    """
+    columns = list(zip_longest(*values))[1:width + 1]
+    columns.extend([(None,) * len(values)] * (width - len(columns)))
+    return [decode_column(column) for column in columns]
+
+
+def build_timeseries_frame(series: List[Tuple[Tuple, List[str], np.ndarray, List[List]]],
+                           names: List, drop_field: bool = False) -> pd.DataFrame:
+    """Aligns every series on the union of their timestamps & builds one DataFrame,
+    the frame concatenating one DataFrame per series would give
+
+    Values are decoded one series at a time. While every column is float they are written
+    into one preallocated array wrapped without a copy, other dtypes are kept per column.
+    Columns of series missing some timestamps are aligned with NaN, so their int columns
+    become float like with pd.concat.
+
+    :param series: list
+        (column labels, value column names, timestamps, raw values) of every series,
+        in column order
+    :param names: list
+        Names of the column levels
+    :param drop_field: bool
+        Leave the value column names out of the column labels
+    :return: pandas dataframe indexed by timestamp
+    """
+    if not series:
+        return pd.DataFrame()
+    index = np.unique(np.concatenate([timestamps for _, _, timestamps, _ in series]))
+    width = sum(len(fields) for _, fields, _, _ in series)
+    data = np.full((len(index), width), np.nan, order='F')
+    # Columns by position once one of them isn't float, None while data holds them all
+    arrays: Optional[Dict[int, object]] = None
+    columns: List[Tuple] = []
+    for labels, fields, timestamps, values in series:
+        aligned = np.array_equal(timestamps, index)
+        positions = None if aligned else np.searchsorted(index, timestamps)
+        for field, points in zip(fields, decode_points(values, len(fields))):
+            position = len(columns)
+            columns.append(labels if drop_field else labels + (field,))
+            if arrays is None and (points.dtype.kind == 'f' or
+                                   (points.dtype.kind == 'i' and not aligned)):
+                data[slice(None) if aligned else positions, position] = points
+                continue
+            if arrays is None:
+                arrays = {column: data[:, column] for column in range(position)}
+            if not aligned:
+                points = pd.Series(points, index=timestamps).reindex(index).array
+            arrays[position] = points
+
+    if len(names) == 1:
+        column_index = pd.Index([labels[0] for labels in columns], name=names[0])
+    else:
+        column_index = pd.MultiIndex.from_tuples(columns, names=names)
+    timestamps = pd.to_datetime(index, unit='ms').rename('timestamp')
+    if arrays is None:
+        return pd.DataFrame(data, index=timestamps, columns=column_index, copy=False)
+    frame = pd.DataFrame(arrays, index=timestamps)
+    frame.columns = column_index
+    return frame
+
+
+@timed('assemble')
 def timeseries_to_dataframe(response: Dict) -> pd.DataFrame:
     """Convert timeseries data to pandas dataframe
 
+    Assets with missing data are logged & left out, an empty DataFrame is
+    returned when no asset has data.
+
     :param response: dict
         Dictionary of asset time series data keyed by symbol
+    :return: pandas dataframe with (asset, column) columns
+    """
+    series = []
+    for key, value in response.items():
+        decoded = decode_timeseries(value)
+        if decoded is None:
+            logging.warning('Missing timeseries data for %s', key)
+            continue
+        series.append(((key,),) + decoded)
+    return build_timeseries_frame(series, [None, None])
+
+
+@timed('assemble')
+def metric_timeseries_to_dataframe(response: Dict, asset_metric: str) -> pd.DataFrame:
+    """Convert metric timeseries data to pandas dataframe, dropping the
+    metric column level for every metric except price
+
+    :param response: dict
+        Dictionary of asset time series data keyed by asset
+    :param asset_metric: str
+        Metric the timeseries was requested for
     :return: pandas dataframe
     """
-    df_list, key_list = [], []
+    if asset_metric == 'price':
+        return timeseries_to_dataframe(response)
+    series = []
     for key, value in response.items():
-        if isinstance(value['values'], list):
-            key_list.append(key)
-            df_columns=[f'{name}' for name in value['parameters_columns']]
-            values_df = pd.DataFrame.from_records(value['values'], columns=df_columns)
-            values_df.set_index('timestamp', inplace=True)
-            values_df.index = pd.to_datetime(values_df.index, unit='ms', origin='unix')  # noqa
-            df_list.append(values_df)
-        else:
+        decoded = decode_timeseries(value)
+        if decoded is None:
             logging.warning('Missing timeseries data for %s', key)
-            #return pd.DataFrame()
             continue
-    # Create multindex DataFrame using list of dataframes & keys
-    metric_data_df = pd.concat(df_list, keys=key_list, axis=1)
-    return metric_data_df
+        fields, timestamps, values = decoded
+        # Only the metric's first value is kept, in one column per asset
+        series.append(((key,), fields[:1], timestamps, values))
+    return build_timeseries_frame(series, [None], drop_field=True)
+
+
+@timed('assemble')
+def metrics_timeseries_to_dataframe(response: Dict[str, Dict[str, Dict]],
+                                    wide: bool = True) -> pd.DataFrame:
+    """Convert the timeseries of several metrics & assets to a single pandas dataframe.
+
+    The wide frame has (asset, metric) columns, plus a field level when a metric
+    returns several values (i.e. price open, high, low, close & volume).
+    The long frame has one row per timestamp, asset, metric & field.
+
+    :param response: dict
+        Dictionary of flattened timeseries data keyed by metric & asset
+    :param wide: bool
+        Return a wide frame indexed by timestamp or a long frame
+    :return: pandas dataframe
+    """
+    series = []
+    for metric, metric_data in response.items():
+        for asset, value in metric_data.items():
+            decoded = decode_timeseries(value)
+            if decoded is None:
+                logging.warning('Missing %s timeseries data for %s', metric, asset)
+                continue
+            series.append(((asset, metric),) + decoded)
+    # Columns are grouped by asset, in the order assets were requested
+    asset_order = {asset: i for i, asset in
+                   enumerate(dict.fromkeys(asset for metric_data in response.values()
+                                           for asset in metric_data))}
+    series.sort(key=lambda item: asset_order[item[0][0]])
+
+    if wide:
+        drop_field = all(len(fields) == 1 for _, fields, _, _ in series)
+        names = ['asset', 'metric'] if drop_field else ['asset', 'metric', 'field']
+        return build_timeseries_frame(series, names, drop_field=drop_field)
+
+    if not series:
+        return pd.DataFrame(columns=['timestamp', 'asset', 'metric', 'field', 'value'])
+    timestamps, assets, metrics, fields, values = [], [], [], [], []
+    for (asset, metric), series_fields, series_timestamps, series_values in series:
+        points = np.column_stack([np.asarray(column)
+                                  for column in decode_points(series_values, len(series_fields))])
+        rows, width = points.shape
+        timestamps.append(np.repeat(series_timestamps, width))
+        assets.append(np.full(rows * width, asset, dtype=object))
+        metrics.append(np.full(rows * width, metric, dtype=object))
+        fields.append(np.tile(np.array(series_fields, dtype=object), rows))
+        values.append(points.ravel())
+    return pd.DataFrame({'timestamp': pd.to_datetime(np.concatenate(timestamps), unit='ms'),
+                         'asset': np.concatenate(assets),
+                         'metric': np.concatenate(metrics),
+                         'field': np.concatenate(fields),
+                         'value': np.concatenate(values)})
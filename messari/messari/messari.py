@@ -1,30 +1,55 @@
 """This module is meant to contain the Messari class"""
 
-from string import Template
-from typing import Union, List, Dict
+from typing import Iterator, Union, List, Dict, Tuple
 import pandas as pd
 
 from messari.dataloader import DataLoader
-from messari.utils import validate_input, convert_flatten, unpack_list_of_dicts
-from .helpers import fields_payload, timeseries_to_dataframe
+from messari.keypool import make_key_pool, first_key, get_limit_id
+from messari.metrics import url_template
+from messari.profiling import profiled
+from messari.pagination import PagePaginator
+from messari.utils import validate_input, flatten_record, records_to_dataframe, \
+    unpack_list_of_dicts
+from .helpers import fields_payload, all_assets_payload, get_timeseries_windows, \
+    collect_timeseries, metric_timeseries_to_dataframe, metrics_timeseries_to_dataframe
+from .timeseriesstore import TimeseriesStore
 
 BASE_URL = 'https://data.messari.io/api/v1/assets'
 BASE_URL_V1 = 'https://data.messari.io/api/v1/assets'
 BASE_URL_V2 = 'https://data.messari.io/api/v2/assets'
 BASE_URL_MARKETS = 'https://data.messari.io/api/v1/markets'
 
+# Calls allowed per minute with & without an API key
+RATE_LIMIT_CALLS = 20
+RATE_LIMIT_CALLS_API_KEY = 30
+RATE_LIMIT_PERIOD = 60
+
+# Max number of assets or markets returned per page
+MAX_PAGE_SIZE = 500
+
 
 class Messari(DataLoader):
     """This class is a wrapper around the Messari API
     """
-    def __init__(self, api_key=None):
-        messari_api_key = {'x-messari-api-key': api_key}
+    def __init__(self, api_key: Union[str, List[str]] = None):
+        messari_api_key = {'x-messari-api-key': first_key(api_key)}
         DataLoader.__init__(self, api_dict=messari_api_key, taxonomy_dict=None)
+        self.timeseries_store = None
+        # Keyed & keyless instances are allowed different limits, keep every key's apart
+        key = first_key(api_key)
+        self.rate_limit_scope = get_limit_id(key) if key else None
+        calls = RATE_LIMIT_CALLS_API_KEY if key else RATE_LIMIT_CALLS
+        self.rate_limiter.set_default(BASE_URL, calls, RATE_LIMIT_PERIOD,
+                                      scope=self.rate_limit_scope)
+        # A list of keys is rotated, each key getting the API key limit
+        self.set_key_pool(make_key_pool(api_key, 'x-messari-api-key', location='headers',
+                                        calls=RATE_LIMIT_CALLS_API_KEY, period=RATE_LIMIT_PERIOD))
         # TODO, look into super() for __init__
 
     #######################
     # markets
     #######################
+    @profiled
     def get_all_markets(self, page: int = 1, limit: int = 20, to_dataframe: bool = True) -> Union[
         List[Dict], pd.DataFrame]:
         """Get the list of all exchanges and pairs that our
@@ -50,9 +75,30 @@ class Messari(DataLoader):
             return pd.DataFrame(response_data['data']).set_index('exchange_slug')
         return response_data['data']
 
+    def iter_all_markets(self, page_size: int = MAX_PAGE_SIZE,
+                         prefetch: bool = True) -> Iterator[Dict]:
+        """Lazily yields every market, walking all the pages of get_all_markets.
+
+        Parameters
+        ----------
+            page_size: int
+                Number of markets requested per page. Default & max value is 500.
+            prefetch: bool
+                Request the next page while the current one is being consumed.
+
+        Returns
+        -------
+            Iterator
+                Market dictionaries
+        """
+        paginator = PagePaginator(records_key='data', page_size=page_size)
+        yield from self.iter_records(BASE_URL_MARKETS, paginator, params={},
+                                     headers=self.api_dict, prefetch=prefetch)
+
     #######################
     # assets
     #######################
+    @profiled
     def get_all_assets(self, page: int = 1, limit: int = 20, asset_fields: Union[str, List] = None,
                        asset_metric: str = None, asset_profile_metric: str = None,
                        to_dataframe: bool = None) -> Union[Dict, pd.DataFrame]:
@@ -124,43 +170,49 @@ class Messari(DataLoader):
             dict, DataFrame
                 Dictionary or pandas DataFrame of asset data.
         """
-        payload = {'page': page, 'limit': limit}
-        if asset_fields:
-            payload['fields'] = fields_payload(asset_fields=asset_fields, asset_metric=asset_metric,
-                                               asset_profile_metric=asset_profile_metric)
+        payload = all_assets_payload(page=page, limit=limit, asset_fields=asset_fields,
+                                     asset_metric=asset_metric,
+                                     asset_profile_metric=asset_profile_metric,
+                                     to_dataframe=to_dataframe)
+        response_data = self.get_response(BASE_URL_V2, params=payload, headers=self.api_dict)
+        response_data = unpack_list_of_dicts(response_data['data'])
         # DataFrame returned if asset metric is provided or if metrics is the only asset field
         if to_dataframe:
-            # DataFrame can't be returned because profile data has been requested.
-            if asset_profile_metric:
-                raise ValueError('Profile data can only be returned as JSON. '
-                                 'Only asset metric data can be returned as DataFrame.')
-
-            # DataFrame can be returned because only metrics has been requested
-            if asset_metric and not asset_fields:
-                asset_fields = ['metrics']
-                payload['fields'] = fields_payload(asset_fields=asset_fields,
-                                                   asset_metric=asset_metric)
-            # DataFrame can be returned because only metrics has been requested
-            elif asset_fields and all(elem == 'metrics' for elem in asset_fields):
-                # If asset metric is supplied, filter data based on metric
-                if asset_metric:
-                    payload['fields'] = fields_payload(asset_fields=asset_fields,
-                                                       asset_metric=asset_metric)
-                # Else return all metrics
-                else:
-                    payload['fields'] = fields_payload(asset_fields=asset_fields)
-            else:
-                raise ValueError(
-                    'Only asset metrics can be returned as DataFrame. Make sure only '
-                    'metrics is specified in asset fields.')
-            response_data = self.get_response(BASE_URL_V2, params=payload, headers=self.api_dict)
-            response_data = unpack_list_of_dicts(response_data['data'])
-            for key, value in response_data.items():
-                response_data[key] = convert_flatten(value)
-            return pd.DataFrame.from_dict(response_data, orient='index')
-        response_data = self.get_response(BASE_URL_V2, params=payload, headers=self.api_dict)
-        return unpack_list_of_dicts(response_data['data'])
+            return records_to_dataframe(response_data)
+        return response_data
 
+    def iter_all_assets(self, asset_fields: Union[str, List] = None,
+                        asset_metric: str = None, asset_profile_metric: str = None,
+                        page_size: int = MAX_PAGE_SIZE, prefetch: bool = True) -> Iterator[Dict]:
+        """Lazily yields every asset, walking all the pages of get_all_assets
+        without holding more than two pages in memory.
+
+        Parameters
+        ----------
+            asset_fields: str, list
+                Single filter string or list of fields to filter data.
+            asset_metric: str
+                Single metric string to filter metric data.
+            asset_profile_metric: str
+                Single profile metric string to filter profile data.
+            page_size: int
+                Number of assets requested per page. Default & max value is 500.
+            prefetch: bool
+                Request the next page while the current one is being consumed.
+
+        Returns
+        -------
+            Iterator
+                Asset dictionaries
+        """
+        payload = all_assets_payload(page=1, limit=page_size, asset_fields=asset_fields,
+                                     asset_metric=asset_metric,
+                                     asset_profile_metric=asset_profile_metric)
+        paginator = PagePaginator(records_key='data', page_size=page_size)
+        yield from self.iter_records(BASE_URL_V2, paginator, params=payload,
+                                     headers=self.api_dict, prefetch=prefetch)
+
+    @profiled
     def get_asset(self, asset_slugs: Union[str, List], asset_fields: Union[str, List] = None,
                   to_dataframe: bool = True) -> \
             Union[Dict, pd.DataFrame]:
@@ -189,19 +241,20 @@ class Messari(DataLoader):
         payload = {}
         if asset_fields:
             payload['fields'] = fields_payload(asset_fields=asset_fields)
-        base_url_template = Template(f'{BASE_URL_V1}/$asset_key')
+        base_url_template = url_template(f'{BASE_URL_V1}/$asset_key')
 
-        response_data = {}
-        for asset in asset_slugs:
+        def get_asset_data(asset: str) -> Dict:
             url = base_url_template.substitute(asset_key=asset)
             response = self.get_response(url, params=payload, headers=self.api_dict)
-            response_flat = convert_flatten(response['data'])
-            response_data[asset] = response_flat
+            return response['data']
+
+        response_data = self.fan_out(get_asset_data, asset_slugs)
 
         if to_dataframe:
-            return pd.DataFrame.from_dict(response_data, orient='index')
-        return response_data
+            return records_to_dataframe(response_data)
+        return {asset: flatten_record(data) for asset, data in response_data.items()}
 
+    @profiled
     def get_asset_profile(self, asset_slugs: Union[str, List],
                           asset_profile_metric: str = None) -> Dict:
         """Get all the qualitative information for an asset.
@@ -236,15 +289,16 @@ class Messari(DataLoader):
         if asset_profile_metric:
             payload['fields'] = fields_payload(asset_fields='id',
                                                asset_profile_metric=asset_profile_metric)
-        base_url_template = Template(f'{BASE_URL_V2}/$asset_key/profile')
-        response_data = {}
-        for asset in asset_slugs:
+        base_url_template = url_template(f'{BASE_URL_V2}/$asset_key/profile')
+
+        def get_profile_data(asset: str) -> Dict:
             url = base_url_template.substitute(asset_key=asset)
             response = self.get_response(url, params=payload, headers=self.api_dict)
-            response_flat = convert_flatten(response['data'])
-            response_data[asset] = response_flat
-        return response_data
+            return flatten_record(response['data'])
+
+        return self.fan_out(get_profile_data, asset_slugs)
 
+    @profiled
     def get_asset_metrics(self, asset_slugs: Union[str, List],
                           asset_metric: str = None, to_dataframe: bool = True) -> \
                           Union[Dict, pd.DataFrame]:
@@ -294,17 +348,19 @@ class Messari(DataLoader):
             # See inconsistent API usage example note.
             # payload['fields'] = fields_payload(asset_fields='id', asset_metric=asset_metric)
             payload['fields'] = f'id,symbol,{asset_metric}'
-        base_url_template = Template(f'{BASE_URL_V1}/$asset_key/metrics')
-        response_data = {}
-        for asset in asset_slugs:
+        base_url_template = url_template(f'{BASE_URL_V1}/$asset_key/metrics')
+
+        def get_metrics_data(asset: str) -> Dict:
             url = base_url_template.substitute(asset_key=asset)
             response = self.get_response(url, params=payload, headers=self.api_dict)
-            response_flat = convert_flatten(response['data'])
-            response_data[asset] = response_flat
+            return response['data']
+
+        response_data = self.fan_out(get_metrics_data, asset_slugs)
         if to_dataframe:
-            return pd.DataFrame.from_dict(response_data, orient='index')
-        return response_data
+            return records_to_dataframe(response_data)
+        return {asset: flatten_record(data) for asset, data in response_data.items()}
 
+    @profiled
     def get_asset_market_data(self, asset_slugs: Union[str, List],
                               to_dataframe: bool = True) -> Union[Dict, pd.DataFrame]:
         """Get the latest market data for an asset.
@@ -327,6 +383,16 @@ class Messari(DataLoader):
     ##############################
     # timeseries
     ##############################
+    def set_timeseries_store(self, timeseries_store: TimeseriesStore) -> None:
+        """Sets the store metric timeseries are kept in. get_metric_timeseries then
+        only fetches the part of a start/end range missing from it
+
+        :param timeseries_store: TimeseriesStore
+            Persistent store, None disables it
+        """
+        self.timeseries_store = timeseries_store
+
+    @profiled
     def get_metric_timeseries(self, asset_slugs: Union[str, List], asset_metric: str,
                               start: str = None, end: str = None, interval: str = '1d',
                               to_dataframe: bool = True) -> Union[Dict, pd.DataFrame]:
@@ -503,11 +569,13 @@ class Messari(DataLoader):
             interval: str
                 Interval of timeseries data. Default value is set to 1d.
 
-                For any given interval, at most 2016 points will be returned. For example,
-                with interval=5m, the maximum range of the request is 2016 * 5 minutes = 7 days.
-                With interval=1h, the maximum range is 2016 * 1 hour = 84 days.
-                Exceeding the maximum range will result in an error,
-                which can be solved by reducing the date range specified in the request.
+                For any given interval, the API returns at most 2016 points per request.
+                For example, with interval=5m a request spans at most 2016 * 5 minutes
+                = 7 days, with interval=1h at most 2016 * 1 hour = 84 days.
+                Longer ranges are split into windows of 2016 points, fetched in parallel
+                across assets & stitched back into a single timeseries per asset.
+                With a TimeseriesStore set (see set_timeseries_store) only the head & tail
+                of the range missing from the store are fetched.
 
                 Anything under 1 day requires an enterprise subscription.
                 Please email enterprise@messari.io for information.
@@ -529,27 +597,72 @@ class Messari(DataLoader):
                 Dictionary or pandas DataFrame of asset data.
         """
         asset_slugs = validate_input(asset_slugs)
-        #metrics = validate_input(a
-
-        payload = {'interval': interval}
-        if start:
-            if not end:
-                raise ValueError('End date must be provided')
-            payload['start'] = start
-            payload['end'] = end
-        base_url_template = Template(f'{BASE_URL}/$asset_key/metrics/{asset_metric}/time-series')
-        response_data = {}
-        for asset in asset_slugs:
-            url = base_url_template.substitute(asset_key=asset)
-            response = self.get_response(url, params=payload, headers=self.api_dict)
-            response_flat = convert_flatten(response['data'])
-            response_data[asset] = response_flat
+        response_data = self.get_metrics_timeseries(
+            asset_slugs, asset_metric, start=start, end=end, interval=interval,
+            to_dataframe=False)[asset_metric]
 
         if not to_dataframe:
             return response_data
+        return metric_timeseries_to_dataframe(response_data, asset_metric)
+
+    @profiled
+    def get_metrics_timeseries(self, asset_slugs: Union[str, List],
+                               asset_metrics: Union[str, List], start: str = None,
+                               end: str = None, interval: str = '1d', to_dataframe: bool = True,
+                               wide: bool = True) -> Union[Dict, pd.DataFrame]:
+        """Retrieve historical timeseries data for several metrics & assets at once.
+
+        The windows of every asset & metric are requested in a single fan out,
+        paced by the rate limiter, & assembled into one frame in a single allocation.
+        See get_metric_timeseries for the available metrics & intervals.
 
-        timeseries_df = timeseries_to_dataframe(response_data)
-        if asset_metric != 'price' and not timeseries_df.empty:
-            col_name = timeseries_df.columns[0][1]
-            timeseries_df = timeseries_df.xs(col_name, axis=1, level=1)
-        return timeseries_df
+        Parameters
+        ----------
+            asset_slugs: str, list
+                Single asset slug string or list of asset slugs (i.e. bitcoin).
+            asset_metrics: str, list
+                Single metric string or list of metrics (i.e. price, real.vol).
+            start: str
+                Starting date string for timeseries data.
+            end: str
+                Ending date string for timeseries data.
+            interval: str
+                Interval of timeseries data. Default value is set to 1d.
+            to_dataframe: bool
+                Return data as DataFrame or JSON. Default is set to DataFrame.
+            wide: bool
+                Return a frame indexed by timestamp with (asset, metric) columns, or a
+                long frame with timestamp, asset, metric, field & value columns.
+                Default is set to wide.
+
+        Returns
+        -------
+            dict, DataFrame
+                Dictionary of asset data keyed by metric & asset or pandas DataFrame.
+        """
+        asset_slugs = validate_input(asset_slugs)
+        asset_metrics = validate_input(asset_metrics)
+        store = self.timeseries_store
+        windows = get_timeseries_windows(asset_slugs, asset_metrics, start=start, end=end,
+                                         interval=interval, store=store)
+        base_url_template = url_template(f'{BASE_URL}/$asset_key/metrics/$metric/time-series')
+
+        def get_timeseries_data(item: Tuple[str, str, int]) -> Dict:
+            metric, asset, window = item
+            url = base_url_template.substitute(asset_key=asset, metric=metric)
+            response = self.get_response(url, params=windows[metric][asset][window],
+                                         headers=self.api_dict)
+            return flatten_record(response['data'])
+
+        # Ranges longer than 2016 points are fetched in windows, in parallel across
+        # assets & metrics
+        items = [(metric, asset, window) for metric, metric_windows in windows.items()
+                 for asset, asset_windows in metric_windows.items()
+                 for window in range(len(asset_windows))]
+        results = self.fan_out(get_timeseries_data, items) if items else {}
+        response_data = collect_timeseries(results, windows, start=start, end=end,
+                                           interval=interval, store=store)
+
+        if not to_dataframe:
+            return response_data
+        return metrics_timeseries_to_dataframe(response_data, wide=wide)
@@ -0,0 +1,245 @@
+"""This module is meant to contain the TimeseriesStore class"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .helpers import INTERVAL_DELTAS, split_timeseries_payload, stitch_timeseries, to_utc
+
+
+def to_milliseconds(date: str) -> int:
+    """Returns the unix milliseconds of a date string"""
+    return int(to_utc(date).value // 10**6)
+
+
+def from_milliseconds(timestamp: int) -> str:
+    """Returns the date string of unix milliseconds"""
+    return pd.Timestamp(timestamp, unit='ms').strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class TimeseriesStore:
+    """This class is a persistent SQLite store of Messari metric timeseries.
+
+    Points are keyed by asset, metric, interval & timestamp (unix milliseconds).
+    Each series also records the contiguous range it covers, so a request only
+    needs the head & tail missing from it. Points whose interval hasn't closed
+    yet are stored but left out of the covered range, they are fetched again
+    until they are final.
+    """
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self.lock, self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS points (asset TEXT, metric TEXT, interval TEXT, '
+                'timestamp INTEGER, value TEXT, PRIMARY KEY (asset, metric, interval, timestamp))')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS series (asset TEXT, metric TEXT, interval TEXT, '
+                'start INTEGER, end INTEGER, meta TEXT, PRIMARY KEY (asset, metric, interval))')
+
+    def get_coverage(self, asset: str, metric: str, interval: str) -> Optional[Tuple[int, int]]:
+        """Returns the range of a series that is stored & final
+
+        :param asset: str
+            Asset slug
+        :param metric: str
+            Metric id (i.e. price)
+        :param interval: str
+            Interval (i.e. 1d)
+        :return: (start, end) unix milliseconds, None if nothing is stored
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT start, end FROM series WHERE asset = ? AND metric = ? AND interval = ?',
+                (asset, metric, interval)).fetchone()
+        return tuple(row) if row is not None and row[0] is not None else None
+
+    def get_missing(self, asset: str, metric: str, interval: str, start: int, end: int,
+                    step: int) -> List[Tuple[int, int]]:
+        """Returns the head & tail of a range missing from the store
+
+        :param asset: str
+            Asset slug
+        :param metric: str
+            Metric id
+        :param interval: str
+            Interval
+        :param start: int
+            Start of the requested range, unix milliseconds
+        :param end: int
+            End of the requested range, unix milliseconds
+        :param step: int
+            Length of the interval in milliseconds
+        :return: List of (start, end) ranges to fetch, both ends included
+        """
+        coverage = self.get_coverage(asset, metric, interval)
+        if coverage is None:
+            return [(start, end)]
+        covered_start, covered_end = coverage
+        missing = []
+        if start < covered_start:
+            # Fetching up to the covered range keeps it contiguous
+            missing.append((start, max(start, covered_start - step)))
+        if end > covered_end:
+            missing.append((min(end, covered_end + step), end))
+        return missing
+
+    def put(self, asset: str, metric: str, interval: str, data: Dict, start: int, end: int,
+            step: int) -> None:
+        """Stores the points of a fetched range & extends the covered range
+
+        :param asset: str
+            Asset slug
+        :param metric: str
+            Metric id
+        :param interval: str
+            Interval
+        :param data: dict
+            Flattened timeseries data, values being lists starting with the timestamp
+        :param start: int
+            Start of the range now entirely stored, unix milliseconds
+        :param end: int
+            End of the range now entirely stored, unix milliseconds
+        :param step: int
+            Length of the interval in milliseconds
+        """
+        values = data.get('values') or []
+        meta = {key: value for key, value in data.items() if key != 'values'}
+        # Points of an interval still in progress can change
+        end = min(end, int(time.time() * 1000) - step)
+        with self.lock, self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?)',
+                [(asset, metric, interval, int(point[0]), json.dumps(point)) for point in values])
+            row = self.connection.execute(
+                'SELECT start, end FROM series WHERE asset = ? AND metric = ? AND interval = ?',
+                (asset, metric, interval)).fetchone()
+            if row is not None and row[0] is not None:
+                start, end = min(start, row[0]), max(end, row[1])
+            elif start > end:
+                start = end = None
+            self.connection.execute('INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?, ?)',
+                                    (asset, metric, interval, start, end, json.dumps(meta)))
+
+    def get(self, asset: str, metric: str, interval: str, start: int,
+            end: int) -> Optional[Dict]:
+        """Returns the stored points of a range, shaped like the flattened API response
+
+        :param asset: str
+            Asset slug
+        :param metric: str
+            Metric id
+        :param interval: str
+            Interval
+        :param start: int
+            Start of the range, unix milliseconds
+        :param end: int
+            End of the range, unix milliseconds
+        :return: Flattened timeseries data, None if the series was never stored
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT meta FROM series WHERE asset = ? AND metric = ? AND interval = ?',
+                (asset, metric, interval)).fetchone()
+            if row is None:
+                return None
+            points = self.connection.execute(
+                'SELECT value FROM points WHERE asset = ? AND metric = ? AND interval = ? '
+                'AND timestamp BETWEEN ? AND ? ORDER BY timestamp',
+                (asset, metric, interval, start, end)).fetchall()
+        data = json.loads(row[0])
+        data['values'] = [json.loads(point) for point, in points] or None
+        return data
+
+    @staticmethod
+    def is_storable(start: str, interval: str) -> bool:
+        """Whether a request covers an explicit range the store can track"""
+        return bool(start) and interval in INTERVAL_DELTAS
+
+    def get_windows(self, assets: List[str], metric: str, start: str, end: str,
+                    interval: str) -> Dict[str, List[Dict]]:
+        """Returns the query parameters of the windows missing from the store for every asset
+
+        :param assets: list
+            Asset slugs
+        :param metric: str
+            Metric id
+        :param start: str
+            Starting date string of the requested range
+        :param end: str
+            Ending date string of the requested range
+        :param interval: str
+            Interval
+        :return: Dict of {asset: [query parameters]}, empty lists for stored assets
+        """
+        step = int(INTERVAL_DELTAS[interval].total_seconds() * 1000)
+        first, last = to_milliseconds(start), to_milliseconds(end)
+        windows = {}
+        for asset in assets:
+            windows[asset] = [payload
+                              for head, tail in self.get_missing(asset, metric, interval,
+                                                                 first, last, step)
+                              for payload in split_timeseries_payload(
+                                  from_milliseconds(head), from_milliseconds(tail), interval)]
+        return windows
+
+    def update(self, metric: str, start: str, end: str, interval: str,
+               windows: Dict[str, List[Dict]], results: Dict[Tuple[str, int], Dict]) -> Dict:
+        """Stores the fetched windows & returns the requested range of every asset
+
+        An asset some windows failed for is left as it was, so its covered range
+        never has a hole.
+
+        :param metric: str
+            Metric id
+        :param start: str
+            Starting date string of the requested range
+        :param end: str
+            Ending date string of the requested range
+        :param interval: str
+            Interval
+        :param windows: dict
+            Windows returned by get_windows
+        :param results: dict
+            Flattened timeseries data keyed by (asset, window index)
+        :return: Flattened timeseries data keyed by asset
+        """
+        step = int(INTERVAL_DELTAS[interval].total_seconds() * 1000)
+        first, last = to_milliseconds(start), to_milliseconds(end)
+        fetched = stitch_timeseries(results)
+        response_data = {}
+        for asset, asset_windows in windows.items():
+            received = sum(1 for key in results if key[0] == asset)
+            if asset_windows and received == len(asset_windows):
+                self.put(asset, metric, interval, fetched[asset], first, last, step)
+            data = self.get(asset, metric, interval, first, last)
+            if data is not None:
+                response_data[asset] = data
+        return response_data
+
+    def clear(self, asset: str = None) -> None:
+        """Removes every series, or only those of one asset
+
+        :param asset: str
+            Asset slug to clear, every asset by default
+        """
+        with self.lock, self.connection:
+            if asset is None:
+                self.connection.execute('DELETE FROM points')
+                self.connection.execute('DELETE FROM series')
+            else:
+                self.connection.execute('DELETE FROM points WHERE asset = ?', (asset,))
+                self.connection.execute('DELETE FROM series WHERE asset = ?', (asset,))
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM points').fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the SQLite connection"""
+        self.connection.close()
@@ -1,15 +1,14 @@
 """This module is meant to contain the Metabase class"""
 
 import json
-import requests
 import pandas as pd
 from typing import List, Dict
 
-# async jazz
+# async jazz, aiohttp is imported by run so Metabase() alone doesn't pay for it
 import asyncio
-from aiohttp import ClientSession
 
 from messari.dataloader import DataLoader
+from messari.transport import split_timeout
 
 HEADERS = {
     'Content-Type': 'application/json',
@@ -41,7 +40,7 @@ class Metabase(DataLoader):
         test_dashboard_id = cards.at[0, 'dashboard']
 
         test_request_url = f'{test_dashboard_id}/card/{test_card_id}'
-        response = requests.get(test_request_url, headers=HEADERS, timeout=60)
+        response = self.session.get(test_request_url, headers=HEADERS, timeout=60)
 
         # if there is a response from the call, then use the first format
         # TODO: use 'if not response' and remove the else statement
@@ -65,7 +64,7 @@ class Metabase(DataLoader):
     
     def get_cards(self) -> pd.DataFrame:
         #url = 'https://dashboard.chaincrunch.cc/api/public/dashboard/873471ae-497e-49f7-99aa-9c2e8e62c58d'
-        response = requests.get(self.url, headers=HEADERS).json()
+        response = self.get_response(self.url, headers=HEADERS)
         cards = pd.DataFrame(response['ordered_cards'])
 
         dashcard_ids = cards['id']
@@ -96,9 +95,9 @@ class Metabase(DataLoader):
         print(name, url)
         try:
             if self.params:
-                response = await session.get(url,headers=HEADERS,params=self.params,timeout=60)
+                response = await session.get(url,headers=HEADERS,params=self.params)
             else:
-                response = await session.get(url,headers=HEADERS,timeout=60)
+                response = await session.get(url,headers=HEADERS)
         except asyncio.TimeoutError as err:
             print(name, url, err)
             return pd.DataFrame()
@@ -138,7 +137,14 @@ class Metabase(DataLoader):
         )
 
         # Query urls & names
-        async with ClientSession() as session:
+        # pylint: disable=import-outside-toplevel
+        from aiohttp import ClientSession, ClientTimeout, TCPConnector
+        connector = TCPConnector(**self.transport.get_connector_kwargs(max(len(urls), 1)))
+        # Same connect & read timeouts as the sync requests
+        connect, read = split_timeout(self.get_timeout())
+        async with ClientSession(connector=connector, headers=self.transport.get_headers(),
+                                 timeout=ClientTimeout(total=None, connect=connect,
+                                                       sock_read=read)) as session:
             # results = [(card dataframe, card name), (card dataframe, card name), ...]
             results = await asyncio.gather(*[self.run_url(item[0], session, item[1]) for item in urls])
 
@@ -0,0 +1,309 @@
+"""This module is meant to contain the MetricsExporter & InMemoryMetrics classes"""
+
+
+import re
+import threading
+from string import Template
+from typing import Dict, List, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+# Upper bounds in seconds of the request latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+# Endpoints labelled per host before new ones are counted as OTHER_ENDPOINT
+DEFAULT_MAX_ENDPOINTS = 100
+OTHER_ENDPOINT = 'other'
+
+# Path segments that are ids rather than routes: numbers, hex addresses, long hashes & keys
+ID_SEGMENT = re.compile(r'^(\d+|0x[0-9a-fA-F]+|[0-9a-zA-Z]{32,})$')
+
+# URL templates of the connectors, {host: {template path: (regex, endpoint label)}}
+ROUTES: Dict[str, Dict[str, Tuple[Pattern, str]]] = {}
+ROUTES_LOCK = threading.Lock()
+
+
+def url_template(template: str) -> Template:
+    """Returns a string.Template of a URL & registers its route, so requests
+    to it are labelled with the template rather than their slug or address
+
+    :param template: str
+        URL with $placeholders (i.e. https://api.llama.fi/protocol/$slug)
+    :return: Template
+    """
+    parts = urlsplit(template)
+    host, path = parts.netloc.lower(), parts.path or '/'
+    routes = ROUTES.get(host, {})
+    if path not in routes:
+        pieces = re.split(r'\$\{?(\w+)\}?', path)
+        regex = ''.join(re.escape(piece) if i % 2 == 0 else '[^/]+'
+                        for i, piece in enumerate(pieces))
+        label = ''.join(piece if i % 2 == 0 else f'{{{piece}}}'
+                        for i, piece in enumerate(pieces))
+        with ROUTES_LOCK:
+            ROUTES.setdefault(host, {})[path] = (re.compile(regex), label)
+    return Template(template)
+
+
+def split_endpoint(url: str) -> Tuple[str, str]:
+    """Splits a URL into the host & endpoint metrics are labelled with.
+
+    The endpoint is the registered URL template the path matches (see url_template),
+    otherwise the path with its id segments replaced by {id}.
+
+    :param url: str
+        URL API string
+    :return: (host, endpoint) tuple
+    """
+    parts = urlsplit(url)
+    host, path = parts.netloc.lower(), parts.path or '/'
+    for regex, label in ROUTES.get(host, {}).values():
+        if regex.fullmatch(path):
+            return host, label
+    return host, '/'.join('{id}' if ID_SEGMENT.match(segment) else segment
+                          for segment in path.split('/'))
+
+
+class MetricsExporter:
+    """This class is the interface DataLoader reports request metrics to.
+
+    Subclass it to forward metrics to statsd, OpenTelemetry, a log... every
+    method is a no-op by default so exporters only implement what they need.
+    Methods are called from worker threads & must be thread safe.
+    """
+    def record_request(self, host: str, endpoint: str, status_code: Optional[int],
+                       latency: float, size: int) -> None:
+        """Called once per HTTP attempt, retries included
+
+        :param host: str
+            Host of the request
+        :param endpoint: str
+            Endpoint (path) of the request
+        :param status_code: int
+            HTTP status, None if the connection failed or timed out
+        :param latency: float
+            Seconds from sending the request to reading the whole body
+        :param size: int
+            Response body size in bytes
+        """
+
+    def record_retry(self, host: str, endpoint: str, status_code: Optional[int]) -> None:
+        """Called when a failed attempt is going to be retried
+
+        :param host: str
+            Host of the request
+        :param endpoint: str
+            Endpoint (path) of the request
+        :param status_code: int
+            HTTP status of the failed attempt, None for connection errors
+        """
+
+    def record_cache_hit(self, host: str, endpoint: str) -> None:
+        """Called when a response is served from the ResponseCache
+
+        :param host: str
+            Host of the request
+        :param endpoint: str
+            Endpoint (path) of the request
+        """
+
+    def record_concurrency(self, host: str, limit: int, in_flight: int) -> None:
+        """Called after every attempt with the adaptive concurrency limit of its host
+
+        :param host: str
+            Host of the request
+        :param limit: int
+            Requests currently allowed in flight to the host
+        :param in_flight: int
+            Requests in flight to the host
+        """
+
+
+class Histogram:
+    """This class is a cumulative histogram with fixed bucket upper bounds"""
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Adds a value to the histogram"""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Returns (upper bound, observations at or below it) pairs ending with +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip([*map(str, self.buckets), '+Inf'], self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class EndpointStats:
+    """This class holds the counters of a single host & endpoint"""
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.requests = 0
+        self.statuses: Dict[str, int] = {}
+        self.latency = Histogram(buckets)
+        self.bytes = 0
+        self.retries = 0
+        self.cache_hits = 0
+
+    def to_dict(self) -> Dict:
+        """Returns the counters as plain python objects"""
+        return {'requests': self.requests,
+                'statuses': dict(self.statuses),
+                'bytes': self.bytes,
+                'retries': self.retries,
+                'cache_hits': self.cache_hits,
+                'latency': {'count': self.latency.count,
+                            'sum': self.latency.sum,
+                            'buckets': dict(self.latency.cumulative())}}
+
+
+def escape_label(value: str) -> str:
+    """Escapes a Prometheus label value"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class InMemoryMetrics(MetricsExporter):
+    """This class aggregates request metrics per host & endpoint in process.
+
+    Use snapshot() to inspect them from python or to_prometheus() to serve
+    them in the Prometheus text exposition format. Past max_endpoints endpoints
+    of a host, new ones are counted under the 'other' endpoint so long running
+    processes keep a bounded number of series.
+    """
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+                 prefix: str = 'messari', max_endpoints: int = DEFAULT_MAX_ENDPOINTS):
+        self.buckets = buckets
+        self.prefix = prefix
+        self.max_endpoints = max_endpoints
+        self.endpoints: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.stats: Dict[Tuple[str, str], EndpointStats] = {}
+        self.concurrency: Dict[str, Dict[str, int]] = {}
+
+    def get_stats(self, host: str, endpoint: str) -> EndpointStats:
+        """Returns the stats of an endpoint, creating them if needed, call with the lock held"""
+        stats = self.stats.get((host, endpoint))
+        if stats is None:
+            if self.endpoints.get(host, 0) >= self.max_endpoints:
+                endpoint = OTHER_ENDPOINT
+                stats = self.stats.get((host, endpoint))
+                if stats is not None:
+                    return stats
+            else:
+                self.endpoints[host] = self.endpoints.get(host, 0) + 1
+            stats = self.stats[(host, endpoint)] = EndpointStats(self.buckets)
+        return stats
+
+    def record_request(self, host: str, endpoint: str, status_code: Optional[int],
+                       latency: float, size: int) -> None:
+        status = 'error' if status_code is None else str(status_code)
+        with self.lock:
+            stats = self.get_stats(host, endpoint)
+            stats.requests += 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.latency.observe(latency)
+            stats.bytes += size
+
+    def record_retry(self, host: str, endpoint: str, status_code: Optional[int]) -> None:
+        with self.lock:
+            self.get_stats(host, endpoint).retries += 1
+
+    def record_cache_hit(self, host: str, endpoint: str) -> None:
+        with self.lock:
+            self.get_stats(host, endpoint).cache_hits += 1
+
+    def record_concurrency(self, host: str, limit: int, in_flight: int) -> None:
+        with self.lock:
+            self.concurrency[host] = {'limit': limit, 'in_flight': in_flight}
+
+    def get_concurrency(self) -> Dict[str, Dict[str, int]]:
+        """Returns the last reported concurrency limit & requests in flight of every host
+
+        :return: Dict of {host: {'limit': int, 'in_flight': int}}
+        """
+        with self.lock:
+            return {host: dict(gauges) for host, gauges in self.concurrency.items()}
+
+    def snapshot(self) -> Dict:
+        """Returns a copy of every counter
+
+        :return: Dict of {host: {endpoint: counters}}
+        """
+        with self.lock:
+            snapshot: Dict = {}
+            for (host, endpoint), stats in self.stats.items():
+                snapshot.setdefault(host, {})[endpoint] = stats.to_dict()
+            return snapshot
+
+    def reset(self) -> None:
+        """Drops every counter"""
+        with self.lock:
+            self.stats.clear()
+            self.endpoints.clear()
+            self.concurrency.clear()
+
+    def to_prometheus(self) -> str:
+        """Returns every counter in the Prometheus text exposition format
+
+        :return: str
+        """
+        prefix = self.prefix
+        snapshot = self.snapshot()
+        series = []
+        for host, endpoints in snapshot.items():
+            for endpoint, stats in endpoints.items():
+                series.append((f'host="{escape_label(host)}",endpoint="{escape_label(endpoint)}"',
+                               stats))
+
+        lines = [f'# HELP {prefix}_requests_total HTTP requests sent, retries included',
+                 f'# TYPE {prefix}_requests_total counter']
+        for labels, stats in series:
+            for status, count in stats['statuses'].items():
+                lines.append(f'{prefix}_requests_total{{{labels},status="{status}"}} {count}')
+
+        lines += [f'# HELP {prefix}_request_duration_seconds Request latency',
+                  f'# TYPE {prefix}_request_duration_seconds histogram']
+        for labels, stats in series:
+            latency = stats['latency']
+            for bound, count in latency['buckets'].items():
+                lines.append(
+                    f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{{labels}}} {latency["sum"]}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{{labels}}} {latency["count"]}')
+
+        for name, key, description in (('response_bytes', 'bytes', 'Response body bytes read'),
+                                       ('retries', 'retries', 'Requests retried'),
+                                       ('cache_hits', 'cache_hits',
+                                        'Responses served from the cache')):
+            lines += [f'# HELP {prefix}_{name}_total {description}',
+                      f'# TYPE {prefix}_{name}_total counter']
+            for labels, stats in series:
+                lines.append(f'{prefix}_{name}_total{{{labels}}} {stats[key]}')
+
+        concurrency = self.get_concurrency()
+        for name, key, description in (('concurrency_limit', 'limit',
+                                        'Requests allowed in flight per host'),
+                                       ('in_flight_requests', 'in_flight',
+                                        'Requests in flight per host')):
+            lines += [f'# HELP {prefix}_{name} {description}',
+                      f'# TYPE {prefix}_{name} gauge']
+            for host, gauges in concurrency.items():
+                lines.append(f'{prefix}_{name}{{host="{escape_label(host)}"}} {gauges[key]}')
+        return '\n'.join(lines) + '\n'
+
+
+# Process wide metrics every DataLoader & AsyncDataLoader reports to by default
+DEFAULT_METRICS = InMemoryMetrics()
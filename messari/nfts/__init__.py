@@ -1,7 +1,11 @@
 """Module to handle initialization, imports, for nft classes"""
 
-# Localize imports of nft apis
-from .upshot import Upshot
-from .nftpricefloor import NFTPriceFloor
-from .nonfungible import NonFungible
-from .opensea import OpenSea
+from messari.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    # Localize imports of nft apis
+    'Upshot': '.upshot',
+    'NFTPriceFloor': '.nftpricefloor',
+    'NonFungible': '.nonfungible',
+    'OpenSea': '.opensea',
+})
@@ -2,12 +2,12 @@
 
 from messari.dataloader import DataLoader
 from messari.utils import validate_input
+from messari.metrics import url_template
 import pandas as pd
-from string import Template
 from typing import Union, List
 
 NFTS_URL = 'https://api-bff.nftpricefloor.com/nfts'
-COLLECTION_URL = Template('https://api-bff.nftpricefloor.com/nft/$collection/chart/pricefloor')
+COLLECTION_URL = url_template('https://api-bff.nftpricefloor.com/nft/$collection/chart/pricefloor')
 COLLECTION_PARAMS = {'interval':'all'}
 
 HEADERS = {
@@ -46,12 +46,13 @@ class NFTPriceFloor(DataLoader):
                 DataFrame with timeseries price floor
         """
         collections = validate_input(collection_in)
-        df_list = []
-        for collection in collections:
+        def get_collection_df(collection: str) -> pd.DataFrame:
             endpoint_url = COLLECTION_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url, params=COLLECTION_PARAMS, headers=HEADERS)
             tmp_df = pd.DataFrame(response)
             tmp_df.set_index('dates', inplace=True)
-            df_list.append(tmp_df)
-        floor_df = pd.concat(df_list, keys=collections, axis=1)
+            return tmp_df
+
+        df_dict = self.fan_out(get_collection_df, collections)
+        floor_df = pd.concat(df_dict, axis=1)
         return floor_df
@@ -2,14 +2,14 @@
 
 from messari.dataloader import DataLoader
 from messari.utils import validate_input, validate_int
+from messari.metrics import url_template
 from typing import Union, List
-from string import Template
 
 import pandas as pd
 
-COLLECTION_HISTORY_URL = Template('https://nonfungible.com/api/v4/market/history/$collection?filter=%5B%7B%22id%22%3A%22blockTimestamp%22%2C%22value%22%3A%5B%222021-12-28T16%3A09%3A42.206Z%22%5D%7D%5D&sort=%5B%7B%22id%22%3A%22usdPrice%22%2C%22desc%22%3Atrue%7D%5D')
-COLLECTION_STATS_URL = Template('https://nonfungible.com/api/v4/market/statistic/project/$collection/7/count-sale,count-salesprimary,count-salessecondary,sum-usd,avg-usd,sum-usdprimary,sum-usdsecondary,sum-feeusd,unique-wallets,unique-buyer,unique-seller/latest,daily')
-COLLECTION_SUMMARY_URL = Template('https://nonfungible.com/api/v4/market/summary/$collection')
+COLLECTION_HISTORY_URL = url_template('https://nonfungible.com/api/v4/market/history/$collection?filter=%5B%7B%22id%22%3A%22blockTimestamp%22%2C%22value%22%3A%5B%222021-12-28T16%3A09%3A42.206Z%22%5D%7D%5D&sort=%5B%7B%22id%22%3A%22usdPrice%22%2C%22desc%22%3Atrue%7D%5D')
+COLLECTION_STATS_URL = url_template('https://nonfungible.com/api/v4/market/statistic/project/$collection/7/count-sale,count-salesprimary,count-salessecondary,sum-usd,avg-usd,sum-usdprimary,sum-usdsecondary,sum-feeusd,unique-wallets,unique-buyer,unique-seller/latest,daily')
+COLLECTION_SUMMARY_URL = url_template('https://nonfungible.com/api/v4/market/summary/$collection')
 
 
 class NonFungible(DataLoader):
@@ -38,13 +38,14 @@ class NonFungible(DataLoader):
 
         collections = validate_input(collections_in)
 
-        df_list=[]
-        for collection in collections:
+        def get_collection_df(collection: str) -> pd.DataFrame:
             endpoint_url = COLLECTION_HISTORY_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url, params=params)
             tmp_df = pd.DataFrame(response['data']['sales'][0]['sales'])
-            df_list.append(tmp_df)
-        collections_df = pd.concat(df_list, keys=collections, axis=1)
+            return tmp_df
+
+        df_dict = self.fan_out(get_collection_df, collections)
+        collections_df = pd.concat(df_dict, axis=1)
         return collections_df
 
     def get_collection_stats(self, collections_in: Union[str, List], length: int=30) -> pd.DataFrame:
@@ -67,8 +68,7 @@ class NonFungible(DataLoader):
 
         collections = validate_input(collections_in)
 
-        series_list=[]
-        for collection in collections:
+        def get_collection_series(collection: str) -> pd.Series:
             endpoint_url = COLLECTION_STATS_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url, params=params)
             tmp_df = pd.DataFrame(response['data'])
@@ -76,8 +76,10 @@ class NonFungible(DataLoader):
             data = tmp_df['data'].tolist()
             series_dict = dict(zip(keys,data))
             tmp_series = pd.Series(series_dict)
-            series_list.append(tmp_series)
-        collections_df = pd.concat(series_list, keys=collections, axis=1)
+            return tmp_series
+
+        series_dict = self.fan_out(get_collection_series, collections)
+        collections_df = pd.concat(series_dict, axis=1)
         return collections_df
 
     def get_collection_summary(self, collections_in: Union[str, List]) -> pd.DataFrame:
@@ -95,16 +97,16 @@ class NonFungible(DataLoader):
         """
 
         collections = validate_input(collections_in)
-        series_list=[]
-        for collection in collections:
+        def get_collection_series(collection: str) -> pd.Series:
             endpoint_url = COLLECTION_SUMMARY_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url)
             response_dict = response['data']['totals'][0]
             response_dict.update(response_dict['totals']['alltime']) #upack
             response_dict.pop('totals')
             tmp_series = pd.Series(response_dict)
+            return tmp_series
 
-            series_list.append(tmp_series)
-        collections_df = pd.concat(series_list, keys=collections, axis=1)
+        series_dict = self.fan_out(get_collection_series, collections)
+        collections_df = pd.concat(series_dict, axis=1)
         return collections_df
 
@@ -3,19 +3,19 @@
 
 from messari.dataloader import DataLoader
 from messari.utils import validate_input
+from messari.metrics import url_template
 
-from string import Template
-from typing import Union, List
+from typing import Union, List, Tuple
 import pandas as pd
 
 
 # Reference: https://docs.opensea.io/reference/api-overview
 # TODO, api key as header
 
-ASSET_URL = Template('https://api.opensea.io/api/v1/asset/$contract/$id/')
-CONTRACT_URL = Template('https://api.opensea.io/api/v1/asset_contract/$contract')
-COLLECTION_URL = Template('https://api.opensea.io/api/v1/collection/$collection')
-STATS_URL = Template('https://api.opensea.io/api/v1/collection/$collection/stats')
+ASSET_URL = url_template('https://api.opensea.io/api/v1/asset/$contract/$id/')
+CONTRACT_URL = url_template('https://api.opensea.io/api/v1/asset_contract/$contract')
+COLLECTION_URL = url_template('https://api.opensea.io/api/v1/collection/$collection')
+STATS_URL = url_template('https://api.opensea.io/api/v1/collection/$collection/stats')
 EVENTS_URL = 'https://api.opensea.io/api/v1/events'
 
 HEADERS = {'Accept': 'application/json'}
@@ -54,18 +54,20 @@ class OpenSea(DataLoader):
 
         contracts = validate_input(contracts_in)
         assets = validate_input(assets_in)
-        df_list=[]
-        for contract in contracts:
-            series_list=[]
-            for asset in assets:
-                endpoint_url = ASSET_URL.substitute(contract=contract, id=asset)
-                response = self.get_response(endpoint_url, params=params, headers=headers)
-
-                tmp_series=pd.Series(response)
-                series_list.append(tmp_series)
-            tmp_df=pd.concat(series_list, keys=assets, axis=1)
-            df_list.append(tmp_df)
-        assets_df=pd.concat(df_list, keys=contracts, axis=1)
+        def get_asset_series(pair: Tuple[str, str]) -> pd.Series:
+            contract, asset = pair
+            endpoint_url = ASSET_URL.substitute(contract=contract, id=asset)
+            response = self.get_response(endpoint_url, params=params, headers=headers)
+
+            tmp_series=pd.Series(response)
+            return tmp_series
+
+        pairs = [(contract, asset) for contract in contracts for asset in assets]
+        contract_dict = {}
+        for (contract, asset), tmp_series in self.fan_out(get_asset_series, pairs).items():
+            contract_dict.setdefault(contract, {})[asset] = tmp_series
+        assets_df=pd.concat({contract: pd.concat(asset_dict, axis=1)
+                             for contract, asset_dict in contract_dict.items()}, axis=1)
         return assets_df
 
     def get_contract(self, contracts_in: Union[str, List]) -> pd.DataFrame:
@@ -89,14 +91,14 @@ class OpenSea(DataLoader):
 
         contracts = validate_input(contracts_in)
 
-        df_list=[]
-        for contract in contracts:
+        def get_contract_df(contract: str) -> pd.DataFrame:
             endpoint_url = CONTRACT_URL.substitute(contract=contract)
             response = self.get_response(endpoint_url, headers=headers)
             tmp_df = pd.DataFrame(response)
+            return tmp_df
 
-            df_list.append(tmp_df)
-        contracts_df = pd.concat(df_list, keys=contracts, axis=1)
+        df_dict = self.fan_out(get_contract_df, contracts)
+        contracts_df = pd.concat(df_dict, axis=1)
         return contracts_df
 
     def get_collection(self, collections_in: Union[str, List]) -> pd.DataFrame:
@@ -121,14 +123,14 @@ class OpenSea(DataLoader):
 
         collections = validate_input(collections_in)
 
-        df_list=[]
-        for collection in collections:
+        def get_collection_df(collection: str) -> pd.DataFrame:
             endpoint_url = COLLECTION_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url, headers=headers)
             tmp_df = pd.DataFrame(response)
+            return tmp_df
 
-            df_list.append(tmp_df)
-        collections_df = pd.concat(df_list, keys=collections, axis=1)
+        df_dict = self.fan_out(get_collection_df, collections)
+        collections_df = pd.concat(df_dict, axis=1)
         return collections_df
 
     # NOTE requires api-key
@@ -187,14 +189,14 @@ class OpenSea(DataLoader):
 
         collections = validate_input(collections_in)
 
-        df_list=[]
-        for collection in collections:
+        def get_collection_df(collection: str) -> pd.DataFrame:
             endpoint_url = STATS_URL.substitute(collection=collection)
             response = self.get_response(endpoint_url, headers=headers)
             tmp_df = pd.DataFrame(response)
+            return tmp_df
 
-            df_list.append(tmp_df)
-        collections_df = pd.concat(df_list, keys=collections, axis=1)
+        df_dict = self.fan_out(get_collection_df, collections)
+        collections_df = pd.concat(df_dict, axis=1)
         fin_df = collections_df.xs('stats', axis=1, level=1)
         return fin_df
 
@@ -2,7 +2,7 @@
 
 from messari.dataloader import DataLoader
 from messari.utils import validate_input, validate_int
-from typing import Union, List
+from typing import Union, List, Tuple
 
 from .helpers import format_df
 import pandas as pd
@@ -58,28 +58,31 @@ class Upshot(DataLoader):
         if asset_id:
             assets = validate_int(asset_id)
 
-        df_list = []
-        for contract in contracts:
-            # need to use either contract or asset id, upshot api is weird
-            if asset_id:
-                responses = []
-                # NOTE: you can do a request w/ repeated values for 'assetId' but making
-                # this work within python is not easy, just looping for now but this can
-                # be made better
-                for asset in assets:
-                    parameters['assetId'] = f'{contract}/{asset}'
-                    response = self.get_response(ASSET_URL, params=parameters)['data']
-                    responses.append(response['assets'][0])
-                asset_df = pd.DataFrame(responses)
-
-
-            else:
-                parameters['contractAddress'] = contract
-                response = self.get_response(ASSET_URL, params=parameters)['data']
-                asset_df = pd.DataFrame(response['assets'])
-
-            df_list.append(asset_df)
-        assets_df = pd.concat(df_list, keys=contracts, axis=1)
+        # need to use either contract or asset id, upshot api is weird
+        if asset_id:
+            # NOTE: you can do a request w/ repeated values for 'assetId' but making
+            # this work within python is not easy, fanning out one request per asset
+            def get_asset_dict(pair: Tuple[str, int]) -> dict:
+                contract, asset = pair
+                pair_parameters = dict(parameters, assetId=f'{contract}/{asset}')
+                response = self.get_response(ASSET_URL, params=pair_parameters)['data']
+                return response['assets'][0]
+
+            pairs = [(contract, asset) for contract in contracts for asset in assets]
+            responses_dict = {}
+            for (contract, _), response in self.fan_out(get_asset_dict, pairs).items():
+                responses_dict.setdefault(contract, []).append(response)
+            df_dict = {contract: pd.DataFrame(responses)
+                       for contract, responses in responses_dict.items()}
+        else:
+            def get_contract_df(contract: str) -> pd.DataFrame:
+                contract_parameters = dict(parameters, contractAddress=contract)
+                response = self.get_response(ASSET_URL, params=contract_parameters)['data']
+                return pd.DataFrame(response['assets'])
+
+            df_dict = self.fan_out(get_contract_df, contracts)
+
+        assets_df = pd.concat(df_dict, axis=1)
         return assets_df
 
     def get_asset_events(self,
@@ -120,19 +123,20 @@ class Upshot(DataLoader):
         contracts = validate_input(contract_address)
         assets = validate_int(asset_id)
 
-        df_list_top = []
-        for contract in contracts:
-            df_list = []
-            for asset in assets:
-                parameters['assetId'] = f'{contract}/{asset}'
-                response = self.get_response(ASSET_EVENTS_URL, params=parameters)['data'][0]
-                tmp_df = pd.DataFrame(response['events'])
-                df_list.append(tmp_df)
+        def get_events_df(pair: Tuple[str, int]) -> pd.DataFrame:
+            contract, asset = pair
+            pair_parameters = dict(parameters, assetId=f'{contract}/{asset}')
+            response = self.get_response(ASSET_EVENTS_URL, params=pair_parameters)['data'][0]
+            tmp_df = pd.DataFrame(response['events'])
+            return tmp_df
 
-            assets_df = pd.concat(df_list, keys=assets, axis=1)
-            df_list_top.append(assets_df)
+        pairs = [(contract, asset) for contract in contracts for asset in assets]
+        contract_dict = {}
+        for (contract, asset), tmp_df in self.fan_out(get_events_df, pairs).items():
+            contract_dict.setdefault(contract, {})[asset] = tmp_df
 
-        events_df = pd.concat(df_list_top, keys=contracts, axis=1)
+        events_df = pd.concat({contract: pd.concat(asset_dict, axis=1)
+                               for contract, asset_dict in contract_dict.items()}, axis=1)
         return events_df
 
 
@@ -181,19 +185,20 @@ class Upshot(DataLoader):
         contracts = validate_input(contract_address)
         assets = validate_int(asset_id)
 
-        df_list_top = []
-        for contract in contracts:
-            df_list = []
-            for asset in assets:
-                parameters['assetId'] = f'{contract}/{asset}'
-                response = self.get_response(PRICING_URL, params=parameters)['data']
-                tmp_df = format_df(pd.DataFrame(response['pricings']))
-                df_list.append(tmp_df)
+        def get_pricing_df(pair: Tuple[str, int]) -> pd.DataFrame:
+            contract, asset = pair
+            pair_parameters = dict(parameters, assetId=f'{contract}/{asset}')
+            response = self.get_response(PRICING_URL, params=pair_parameters)['data']
+            tmp_df = format_df(pd.DataFrame(response['pricings']))
+            return tmp_df
 
-            assets_df = pd.concat(df_list, keys=assets, axis=1)
-            df_list_top.append(assets_df)
+        pairs = [(contract, asset) for contract in contracts for asset in assets]
+        contract_dict = {}
+        for (contract, asset), tmp_df in self.fan_out(get_pricing_df, pairs).items():
+            contract_dict.setdefault(contract, {})[asset] = tmp_df
 
-        prices_df = pd.concat(df_list_top, keys=contracts, axis=1)
+        prices_df = pd.concat({contract: pd.concat(asset_dict, axis=1)
+                               for contract, asset_dict in contract_dict.items()}, axis=1)
         return prices_df
 
 
@@ -232,18 +237,19 @@ class Upshot(DataLoader):
         contracts = validate_input(contract_address)
         assets = validate_int(asset_id)
 
-        df_list_top = []
-        for contract in contracts:
-            df_list = []
-            for asset in assets:
-                parameters['assetId'] = f'{contract}/{asset}'
-                response = self.get_response(PRICING_CURRENT_URL, params=parameters)['data']
-                tmp_df = format_df(pd.DataFrame(response['pricings']))
-                df_list.append(tmp_df)
+        def get_pricing_df(pair: Tuple[str, int]) -> pd.DataFrame:
+            contract, asset = pair
+            pair_parameters = dict(parameters, assetId=f'{contract}/{asset}')
+            response = self.get_response(PRICING_CURRENT_URL, params=pair_parameters)['data']
+            tmp_df = format_df(pd.DataFrame(response['pricings']))
+            return tmp_df
 
-            assets_df = pd.concat(df_list, keys=assets, axis=1)
-            df_list_top.append(assets_df)
+        pairs = [(contract, asset) for contract in contracts for asset in assets]
+        contract_dict = {}
+        for (contract, asset), tmp_df in self.fan_out(get_pricing_df, pairs).items():
+            contract_dict.setdefault(contract, {})[asset] = tmp_df
 
-        prices_df = pd.concat(df_list_top, keys=contracts, axis=1)
+        prices_df = pd.concat({contract: pd.concat(asset_dict, axis=1)
+                               for contract, asset_dict in contract_dict.items()}, axis=1)
         return prices_df
 
@@ -0,0 +1,127 @@
+"""This module is meant to contain the Paginator classes used by DataLoader.iter_pages"""
+
+
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+class Paginator:
+    """This class describes how an endpoint splits its results into pages.
+
+    Subclasses build the params of the first page & of the page following the
+    records just received. A page holding fewer records than page_size is the last.
+    """
+    def __init__(self, records_key: Union[str, Callable[[Dict], List], None] = None,
+                 page_size: int = 100, size_param: str = 'limit'):
+        self.records_key = records_key
+        self.page_size = page_size
+        self.size_param = size_param
+
+    def get_records(self, response: Union[Dict, List]) -> List:
+        """Extracts the list of records from a page
+
+        :param response: dict, list
+            JSON response of one page
+        :return: List of records, empty if the page holds none (i.e. an error message)
+        """
+        if callable(self.records_key):
+            records = self.records_key(response)
+        elif self.records_key is None:
+            records = response
+        else:
+            records = response.get(self.records_key) if isinstance(response, dict) else None
+        return records if isinstance(records, list) else []
+
+    def make_page(self, records: List) -> Union[Dict, List]:
+        """Wraps records the way the endpoint returns a page, the inverse of get_records
+
+        :param records: list
+            Records of the page
+        :return: JSON page
+        """
+        if callable(self.records_key):
+            raise ValueError('Pages can only be built for a records_key string or None')
+        return records if self.records_key is None else {self.records_key: records}
+
+    def get_page_size(self, params: Dict) -> int:
+        """Returns the number of records requested by params"""
+        return int(params.get(self.size_param, self.page_size))
+
+    def first_params(self, params: Dict = None) -> Dict:
+        """Returns the params requesting the first page
+
+        :param params: dict
+            Params shared by every page
+        :return: Dictionary of query parameters
+        """
+        raise NotImplementedError
+
+    def next_params(self, params: Dict, records: List) -> Optional[Dict]:
+        """Returns the params requesting the page after the one holding records
+
+        :param params: dict
+            Params of the page just received
+        :param records: list
+            Records of the page just received
+        :return: Dictionary of query parameters, None if it was the last page
+        """
+        raise NotImplementedError
+
+    def get_bounds(self, params: Dict) -> Tuple[int, int]:
+        """Returns the records requested by params, the inverse of first_params & next_params
+
+        :param params: dict
+            Params of a page request
+        :return: (index of the first record, index after the last record) tuple
+        """
+        raise NotImplementedError
+
+
+class PagePaginator(Paginator):
+    """This class pages with a page number, i.e. Messari's page & limit
+    or the explorers' page & offset
+    """
+    def __init__(self, records_key: Union[str, Callable[[Dict], List], None] = None,
+                 page_size: int = 100, size_param: str = 'limit',
+                 page_param: str = 'page', start: int = 1):
+        Paginator.__init__(self, records_key=records_key, page_size=page_size,
+                           size_param=size_param)
+        self.page_param = page_param
+        self.start = start
+
+    def first_params(self, params: Dict = None) -> Dict:
+        return dict(params or {}, **{self.page_param: self.start,
+                                     self.size_param: self.page_size})
+
+    def next_params(self, params: Dict, records: List) -> Optional[Dict]:
+        if len(records) < self.page_size:
+            return None
+        return dict(params, **{self.page_param: params[self.page_param] + 1})
+
+    def get_bounds(self, params: Dict) -> Tuple[int, int]:
+        size = self.get_page_size(params)
+        first = (int(params.get(self.page_param, self.start)) - self.start) * size
+        return first, first + size
+
+
+class OffsetPaginator(Paginator):
+    """This class pages with a record offset, i.e. Solscan & FRED's offset & limit"""
+    def __init__(self, records_key: Union[str, Callable[[Dict], List], None] = None,
+                 page_size: int = 100, size_param: str = 'limit',
+                 offset_param: str = 'offset', start: int = 0):
+        Paginator.__init__(self, records_key=records_key, page_size=page_size,
+                           size_param=size_param)
+        self.offset_param = offset_param
+        self.start = start
+
+    def first_params(self, params: Dict = None) -> Dict:
+        return dict(params or {}, **{self.offset_param: self.start,
+                                     self.size_param: self.page_size})
+
+    def next_params(self, params: Dict, records: List) -> Optional[Dict]:
+        if len(records) < self.page_size:
+            return None
+        return dict(params, **{self.offset_param: params[self.offset_param] + len(records)})
+
+    def get_bounds(self, params: Dict) -> Tuple[int, int]:
+        first = int(params.get(self.offset_param, self.start)) - self.start
+        return first, first + self.get_page_size(params)
@@ -0,0 +1,179 @@
+"""This module is meant to contain the Profiler class & the phase timing helpers"""
+
+
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+# Phases get_response & the shared helpers are split into
+PHASES = ('throttle', 'http', 'read', 'decode', 'backoff', 'normalize', 'assemble')
+
+# Default number of method calls a Profiler keeps
+DEFAULT_MAX_CALLS = 1000
+
+
+class CallProfile:
+    """This class holds the time spent in each phase during one method call.
+
+    Phase times are exclusive, time spent in a nested phase isn't counted twice.
+    Phases run by fan_out workers are summed across threads, so with concurrency
+    they can add up to more than the wall time of the call.
+    """
+    def __init__(self, method: str):
+        self.method = method
+        self.phases: Dict[str, float] = {}
+        self.wall = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, phase_name: str, seconds: float) -> None:
+        """Adds time to a phase"""
+        with self.lock:
+            self.phases[phase_name] = self.phases.get(phase_name, 0.0) + seconds
+
+    def to_dict(self) -> Dict:
+        """Returns the phase breakdown with the wall time & the unaccounted remainder"""
+        with self.lock:
+            breakdown = dict(self.phases)
+        breakdown['wall'] = self.wall
+        breakdown['other'] = max(0.0, self.wall - sum(self.phases.values()))
+        return breakdown
+
+
+# Call being profiled & stack of [phase, start] entries in the current thread or task
+CURRENT_CALL: ContextVar[Optional[CallProfile]] = ContextVar('current_call', default=None)
+PHASE_STACK: ContextVar[tuple] = ContextVar('phase_stack', default=())
+
+
+def is_profiling() -> bool:
+    """Returns whether the current thread or task is inside a profiled call"""
+    return CURRENT_CALL.get() is not None
+
+
+@contextmanager
+def phase(name: str):
+    """Times the enclosed block as phase name of the current profiled call.
+
+    Does nothing outside of a profiled call. Entering a phase pauses the
+    enclosing one & re-entering the phase already running is not timed twice.
+    """
+    call = CURRENT_CALL.get()
+    stack = PHASE_STACK.get()
+    if call is None or (stack and stack[-1][0] == name):
+        yield
+        return
+    now = time.perf_counter()
+    if stack:
+        outer = stack[-1]
+        call.add(outer[0], now - outer[1])
+    entry = [name, now]
+    token = PHASE_STACK.set(stack + (entry,))
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        call.add(name, end - entry[1])
+        PHASE_STACK.reset(token)
+        if stack:
+            stack[-1][1] = end
+
+
+def timed(name: str) -> Callable:
+    """Decorator timing every call of a helper as phase name when profiling
+
+    :param name: str
+        Phase name, i.e. normalize or assemble
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if CURRENT_CALL.get() is None:
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profiled(method: Callable) -> Callable:
+    """Decorator recording a DataLoader method call in self.profiler when profiling is on.
+
+    Calls made from inside another profiled method are part of the outer call.
+    Works for both regular methods & coroutines.
+    """
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            if self.profiler is None or CURRENT_CALL.get() is not None:
+                return await method(self, *args, **kwargs)
+            call = CallProfile(method.__name__)
+            token = CURRENT_CALL.set(call)
+            start = time.perf_counter()
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                call.wall = time.perf_counter() - start
+                CURRENT_CALL.reset(token)
+                self.profiler.record(call)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is None or CURRENT_CALL.get() is not None:
+            return method(self, *args, **kwargs)
+        call = CallProfile(method.__name__)
+        token = CURRENT_CALL.set(call)
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            call.wall = time.perf_counter() - start
+            CURRENT_CALL.reset(token)
+            self.profiler.record(call)
+    return wrapper
+
+
+class Profiler:
+    """This class collects the phase breakdown of profiled method calls"""
+    def __init__(self, max_calls: int = DEFAULT_MAX_CALLS):
+        self.calls: deque = deque(maxlen=max_calls)
+        self.lock = threading.Lock()
+
+    def record(self, call: CallProfile) -> None:
+        """Stores a finished call"""
+        with self.lock:
+            self.calls.append(call)
+
+    def get_calls(self) -> List[Dict]:
+        """Returns the breakdown of every recorded call, oldest first
+
+        :return: List of dictionaries with the method name, wall time & seconds per phase
+        """
+        with self.lock:
+            calls = list(self.calls)
+        return [dict(call.to_dict(), method=call.method) for call in calls]
+
+    def summary(self) -> pd.DataFrame:
+        """Returns the total seconds spent in each phase per method
+
+        :return: DataFrame indexed by method with a calls, wall, other & one column per phase
+        """
+        calls = self.get_calls()
+        if not calls:
+            return pd.DataFrame()
+        calls_df = pd.DataFrame(calls).fillna(0.0)
+        summary_df = calls_df.groupby('method').sum()
+        summary_df.insert(0, 'calls', calls_df.groupby('method').size())
+        columns = ['calls', 'wall'] + [name for name in PHASES if name in summary_df] + ['other']
+        return summary_df[columns]
+
+    def reset(self) -> None:
+        """Drops every recorded call"""
+        with self.lock:
+            self.calls.clear()
@@ -0,0 +1,478 @@
+"""This module is meant to contain the TokenBucket, QuotaLedger & RateLimiter classes"""
+
+
+import asyncio
+import contextvars
+import functools
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Environment variable pointing DEFAULT_RATE_LIMITER at a SQLite ledger shared
+# by every process of the host (i.e. ~/.cache/messari/ratelimit.db)
+RATE_LIMIT_DB_ENV = 'MESSARI_RATE_LIMIT_DB'
+
+SECONDS_PER_DAY = 86400
+
+
+def get_host(url: str) -> str:
+    """Returns the host a rate limit is keyed by
+
+    :param url: str
+        Full URL (https://api.etherscan.io/api) or bare host (api.etherscan.io)
+    :return: lower case host string
+    """
+    if '://' in url:
+        return urlsplit(url).netloc.lower()
+    return url.lower()
+
+
+def get_day(now: float) -> str:
+    """Returns the UTC day quotas of an epoch timestamp are counted in (i.e. 2022-05-31)"""
+    return time.strftime('%Y-%m-%d', time.gmtime(now))
+
+
+async def run_blocking(blocking: bool, func: Callable, *args) -> Any:
+    """Calls func, in the loop's default executor when it blocks on I/O (SQLite, files)
+    so other coroutines keep running. Context variables (deadline, profiler) are kept
+
+    :param blocking: bool
+        Whether func does I/O
+    :param func: callable
+        Function to call with args
+    :return: What func returns
+    """
+    if not blocking:
+        return func(*args)
+    call = functools.partial(contextvars.copy_context().run, func, *args)
+    return await asyncio.get_running_loop().run_in_executor(None, call)
+
+
+def get_scoped_name(host: str, scope: str = None) -> str:
+    """Returns the name of the bucket limiting host for one scope, the host without one"""
+    return host if scope is None else f'{host}#{scope}'
+
+
+def take_tokens(balance: float, updated: float, now: float, interval: float, burst: int,
+                tokens: int) -> Tuple[float, float]:
+    """Refills a bucket balance up to burst & takes tokens from it
+
+    :return: (new balance, seconds to wait before the tokens can be used) tuple
+    """
+    balance = min(float(burst), balance + max(0.0, now - updated) / interval) - tokens
+    return balance, 0.0 if balance >= 0 else -balance * interval
+
+
+class TokenBucket:
+    """This class is a thread safe token bucket allowing `calls` requests every `period` seconds.
+
+    Callers reserve a token and get back how long they have to wait before using it.
+    The balance is allowed to go negative so concurrent callers queue up behind each
+    other instead of all waking up at once & tripping the provider's limit.
+    """
+    def __init__(self, calls: float, period: float = 1.0, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        if calls <= 0 or period <= 0:
+            raise ValueError('calls & period must be positive')
+        if burst < 1:
+            raise ValueError('burst must be at least 1')
+        self.calls = calls
+        self.period = period
+        self.burst = burst
+        self.interval = period / calls
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def peek(self, tokens: int = 1) -> float:
+        """Returns how long a reservation made now would wait, without taking tokens
+
+        :param tokens: int
+            Number of tokens that would be taken
+        :return: Seconds to wait
+        """
+        with self.lock:
+            return take_tokens(self.tokens, self.updated, self.clock(), self.interval,
+                               self.burst, tokens)[1]
+
+    def reserve(self, tokens: int = 1) -> float:
+        """Takes tokens from the bucket
+
+        :param tokens: int
+            Number of tokens to take, default 1 per request
+        :return: Seconds to wait before the request is allowed
+        """
+        with self.lock:
+            now = self.clock()
+            self.tokens, delay = take_tokens(self.tokens, self.updated, now, self.interval,
+                                             self.burst, tokens)
+            self.updated = now
+            return delay
+
+
+class SharedTokenBucket(TokenBucket):
+    """This class is a token bucket whose balance lives in a shared QuotaLedger,
+    so every process using the ledger draws from the same bucket
+    """
+    def __init__(self, name: str, ledger: 'QuotaLedger', calls: float, period: float = 1.0,
+                 burst: int = 1):
+        TokenBucket.__init__(self, calls, period=period, burst=burst, clock=ledger.clock)
+        self.name = name
+        self.ledger = ledger
+
+    def peek(self, tokens: int = 1) -> float:
+        return self.ledger.take(self.name, tokens, self.interval, self.burst, peek=True)
+
+    def reserve(self, tokens: int = 1) -> float:
+        return self.ledger.take(self.name, tokens, self.interval, self.burst)
+
+
+class QuotaLedger:
+    """This class counts the requests made under each limit per UTC day, in memory.
+
+    It is the storage interface of RateLimiter. Token bucket balances taken with take
+    live in this process, ledgers with shared set to True keep them where every
+    process sees them so limits hold across processes.
+    Ledgers with blocking set to True do I/O, AsyncDataLoader calls them off the event loop.
+    """
+    shared = False
+    blocking = False
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.usage: Dict[Tuple[str, str], int] = {}
+        self.balances: Dict[str, Tuple[float, float]] = {}
+        self.lock = threading.Lock()
+
+    def take(self, name: str, tokens: int, interval: float, burst: int,
+             peek: bool = False) -> float:
+        """Takes tokens from the bucket called name & counts them as used today
+
+        :param name: str
+            Host or key the bucket limits
+        :param tokens: int
+            Number of tokens to take
+        :param interval: float
+            Seconds it takes to refill one token
+        :param burst: int
+            Capacity of the bucket
+        :param peek: bool
+            Only return the wait, leaving the bucket & usage untouched
+        :return: Seconds to wait before the request is allowed
+        """
+        with self.lock:
+            now = self.clock()
+            balance, updated = self.balances.get(name, (float(burst), now))
+            balance, delay = take_tokens(balance, updated, now, interval, burst, tokens)
+            if not peek:
+                self.balances[name] = (balance, now)
+                key = (name, get_day(now))
+                self.usage[key] = self.usage.get(key, 0) + tokens
+            return delay
+
+    def add_usage(self, name: str, calls: int = 1) -> None:
+        """Counts calls made under name today"""
+        key = (name, get_day(self.clock()))
+        with self.lock:
+            self.usage[key] = self.usage.get(key, 0) + calls
+
+    def get_usage(self, name: str, day: str = None) -> int:
+        """Returns the calls made under name on a UTC day, today by default"""
+        with self.lock:
+            return self.usage.get((name, day or get_day(self.clock())), 0)
+
+
+class SQLiteLedger(QuotaLedger):
+    """This class is a QuotaLedger stored in a single SQLite file.
+
+    Every process of the host opening the same file shares token bucket balances
+    & daily usage, each reservation being one short write transaction.
+    Balances are timed with the wall clock, the only clock processes share.
+    """
+    shared = True
+    blocking = True
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        QuotaLedger.__init__(self, clock=clock)
+        self.path = os.path.expanduser(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30,
+                                          isolation_level=None)
+        with self.lock:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets '
+                '(name TEXT PRIMARY KEY, tokens REAL, updated REAL)')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS usage '
+                '(name TEXT, day TEXT, calls INTEGER, PRIMARY KEY (name, day))')
+
+    def take(self, name: str, tokens: int, interval: float, burst: int,
+             peek: bool = False) -> float:
+        with self.lock:
+            # BEGIN IMMEDIATE takes the write lock first, so processes queue on the bucket
+            self.connection.execute('BEGIN IMMEDIATE')
+            try:
+                now = self.clock()
+                row = self.connection.execute(
+                    'SELECT tokens, updated FROM buckets WHERE name = ?', (name,)).fetchone()
+                balance, updated = row if row is not None else (float(burst), now)
+                balance, delay = take_tokens(balance, updated, now, interval, burst, tokens)
+                if not peek:
+                    self.connection.execute('INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)',
+                                            (name, balance, now))
+                    self.increment(name, get_day(now), tokens)
+                self.connection.execute('COMMIT')
+            except BaseException:
+                self.connection.execute('ROLLBACK')
+                raise
+            return delay
+
+    def increment(self, name: str, day: str, calls: int) -> None:
+        """Adds calls to the usage row of name & day, called inside a transaction"""
+        self.connection.execute(
+            'INSERT INTO usage VALUES (?, ?, ?) '
+            'ON CONFLICT (name, day) DO UPDATE SET calls = calls + excluded.calls',
+            (name, day, calls))
+
+    def add_usage(self, name: str, calls: int = 1) -> None:
+        with self.lock:
+            self.increment(name, get_day(self.clock()), calls)
+
+    def get_usage(self, name: str, day: str = None) -> int:
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT calls FROM usage WHERE name = ? AND day = ?',
+                (name, day or get_day(self.clock()))).fetchone()
+        return row[0] if row is not None else 0
+
+    def close(self) -> None:
+        """Closes the SQLite connection"""
+        self.connection.close()
+
+
+class RateLimiter:
+    """This class is a registry of token buckets keyed by host.
+
+    Connectors register their provider's published limit with set_default, users
+    can override a host with set_limit & defaults never replace an explicit limit.
+    Defaults can be scoped, to an API key for instance, when callers of a host are
+    allowed different limits. Hosts without a limit are not throttled.
+    Every reservation is counted in the ledger, so the calls made today & the
+    daily quota left can be read with get_quota. With a shared ledger (SQLiteLedger)
+    limits & counts hold across every process of the host.
+    """
+    def __init__(self, ledger: QuotaLedger = None):
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.explicit = set()
+        self.quotas: Dict[str, int] = {}
+        self.ledger = ledger if ledger is not None else QuotaLedger()
+        self.lock = threading.Lock()
+
+    def make_bucket(self, host: str, calls: float, period: float, burst: int) -> TokenBucket:
+        """Returns the bucket limiting host, its balance kept by the ledger when shared"""
+        if self.ledger.shared:
+            return SharedTokenBucket(host, self.ledger, calls, period=period, burst=burst)
+        return TokenBucket(calls, period=period, burst=burst)
+
+    def set_limit(self, url: str, calls: float, period: float = 1.0, burst: int = 1) -> None:
+        """Sets the limit for a host, overriding any provider default
+
+        :param url: str
+            URL or host to limit
+        :param calls: float
+            Number of calls allowed every period
+        :param period: float
+            Length of the period in seconds
+        :param burst: int
+            Number of calls that can be made back to back before throttling kicks in
+        """
+        host = get_host(url)
+        with self.lock:
+            self.buckets[host] = self.make_bucket(host, calls, period, burst)
+            self.explicit.add(host)
+
+    def set_default(self, url: str, calls: float, period: float = 1.0, burst: int = 1,
+                    scope: str = None) -> None:
+        """Sets the provider default limit for a host unless one was set explicitly
+
+        :param url: str
+            URL or host to limit
+        :param calls: float
+            Number of calls allowed every period
+        :param period: float
+            Length of the period in seconds
+        :param burst: int
+            Number of calls that can be made back to back before throttling kicks in
+        :param scope: str
+            Limit only the requests reserved with this scope (i.e. an API key id),
+            so callers of the same host with different limits don't reset each other's
+        """
+        host = get_host(url)
+        name = get_scoped_name(host, scope)
+        with self.lock:
+            if host in self.explicit:
+                return
+            bucket = self.buckets.get(name)
+            if bucket and (bucket.calls, bucket.period, bucket.burst) == (calls, period, burst):
+                return
+            self.buckets[name] = self.make_bucket(name, calls, period, burst)
+
+    def remove_limit(self, url: str) -> None:
+        """Stops throttling a host
+
+        :param url: str
+            URL or host to stop limiting
+        """
+        host = get_host(url)
+        with self.lock:
+            for name in [name for name in self.buckets
+                         if name == host or name.startswith(f'{host}#')]:
+                del self.buckets[name]
+            self.explicit.discard(host)
+
+    def get_limit(self, url: str) -> TokenBucket:
+        """Returns the bucket limiting a host, None if it isn't limited
+
+        :param url: str
+            URL or host
+        :return: TokenBucket or None
+        """
+        return self.buckets.get(get_host(url))
+
+    @property
+    def blocking(self) -> bool:
+        """Whether reserving a request does I/O on the ledger"""
+        return self.ledger.blocking
+
+    def get_bucket(self, host: str, scope: str = None) -> Optional[TokenBucket]:
+        """Returns the bucket a request to host is reserved on: the scope's default
+        unless the host has an explicit limit, the host's otherwise"""
+        if scope is not None and host not in self.explicit:
+            bucket = self.buckets.get(get_scoped_name(host, scope))
+            if bucket is not None:
+                return bucket
+        return self.buckets.get(host)
+
+    def reserve(self, url: str, scope: str = None) -> float:
+        """Reserves a request to url's host
+
+        :param url: str
+            URL about to be requested
+        :param scope: str
+            Scope the request is limited under, see set_default
+        :return: Seconds to wait before making the request
+        """
+        host = get_host(url)
+        bucket = self.get_bucket(host, scope)
+        if bucket is None:
+            self.ledger.add_usage(host)
+            return 0.0
+        # Shared buckets count their own usage, under their name
+        if not self.ledger.shared or bucket is not self.buckets.get(host):
+            self.ledger.add_usage(host)
+        return bucket.reserve()
+
+    def record(self, url: str, calls: int = 1) -> None:
+        """Counts calls made to url's host without throttling them
+
+        :param url: str
+            URL or host requested
+        :param calls: int
+            Number of calls made
+        """
+        self.ledger.add_usage(get_host(url), calls)
+
+    def set_quota(self, url: str, calls: int) -> None:
+        """Sets the number of calls a host or key is allowed per UTC day
+
+        :param url: str
+            URL or host
+        :param calls: int
+            Daily quota
+        """
+        self.quotas[get_host(url)] = calls
+
+    def get_usage(self, url: str, day: str = None) -> int:
+        """Returns the calls made to a host on a UTC day, every process included
+        when the ledger is shared
+
+        :param url: str
+            URL or host
+        :param day: str
+            UTC day (i.e. 2022-05-31), today by default
+        :return: int
+        """
+        return self.ledger.get_usage(get_host(url), day)
+
+    def get_quota(self, url: str) -> Dict[str, Optional[float]]:
+        """Returns today's use of a host's daily quota, for jobs to plan around
+
+        :param url: str
+            URL or host
+        :return: dict with used, quota & remaining calls (None without a quota)
+            and the seconds until the quota resets
+        """
+        host = get_host(url)
+        now = self.ledger.clock()
+        used = self.ledger.get_usage(host)
+        quota = self.quotas.get(host)
+        return {'used': used, 'quota': quota,
+                'remaining': max(0, quota - used) if quota is not None else None,
+                'resets_in': SECONDS_PER_DAY - now % SECONDS_PER_DAY}
+
+    def wait(self, url: str, deadline=None, scope: str = None) -> None:
+        """Blocks until a request to url's host is allowed
+
+        :param url: str
+            URL about to be requested
+        :param deadline: messari.deadline.Deadline
+            Budget of the call, raises instead of waiting past it
+        :param scope: str
+            Scope the request is limited under, see set_default
+        """
+        delay = self.reserve(url, scope)
+        if delay > 0:
+            if deadline is not None:
+                deadline.sleep(delay)
+            else:
+                time.sleep(delay)
+
+    async def wait_async(self, url: str, deadline=None, scope: str = None) -> None:
+        """Sleeps on the event loop until a request to url's host is allowed
+
+        :param url: str
+            URL about to be requested
+        :param deadline: messari.deadline.Deadline
+            Budget of the call, raises instead of waiting past it
+        :param scope: str
+            Scope the request is limited under, see set_default
+        """
+        delay = await run_blocking(self.blocking, self.reserve, url, scope)
+        if delay > 0:
+            if deadline is not None:
+                await deadline.sleep_async(delay)
+            else:
+                await asyncio.sleep(delay)
+
+
+def make_rate_limiter(path: str = None) -> RateLimiter:
+    """Returns a RateLimiter shared across processes through the SQLite file at path,
+    or a process local one when path is empty
+
+    :param path: str
+        Path of the SQLite ledger
+    :return: RateLimiter
+    """
+    return RateLimiter(ledger=SQLiteLedger(path) if path else None)
+
+
+# Process wide limiter shared by every DataLoader & AsyncDataLoader,
+# so several instances & fan out threads all draw from the same buckets
+DEFAULT_RATE_LIMITER = make_rate_limiter(os.environ.get(RATE_LIMIT_DB_ENV))
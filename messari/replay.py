@@ -0,0 +1,276 @@
+"""This module is meant to contain the Cassette class & the record/replay transport"""
+
+
+import atexit
+import base64
+import datetime
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl, urlencode, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from messari.cache import is_secret, make_cache_key
+
+# record: always hit the network & store every response
+# replay: only serve stored responses, unrecorded requests raise
+# once: serve stored responses, record the ones missing
+MODES = ('record', 'replay', 'once')
+
+# Environment variables setting a cassette on every DataLoader
+CASSETTE_ENV = 'MESSARI_CASSETTE'
+CASSETTE_MODE_ENV = 'MESSARI_CASSETTE_MODE'
+
+# Headers that don't describe the stored body
+DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection',
+                   'set-cookie', 'date', 'keep-alive')
+
+
+class UnrecordedRequestError(Exception):
+    """Raised when a cassette in replay mode has no response for a request"""
+    def __init__(self, method: str, url: str):
+        self.method = method
+        self.url = url
+        super().__init__(f'No recorded response for {method} {url}')
+
+
+def split_url(url: str) -> Tuple[str, Dict]:
+    """Splits a URL into its scheme-less address (host & path) and query parameters
+
+    :param url: str
+        URL API string, with or without a query string
+    :return: (host/path, {param: value or list of values}) tuple
+    """
+    parts = urlsplit(url)
+    params: Dict = {}
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        if name in params:
+            previous = params[name]
+            params[name] = previous + [value] if isinstance(previous, list) else [previous, value]
+        else:
+            params[name] = value
+    return parts.netloc.lower() + (parts.path or '/'), params
+
+
+def request_key(method: str, url: str) -> str:
+    """Builds the key a request is recorded under, leaving out the scheme & credentials
+
+    :param method: str
+        HTTP method
+    :param url: str
+        URL API string including the query string
+    :return: str
+    """
+    address, params = split_url(url)
+    return f'{method.upper()} {make_cache_key(address, params)}'
+
+
+def redact_url(url: str) -> str:
+    """Removes credentials from the query string of a URL
+
+    :param url: str
+        URL API string
+    :return: str
+    """
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not is_secret(name)]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class Cassette:
+    """This class stores recorded responses keyed by request, optionally in a JSON file.
+
+    Identical requests recorded several times are replayed in the order they were
+    recorded, the last response being repeated once they have all been served.
+    Credentials are stripped from recorded URLs & are not used to match requests,
+    so cassettes can be recorded with one API key & replayed without any.
+    """
+    def __init__(self, path: str = None, mode: str = 'once'):
+        if mode not in MODES:
+            raise ValueError(f'mode must be one of {MODES}')
+        self.path = path
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.interactions: Dict[str, List[Dict]] = {}
+        self.played: Dict[str, int] = {}
+        self.dirty = False
+        if path is not None and mode != 'record' and os.path.exists(path):
+            self.load()
+
+    def load(self) -> None:
+        """Reads the interactions stored in path"""
+        with open(self.path, 'r', encoding='utf-8') as cassette_file:
+            entries = json.load(cassette_file)['interactions']
+        with self.lock:
+            self.interactions = {}
+            self.played = {}
+            for entry in entries:
+                key = request_key(entry['method'], entry['url'])
+                self.interactions.setdefault(key, []).append(entry)
+
+    def save(self) -> None:
+        """Writes every interaction to path, does nothing for in memory cassettes"""
+        if self.path is None:
+            return
+        with self.lock:
+            entries = [entry for responses in self.interactions.values() for entry in responses]
+            self.dirty = False
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as cassette_file:
+            json.dump({'interactions': entries}, cassette_file, indent=1)
+
+    def find(self, method: str, url: str) -> Optional[Dict]:
+        """Returns the next recorded response for a request
+
+        :param method: str
+            HTTP method
+        :param url: str
+            URL API string including the query string
+        :return: Dict with status, headers & body or None if it was never recorded
+        """
+        key = request_key(method, url)
+        with self.lock:
+            responses = self.interactions.get(key)
+            if not responses:
+                return None
+            index = self.played.get(key, 0)
+            self.played[key] = index + 1
+            return responses[min(index, len(responses) - 1)]
+
+    def record(self, method: str, url: str, status: int, headers: Dict, body: bytes) -> None:
+        """Stores a response
+
+        :param method: str
+            HTTP method
+        :param url: str
+            URL API string including the query string
+        :param status: int
+            HTTP status
+        :param headers: dict
+            Response headers
+        :param body: bytes
+            Decoded (not gzipped) response body
+        """
+        entry = {'method': method.upper(), 'url': redact_url(url), 'status': status,
+                 'headers': {name: value for name, value in headers.items()
+                             if name.lower() not in DROPPED_HEADERS}}
+        try:
+            entry['body'] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            entry['body_base64'] = base64.b64encode(body).decode('ascii')
+        key = request_key(method, url)
+        with self.lock:
+            self.interactions.setdefault(key, []).append(entry)
+            self.dirty = True
+
+    def __len__(self) -> int:
+        with self.lock:
+            return sum(len(responses) for responses in self.interactions.values())
+
+
+def get_body(entry: Dict) -> bytes:
+    """Returns the body of a recorded response as bytes"""
+    if 'body_base64' in entry:
+        return base64.b64decode(entry['body_base64'])
+    return entry.get('body', '').encode('utf-8')
+
+
+def build_response(request: requests.PreparedRequest, entry: Dict) -> requests.Response:
+    """Builds a requests Response from a recorded response
+
+    :param request: PreparedRequest
+        Request being answered
+    :param entry: dict
+        Recorded response
+    :return: requests Response
+    """
+    response = requests.Response()
+    response.status_code = entry['status']
+    response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = get_body(entry)  # pylint: disable=protected-access
+    response.url = request.url
+    response.request = request
+    response.reason = 'Replayed'
+    response.elapsed = datetime.timedelta(0)
+    return response
+
+
+class CassetteAdapter(BaseAdapter):
+    """This class is a requests transport adapter recording to or replaying from a Cassette.
+
+    Mount it on a DataLoader with DataLoader.set_transport(CassetteAdapter(cassette)).
+    """
+    def __init__(self, cassette: Cassette, adapter: BaseAdapter = None):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter if adapter is not None else HTTPAdapter()
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False,  # pylint: disable=too-many-arguments
+             timeout=None, verify=True, cert=None, proxies=None) -> requests.Response:
+        if self.cassette.mode != 'record':
+            entry = self.cassette.find(request.method, request.url)
+            if entry is not None:
+                return build_response(request, entry)
+            if self.cassette.mode == 'replay':
+                raise UnrecordedRequestError(request.method, redact_url(request.url))
+
+        response = self.adapter.send(request, stream=False, timeout=timeout, verify=verify,
+                                     cert=cert, proxies=proxies)
+        self.cassette.record(request.method, request.url, response.status_code,
+                             response.headers, response.content)
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+# Cassettes opened through get_cassette, by path
+CASSETTES: Dict[str, Cassette] = {}
+CASSETTES_LOCK = threading.Lock()
+
+
+def save_cassettes() -> None:
+    """Saves every cassette opened through get_cassette holding new responses"""
+    with CASSETTES_LOCK:
+        cassettes = list(CASSETTES.values())
+    for cassette in cassettes:
+        if cassette.dirty:
+            cassette.save()
+
+
+def get_cassette(path: str, mode: str = 'once') -> Cassette:
+    """Returns the process wide cassette stored at path, saved when the interpreter exits
+
+    :param path: str
+        Path of the JSON cassette file
+    :param mode: str
+        record, replay or once
+    :return: Cassette
+    """
+    path = os.path.abspath(path)
+    with CASSETTES_LOCK:
+        cassette = CASSETTES.get(path)
+        if cassette is None:
+            if not CASSETTES:
+                atexit.register(save_cassettes)
+            cassette = CASSETTES[path] = Cassette(path, mode=mode)
+        return cassette
+
+
+def get_env_cassette() -> Optional[Cassette]:
+    """Returns the cassette named by the MESSARI_CASSETTE environment variable, if any.
+
+    MESSARI_CASSETTE_MODE picks the mode, once by default.
+    """
+    path = os.environ.get(CASSETTE_ENV)
+    if not path:
+        return None
+    return get_cassette(path, mode=os.environ.get(CASSETTE_MODE_ENV, 'once'))
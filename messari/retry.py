@@ -0,0 +1,125 @@
+"""This module is meant to contain the RetryPolicy & RetryBudget classes"""
+
+
+import datetime
+import random
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Default number of retries allowed per status code for a single request
+DEFAULT_STATUS_RETRIES = {429: 5, 500: 2, 502: 3, 503: 3, 504: 3}
+
+
+class QueryFailedError(Exception):
+    """Raised when a request still fails after the retry policy gave up"""
+    def __init__(self, status_code: int, url: str = None):
+        Exception.__init__(self, f'Query Failed - code: {status_code}')
+        self.status_code = status_code
+        self.url = url
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header, which is either a number of seconds or an HTTP date
+
+    :param value: str
+        Raw header value, None if the header is missing
+    :return: Seconds to wait or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+class RetryPolicy:
+    """This class describes how a DataLoader retries failed requests.
+
+    Retries are spaced with full jitter exponential backoff, a uniform wait between 0 &
+    min(max_backoff, backoff_factor * 2 ** attempt). When the server sends Retry-After
+    that wait is used instead, unless it is longer than max_retry_after in which case
+    the request fails straight away rather than blocking the whole batch.
+    Every status code has its own budget & max_retries caps the total.
+    """
+    def __init__(self, max_retries: int = 5, backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0, max_retry_after: float = 120.0,
+                 status_retries: Dict[int, int] = None, connection_retries: int = 3,
+                 rng: random.Random = None):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.status_retries = dict(DEFAULT_STATUS_RETRIES if status_retries is None
+                                   else status_retries)
+        self.connection_retries = connection_retries
+        self.rng = rng if rng is not None else random.Random()
+
+    def get_backoff(self, attempt: int) -> float:
+        """Returns a jittered wait for the n-th retry (starting at 0)
+
+        :param attempt: int
+            Number of retries already made for the request
+        :return: Seconds to wait
+        """
+        ceiling = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        return self.rng.uniform(0, ceiling)
+
+    def new_budget(self) -> 'RetryBudget':
+        """Returns a fresh budget to track the retries of a single request
+
+        :return: RetryBudget
+        """
+        return RetryBudget(self)
+
+
+class RetryBudget:
+    """This class tracks the retries made for one request against its RetryPolicy"""
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.attempts = 0
+        self.status_attempts: Dict[Optional[int], int] = {}
+
+    def next_delay(self, status_code: int = None, retry_after: str = None) -> Optional[float]:
+        """Spends a retry & returns how long to wait before it, None once the budget is spent
+
+        :param status_code: int
+            HTTP status of the failed response, None for connection errors & timeouts
+        :param retry_after: str
+            Raw Retry-After header of the failed response
+        :return: Seconds to wait before retrying or None if the request should fail
+        """
+        policy = self.policy
+        if status_code is None:
+            allowed = policy.connection_retries
+        else:
+            allowed = policy.status_retries.get(status_code, 0)
+        used = self.status_attempts.get(status_code, 0)
+        if used >= allowed or self.attempts >= policy.max_retries:
+            return None
+
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = policy.get_backoff(self.attempts)
+        elif delay > policy.max_retry_after:
+            return None
+
+        self.status_attempts[status_code] = used + 1
+        self.attempts += 1
+        return delay
+
+
+# Retry policy used by DataLoader & AsyncDataLoader unless a connector sets its own
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+# Never retry, fail on the first error like the original get_response
+NO_RETRY_POLICY = RetryPolicy(max_retries=0)
@@ -0,0 +1,162 @@
+"""This module is meant to contain the SingleFlight & AsyncSingleFlight classes"""
+
+
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from messari.deadline import Deadline, DeadlineExceededError, RequestCancelledError
+
+# Errors of a leader's own budget, waiters retry instead of sharing them
+LEADER_ERRORS = (DeadlineExceededError, RequestCancelledError)
+
+# Seconds between deadline checks of a waiter
+POLL_INTERVAL = 0.1
+
+
+class Call:
+    """This class holds the outcome of a call shared by several callers"""
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """This class coalesces concurrent identical calls across threads.
+
+    The first caller for a key runs the function, callers arriving while it is in
+    flight block & share its outcome instead of making their own request.
+    Results are JSON objects that connectors may modify, so when a result is shared
+    every caller gets its own deep copy. Calls nobody waited on are returned as is.
+    Waiters keep to their own deadline: they give up when it runs out & don't
+    share the leader's deadline or cancellation errors, they retry as the new leader.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: Dict[str, Call] = {}
+
+    def do(self, key: str, func: Callable[[], Any], deadline: Deadline = None) -> Any:
+        """Runs func unless an identical call is in flight, then waits for its outcome
+
+        :param key: str
+            Key identifying identical calls
+        :param func: Callable
+            Function taking no arguments
+        :param deadline: messari.deadline.Deadline
+            Budget of the caller, a waiter raises once it runs out
+        :return: func's result
+        """
+        while True:
+            with self.lock:
+                call = self.calls.get(key)
+                leader = call is None
+                if leader:
+                    call = Call()
+                    self.calls[key] = call
+                else:
+                    call.waiters += 1
+
+            if leader:
+                break
+            wait(call.event, deadline)
+            if isinstance(call.error, LEADER_ERRORS):
+                # The leader ran out of its own budget, not ours
+                continue
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+                shared = call.waiters > 0
+            call.event.set()
+        return copy.deepcopy(call.result) if shared else call.result
+
+
+def wait(event: threading.Event, deadline: Optional[Deadline]) -> None:
+    """Waits for event, raising if deadline is cancelled or runs out first"""
+    if deadline is None:
+        event.wait()
+        return
+    while True:
+        deadline.check()
+        remaining = deadline.remaining()
+        timeout = POLL_INTERVAL if remaining is None else min(remaining, POLL_INTERVAL)
+        if event.wait(timeout):
+            return
+
+
+class AsyncSingleFlight:
+    """This class coalesces concurrent identical coroutines on one event loop,
+    the asyncio counterpart of SingleFlight
+    """
+    def __init__(self):
+        self.calls: Dict[str, asyncio.Future] = {}
+        self.waiters: Dict[str, int] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable],
+                 deadline: Deadline = None) -> Any:
+        """Awaits func unless an identical call is in flight, then waits for its outcome
+
+        :param key: str
+            Key identifying identical calls
+        :param func: Callable
+            Coroutine function taking no arguments
+        :param deadline: messari.deadline.Deadline
+            Budget of the caller, a waiter raises once it runs out
+        :return: func's result
+        """
+        future = self.calls.get(key)
+        while future is not None:
+            self.waiters[key] += 1
+            await wait_async(future, deadline)
+            if future.cancelled() or isinstance(future.exception(), LEADER_ERRORS):
+                # The leader was cancelled or ran out of its own budget, not ours
+                future = self.calls.get(key)
+                continue
+            return copy.deepcopy(future.result())
+
+        future = asyncio.get_running_loop().create_future()
+        self.calls[key] = future
+        self.waiters[key] = 0
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception so it isn't reported as never retrieved
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self.calls[key]
+            shared = self.waiters.pop(key) > 0
+        return copy.deepcopy(result) if shared else result
+
+
+async def wait_async(future: asyncio.Future, deadline: Optional[Deadline]) -> None:
+    """Waits for future to be done, raising if deadline is cancelled or runs out first"""
+    while not future.done():
+        timeout = None
+        if deadline is not None:
+            deadline.check()
+            remaining = deadline.remaining()
+            timeout = POLL_INTERVAL if remaining is None else min(remaining, POLL_INTERVAL)
+        await asyncio.wait([future], timeout=timeout)
+
+
+# Process wide coalescer shared by every DataLoader, identical requests made
+# at the same time by different instances & threads only go upstream once
+DEFAULT_SINGLE_FLIGHT = SingleFlight()
@@ -0,0 +1,217 @@
+"""This module is meant to contain the Taxonomy & TaxonomyRegistry classes"""
+
+
+import json
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Directory holding the mapping files shipped with the package
+MAPPINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mappings')
+
+
+def normalize_slug(slug: str) -> str:
+    """Normalizes a slug or symbol the way Messari does, case & separator insensitive
+
+    :param slug: str
+        Slug or symbol (i.e. Yearn_Finance, UNI)
+    :return: str (i.e. yearn-finance, uni)
+    """
+    return str(slug).strip().lower().replace('_', '-').replace(' ', '-')
+
+
+class Taxonomy(Mapping):
+    """This class maps Messari slugs & symbols to the ids of another API.
+
+    It behaves like the read only dictionary it was built from, with an index of
+    normalized keys so lookups are case insensitive and a reverse index mapping
+    the API's ids back to Messari. Indexes are swapped atomically on update, so a
+    taxonomy shared by several loaders can be reloaded while they use it.
+    """
+    def __init__(self, mapping: Dict[str, str] = None):
+        self.forward: Dict[str, str] = {}
+        self.normalized: Dict[str, str] = {}
+        self.reverse: Dict[str, List[str]] = {}
+        self.update(mapping or {})
+
+    def update(self, mapping: Dict[str, str]) -> None:
+        """Replaces the mapping & rebuilds every index
+
+        :param mapping: dict
+            Dictionary of {messari slug or symbol: api id}
+        """
+        forward = dict(mapping)
+        normalized: Dict[str, str] = {}
+        reverse: Dict[str, List[str]] = {}
+        for key, value in forward.items():
+            normalized.setdefault(normalize_slug(key), value)
+            reverse.setdefault(value, []).append(key)
+        self.forward, self.normalized, self.reverse = forward, normalized, reverse
+
+    def __getitem__(self, key: str) -> str:
+        return self.forward[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.forward)
+
+    def __len__(self) -> int:
+        return len(self.forward)
+
+    def translate(self, slug: str) -> str:
+        """Returns the API id of a Messari slug or symbol, the slug itself if it isn't mapped
+
+        :param slug: str
+            Messari slug or symbol, any case (i.e. UNI)
+        :return: str (i.e. uniswap)
+        """
+        value = self.forward.get(slug)
+        if value is None:
+            value = self.normalized.get(normalize_slug(slug), slug)
+        return value
+
+    def to_messari(self, api_id: str) -> Optional[str]:
+        """Returns the Messari slug an API id was mapped from
+
+        :param api_id: str
+            Id used by the API (i.e. uniswap)
+        :return: str, the first key mapped to api_id (slugs come before symbols),
+            None if api_id isn't mapped
+        """
+        keys = self.reverse.get(api_id)
+        return keys[0] if keys else None
+
+    def aliases(self, api_id: str) -> List[str]:
+        """Returns every Messari slug & symbol mapped to an API id
+
+        :param api_id: str
+            Id used by the API (i.e. uniswap)
+        :return: List of slugs & symbols (i.e. ['uniswap', 'uni'])
+        """
+        return list(self.reverse.get(api_id, []))
+
+
+def as_taxonomy(taxonomy_dict: Optional[Dict]) -> Taxonomy:
+    """Returns taxonomy_dict as a Taxonomy, building one for plain dictionaries & None"""
+    if isinstance(taxonomy_dict, Taxonomy):
+        return taxonomy_dict
+    return Taxonomy(taxonomy_dict)
+
+
+def find_mapping(filename: str) -> Optional[str]:
+    """Finds a mapping file, next to the package for installs or in mappings/
+
+    :param filename: str
+        Mapping file name (i.e. messari_to_dl.json)
+    :return: str path or None if it can't be found
+    """
+    for path in (os.path.join(os.path.dirname(MAPPINGS_DIR), '..', filename),
+                 os.path.join(MAPPINGS_DIR, filename)):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def read_mapping(filename: str) -> Tuple[Dict[str, str], Optional[float]]:
+    """Reads a mapping file
+
+    :param filename: str
+        Mapping file name or path
+    :return: (mapping, modification time) tuple, ({}, None) if it can't be found
+    """
+    path = filename if os.path.isabs(filename) else find_mapping(filename)
+    if path is None or not os.path.exists(path):
+        logging.error('Cannot find taxonomy mapping %s', filename)
+        return {}, None
+    with open(path, 'r', encoding='utf-8') as mapping_file:
+        mapping = json.load(mapping_file)
+    return mapping, os.path.getmtime(path)
+
+
+class TaxonomyRegistry:
+    """This class loads every mapping file once & shares its Taxonomy across loaders"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.taxonomies: Dict[str, Taxonomy] = {}
+        self.mtimes: Dict[str, Optional[float]] = {}
+
+    def get(self, filename: str) -> Taxonomy:
+        """Returns the taxonomy of a mapping file, reading it on first use
+
+        :param filename: str
+            Mapping file name (i.e. messari_to_dl.json) or absolute path
+        :return: Taxonomy
+        """
+        taxonomy = self.taxonomies.get(filename)
+        if taxonomy is not None:
+            return taxonomy
+        with self.lock:
+            taxonomy = self.taxonomies.get(filename)
+            if taxonomy is None:
+                mapping, mtime = read_mapping(filename)
+                taxonomy = self.taxonomies[filename] = Taxonomy(mapping)
+                self.mtimes[filename] = mtime
+            return taxonomy
+
+    def register(self, name: str, mapping: Dict[str, str]) -> Taxonomy:
+        """Registers a mapping that doesn't come from a file, or replaces a loaded one
+
+        :param name: str
+            Name the taxonomy is retrieved with
+        :param mapping: dict
+            Dictionary of {messari slug or symbol: api id}
+        :return: Taxonomy
+        """
+        with self.lock:
+            taxonomy = self.taxonomies.get(name)
+            if taxonomy is None:
+                taxonomy = self.taxonomies[name] = Taxonomy(mapping)
+            else:
+                taxonomy.update(mapping)
+            self.mtimes[name] = None
+            return taxonomy
+
+    def reload(self, filename: str = None, changed_only: bool = False) -> List[str]:
+        """Re-reads mapping files, loaders using their taxonomy see the new mapping.
+        A file that can't be read (missing, invalid JSON) keeps its previous mapping.
+
+        :param filename: str
+            Mapping file to reload, default every file loaded so far
+        :param changed_only: bool
+            Only reload files modified since they were read
+        :return: List of the reloaded files
+        """
+        with self.lock:
+            filenames = [filename] if filename else [name for name, mtime in self.mtimes.items()
+                                                     if mtime is not None]
+            reloaded = []
+            for name in filenames:
+                path = name if os.path.isabs(name) else find_mapping(name)
+                if changed_only and path is not None and os.path.exists(path) and \
+                        name in self.mtimes and os.path.getmtime(path) == self.mtimes[name]:
+                    continue
+                try:
+                    mapping, mtime = read_mapping(name)
+                except (OSError, ValueError) as e:
+                    logging.error('Cannot read taxonomy mapping %s: %s', name, e)
+                    continue
+                if mtime is None and name in self.taxonomies:
+                    # Keep serving the previous mapping until the file is back
+                    continue
+                if name in self.taxonomies:
+                    self.taxonomies[name].update(mapping)
+                else:
+                    self.taxonomies[name] = Taxonomy(mapping)
+                self.mtimes[name] = mtime
+                reloaded.append(name)
+            return reloaded
+
+
+# Process wide registry used by the connectors
+DEFAULT_TAXONOMIES = TaxonomyRegistry()
+
+
+def get_taxonomy(filename: str) -> Taxonomy:
+    """Returns the shared taxonomy of a mapping file, see TaxonomyRegistry.get"""
+    return DEFAULT_TAXONOMIES.get(filename)
@@ -1,25 +1,34 @@
 """This module is meant to contain the TokenTerminal class"""
 
-from string import Template
 import datetime
 from typing import List, Union
 import pandas as pd
 
 from messari.dataloader import DataLoader
-from messari.utils import get_taxonomy_dict, time_filter_df
+from messari.keypool import make_key_pool, first_key
+from messari.utils import time_filter_df
+from messari.taxonomy import get_taxonomy
+from messari.metrics import url_template
 from .helpers import response_to_df
 
 
 BASE_URL = 'https://api.tokenterminal.com/v1/projects'
 
+# The project overview behind BASE_URL (project ids & latest data) is updated every 10 minutes
+PROJECTS_CACHE_TTL = 600
+
 class TokenTerminal(DataLoader):
     """This class is a wrapper for the Token Terminal API
     """
 
-    def __init__(self, api_key: str):
-        tt_api_key = {'Authorization': f'Bearer {api_key}'}
-        messari_to_tt_dict = get_taxonomy_dict('messari_to_tt.json')
-        DataLoader.__init__(self, api_dict=tt_api_key, taxonomy_dict=messari_to_tt_dict)
+    def __init__(self, api_key: Union[str, List[str]]):
+        tt_api_key = {'Authorization': f'Bearer {first_key(api_key)}'}
+        messari_to_tt = get_taxonomy('messari_to_tt.json')
+        DataLoader.__init__(self, api_dict=tt_api_key, taxonomy_dict=messari_to_tt)
+        # A list of keys is rotated, Token Terminal doesn't publish a per key limit
+        self.set_key_pool(make_key_pool(api_key, 'Authorization', location='headers',
+                                        template='Bearer {key}'))
+        self.set_cache_ttl(BASE_URL, PROJECTS_CACHE_TTL)
 
     def get_project_ids(self):
         """
@@ -86,8 +95,7 @@ class TokenTerminal(DataLoader):
         """
         protocols = self.translate(protocol_ids)
 
-        df_list = []
-        for protocol in protocols:
+        def get_protocol_df(protocol: str) -> pd.DataFrame:
             url = f'{BASE_URL}/{protocol}/metrics'
             try:
                 data = self.get_response(url, headers=self.api_dict)
@@ -97,9 +105,10 @@ class TokenTerminal(DataLoader):
             except Exception as e:
                 print(f'failed to get data for {protocol}: {e}')
                 df = pd.DataFrame()
-            df_list.append(df)
+            return df
 
-        final_df = pd.concat(df_list, keys=protocols, axis=1)
+        df_dict = self.fan_out(get_protocol_df, protocols)
+        final_df = pd.concat(df_dict, axis=1)
         final_df = time_filter_df(final_df, start_date=start_date, end_date=end_date)
         return final_df
 
@@ -140,17 +149,18 @@ class TokenTerminal(DataLoader):
             DataFrame
                 pandas DataFrame with asset metric data.
         """
-        url_temp = Template(f'{BASE_URL}/$asset_key/metrics')
+        url_temp = url_template(f'{BASE_URL}/$asset_key/metrics')
         metric_df = pd.DataFrame()
         ids = self.translate(protocol_ids)
 
-        for protocol_id in ids:
+        def get_metric_df(protocol_id: str) -> pd.DataFrame:
             url = url_temp.substitute(asset_key=protocol_id)
             data = self.get_response(url, headers=self.api_dict)
             data_df = response_to_df(data)
             single_metric_df = data_df[metric].to_frame()
             single_metric_df.columns = [protocol_id]
-            single_metric_df = time_filter_df(single_metric_df,
-                                              start_date=start_date, end_date=end_date)
+            return time_filter_df(single_metric_df, start_date=start_date, end_date=end_date)
+
+        for single_metric_df in self.fan_out(get_metric_df, ids).values():
             metric_df = metric_df.join(single_metric_df, how='outer')
         return metric_df
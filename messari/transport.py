@@ -0,0 +1,280 @@
+"""This module is meant to contain the TransportRegistry class & the shared connection pool"""
+
+
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+from urllib3.util.request import ACCEPT_ENCODING
+
+from messari.ratelimit import get_host
+
+# Number of hosts whose connection pools are kept open
+DEFAULT_POOL_CONNECTIONS = 32
+
+# Connections kept open per host, at least DataLoader's default number of workers
+DEFAULT_POOL_MAXSIZE = 16
+
+# (connect, read) seconds a request may take when the caller doesn't set a timeout
+DEFAULT_TIMEOUT = (10.0, 60.0)
+
+# Seconds an idle connection is kept open by the async tier
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+
+# Seconds, or a (connect, read) tuple, None waits forever
+Timeout = Union[float, Tuple[Optional[float], Optional[float]], None]
+
+
+def split_timeout(timeout: Timeout) -> Tuple[Optional[float], Optional[float]]:
+    """Returns timeout as a (connect, read) tuple"""
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+class HostPoolManager(PoolManager):
+    """This class is a urllib3 PoolManager sizing the pool of each host from the registry
+    when the pool is opened, so pools grow without rebuilding the manager"""
+    def __init__(self, registry: 'TransportRegistry', **kwargs):
+        PoolManager.__init__(self, **kwargs)
+        self.registry = registry
+
+    def connection_from_context(self, request_context: Dict):
+        host = str(request_context.get('host', '')).lower()
+        # maxsize is part of the pool key, so a resized host gets a new pool while
+        # requests in flight finish on the old one, which is dropped once evicted
+        request_context = dict(request_context,
+                               maxsize=self.registry.get_pool_size(host,
+                                                                   request_context.get('port')))
+        return PoolManager.connection_from_context(self, request_context)
+
+
+class PooledAdapter(HTTPAdapter):
+    """This class is the requests transport adapter of a DataLoader.
+
+    Every adapter of a registry sends its requests through the registry's connection
+    pools, one per host for the whole process, & applies the registry's timeout to
+    requests sent without one. Closing an adapter closes the pooled connections once
+    no other adapter of the registry is open.
+    """
+    def __init__(self, registry: 'TransportRegistry'):
+        self.registry = registry
+        self.closed = False
+        HTTPAdapter.__init__(self, pool_connections=registry.pool_connections,
+                             pool_maxsize=registry.pool_maxsize)
+
+    @property
+    def poolmanager(self) -> HostPoolManager:
+        """Connection pools shared by every adapter of the registry"""
+        return self.registry.get_pools()
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        # pylint: disable=attribute-defined-outside-init
+        # The pools belong to the registry, see TransportRegistry.get_pools
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False,  # pylint: disable=too-many-arguments
+             timeout: Timeout = None, verify=True, cert=None, proxies=None) -> requests.Response:
+        if timeout is None:
+            timeout = self.registry.timeout
+        return HTTPAdapter.send(self, request, stream=stream, timeout=timeout, verify=verify,
+                                cert=cert, proxies=proxies)
+
+    def close(self) -> None:
+        """Closes the adapter's proxy pools & releases its share of the registry's pools,
+        sessions close it more than once as it is mounted for both http & https"""
+        if self.closed:
+            return
+        self.closed = True
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
+        self.registry.release_pools()
+
+
+class TransportRegistry:
+    """This class holds the HTTP transport settings & connection pool shared by every loader.
+
+    Sync loaders mount PooledAdapters sending requests through the same pools, so
+    concurrent fan outs across instances reuse warm connections instead of opening
+    new TCP & TLS sessions. The pools are closed when the last adapter is.
+    Async loaders build their aiohttp connector from the same keep-alive settings,
+    aiohttp connectors being bound to an event loop & sized by max_concurrency.
+    Responses are negotiated compressed, brotli included when brotli is installed.
+    """
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE, timeout: Timeout = DEFAULT_TIMEOUT,
+                 keep_alive: bool = True, compress: bool = True,
+                 keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT):
+        self.lock = threading.Lock()
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.compress = compress
+        self.keepalive_timeout = keepalive_timeout
+        self.host_maxsize: Dict[str, int] = {}
+        self.pools: Optional[HostPoolManager] = None
+        # Number of PooledAdapters open
+        self.adapters = 0
+
+    def configure(self, pool_connections: int = None, pool_maxsize: int = None,
+                  keep_alive: bool = None, compress: bool = None,
+                  keepalive_timeout: float = None) -> None:
+        """Changes transport settings, arguments left to None are kept
+
+        Pool sizes apply to pools opened afterwards, changing pool_connections closes
+        the pools. Sessions pick up keep_alive & compress when they are configured.
+
+        :param pool_connections: int
+            Number of hosts whose connection pools are kept open
+        :param pool_maxsize: int
+            Connections kept open per host
+        :param keep_alive: bool
+            Reuse connections between requests
+        :param compress: bool
+            Ask for gzip, deflate & brotli (when installed) compressed responses
+        :param keepalive_timeout: float
+            Seconds an idle connection is kept open by the async tier
+        """
+        with self.lock:
+            if pool_connections is not None and pool_connections != self.pool_connections:
+                self.pool_connections = pool_connections
+                self.reset_pools()
+            if pool_maxsize is not None:
+                self.pool_maxsize = pool_maxsize
+            if keep_alive is not None:
+                self.keep_alive = keep_alive
+            if compress is not None:
+                self.compress = compress
+            if keepalive_timeout is not None:
+                self.keepalive_timeout = keepalive_timeout
+
+    def set_timeout(self, timeout: Timeout) -> None:
+        """Sets the timeout of requests sent without one
+
+        :param timeout: float, tuple
+            Seconds or (connect, read) seconds, None waits forever
+        """
+        self.timeout = timeout
+
+    def set_pool_size(self, url: str, maxsize: int) -> None:
+        """Sets the number of connections kept open to one host
+
+        :param url: str
+            URL or host (i.e. https://api.etherscan.io/api)
+        :param maxsize: int
+            Connections kept open to the host
+        """
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.host_maxsize[get_host(url)] = maxsize
+
+    def get_pool_size(self, host: str, port: int = None) -> int:
+        """Returns the number of connections kept open to host
+
+        :param host: str
+            Host name, lower case
+        :param port: int
+            Port of the host
+        :return: Size of the host's pool, set_pool_size's or pool_maxsize
+        """
+        return self.host_maxsize.get(f'{host}:{port}',
+                                     self.host_maxsize.get(host, self.pool_maxsize))
+
+    def reserve(self, connections: int) -> None:
+        """Grows the default pool size to at least connections, so a loader fanning out
+        over that many workers doesn't open & drop connections past the pool.
+
+        Open pools are left to the loaders using them, the next request to a host
+        opens a pool of the new size.
+
+        :param connections: int
+            Number of concurrent requests a loader sends to one host
+        """
+        with self.lock:
+            self.pool_maxsize = max(self.pool_maxsize, connections)
+
+    def reset_pools(self) -> None:
+        """Closes the pools & opens new ones on the next request, called holding the lock"""
+        if self.pools is not None:
+            pools, self.pools = self.pools, None
+            # PoolManager.clear only drops the pools, close their idle connections rather
+            # than leaving them to the GC, connections in use are closed once released
+            for key in pools.pools.keys():
+                pool = pools.pools.get(key)
+                if pool is not None:
+                    pool.close()
+            pools.clear()
+
+    def get_pools(self) -> HostPoolManager:
+        """Returns the connection pools shared by every adapter, creating them on first use"""
+        pools = self.pools
+        if pools is None:
+            with self.lock:
+                if self.pools is None:
+                    self.pools = HostPoolManager(self, num_pools=self.pool_connections,
+                                                 maxsize=self.pool_maxsize)
+                pools = self.pools
+        return pools
+
+    def new_adapter(self) -> PooledAdapter:
+        """Returns a transport adapter sending requests through the shared pools,
+        the pools stay open until every adapter is closed"""
+        with self.lock:
+            self.adapters += 1
+        return PooledAdapter(self)
+
+    def release_pools(self) -> None:
+        """Closes the pooled connections once the last open adapter releases them"""
+        with self.lock:
+            self.adapters -= 1
+            if self.adapters <= 0:
+                self.adapters = 0
+                self.reset_pools()
+
+    def get_headers(self) -> Dict[str, str]:
+        """Returns the content negotiation headers every request is sent with"""
+        return {'Accept-Encoding': ACCEPT_ENCODING if self.compress else 'identity'}
+
+    def configure_session(self, session: requests.Session,
+                          adapter: PooledAdapter) -> requests.Session:
+        """Mounts a pooled adapter on a session & sets its default headers
+
+        :param session: requests.Session
+            Session of a loader
+        :param adapter: PooledAdapter
+            Adapter of the loader, see new_adapter
+        :return: the session
+        """
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(self.get_headers())
+        session.headers['Connection'] = 'keep-alive' if self.keep_alive else 'close'
+        return session
+
+    def get_connector_kwargs(self, limit: int) -> Dict:
+        """Returns the keyword arguments of an aiohttp TCPConnector using these settings
+
+        :param limit: int
+            Total number of connections of the connector
+        :return: dict
+        """
+        kwargs: Dict = {'limit': limit}
+        if self.keep_alive:
+            kwargs['keepalive_timeout'] = self.keepalive_timeout
+        else:
+            kwargs['force_close'] = True
+        return kwargs
+
+    def close(self) -> None:
+        """Closes the pooled connections, the next request opens new ones"""
+        with self.lock:
+            self.reset_pools()
+
+
+# Process wide transport used by every loader
+DEFAULT_TRANSPORT = TransportRegistry()
@@ -1,13 +1,14 @@
 """This module is dedicated to utilites used by multiple classes"""
 
 import datetime
-import json
-import os
 from collections.abc import MutableMapping
-from typing import List, Union, Dict
+from typing import List, Optional, Tuple, Union, Dict
 
 import pandas as pd
 
+from messari.profiling import timed
+from messari.taxonomy import get_taxonomy
+
 #******** Constants *************
 HEADERS = {
     'Content-Type': 'application/json',
@@ -23,8 +24,9 @@ HEADERS = {
 # doesn't work: https://data.messari.io/api/v2/assets/BTC/profile?fields=id,symbol,general
 
 
+@timed('normalize')
 def convert_flatten(response_json: Union[Dict, MutableMapping],
-                    parent_key: str = "", sep: str = "_") -> Dict:
+                    parent_key: str = '', sep: str = '_') -> Dict:
     """Collapse JSON response to one single dictionary.
 
      :param response_json: dict, MutableMapping
@@ -45,6 +47,165 @@ def convert_flatten(response_json: Union[Dict, MutableMapping],
     return dict(items)
 
 
+# Flatten schemas keyed by separator & top level keys of the record they were inferred from
+FLATTEN_SCHEMAS: Dict[Tuple, Optional[Tuple[Tuple, List[str]]]] = {}
+
+# Number of record shapes whose schemas are kept
+MAX_FLATTEN_SCHEMAS = 256
+
+
+def infer_flatten_schema(record: Dict) -> Tuple:
+    """Returns the key paths of a record, a tuple of (key, child schema) pairs
+    where child schema is None for leaves"""
+    return tuple((key, infer_flatten_schema(value) if isinstance(value, dict) else None)
+                 for key, value in record.items())
+
+
+def flatten_schema_keys(schema: Tuple, parent_key: str = '', sep: str = '_') -> List[str]:
+    """Returns the collapsed keys of the leaves of a schema, in convert_flatten's order"""
+    keys = []
+    for key, child in schema:
+        new_key = parent_key + sep + key if parent_key else key
+        if child is None:
+            keys.append(new_key)
+        else:
+            keys.extend(flatten_schema_keys(child, new_key, sep))
+    return keys
+
+
+def get_flatten_schema(record: Dict, sep: str = '_') -> Optional[Tuple[Tuple, List[str]]]:
+    """Returns the cached schema & collapsed keys of records shaped like record.
+
+    A cached schema inferred from another shape with the same top level keys is
+    replaced. None is returned for records whose collapsed keys collide,
+    convert_flatten has to merge those.
+
+    :param record: dict
+        Record the schema is looked up or inferred for
+    :param sep: str
+        Delimiter for new keys
+    :return: (schema, collapsed keys), None if the record can't be flattened with a schema
+    """
+    cache_key = (sep,) + tuple(record)
+    cached = FLATTEN_SCHEMAS.get(cache_key)
+    if cached is not None and matches_flatten_schema(record, cached[0]):
+        return cached
+    schema = infer_flatten_schema(record)
+    keys = flatten_schema_keys(schema, sep=sep)
+    cached = (schema, keys) if len(set(keys)) == len(keys) else None
+    if len(FLATTEN_SCHEMAS) >= MAX_FLATTEN_SCHEMAS:
+        FLATTEN_SCHEMAS.clear()
+    FLATTEN_SCHEMAS[cache_key] = cached
+    return cached
+
+
+def matches_flatten_schema(record: Dict, schema: Tuple) -> bool:
+    """Whether record has exactly the key paths of schema"""
+    try:
+        extract_flatten_values(record, schema, [])
+    except (KeyError, TypeError):
+        return False
+    return True
+
+
+def extract_flatten_values(record: Dict, schema: Tuple, values: List) -> None:
+    """Appends the leaves of record to values in schema order
+
+    :raises KeyError, TypeError if record isn't shaped like schema
+    """
+    if len(record) != len(schema):
+        raise KeyError('record keys differ from the schema')
+    for key, child in schema:
+        value = record[key]
+        if isinstance(value, dict):
+            if child is None:
+                raise TypeError(f'{key} is not a leaf of the schema')
+            extract_flatten_values(value, child, values)
+        elif child is not None:
+            raise TypeError(f'{key} is not a leaf of the record')
+        else:
+            values.append(value)
+
+
+@timed('normalize')
+def flatten_record(record: Dict, sep: str = '_') -> Dict:
+    """Collapses a JSON record to one single dictionary like convert_flatten,
+    reusing the schema cached for records of the same shape.
+
+    :param record: dict
+        JSON record from API call
+    :param sep: str
+        Delimiter for new keys
+    :return: Collapsed JSON
+    """
+    cached = get_flatten_schema(record, sep) if isinstance(record, dict) else None
+    if cached is None:
+        return convert_flatten(record, sep=sep)
+    values: List = []
+    extract_flatten_values(record, cached[0], values)
+    return dict(zip(cached[1], values))
+
+
+@timed('normalize')
+def flatten_columns(records: List[Dict], sep: str = '_') -> Dict[str, List]:
+    """Collapses a list of JSON records into columns, in a single pass over the records.
+
+    The key paths are inferred once from the first record & cached per shape,
+    every record with that shape is then read straight into rows without building
+    its collapsed keys. Records shaped differently go through convert_flatten,
+    the columns they miss are filled with NaN like DataFrame.from_dict does.
+
+    :param records: list
+        JSON records from API call
+    :param sep: str
+        Delimiter for new keys
+    :return: Dictionary of {collapsed key: column values}
+    """
+    if not records:
+        return {}
+    cached = get_flatten_schema(records[0], sep) if isinstance(records[0], dict) else None
+    if cached is None:
+        return records_to_columns([convert_flatten(record, sep=sep) for record in records])
+
+    schema, keys = cached
+    rows: List = []
+    others: Dict[int, Dict] = {}
+    for i, record in enumerate(records):
+        values: List = []
+        try:
+            extract_flatten_values(record, schema, values)
+        except (KeyError, TypeError):
+            others[i] = convert_flatten(record, sep=sep)
+            values = None
+        rows.append(values)
+
+    if not others:
+        return dict(zip(keys, map(list, zip(*rows))))
+    return records_to_columns([others[i] if values is None else dict(zip(keys, values))
+                               for i, values in enumerate(rows)])
+
+
+def records_to_columns(records: List[Dict]) -> Dict[str, List]:
+    """Turns collapsed records into columns, filling the keys a record misses with NaN"""
+    keys = list(dict.fromkeys(key for record in records for key in record))
+    return {key: [record.get(key, float('nan')) for record in records] for key in keys}
+
+
+@timed('assemble')
+def records_to_dataframe(records: Dict[str, Dict], sep: str = '_') -> pd.DataFrame:
+    """Collapses JSON records keyed by asset into a DataFrame indexed by asset,
+    the equivalent of DataFrame.from_dict of every convert_flatten record
+
+    :param records: dict
+        JSON records from API call keyed by asset
+    :param sep: str
+        Delimiter for new keys
+    :return: pandas DataFrame with one row per record
+    """
+    return pd.DataFrame(flatten_columns(list(records.values()), sep=sep),
+                        index=list(records))
+
+
 def validate_input(asset_input: Union[str, List]) -> List[str]:
     """Checks if input is list.
 
@@ -58,7 +219,7 @@ def validate_input(asset_input: Union[str, List]) -> List[str]:
     elif isinstance(asset_input, list):
         return asset_input
     else:
-        raise ValueError("Input should be of type string or list")
+        raise ValueError('Input should be of type string or list')
 
 
 def validate_int(int_input: Union[int, List]) -> List[int]:
@@ -74,9 +235,9 @@ def validate_int(int_input: Union[int, List]) -> List[int]:
     elif isinstance(int_input, list):
         return int_input
     else:
-        raise ValueError("Input should be of type int or list")
+        raise ValueError('Input should be of type int or list')
 
-DATETIME_FORMAT = "%Y-%m-%d"
+DATETIME_FORMAT = '%Y-%m-%d'
 
 
 def validate_datetime(datetime_input: Union[str, datetime.datetime]) -> Union[datetime.date, None]:
@@ -97,6 +258,7 @@ def validate_datetime(datetime_input: Union[str, datetime.datetime]) -> Union[da
         raise ValueError("Input should be of type string 'YYYY-MM-DD' or datetime.datetime")
 
 
+@timed('normalize')
 def unpack_list_of_dicts(list_of_dicts: List) -> Dict:
     """Unpack list of dictionaries to dictionary of dictionaries.
 
@@ -106,7 +268,7 @@ def unpack_list_of_dicts(list_of_dicts: List) -> Dict:
         List of python dictionaries
     :return Dictionary of dictionaries
     """
-    return {asset_data["slug"]: asset_data for asset_data in list_of_dicts}
+    return {asset_data['slug']: asset_data for asset_data in list_of_dicts}
 
 
 def validate_asset_fields_list_order(asset_fields: List, field: str) -> List:
@@ -141,6 +303,7 @@ def find_and_update_asset_field(asset_fields: List, field: str, updated_field: s
     return asset_fields
 
 
+@timed('assemble')
 def time_filter_df(df_in: pd.DataFrame, start_date: Union[str, datetime.datetime] = None,
                    end_date: Union[str, datetime.datetime] = None) -> pd.DataFrame:
     """Convert filter timeseries indexed DataFrame
@@ -171,20 +334,10 @@ def time_filter_df(df_in: pd.DataFrame, start_date: Union[str, datetime.datetime
 
 
 def get_taxonomy_dict(filename: str) -> Dict:
-    current_path = os.path.dirname(__file__)
-    # this file is being called from an install
-    if os.path.exists(os.path.join(current_path, f"../{filename}")):
-        json_path = os.path.join(current_path, f"../{filename}")
-        with open(json_path, "r", encoding="utf=8") as file:
-            taxonomy_dict = json.load(file)
-            file.close()
-    # this file is being called from the project dir
-    elif os.path.exists(os.path.join(current_path, f"mappings/{filename}")):
-        json_path = os.path.join(current_path, f"mappings/{filename}")
-        with open(json_path, "r", encoding="utf-8") as file:
-            taxonomy_dict = json.load(file)
-            file.close()
-    else:  # Can't find .mappings mapping file, default to empty
-        print(f"ERROR: cannot find {filename}")
-        taxonomy_dict = {}
-    return taxonomy_dict
+    """Returns a copy of a mapping file, read once per process by messari.taxonomy
+
+    :param filename: str
+        Mapping file name (i.e. messari_to_dl.json)
+    :return: Dict of {messari slug or symbol: api id}, empty if the file can't be found
+    """
+    return dict(get_taxonomy(filename))
@@ -0,0 +1,149 @@
+"""Unit Tests for the AsyncDataLoader class"""
+
+import asyncio
+import inspect
+import os
+import tempfile
+import threading
+import unittest
+from aiohttp import web
+from messari.asyncdataloader import AsyncDataLoader, to_query, to_headers
+from messari.dataloader import DataLoader
+from messari.cache import ResponseCache, SQLiteCache
+from messari.ratelimit import RateLimiter, SQLiteLedger
+from messari.messari import AsyncMessari
+from messari.blockexplorers import AsyncEtherscan
+
+
+async def start_server(handler):
+    """Start a local aiohttp server answering every GET with handler"""
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f'http://127.0.0.1:{port}'
+
+
+class TestAsyncDataLoader(unittest.TestCase):
+    """This is a unit testing class for testing the AsyncDataLoader class"""
+
+    def test_init(self):
+        """Test initializing AsyncDataLoader class outside of an event loop"""
+        loader = AsyncDataLoader(api_dict=None, taxonomy_dict=None)
+        self.assertIsInstance(loader, AsyncDataLoader)
+        self.assertIsNone(loader.session)
+
+    def test_shared_base(self):
+        """Test both loaders share their configuration & decision logic"""
+        for name in ('set_cache', 'set_retry_policy', 'set_coalesce', 'translate',
+                     'is_quota_error', 'release_slot', 'collect_results'):
+            self.assertIs(getattr(AsyncDataLoader, name), getattr(DataLoader, name), name)
+        self.assertIsNot(AsyncDataLoader(api_dict=None, taxonomy_dict=None).single_flight,
+                         DataLoader(api_dict=None, taxonomy_dict=None).single_flight)
+
+    def test_query_and_headers(self):
+        """Test params & headers are converted like requests does"""
+        query = to_query({'page': 1, 'skip': None, 'id': ['a', 'b'], 'flag': 'true'})
+        self.assertEqual(query, [('page', '1'), ('id', 'a'), ('id', 'b'), ('flag', 'true')])
+        self.assertEqual(to_headers({'x-messari-api-key': None, 'a': 1}), {'a': '1'})
+
+    def test_get_response(self):
+        """Test get_response returns json & raises on non-200"""
+        async def handler(request):
+            if request.path == '/missing':
+                return web.Response(status=404)
+            return web.json_response({'path': request.path, 'page': request.query.get('page')})
+
+        async def run():
+            runner, url = await start_server(handler)
+            try:
+                async with AsyncDataLoader(api_dict=None, taxonomy_dict=None) as loader:
+                    response = await loader.get_response(f'{url}/data', params={'page': 2})
+                    self.assertEqual(response, {'path': '/data', 'page': '2'})
+                    with self.assertRaises(Exception):
+                        await loader.get_response(f'{url}/missing')
+            finally:
+                await runner.cleanup()
+
+        asyncio.run(run())
+
+    def test_fan_out(self):
+        """Test fan out keeps input order & bounds requests in flight"""
+        in_flight = [0, 0]
+
+        async def handler(request):
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return web.json_response({'item': request.path.strip('/')})
+
+        async def run():
+            runner, url = await start_server(handler)
+            loader = AsyncDataLoader(api_dict=None, taxonomy_dict=None, max_concurrency=4)
+            try:
+                async def get_item(item):
+                    return (await loader.get_response(f'{url}/{item}'))['item']
+
+                items = [str(i) for i in range(20)] + ['3']
+                results = await loader.fan_out(get_item, items)
+                self.assertEqual(list(results.keys()), [str(i) for i in range(20)])
+                self.assertEqual(list(results.values()), [str(i) for i in range(20)])
+            finally:
+                await loader.close()
+                await runner.cleanup()
+
+        asyncio.run(run())
+        self.assertLessEqual(in_flight[1], 4)
+        self.assertGreater(in_flight[1], 1)
+
+    def test_blocking_stores(self):
+        """Test SQLite caches & ledgers are used off the event loop thread"""
+        threads = []
+
+        def record_thread(func):
+            def wrapper(*args, **kwargs):
+                threads.append(threading.get_ident())
+                return func(*args, **kwargs)
+            return wrapper
+
+        async def handler(request):
+            return web.json_response({'path': request.path})
+
+        async def run():
+            runner, url = await start_server(handler)
+            with tempfile.TemporaryDirectory() as directory:
+                cache = ResponseCache(SQLiteCache(os.path.join(directory, 'cache.db')))
+                ledger = SQLiteLedger(os.path.join(directory, 'ledger.db'))
+                cache.backend.get = record_thread(cache.backend.get)
+                cache.backend.set = record_thread(cache.backend.set)
+                ledger.take = record_thread(ledger.take)
+                loader = AsyncDataLoader(api_dict=None, taxonomy_dict=None, cache=cache,
+                                         rate_limiter=RateLimiter(ledger=ledger))
+                loader.set_rate_limit(url, 100)
+                try:
+                    self.assertEqual(await loader.get_response(f'{url}/data'), {'path': '/data'})
+                    self.assertEqual(await loader.get_response(f'{url}/data'), {'path': '/data'})
+                finally:
+                    await loader.close()
+                    await runner.cleanup()
+                    cache.backend.close()
+                    ledger.connection.close()
+
+        asyncio.run(run())
+        # get, take & set on the miss, get on the hit
+        self.assertEqual(len(threads), 4)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_connectors(self):
+        """Test async connectors expose coroutine methods"""
+        self.assertTrue(inspect.iscoroutinefunction(AsyncMessari.get_metric_timeseries))
+        self.assertTrue(inspect.iscoroutinefunction(AsyncEtherscan.get_account_native_balance))
+        self.assertTrue(inspect.iscoroutinefunction(AsyncEtherscan.get_total_eth_supply))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Unit Tests for the benchmark runner"""
+
+import os
+import tempfile
+import unittest
+from benchmarks.cases import CASES
+from benchmarks.runner import run, compare, save_baseline, load_baseline
+
+
+class TestBenchmarks(unittest.TestCase):
+    """This is a unit testing class for testing the benchmark runner"""
+
+    def test_cases_run(self):
+        """Test every case runs on small payloads & reports time and memory"""
+        results = run(sizes=['small'], repeat=1)
+        self.assertEqual(set(results), {case.name for case in CASES})
+        for name, sizes in results.items():
+            result = sizes['small' if 'small' in sizes else 'any']
+            if 'skipped' in result:
+                # Only cases with a missing optional dependency are skipped
+                self.assertIn('No module named', result['skipped'], name)
+                continue
+            self.assertGreater(result['min'], 0)
+            self.assertGreater(result['peak_bytes'], 0)
+
+    def test_baseline_cases(self):
+        """Test every case has an entry in the stored baseline"""
+        baseline = load_baseline()
+        self.assertEqual(sorted({case.name for case in CASES} - set(baseline)), [])
+
+    def test_compare(self):
+        """Test regressions, improvements & new cases are told apart"""
+        def result(seconds, peak):
+            return {'min': seconds, 'median': seconds, 'mean': seconds, 'peak_bytes': peak}
+        path = os.path.join(tempfile.mkdtemp(), 'baseline.json')
+        save_baseline({'slow': {'small': result(0.1, 1000)},
+                       'fast': {'small': result(0.1, 1000)},
+                       'noise': {'small': result(0.001, 1000)},
+                       'skipped': {'small': {'skipped': 'No module named web3'}}}, path)
+        baseline = load_baseline(path)
+        self.assertNotIn('small', baseline['skipped'])
+
+        comparison = compare({'slow': {'small': result(0.2, 1000)},
+                              'fast': {'small': result(0.05, 1000)},
+                              'noise': {'small': result(0.002, 1000)},
+                              'new': {'small': result(0.1, 1000)}}, baseline)
+        statuses = dict(zip(comparison['case'], comparison['status']))
+        self.assertEqual(statuses, {'slow': 'regression', 'fast': 'improvement',
+                                    'noise': 'ok', 'new': 'new'})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 
 from messari.blockexplorers import BSCscan
 import unittest
+from messari.replay import CASSETTE_MODE_ENV
 import os
 import sys
 import pandas as pd
@@ -9,6 +10,9 @@ import time
 from typing import Dict
 
 API_KEY = os.getenv('BSCSCAN_API_KEY')
+if API_KEY is None and os.getenv(CASSETTE_MODE_ENV) == 'replay':
+    # Recorded responses are matched without credentials
+    API_KEY = 'replay'
 if API_KEY is None:
     print('Please define BSCSCAN_API_KEY in your runtime enviornment')
     sys.exit()
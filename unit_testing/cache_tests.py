@@ -0,0 +1,108 @@
+"""Unit Tests for the ResponseCache class & its backends"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from messari.cache import ResponseCache, MemoryCache, SQLiteCache, DiskCache, make_cache_key
+from messari.dataloader import DataLoader
+from messari.blockexplorers import Etherscan
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """Answers every GET with the number of requests served so far"""
+    count = 0
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a GET request"""
+        CountingHandler.count += 1
+        body = f'{{"count": {CountingHandler.count}}}'.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep test output quiet"""
+
+
+class TestCache(unittest.TestCase):
+    """This is a unit testing class for testing the response cache"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def backends(self, max_entries):
+        """Returns one backend of every type"""
+        return [MemoryCache(max_entries),
+                SQLiteCache(os.path.join(self.directory.name, 'cache.db'), max_entries),
+                DiskCache(os.path.join(self.directory.name, 'responses'), max_entries)]
+
+    def test_cache_key(self):
+        """Test param order & credentials don't change the key"""
+        key = make_cache_key('https://x.io/api', {'a': 1, 'b': 2, 'apikey': 'one'},
+                             {'x-messari-api-key': 'one', 'Accept': 'json'})
+        self.assertEqual(key, make_cache_key('https://x.io/api', {'b': 2, 'a': 1, 'apikey': 'two'},
+                                             {'x-messari-api-key': 'two', 'accept': 'json'}))
+        self.assertNotEqual(key, make_cache_key('https://x.io/api', {'a': 1, 'b': 3}))
+
+    def test_backends(self):
+        """Test every backend expires entries & evicts the least recently used"""
+        for backend in self.backends(max_entries=2):
+            backend.set('a', '1', None)
+            backend.set('b', '2', None)
+            if isinstance(backend, DiskCache):
+                time.sleep(0.01)
+            self.assertEqual(backend.get('a'), '1')
+            if isinstance(backend, DiskCache):
+                time.sleep(0.01)
+            backend.set('c', '3', None)
+            self.assertIsNone(backend.get('b'), type(backend).__name__)
+            self.assertEqual(len(backend), 2)
+            backend.set('d', '4', time.time() - 1)
+            self.assertIsNone(backend.get('d'))
+            backend.clear()
+            self.assertEqual(len(backend), 0)
+
+    def test_ttl_rules(self):
+        """Test cache rules beat connector rules & exact urls beat prefixes"""
+        cache = ResponseCache(default_ttl=60)
+        defaults = [('https://x.io/api', {}, 10, True),
+                    ('https://x.io/api', {'action': 'getabi'}, None, False)]
+        self.assertEqual(cache.get_ttl('https://y.io'), 60)
+        self.assertEqual(cache.get_ttl('https://x.io/api/v1', None, defaults), 10)
+        self.assertIsNone(cache.get_ttl('https://x.io/api', {'action': 'getabi'}, defaults))
+        cache.set_ttl('https://x.io/api', 0, prefix=True)
+        self.assertEqual(cache.get_ttl('https://x.io/api', {'action': 'getabi'}, defaults), 0)
+
+    def test_get_response(self):
+        """Test get_response serves repeated requests from the cache"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), CountingHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        try:
+            loader = DataLoader(api_dict=None, taxonomy_dict=None, cache=ResponseCache())
+            loader.set_cache_ttl(f'{url}/live', 0)
+            first = loader.get_response(f'{url}/static', params={'apikey': 'a'})
+            self.assertEqual(loader.get_response(f'{url}/static', params={'apikey': 'b'}), first)
+            live = loader.get_response(f'{url}/live')
+            self.assertNotEqual(loader.get_response(f'{url}/live'), live)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_scanner(self):
+        """Test explorer errors returned with a 200 aren't cached"""
+        etherscan = Etherscan()
+        self.assertFalse(etherscan.is_cacheable({'status': '0', 'result': 'Max rate limit reached'}))
+        self.assertTrue(etherscan.is_cacheable({'status': '1', 'result': '[]'}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""Unit Tests for the AdaptiveLimit & ConcurrencyController classes"""
+
+import asyncio
+import threading
+import time
+import unittest
+from messari.asyncdataloader import AsyncDataLoader
+from messari.concurrency import AdaptiveLimit, ConcurrencyController, DEFAULT_CONCURRENCY
+from messari.dataloader import DataLoader
+from messari.deadline import DeadlineExceededError, deadline
+from messari.fixtureserver import FixtureServer
+from messari.metrics import InMemoryMetrics
+from messari.ratelimit import RateLimiter
+from messari.retry import RetryPolicy
+
+UPSTREAM_URL = 'https://api.llama.fi/protocol/aave'
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAdaptiveLimit(unittest.TestCase):
+    """This is a unit testing class for testing the AIMD limit"""
+
+    def test_increase(self):
+        """Test a busy limit grows by one every limit healthy responses"""
+        limit = AdaptiveLimit(initial=2, max_limit=3)
+        for _ in range(2):
+            slots = [limit.acquire(), limit.acquire()]
+            for slot in slots:
+                limit.release(slot, 200, 0.1)
+        self.assertEqual(limit.get_limit(), 3)
+        # Sequential requests don't use the limit, so it doesn't grow
+        limit = AdaptiveLimit(initial=4)
+        for _ in range(20):
+            limit.release(limit.acquire(), 200, 0.1)
+        self.assertEqual(limit.get_limit(), 4)
+
+    def test_decrease(self):
+        """Test overload halves the limit once per round trip, down to min_limit"""
+        clock = FakeClock()
+        limit = AdaptiveLimit(initial=16, clock=clock)
+        slots = [limit.acquire() for _ in range(4)]
+        clock.now = 1.0
+        for slot in slots:
+            limit.release(slot, 429, 0.1)
+        self.assertEqual(limit.get_limit(), 8)
+        for status in (503, None, 429, 500):
+            clock.now += 1
+            limit.release(limit.acquire(), status, 0.1)
+        self.assertEqual(limit.get_limit(), 1)
+        limit.release(limit.acquire(), 404, 0.1)
+        self.assertEqual(limit.get_limit(), 1)
+
+    def test_latency_spike(self):
+        """Test a response much slower than usual cuts the limit"""
+        clock = FakeClock()
+        limit = AdaptiveLimit(initial=8, clock=clock)
+        for _ in range(5):
+            limit.release(limit.acquire(), 200, 0.1)
+        clock.now = 1.0
+        limit.release(limit.acquire(), 200, 1.0)
+        self.assertEqual(limit.get_limit(), 4)
+
+    def test_latency_shift(self):
+        """Test a lasting slowdown becomes the usual latency & the limit recovers"""
+        clock = FakeClock()
+        limit = AdaptiveLimit(initial=16, clock=clock)
+        for _ in range(5):
+            limit.release(limit.acquire(), 200, 0.1)
+        for _ in range(50):
+            clock.now += 1
+            slots = [limit.acquire() for _ in range(limit.get_limit())]
+            for slot in slots:
+                limit.release(slot, 200, 1.0)
+        self.assertGreaterEqual(limit.get_limit(), 8)
+        self.assertAlmostEqual(limit.latency, 1.0, places=2)
+
+    def test_wait(self):
+        """Test callers past the limit wait for a slot & honour the deadline"""
+        limit = AdaptiveLimit(initial=1, max_limit=1)
+        slot = limit.acquire()
+        threading.Timer(0.1, limit.release, (slot, 200, 0.1)).start()
+        start = time.monotonic()
+        limit.cancel(limit.acquire())
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        slot = limit.acquire()
+        with self.assertRaises(DeadlineExceededError):
+            with deadline(0.15) as budget:
+                limit.acquire(budget)
+
+        async def wait():
+            threading.Timer(0.1, limit.cancel, (slot,)).start()
+            return await limit.acquire_async()
+
+        self.assertEqual(asyncio.run(wait())[1], 1)
+
+
+class TestLoaderConcurrency(unittest.TestCase):
+    """This is a unit testing class for testing adaptive concurrency in the loaders"""
+
+    def setUp(self):
+        self.server = FixtureServer()
+        self.server.start()
+        for item in range(32):
+            self.server.add_response(f'{UPSTREAM_URL}?item={item}', {'name': 'aave'})
+        self.controller = ConcurrencyController(initial=16)
+        self.metrics = InMemoryMetrics()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def make_loader(self) -> DataLoader:
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, rate_limiter=RateLimiter(),
+                            retry_policy=RetryPolicy(backoff_factor=0, max_retries=10,
+                                                     status_retries={429: 10}),
+                            coalesce=False, max_workers=16, metrics=self.metrics)
+        loader.set_transport(self.server.get_adapter())
+        loader.set_concurrency(self.controller)
+        return loader
+
+    def test_opt_in(self):
+        """Test loaders only share the process wide controller when built adaptive"""
+        self.assertIsNone(DataLoader(api_dict=None, taxonomy_dict=None).concurrency)
+        self.assertIsNone(AsyncDataLoader(api_dict=None, taxonomy_dict=None).concurrency)
+        self.assertIs(DataLoader(api_dict=None, taxonomy_dict=None, adaptive=True).concurrency,
+                      DEFAULT_CONCURRENCY)
+        self.assertIs(AsyncDataLoader(api_dict=None, taxonomy_dict=None,
+                                      adaptive=True).concurrency, DEFAULT_CONCURRENCY)
+
+    def test_backs_off(self):
+        """Test 429s cut the host's limit & the limit is reported to metrics"""
+        self.server.rate_limit = (4, 0.2)
+        loader = self.make_loader()
+        results = loader.fan_out(lambda item: loader.get_response(f'{UPSTREAM_URL}?item={item}'),
+                                 list(range(32)))
+        self.assertEqual(len(results), 32)
+        limit = self.controller.get_limits()['api.llama.fi']
+        self.assertLess(limit['limit'], 16)
+        self.assertEqual(limit['in_flight'], 0)
+        self.assertEqual(self.metrics.get_concurrency()['api.llama.fi']['limit'], limit['limit'])
+        self.assertIn('messari_concurrency_limit{host="api.llama.fi"}',
+                      self.metrics.to_prometheus())
+
+    def test_in_flight(self):
+        """Test no more requests than the limit are in flight"""
+        self.server.latency = 0.05
+        self.controller.configure(UPSTREAM_URL, initial=2, max_limit=2)
+        loader = self.make_loader()
+        start = time.monotonic()
+        loader.fan_out(lambda item: loader.get_response(f'{UPSTREAM_URL}?item={item}'),
+                       list(range(8)))
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_async(self):
+        """Test the async tier takes slots from the same limits"""
+        self.server.latency = 0.05
+        self.controller.configure(self.server.url, initial=2, max_limit=2)
+        url = self.server.local_url(UPSTREAM_URL)
+
+        async def fetch():
+            async with AsyncDataLoader(api_dict=None, taxonomy_dict=None,
+                                       rate_limiter=RateLimiter(),
+                                       metrics=self.metrics) as loader:
+                loader.set_concurrency(self.controller)
+                return await loader.fan_out(
+                    lambda item: loader.get_response(f'{url}?item={item}'), list(range(8)))
+
+        start = time.monotonic()
+        self.assertEqual(len(asyncio.run(fetch())), 8)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
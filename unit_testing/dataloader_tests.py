@@ -0,0 +1,67 @@
+"""Unit Tests for the DataLoader class"""
+
+import threading
+import time
+import unittest
+from messari.dataloader import DataLoader
+
+class TestDataLoader(unittest.TestCase):
+    """This is a unit testing class for testing the DataLoader class"""
+
+    def test_init(self):
+        """Test initializing DataLoader class"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        self.assertIsInstance(loader, DataLoader)
+
+    def test_fan_out_order(self):
+        """Test fan out keeps input order & drops duplicates"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, max_workers=4)
+
+        def slow_upper(item):
+            time.sleep(0.01 * (5 - len(item)))
+            return item.upper()
+
+        results = loader.fan_out(slow_upper, ['a', 'bb', 'ccc', 'a', 'dddd'])
+        self.assertEqual(list(results.keys()), ['a', 'bb', 'ccc', 'dddd'])
+        self.assertEqual(list(results.values()), ['A', 'BB', 'CCC', 'DDDD'])
+
+    def test_fan_out_bounded(self):
+        """Test fan out never runs more than max_workers at once"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, max_workers=3)
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def track(item):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return item
+
+        loader.fan_out(track, list(range(12)))
+        self.assertLessEqual(active[1], 3)
+        self.assertGreater(active[1], 1)
+
+    def test_fan_out_sequential(self):
+        """Test max_workers=1 runs in the calling thread"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        loader.set_max_workers(1)
+        caller = threading.get_ident()
+        results = loader.fan_out(lambda item: threading.get_ident(), [1, 2, 3])
+        self.assertEqual(set(results.values()), {caller})
+        self.assertRaises(ValueError, loader.set_max_workers, 0)
+
+    def test_fan_out_error(self):
+        """Test errors from a worker are raised to the caller"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+
+        def fail(item):
+            raise Exception(f'Query Failed - {item}')
+
+        self.assertRaises(Exception, loader.fan_out, fail, ['a', 'b'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Unit Tests for the Deadline class & request timeouts"""
+
+import asyncio
+import threading
+import time
+import unittest
+from messari.asyncdataloader import AsyncDataLoader
+from messari.dataloader import DataLoader
+from messari.deadline import Deadline, DeadlineExceededError, RequestCancelledError, deadline
+from messari.fixtureserver import FixtureServer
+from messari.ratelimit import RateLimiter
+from messari.retry import RetryPolicy
+
+UPSTREAM_URL = 'https://api.llama.fi/protocol/aave'
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDeadline(unittest.TestCase):
+    """This is a unit testing class for testing time budgets"""
+
+    def test_budget(self):
+        """Test the budget runs out, caps timeouts & nests"""
+        clock = FakeClock()
+        budget = Deadline(10, clock=clock)
+        self.assertEqual(budget.cap((5.0, 60.0)), (5.0, 10.0))
+        self.assertEqual(budget.cap(None), (10.0, 10.0))
+        nested = Deadline(30, parent=budget, clock=clock)
+        self.assertEqual(nested.remaining(), 10.0)
+        with self.assertRaises(DeadlineExceededError):
+            budget.sleep(11)
+        clock.now = 10.0
+        with self.assertRaises(DeadlineExceededError):
+            nested.check()
+
+    def test_cancel(self):
+        """Test cancelling wakes up sleepers & reaches nested deadlines"""
+        budget = Deadline()
+        nested = Deadline(parent=budget)
+        threading.Timer(0.05, budget.cancel).start()
+        start = time.monotonic()
+        with self.assertRaises(RequestCancelledError):
+            nested.sleep(5)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertIsNone(budget.remaining())
+
+
+class TestLoaderDeadline(unittest.TestCase):
+    """This is a unit testing class for testing deadlines & timeouts in the loaders"""
+
+    def setUp(self):
+        self.server = FixtureServer()
+        self.server.start()
+        self.server.add_response(UPSTREAM_URL, {'name': 'aave'})
+
+    def tearDown(self):
+        self.server.stop()
+
+    def make_loader(self, **kwargs) -> DataLoader:
+        kwargs.setdefault('retry_policy', RetryPolicy(backoff_factor=0))
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, rate_limiter=RateLimiter(),
+                            coalesce=False, **kwargs)
+        loader.set_transport(self.server.get_adapter())
+        return loader
+
+    def test_timeout(self):
+        """Test a hung request is given up after the loader's timeout"""
+        self.server.latency = 0.5
+        loader = self.make_loader(retry_policy=RetryPolicy(max_retries=0))
+        loader.set_timeout(0.05)
+        with self.assertRaises(SystemError):
+            loader.get_response(UPSTREAM_URL)
+
+    def test_request_deadline(self):
+        """Test a request is cut short by the deadline of the call"""
+        self.server.latency = 0.5
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceededError):
+            with deadline(0.1):
+                self.make_loader().get_response(UPSTREAM_URL)
+        self.assertLess(time.monotonic() - start, 0.45)
+
+    def test_backoff_deadline(self):
+        """Test a Retry-After outlasting the deadline fails straight away"""
+        self.server.responses.clear()
+        self.server.add_response(UPSTREAM_URL, {}, status=429, headers={'Retry-After': '5'})
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceededError):
+            with deadline(1):
+                self.make_loader().get_response(UPSTREAM_URL)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_fan_out_deadline(self):
+        """Test the deadline covers every sub-request of a fan out"""
+        self.server.latency = 0.1
+        loader = self.make_loader(max_workers=2)
+        with self.assertRaises(DeadlineExceededError):
+            with deadline(0.35):
+                loader.fan_out(lambda item: loader.get_response(f'{UPSTREAM_URL}?item={item}'),
+                               list(range(20)))
+        self.assertLess(len(self.server.requests), 20)
+
+    def test_fan_out_cancel(self):
+        """Test cancelling from another thread abandons the queued items"""
+        self.server.latency = 0.1
+        loader = self.make_loader(max_workers=2)
+        with self.assertRaises(RequestCancelledError):
+            with deadline() as budget:
+                threading.Timer(0.15, budget.cancel).start()
+                loader.fan_out(lambda item: loader.get_response(f'{UPSTREAM_URL}?item={item}'),
+                               list(range(20)))
+        self.assertLess(len(self.server.requests), 20)
+
+    def test_rate_limit_deadline(self):
+        """Test waiting on a rate limit past the deadline fails straight away"""
+        loader = self.make_loader()
+        loader.set_rate_limit(UPSTREAM_URL, calls=1, period=10)
+        loader.get_response(UPSTREAM_URL)
+        with self.assertRaises(DeadlineExceededError):
+            with deadline(1):
+                loader.get_response(f'{UPSTREAM_URL}?page=2')
+
+    def test_async_deadline(self):
+        """Test the async tier honours the deadline of the call"""
+        self.server.latency = 0.5
+        url = self.server.local_url(UPSTREAM_URL)
+
+        async def fetch():
+            async with AsyncDataLoader(api_dict=None, taxonomy_dict=None,
+                                       rate_limiter=RateLimiter()) as loader:
+                with deadline(0.1):
+                    return await loader.get_response(url)
+
+        with self.assertRaises(DeadlineExceededError):
+            asyncio.run(fetch())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 
 from messari.blockexplorers import Etherscan
 import unittest
+from messari.replay import CASSETTE_MODE_ENV
 import os
 import sys
 import pandas as pd
@@ -9,6 +10,9 @@ import time
 from typing import Dict
 
 API_KEY = os.getenv('ETHERSCAN_API_KEY')
+if API_KEY is None and os.getenv(CASSETTE_MODE_ENV) == 'replay':
+    # Recorded responses are matched without credentials
+    API_KEY = 'replay'
 if API_KEY is None:
     print('Please define ETHERSCAN_API_KEY in your runtime enviornment')
     sys.exit()
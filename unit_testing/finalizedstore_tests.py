@@ -0,0 +1,112 @@
+"""Unit Tests for the FinalizedStore class & Scanner finalized data"""
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from messari.blockexplorers import Scanner, AsyncScanner, FinalizedStore
+
+HEAD = 1000
+FINAL_TX = '0xAAA'
+RECENT_TX = '0xbbb'
+
+
+class ExplorerHandler(BaseHTTPRequestHandler):
+    """Answers the proxy actions of an explorer API & counts them"""
+    calls = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a GET request"""
+        query = {key: value[0] for key, value in parse_qs(urlsplit(self.path).query).items()}
+        action = query['action']
+        ExplorerHandler.calls.append(action)
+        if action == 'eth_blockNumber':
+            result = hex(HEAD)
+        elif action == 'eth_getBlockByNumber':
+            result = {'number': query['tag'], 'hash': f'0x{int(query["tag"], 16)}'}
+        else:
+            block = 10 if query['txhash'].lower() == FINAL_TX.lower() else HEAD - 1
+            result = {'hash': query['txhash'], 'blockNumber': hex(block), 'status': '0x1',
+                      'logs': []}
+        body = json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': result}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep test output quiet"""
+
+
+class TestFinalizedStore(unittest.TestCase):
+    """This is a unit testing class for testing finalized chain data"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ExplorerHandler)
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}/api'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        ExplorerHandler.calls = []
+        self.scanner = Scanner(self.url)
+        self.scanner.set_finalized_store(FinalizedStore(), confirmations=64)
+
+    def test_store(self):
+        """Test objects are keyed by chain, kind & case insensitive key"""
+        store = FinalizedStore()
+        store.set('api.etherscan.io', 'receipt', '0xABC', {'status': '0x1'})
+        self.assertEqual(store.get('api.etherscan.io', 'receipt', '0xabc'), {'status': '0x1'})
+        self.assertIsNone(store.get('api.bscscan.com', 'receipt', '0xabc'))
+        self.assertEqual(store.get_many('api.etherscan.io', 'receipt', ['0xAbC', '0xdef']),
+                         {'0xAbC': {'status': '0x1'}})
+
+    def test_blocks(self):
+        """Test only blocks behind the confirmation depth are stored"""
+        self.scanner.get_eth_block([1, HEAD])
+        ExplorerHandler.calls = []
+        blocks_df = self.scanner.get_eth_block([1, HEAD])
+        self.assertEqual(ExplorerHandler.calls, ['eth_blockNumber', 'eth_getBlockByNumber'])
+        self.assertEqual(blocks_df[1]['number'], '0x1')
+
+        ExplorerHandler.calls = []
+        self.scanner.get_eth_block(1)
+        self.assertEqual(ExplorerHandler.calls, [])
+
+    def test_transactions(self):
+        """Test receipts, transactions & statuses come from the store once final"""
+        self.scanner.get_eth_transaction_receipt([FINAL_TX, RECENT_TX])
+        self.scanner.get_eth_transaction_by_hash(FINAL_TX)
+        ExplorerHandler.calls = []
+        status_df = self.scanner.get_transaction_execution_status(FINAL_TX.lower())
+        self.scanner.get_eth_transaction_by_hash(FINAL_TX)
+        self.assertEqual(ExplorerHandler.calls, [])
+        self.assertEqual(status_df['transactions'][FINAL_TX.lower()], {'status': '1'})
+
+        self.scanner.get_eth_transaction_receipt(RECENT_TX)
+        self.assertIn('eth_getTransactionReceipt', ExplorerHandler.calls)
+
+    def test_async(self):
+        """Test AsyncScanner shares the store & returns the same data as Scanner"""
+        scanner = AsyncScanner(self.url)
+        scanner.set_finalized_store(self.scanner.finalized_store, confirmations=64)
+        blocks_df = scanner.run(scanner.get_eth_block([1, HEAD]))
+        self.assertTrue(blocks_df.equals(self.scanner.get_eth_block([1, HEAD])))
+        receipts_df = scanner.run(scanner.get_eth_transaction_receipt([FINAL_TX, RECENT_TX]))
+        ExplorerHandler.calls = []
+        self.assertTrue(receipts_df.equals(self.scanner.get_eth_transaction_receipt(FINAL_TX)
+                                           .join(self.scanner.get_eth_transaction_receipt(
+                                               RECENT_TX))))
+        self.assertEqual(ExplorerHandler.calls, ['eth_blockNumber', 'eth_getTransactionReceipt'])
+        self.assertEqual(scanner.run(scanner.get_eth_block_number()), HEAD)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Unit Tests for the FixtureServer class"""
+
+import time
+import unittest
+from messari.dataloader import DataLoader
+from messari.fixtureserver import FixtureServer
+from messari.pagination import PagePaginator, OffsetPaginator
+from messari.ratelimit import RateLimiter
+from messari.replay import Cassette
+from messari.retry import RetryPolicy, QueryFailedError
+
+RECORDS = list(range(23))
+
+
+class TestFixtureServer(unittest.TestCase):
+    """This is a unit testing class for testing the local fixture server"""
+
+    def setUp(self):
+        self.loader = DataLoader(api_dict=None, taxonomy_dict=None, rate_limiter=RateLimiter(),
+                                 retry_policy=RetryPolicy(backoff_factor=0))
+
+    def test_routes(self):
+        """Test static responses, cassette fallback & unknown requests"""
+        cassette = Cassette()
+        cassette.record('GET', 'https://api.llama.fi/chains/', 200, {}, b'[{"name": "Ethereum"}]')
+        with FixtureServer(cassette=cassette) as server:
+            server.add_response('https://api.llama.fi/protocols', [{'slug': 'aave'}])
+            self.loader.set_transport(server.get_adapter())
+            self.assertEqual(self.loader.get_response('https://api.llama.fi/protocols'),
+                             [{'slug': 'aave'}])
+            self.assertEqual(self.loader.get_response('https://api.llama.fi/chains/'),
+                             [{'name': 'Ethereum'}])
+            with self.assertRaises(QueryFailedError):
+                self.loader.get_response('https://api.llama.fi/missing')
+            self.assertEqual(server.local_url('https://api.llama.fi/tvl/aave?a=1'),
+                             f'{server.url}/api.llama.fi/tvl/aave?a=1')
+            self.assertEqual(server.requests[0], 'https://api.llama.fi/protocols')
+
+    def test_pagination(self):
+        """Test records are served page by page for either paginator"""
+        with FixtureServer() as server:
+            self.loader.set_transport(server.get_adapter())
+            pages = PagePaginator(records_key='data', page_size=10)
+            server.add_records('https://data.messari.io/api/v1/markets', RECORDS, pages)
+            self.assertEqual(self.loader.fetch_all('https://data.messari.io/api/v1/markets', pages),
+                             RECORDS)
+            offsets = OffsetPaginator(page_size=7)
+            server.add_records('https://public-api.solscan.io/token/holders', RECORDS, offsets)
+            self.assertEqual(
+                self.loader.fetch_all('https://public-api.solscan.io/token/holders', offsets),
+                RECORDS)
+
+    def test_rate_limit(self):
+        """Test requests over the limit get a 429 the retry policy waits out"""
+        with FixtureServer(rate_limit=(2, 0.2)) as server:
+            server.add_response('https://api.coingecko.com/api/v3/ping', {'ok': True})
+            self.loader.set_transport(server.get_adapter())
+            start = time.monotonic()
+            for _ in range(4):
+                self.loader.get_response('https://api.coingecko.com/api/v3/ping')
+            self.assertGreaterEqual(time.monotonic() - start, 0.2)
+            self.assertGreater(len(server.requests), 4)
+
+    def test_latency(self):
+        """Test every response is delayed by the configured latency"""
+        with FixtureServer(latency=0.05) as server:
+            server.add_response('https://api.example.com/slow', {})
+            self.loader.set_transport(server.get_adapter())
+            start = time.monotonic()
+            self.loader.get_response('https://api.example.com/slow')
+            self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Unit Tests for the schema cached flattening helpers"""
+
+import unittest
+import pandas as pd
+from messari.fixtureserver import FixtureServer
+from messari.messari import Messari
+from messari.retry import RetryPolicy
+from messari.utils import convert_flatten, flatten_record, flatten_columns, \
+    records_to_dataframe, get_flatten_schema, FLATTEN_SCHEMAS
+
+ASSET_URL = 'https://data.messari.io/api/v1/assets/{asset}/metrics'
+
+
+def make_record(asset: str, price: float) -> dict:
+    """Builds a nested asset metrics record"""
+    return {'id': asset, 'symbol': asset[:3].upper(),
+            'market_data': {'price_usd': price, 'ohlcv_last_1_hour': {'open': price,
+                                                                      'close': price + 1}},
+            'supply': {'circulating': price * 10}, 'tags': ['layer-1']}
+
+
+class TestFlatten(unittest.TestCase):
+    """This is a unit testing class for testing the schema cached flattening"""
+
+    def setUp(self):
+        FLATTEN_SCHEMAS.clear()
+        self.records = {asset: make_record(asset, float(i))
+                        for i, asset in enumerate(['bitcoin', 'ethereum', 'solana'])}
+
+    def from_dict(self, records: dict) -> pd.DataFrame:
+        return pd.DataFrame.from_dict({key: convert_flatten(value)
+                                       for key, value in records.items()}, orient='index')
+
+    def test_record(self):
+        """Test records are collapsed exactly like convert_flatten & the schema is reused"""
+        for record in self.records.values():
+            self.assertEqual(list(flatten_record(record).items()),
+                             list(convert_flatten(record).items()))
+        self.assertEqual(len(FLATTEN_SCHEMAS), 1)
+        self.assertEqual(flatten_record(self.records['bitcoin'], sep='.')['supply.circulating'],
+                         0.0)
+        self.assertEqual(len(FLATTEN_SCHEMAS), 2)
+
+    def test_columns(self):
+        """Test a list of records is emitted as columns"""
+        columns = flatten_columns(list(self.records.values()))
+        self.assertEqual(columns['market_data_ohlcv_last_1_hour_close'], [1.0, 2.0, 3.0])
+        self.assertEqual(columns['tags'], [['layer-1']] * 3)
+        self.assertEqual(flatten_columns([]), {})
+        pd.testing.assert_frame_equal(records_to_dataframe(self.records),
+                                      self.from_dict(self.records))
+
+    def test_shapes(self):
+        """Test records shaped differently fall back to convert_flatten"""
+        self.records['ethereum']['supply'] = None
+        self.records['solana']['market_data']['ohlcv_last_1_hour'].pop('close')
+        self.records['dogecoin'] = {'id': 'dogecoin', 'extra': {'a': 1}}
+        pd.testing.assert_frame_equal(records_to_dataframe(self.records),
+                                      self.from_dict(self.records))
+        # The cached schema of a shape is replaced when the same top level keys nest differently
+        record = make_record('bitcoin', 1.0)
+        record['supply'] = {'liquid': 1.0}
+        self.assertIn('supply_liquid', flatten_record(record))
+        self.assertEqual(get_flatten_schema(record)[1][-2], 'supply_liquid')
+        # Colliding collapsed keys can't be flattened with a schema
+        colliding = {'a_b': 1, 'a': {'b': 2}}
+        self.assertIsNone(get_flatten_schema(colliding))
+        self.assertEqual(flatten_record(colliding), convert_flatten(colliding))
+
+
+class TestMessariFlatten(unittest.TestCase):
+    """This is a unit testing class for testing Messari responses are flattened in batches"""
+
+    def setUp(self):
+        self.server = FixtureServer()
+        self.server.start()
+        for i, asset in enumerate(['bitcoin', 'ethereum']):
+            self.server.add_response(ASSET_URL.format(asset=asset),
+                                     {'status': {}, 'data': make_record(asset, float(i))})
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_asset_metrics(self):
+        """Test get_asset_metrics builds the same frame & dicts as before"""
+        messari = Messari('key')
+        messari.set_transport(self.server.get_adapter())
+        messari.set_retry_policy(RetryPolicy(max_retries=0))
+        messari.set_rate_limit(ASSET_URL.format(asset='bitcoin'), 1000)
+        metrics_df = messari.get_asset_metrics(['bitcoin', 'ethereum'])
+        self.assertEqual(list(metrics_df.index), ['bitcoin', 'ethereum'])
+        self.assertEqual(metrics_df.loc['ethereum', 'market_data_ohlcv_last_1_hour_close'], 2.0)
+        metrics = messari.get_asset_metrics(['bitcoin', 'ethereum'], to_dataframe=False)
+        self.assertEqual(metrics['bitcoin'], convert_flatten(make_record('bitcoin', 0.0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Unit Tests guarding the import time of the package: subpackages must only import
+a class & its dependencies the first time it is accessed"""
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PACKAGES = ['messari.blockexplorers', 'messari.coingecko', 'messari.deepdao',
+            'messari.defillama', 'messari.eventmonitor', 'messari.fred', 'messari.gokustats',
+            'messari.messari', 'messari.metabase', 'messari.nfts', 'messari.tokenterminal']
+
+
+def loaded_after(statement: str) -> set:
+    """Runs statement in a fresh interpreter & returns the modules it loaded"""
+    code = f'import sys, json\n{statement}\nprint(json.dumps(sorted(sys.modules)))'
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                            capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=ROOT)).stdout
+    return set(json.loads(output.splitlines()[-1]))
+
+
+class TestImports(unittest.TestCase):
+    """This is a unit testing class for testing lazy imports"""
+
+    def test_packages_are_lazy(self):
+        """Test importing a package imports none of its connectors or their dependencies"""
+        for package in PACKAGES:
+            modules = loaded_after(f'import {package}')
+            heavy = {'pandas', 'requests', 'aiohttp', 'web3'} & modules
+            self.assertEqual(heavy, set(), package)
+
+    def test_class_imports_only_its_dependencies(self):
+        """Test a class only imports its own module & dependencies"""
+        modules = loaded_after('from messari.blockexplorers import Etherscan')
+        self.assertIn('messari.blockexplorers.etherscan.etherscan', modules)
+        self.assertNotIn('messari.blockexplorers.etherscan.asyncetherscan', modules)
+        self.assertNotIn('messari.blockexplorers.bscscan', modules)
+        self.assertNotIn('aiohttp', modules)
+
+        modules = loaded_after('from messari.defillama import DeFiLlama')
+        self.assertNotIn('aiohttp', modules)
+        modules = loaded_after('from messari.metabase import Metabase')
+        self.assertNotIn('aiohttp', modules)
+
+    def test_exports_resolve(self):
+        """Test every lazily exported name & the names star imported before still resolve"""
+        for package in PACKAGES:
+            module = importlib.import_module(package)
+            for name in module.__all__:
+                try:
+                    self.assertIsNotNone(getattr(module, name))
+                except ModuleNotFoundError as e:
+                    # Optional dependency not installed, i.e. web3 for EventMonitor
+                    self.assertIn(e.name, ('web3',), f'{package}.{name}')
+        from messari.defillama import DL_PROTOCOLS_URL  # pylint: disable=import-outside-toplevel
+        from messari.blockexplorers import DEFAULT_CONFIRMATIONS  # pylint: disable=import-outside-toplevel
+        self.assertTrue(DL_PROTOCOLS_URL.startswith('https://'))
+        self.assertGreater(DEFAULT_CONFIRMATIONS, 0)
+        with self.assertRaises(ImportError):
+            from messari.defillama import NotAConnector  # pylint: disable=import-outside-toplevel,unused-import
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""Unit Tests for the KeyPool class"""
+
+import asyncio
+import unittest
+from messari.asyncdataloader import AsyncDataLoader
+from messari.blockexplorers import Etherscan
+from messari.dataloader import DataLoader
+from messari.fixtureserver import FixtureServer
+from messari.keypool import KeyPool, make_key_pool, first_key
+from messari.ratelimit import RateLimiter
+from messari.replay import split_url
+from messari.retry import RetryPolicy, QueryFailedError
+
+UPSTREAM_URL = 'https://api.llama.fi/protocol/aave'
+ETHERSCAN_URL = 'https://api.etherscan.io/api'
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestKeyPool(unittest.TestCase):
+    """This is a unit testing class for testing key rotation & benching"""
+
+    def test_rotation(self):
+        """Test requests spread evenly across keys"""
+        pool = KeyPool(['a', 'b', 'c', 'a', ''], 'apikey', rate_limiter=RateLimiter())
+        self.assertEqual(len(pool), 3)
+        used = [pool.choose()[0].value for _ in range(6)]
+        self.assertEqual(sorted(used), ['a', 'a', 'b', 'b', 'c', 'c'])
+
+    def test_per_key_limit(self):
+        """Test each key has its own rate limit, so throughput adds up"""
+        pool = KeyPool(['a', 'b'], 'apikey', calls=1, period=10, rate_limiter=RateLimiter())
+        first, second = pool.choose(), pool.choose()
+        self.assertEqual({first[0].value, second[0].value}, {'a', 'b'})
+        self.assertEqual((first[1], second[1]), (0.0, 0.0))
+        self.assertGreater(pool.choose()[1], 0)
+
+    def test_bench(self):
+        """Test a key over its quota is skipped until Retry-After passes"""
+        clock = FakeClock()
+        pool = KeyPool(['a', 'b'], 'apikey', rate_limiter=RateLimiter(), clock=clock)
+        key_a = pool.keys[0]
+        self.assertTrue(pool.report(key_a, 429, '30'))
+        self.assertEqual({pool.choose()[0].value for _ in range(4)}, {'b'})
+        self.assertFalse(pool.report(pool.keys[1], 401))
+        self.assertEqual(pool.choose(), (None, 30.0))
+        clock.now = 30.0
+        self.assertEqual(pool.choose()[0].value, 'a')
+        stats = pool.get_stats()
+        self.assertEqual(stats[0]['key'], 'APIKey(...a)')
+        self.assertEqual(stats[1]['invalid_errors'], 1)
+
+    def test_apply(self):
+        """Test credentials are added to copies of params or headers"""
+        params = {'module': 'account'}
+        pool = KeyPool(['a'], 'Authorization', location='headers', template='Bearer {key}')
+        self.assertEqual(pool.apply(pool.keys[0], params, None),
+                         (params, {'Authorization': 'Bearer a'}))
+        pool = KeyPool(['a'], 'apikey')
+        self.assertEqual(pool.apply(pool.keys[0], params, None)[0],
+                         {'module': 'account', 'apikey': 'a'})
+        self.assertEqual(params, {'module': 'account'})
+
+    def test_single_key(self):
+        """Test connectors given one key don't build a pool"""
+        self.assertIsNone(make_key_pool('a', 'apikey'))
+        self.assertEqual(first_key(['a', 'b']), 'a')
+        self.assertEqual(first_key('a'), 'a')
+        with self.assertRaises(ValueError):
+            KeyPool([], 'apikey')
+
+
+class TestLoaderKeyPool(unittest.TestCase):
+    """This is a unit testing class for testing key pools in the loaders"""
+
+    def setUp(self):
+        self.server = FixtureServer()
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def make_loader(self, keys) -> DataLoader:
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, rate_limiter=RateLimiter(),
+                            retry_policy=RetryPolicy(backoff_factor=0), coalesce=False)
+        loader.set_transport(self.server.get_adapter())
+        loader.set_key_pool(KeyPool(keys, 'apikey', rate_limiter=RateLimiter()))
+        return loader
+
+    def sent_keys(self):
+        return [split_url(url)[1].get('apikey') for url in self.server.requests]
+
+    def test_retry_other_key(self):
+        """Test a 429 benches the key & the retry goes out with another one"""
+        self.server.add_response(UPSTREAM_URL, {}, status=429, headers={'Retry-After': '60'})
+        self.server.add_response(UPSTREAM_URL, {'name': 'aave'})
+        loader = self.make_loader(['a', 'b'])
+        for _ in range(3):
+            self.assertEqual(loader.get_response(UPSTREAM_URL), {'name': 'aave'})
+        self.assertEqual(self.sent_keys(), ['a', 'b', 'b', 'b'])
+        self.assertEqual(loader.key_pool.keys[0].quota_errors, 1)
+
+    def test_auth_error(self):
+        """Test a 401 benches the key & is retried once with another one"""
+        self.server.add_response(UPSTREAM_URL, {}, status=401)
+        self.server.add_response(UPSTREAM_URL, {'name': 'aave'})
+        loader = self.make_loader(['a', 'b'])
+        self.assertEqual(loader.get_response(UPSTREAM_URL), {'name': 'aave'})
+        self.assertEqual(self.sent_keys(), ['a', 'b'])
+        self.assertEqual(loader.key_pool.keys[0].invalid_errors, 1)
+
+    def test_auth_error_once(self):
+        """Test auth errors aren't retried past a second key"""
+        self.server.add_response(UPSTREAM_URL, {}, status=403)
+        loader = self.make_loader(['a', 'b', 'c'])
+        with self.assertRaises(QueryFailedError):
+            loader.get_response(UPSTREAM_URL)
+        keys = self.sent_keys()
+        self.assertEqual(len(keys), 2)
+        self.assertNotEqual(keys[0], keys[1])
+
+    def test_quota_error_body(self):
+        """Test Etherscan's 200 rate limit error benches the key"""
+        url = f'{ETHERSCAN_URL}?module=account'
+        self.server.add_response(url, {'status': '0', 'message': 'NOTOK',
+                                       'result': 'Max rate limit reached'})
+        self.server.add_response(url, {'status': '1', 'message': 'OK', 'result': '42'})
+        etherscan = Etherscan(api_key=['a', 'b'])
+        etherscan.set_transport(self.server.get_adapter())
+        etherscan.set_retry_policy(RetryPolicy(backoff_factor=0))
+        response = etherscan.get_response(ETHERSCAN_URL, params={'module': 'account'})
+        self.assertEqual(response['result'], '42')
+        self.assertEqual(self.sent_keys(), ['a', 'b'])
+        self.assertEqual(etherscan.key_pool.keys[0].quota_errors, 1)
+
+    def test_async(self):
+        """Test the async tier rotates & benches keys"""
+        self.server.add_response(UPSTREAM_URL, {}, status=429)
+        self.server.add_response(UPSTREAM_URL, {'name': 'aave'})
+        url = self.server.local_url(UPSTREAM_URL)
+
+        async def fetch():
+            async with AsyncDataLoader(api_dict=None, taxonomy_dict=None,
+                                       rate_limiter=RateLimiter(),
+                                       retry_policy=RetryPolicy(backoff_factor=0)) as loader:
+                loader.set_key_pool(KeyPool(['a', 'b'], 'apikey', rate_limiter=RateLimiter()))
+                return [await loader.get_response(url) for _ in range(2)]
+
+        self.assertEqual(asyncio.run(fetch()), [{'name': 'aave'}] * 2)
+        self.assertEqual(self.sent_keys(), ['a', 'b', 'b'])
+
+    def test_async_auth_error(self):
+        """Test the async tier retries a 401 once with another key"""
+        self.server.add_response(UPSTREAM_URL, {}, status=401)
+        self.server.add_response(UPSTREAM_URL, {'name': 'aave'})
+        url = self.server.local_url(UPSTREAM_URL)
+
+        async def fetch():
+            async with AsyncDataLoader(api_dict=None, taxonomy_dict=None,
+                                       rate_limiter=RateLimiter(),
+                                       retry_policy=RetryPolicy(backoff_factor=0)) as loader:
+                loader.set_key_pool(KeyPool(['a', 'b'], 'apikey', rate_limiter=RateLimiter()))
+                return await loader.get_response(url)
+
+        self.assertEqual(asyncio.run(fetch()), {'name': 'aave'})
+        self.assertEqual(self.sent_keys(), ['a', 'b'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Unit Tests for the InMemoryMetrics class & DataLoader instrumentation"""
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from messari.cache import ResponseCache
+from messari.dataloader import DataLoader
+from messari.metrics import InMemoryMetrics, Histogram, MetricsExporter, url_template, \
+    split_endpoint, OTHER_ENDPOINT
+from messari.retry import RetryPolicy
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Fails the first request to every path with a 502"""
+    seen = set()
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a GET request"""
+        if self.path not in self.seen:
+            self.seen.add(self.path)
+            self.send_response(502)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = b'{"data": [1, 2, 3]}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep test output quiet"""
+
+
+class TestMetrics(unittest.TestCase):
+    """This is a unit testing class for testing request metrics"""
+
+    def test_histogram(self):
+        """Test observations land in cumulative buckets"""
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [('0.1', 1), ('1.0', 3), ('+Inf', 4)])
+        self.assertAlmostEqual(histogram.sum, 4.25)
+
+    def test_prometheus(self):
+        """Test the text exposition format"""
+        metrics = InMemoryMetrics(buckets=(1.0,))
+        metrics.record_request('api.llama.fi', '/protocols', 200, 0.5, 100)
+        metrics.record_request('api.llama.fi', '/protocols', None, 2.0, 0)
+        metrics.record_retry('api.llama.fi', '/protocols', None)
+        text = metrics.to_prometheus()
+        labels = 'host="api.llama.fi",endpoint="/protocols"'
+        self.assertIn(f'messari_requests_total{{{labels},status="200"}} 1', text)
+        self.assertIn(f'messari_requests_total{{{labels},status="error"}} 1', text)
+        self.assertIn(f'messari_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', text)
+        self.assertIn(f'messari_response_bytes_total{{{labels}}} 100', text)
+        self.assertIn(f'messari_retries_total{{{labels}}} 1', text)
+        self.assertIn('# TYPE messari_request_duration_seconds histogram', text)
+
+    def test_endpoints(self):
+        """Test endpoints are labelled by URL template & capped per host"""
+        url_template('https://metrics.test/protocol/$slug/tvl')
+        self.assertEqual(split_endpoint('https://metrics.test/protocol/aave/tvl'),
+                         ('metrics.test', '/protocol/{slug}/tvl'))
+        self.assertEqual(split_endpoint('https://other.test/token/0xdAC17F958D2ee523a22/holders'),
+                         ('other.test', '/token/{id}/holders'))
+        self.assertEqual(split_endpoint('https://other.test/blocks/123'),
+                         ('other.test', '/blocks/{id}'))
+
+        metrics = InMemoryMetrics(max_endpoints=2)
+        for endpoint in ('/a', '/b', '/c', '/d', '/a'):
+            metrics.record_request('other.test', endpoint, 200, 0.1, 10)
+        stats = metrics.snapshot()['other.test']
+        self.assertEqual(sorted(stats), ['/a', '/b', OTHER_ENDPOINT])
+        self.assertEqual(stats['/a']['requests'], 2)
+        self.assertEqual(stats[OTHER_ENDPOINT]['requests'], 2)
+
+    def test_loader(self):
+        """Test get_response reports attempts, retries, bytes & cache hits"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host = f'127.0.0.1:{server.server_address[1]}'
+        metrics = InMemoryMetrics()
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, metrics=metrics,
+                            retry_policy=RetryPolicy(backoff_factor=0), cache=ResponseCache())
+        try:
+            loader.get_response(f'http://{host}/data')
+            loader.get_response(f'http://{host}/data')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        stats = metrics.snapshot()[host]['/data']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['statuses'], {'502': 1, '200': 1})
+        self.assertEqual(stats['retries'], 1)
+        self.assertEqual(stats['cache_hits'], 1)
+        self.assertEqual(stats['bytes'], len(b'{"data": [1, 2, 3]}'))
+        self.assertEqual(stats['latency']['count'], 2)
+
+        loader.set_metrics(MetricsExporter())
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
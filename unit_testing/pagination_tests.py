@@ -0,0 +1,110 @@
+"""Unit Tests for the Paginator classes & DataLoader.iter_pages"""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from messari.pagination import PagePaginator, OffsetPaginator
+
+RECORDS = list(range(23))
+DELAY = 0.05
+
+
+class PagedHandler(BaseHTTPRequestHandler):
+    """Serves RECORDS by page (/page?page=&limit=) or offset (/offset?offset=&limit=)"""
+    requests = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a GET request"""
+        url = urlsplit(self.path)
+        query = {key: int(value[0]) for key, value in parse_qs(url.query).items()}
+        PagedHandler.requests.append(query)
+        limit = query['limit']
+        start = (query['page'] - 1) * limit if url.path == '/page' else query['offset']
+        time.sleep(DELAY)
+        body = json.dumps({'data': RECORDS[start:start + limit]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep test output quiet"""
+
+
+class TestPagination(unittest.TestCase):
+    """This is a unit testing class for testing pagination"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), PagedHandler)
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        PagedHandler.requests = []
+        self.loader = DataLoader(api_dict=None, taxonomy_dict=None)
+
+    def test_paginators(self):
+        """Test page & offset params and the last page check"""
+        pages = PagePaginator(page_size=10, size_param='offset')
+        self.assertEqual(pages.first_params({'a': 1}), {'a': 1, 'page': 1, 'offset': 10})
+        self.assertEqual(pages.next_params({'page': 1, 'offset': 10}, [0] * 10),
+                         {'page': 2, 'offset': 10})
+        self.assertIsNone(pages.next_params({'page': 1, 'offset': 10}, [0] * 9))
+        offsets = OffsetPaginator(records_key='data', page_size=5)
+        self.assertEqual(offsets.next_params({'offset': 5, 'limit': 5}, [0] * 5),
+                         {'offset': 10, 'limit': 5})
+        self.assertEqual(offsets.get_records({'data': 'Max rate limit reached'}), [])
+
+    def test_iter_records(self):
+        """Test every record is yielded lazily in order"""
+        records = self.loader.iter_records(f'{self.url}/page',
+                                           PagePaginator(records_key='data', page_size=10))
+        self.assertEqual(PagedHandler.requests, [])
+        self.assertEqual(list(records), RECORDS)
+        self.assertEqual([query['page'] for query in PagedHandler.requests], [1, 2, 3])
+
+        pages = self.loader.iter_pages(f'{self.url}/offset',
+                                       OffsetPaginator(records_key='data', page_size=10),
+                                       max_pages=2)
+        self.assertEqual(len(list(pages)), 2)
+
+    def test_fetch_all_prefetch(self):
+        """Test the next page is requested while the current one is processed"""
+        paginator = OffsetPaginator(records_key='data', page_size=5)
+        self.assertEqual(self.loader.fetch_all(f'{self.url}/offset', paginator), RECORDS)
+
+        start = time.monotonic()
+        for _ in self.loader.iter_pages(f'{self.url}/offset', paginator, prefetch=True):
+            time.sleep(DELAY)
+        prefetched = time.monotonic() - start
+        # 5 pages each taking DELAY to serve & DELAY to process, overlapped
+        self.assertLess(prefetched, 9 * DELAY)
+
+    def test_async(self):
+        """Test the async generators walk every page"""
+        async def run():
+            async with AsyncDataLoader(api_dict=None, taxonomy_dict=None) as loader:
+                paginator = PagePaginator(records_key='data', page_size=10)
+                records = [record async for record in
+                           loader.iter_records(f'{self.url}/page', paginator)]
+                self.assertEqual(records, RECORDS)
+                self.assertEqual(await loader.fetch_all(f'{self.url}/page', paginator), RECORDS)
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""Unit Tests for the Profiler class & DataLoader phase profiling"""
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from messari.profiling import profiled, phase, timed, CallProfile, CURRENT_CALL
+from messari.utils import convert_flatten
+
+DELAY = 0.05
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Serves a nested JSON object after DELAY"""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a GET request"""
+        time.sleep(DELAY)
+        body = json.dumps({'data': {'id': self.path, 'metrics': {'price': 1.0}}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep test output quiet"""
+
+
+class Loader(DataLoader):
+    """Minimal connector with a profiled method"""
+    def __init__(self, url: str, profile: bool = True):
+        DataLoader.__init__(self, api_dict=None, taxonomy_dict=None, profile=profile)
+        self.url = url
+
+    @profiled
+    def get_items(self, items: list) -> pd.DataFrame:
+        """Fans out over items & builds a DataFrame"""
+        responses = self.fan_out(lambda item: self.get_response(f'{self.url}/{item}'), items)
+        flat = {item: convert_flatten(response['data']) for item, response in responses.items()}
+        with phase('assemble'):
+            return pd.DataFrame(flat)
+
+
+class AsyncLoader(AsyncDataLoader):
+    """Minimal async connector with a profiled method"""
+    def __init__(self, url: str):
+        AsyncDataLoader.__init__(self, api_dict=None, taxonomy_dict=None, profile=True)
+        self.url = url
+
+    @profiled
+    async def get_items(self, items: list) -> pd.DataFrame:
+        """Fans out over items & builds a DataFrame"""
+        async def get_item(item):
+            return await self.get_response(f'{self.url}/{item}')
+        responses = await self.fan_out(get_item, items)
+        flat = {item: convert_flatten(response['data']) for item, response in responses.items()}
+        with phase('assemble'):
+            return pd.DataFrame(flat)
+
+
+class TestProfiling(unittest.TestCase):
+    """This is a unit testing class for testing phase profiling"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_phases(self):
+        """Test nested phases are exclusive & same name phases aren't timed twice"""
+        call = CallProfile('test')
+        token = CURRENT_CALL.set(call)
+        try:
+            with phase('assemble'):
+                time.sleep(DELAY)
+                with phase('normalize'):
+                    time.sleep(DELAY)
+                    with phase('normalize'):
+                        time.sleep(DELAY)
+        finally:
+            CURRENT_CALL.reset(token)
+        self.assertAlmostEqual(call.phases['assemble'], DELAY, delta=DELAY / 2)
+        self.assertAlmostEqual(call.phases['normalize'], 2 * DELAY, delta=DELAY / 2)
+
+        # Outside of a profiled call phases & timed helpers are no-ops
+        with phase('decode'):
+            pass
+        self.assertEqual(timed('normalize')(lambda value: value + 1)(1), 2)
+
+    def test_loader(self):
+        """Test a profiled call records network, decode, normalize & assemble phases"""
+        loader = Loader(self.url)
+        items_df = loader.get_items(['a', 'b', 'c'])
+        self.assertEqual(list(items_df.columns), ['a', 'b', 'c'])
+
+        calls = loader.get_profile(calls=True)
+        self.assertEqual(len(calls), 1)
+        call = calls[0]
+        self.assertEqual(call['method'], 'get_items')
+        for name in ('throttle', 'http', 'read', 'decode', 'normalize', 'assemble'):
+            self.assertIn(name, call)
+        # Workers run in parallel, each waiting DELAY on the server
+        self.assertGreaterEqual(call['http'], 3 * DELAY * 0.9)
+        self.assertLess(call['wall'], 3 * DELAY)
+
+        loader.get_items(['d'])
+        summary = loader.get_profile()
+        self.assertEqual(summary.loc['get_items', 'calls'], 2)
+        self.assertIn('normalize', summary.columns)
+
+        loader.set_profiling(False)
+        loader.get_items(['e'])
+        with self.assertRaises(RuntimeError):
+            loader.get_profile()
+
+    def test_off_by_default(self):
+        """Test nothing is recorded unless profiling is enabled"""
+        loader = Loader(self.url, profile=False)
+        loader.get_items(['f'])
+        self.assertIsNone(loader.profiler)
+
+    def test_async(self):
+        """Test profiled coroutines record the network & decode phases"""
+        async def run():
+            async with AsyncLoader(self.url) as loader:
+                await loader.get_items(['a', 'b'])
+                return loader.get_profile(calls=True)
+
+        calls = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        for name in ('http', 'read', 'decode', 'normalize', 'assemble'):
+            self.assertIn(name, calls[0])
+        self.assertGreaterEqual(calls[0]['http'], 2 * DELAY * 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
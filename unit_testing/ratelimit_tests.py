@@ -0,0 +1,198 @@
+"""Unit Tests for the TokenBucket & RateLimiter classes"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import unittest
+from messari.ratelimit import TokenBucket, RateLimiter, QuotaLedger, SQLiteLedger, get_host, \
+    make_rate_limiter, DEFAULT_RATE_LIMITER
+from messari.blockexplorers import Etherscan
+from messari.messari import Messari
+
+
+class FakeClock:
+    """Clock that only moves when told to"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimit(unittest.TestCase):
+    """This is a unit testing class for testing the rate limiting classes"""
+
+    def test_get_host(self):
+        """Test urls & hosts map to the same key"""
+        self.assertEqual(get_host('https://API.etherscan.io/api?module=stats'), 'api.etherscan.io')
+        self.assertEqual(get_host('api.etherscan.io'), 'api.etherscan.io')
+
+    def test_bucket_spacing(self):
+        """Test back to back reservations are spaced by period / calls"""
+        clock = FakeClock()
+        bucket = TokenBucket(5, period=1, clock=clock)
+        waits = [bucket.reserve() for _ in range(4)]
+        self.assertEqual(waits[0], 0.0)
+        for expected, wait in zip([0.2, 0.4, 0.6], waits[1:]):
+            self.assertAlmostEqual(wait, expected)
+
+        # after a quiet second the bucket only refills up to burst
+        clock.now = 10.0
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+
+    def test_bucket_burst(self):
+        """Test burst allows back to back calls"""
+        clock = FakeClock()
+        bucket = TokenBucket(30, period=60, burst=3, clock=clock)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 2.0)
+        self.assertRaises(ValueError, TokenBucket, 0)
+
+    def test_defaults(self):
+        """Test provider defaults never replace explicit limits"""
+        limiter = RateLimiter()
+        self.assertEqual(limiter.reserve('https://unlimited.io/x'), 0.0)
+        limiter.set_default('https://api.example.io/api', 5)
+        self.assertEqual(limiter.get_limit('api.example.io').calls, 5)
+        limiter.set_limit('api.example.io', 2, period=1)
+        limiter.set_default('https://api.example.io/api', 5)
+        self.assertEqual(limiter.get_limit('api.example.io').calls, 2)
+        limiter.remove_limit('api.example.io')
+        self.assertIsNone(limiter.get_limit('api.example.io'))
+
+    def test_threads(self):
+        """Test concurrent callers are queued instead of released together"""
+        limiter = RateLimiter()
+        limiter.set_limit('api.example.io', 20, period=1)
+        stamps = []
+        lock = threading.Lock()
+
+        def call():
+            limiter.wait('https://api.example.io/x')
+            with lock:
+                stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=call) for _ in range(6)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(max(stamps) - start, 0.24)
+
+    def test_connector_defaults(self):
+        """Test connectors register their provider defaults"""
+        Etherscan()
+        self.assertEqual(DEFAULT_RATE_LIMITER.get_limit('api.etherscan.io').calls, 5)
+        Messari()
+        self.assertEqual(DEFAULT_RATE_LIMITER.get_limit('data.messari.io').calls, 20)
+        scope = Messari('key').rate_limit_scope
+        self.assertEqual(DEFAULT_RATE_LIMITER.get_bucket('data.messari.io', scope).calls, 30)
+        # A keyless instance made later leaves the key's limit alone
+        Messari()
+        self.assertEqual(DEFAULT_RATE_LIMITER.get_bucket('data.messari.io', scope).calls, 30)
+        self.assertEqual(DEFAULT_RATE_LIMITER.get_limit('data.messari.io').calls, 20)
+
+    def test_scoped_defaults(self):
+        """Test scoped defaults limit their scope only & explicit limits win over them"""
+        clock = FakeClock()
+        limiter = RateLimiter(ledger=QuotaLedger(clock=clock))
+        limiter.set_default('api.example.io', 1)
+        limiter.set_default('api.example.io', 2, scope='a')
+        self.assertEqual(limiter.get_bucket('api.example.io', 'a').calls, 2)
+        self.assertEqual(limiter.get_bucket('api.example.io', 'b').calls, 1)
+        self.assertEqual(limiter.get_bucket('api.example.io').calls, 1)
+        limiter.reserve('https://api.example.io/x', scope='a')
+        limiter.reserve('https://api.example.io/x')
+        self.assertEqual(limiter.get_usage('api.example.io'), 2)
+        limiter.set_limit('api.example.io', 10)
+        self.assertEqual(limiter.get_bucket('api.example.io', 'a').calls, 10)
+        limiter.remove_limit('api.example.io')
+        self.assertIsNone(limiter.get_bucket('api.example.io', 'a'))
+
+    def test_memory_ledger_take(self):
+        """Test the process local ledger keeps token bucket balances"""
+        clock = FakeClock()
+        ledger = QuotaLedger(clock=clock)
+        self.assertEqual(ledger.take('api.example.io', 1, 0.5, 1), 0.0)
+        self.assertEqual(ledger.take('api.example.io', 1, 0.5, 1, peek=True), 0.5)
+        self.assertEqual(ledger.take('api.example.io', 1, 0.5, 1), 0.5)
+        self.assertEqual(ledger.get_usage('api.example.io'), 2)
+        clock.now = 10.0
+        self.assertEqual(ledger.take('api.example.io', 1, 0.5, 1), 0.0)
+
+
+def reserve_many(path: str, calls: int) -> None:
+    """Reserves calls requests from a new process sharing the ledger at path"""
+    limiter = make_rate_limiter(path)
+    limiter.set_limit('api.example.io', 1000, period=1, burst=1000)
+    for _ in range(calls):
+        limiter.reserve('https://api.example.io/x')
+
+
+class TestSharedLedger(unittest.TestCase):
+    """This is a unit testing class for testing limits & quotas shared across processes"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ratelimit.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_limiter(self, clock: FakeClock) -> RateLimiter:
+        limiter = RateLimiter(ledger=SQLiteLedger(self.path, clock=clock))
+        limiter.set_limit('api.example.io', 5, period=1)
+        return limiter
+
+    def test_shared_bucket(self):
+        """Test limiters on the same ledger queue behind each other"""
+        clock = FakeClock()
+        first, second = self.make_limiter(clock), self.make_limiter(clock)
+        self.assertEqual(first.reserve('api.example.io'), 0.0)
+        self.assertAlmostEqual(second.reserve('api.example.io'), 0.2)
+        self.assertAlmostEqual(first.get_limit('api.example.io').peek(), 0.4)
+        clock.now = 10.0
+        self.assertEqual(second.reserve('api.example.io'), 0.0)
+
+    def test_quota(self):
+        """Test daily usage is counted across limiters & reset every UTC day"""
+        clock = FakeClock()
+        first, second = self.make_limiter(clock), self.make_limiter(clock)
+        first.set_quota('api.example.io', 10)
+        for limiter in (first, second, second):
+            limiter.reserve('https://api.example.io/x')
+        second.record('https://unlimited.io/x', calls=2)
+        self.assertEqual(first.get_quota('api.example.io'),
+                         {'used': 3, 'quota': 10, 'remaining': 7, 'resets_in': 86400.0})
+        self.assertEqual(first.get_usage('unlimited.io'), 2)
+        clock.now = 86400.0
+        self.assertEqual(first.get_quota('api.example.io')['remaining'], 10)
+        self.assertEqual(first.get_usage('api.example.io', day='1970-01-01'), 3)
+
+    def test_processes(self):
+        """Test reservations made by several processes all land in the ledger"""
+        context = multiprocessing.get_context('spawn')
+        processes = [context.Process(target=reserve_many, args=(self.path, 5))
+                     for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(make_rate_limiter(self.path).get_usage('api.example.io'), 15)
+
+    def test_memory_quota(self):
+        """Test the process local ledger counts usage too"""
+        limiter = RateLimiter()
+        limiter.set_quota('api.example.io', 2)
+        limiter.reserve('https://api.example.io/x')
+        limiter.set_limit('api.example.io', 5)
+        limiter.reserve('https://api.example.io/x')
+        self.assertEqual(limiter.get_quota('api.example.io')['remaining'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Unit Tests for the Cassette class & the record/replay transport"""
+
+import json
+import os
+import tempfile
+import unittest
+from messari.dataloader import DataLoader
+from messari.fixtureserver import FixtureServer
+from messari.replay import Cassette, CassetteAdapter, UnrecordedRequestError, redact_url, \
+    get_env_cassette, CASSETTE_ENV, CASSETTE_MODE_ENV
+
+
+class TestReplay(unittest.TestCase):
+    """This is a unit testing class for testing record & replay"""
+
+    def setUp(self):
+        self.server = FixtureServer()
+        self.server.start()
+        self.server.add_response('https://api.example.com/data?id=1', {'value': 1})
+        self.server.add_response('https://api.example.com/data?id=1', {'value': 2})
+        self.path = os.path.join(tempfile.mkdtemp(), 'cassette.json')
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_redact(self):
+        """Test credentials never reach a cassette"""
+        self.assertEqual(redact_url('https://a.io/api?module=x&apikey=secret&page=1'),
+                         'https://a.io/api?module=x&page=1')
+
+    def test_record_replay(self):
+        """Test responses are recorded once & replayed in order without network"""
+        cassette = Cassette(self.path, mode='record')
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, coalesce=False)
+        loader.set_transport(CassetteAdapter(cassette, adapter=self.server.get_adapter()))
+        url = 'https://api.example.com/data'
+        self.assertEqual(loader.get_response(url, params={'id': 1, 'apikey': 'secret'}),
+                         {'value': 1})
+        self.assertEqual(loader.get_response(url, params={'id': 1, 'apikey': 'secret'}),
+                         {'value': 2})
+        cassette.save()
+        with open(self.path, 'r', encoding='utf-8') as cassette_file:
+            self.assertNotIn('secret', cassette_file.read())
+
+        self.server.stop()
+        replay = Cassette(self.path, mode='replay')
+        self.assertEqual(len(replay), 2)
+        loader.set_transport(CassetteAdapter(replay))
+        # Requests made with another key match the recording
+        for value in (1, 2, 2):
+            self.assertEqual(loader.get_response(url, params={'id': 1, 'apikey': 'other'}),
+                             {'value': value})
+        with self.assertRaises(UnrecordedRequestError):
+            loader.get_response(url, params={'id': 2})
+
+    def test_once(self):
+        """Test once mode only records requests missing from the cassette"""
+        cassette = Cassette(mode='once')
+        cassette.record('GET', 'https://api.example.com/data?id=1', 200, {}, b'{"value": 0}')
+        loader = DataLoader(api_dict=None, taxonomy_dict=None)
+        loader.set_transport(CassetteAdapter(cassette, adapter=self.server.get_adapter()))
+        self.assertEqual(loader.get_response('https://api.example.com/data', {'id': 1}),
+                         {'value': 0})
+        self.server.add_response('https://api.example.com/data?id=3', [3])
+        self.assertEqual(loader.get_response('https://api.example.com/data', {'id': 3}), [3])
+        self.assertEqual(len(cassette), 2)
+
+    def test_env(self):
+        """Test MESSARI_CASSETTE sets a cassette on every loader"""
+        with open(self.path, 'w', encoding='utf-8') as cassette_file:
+            json.dump({'interactions': [{'method': 'GET', 'url': 'https://api.example.com/env',
+                                         'status': 200, 'headers': {}, 'body': '[1]'}]},
+                      cassette_file)
+        os.environ[CASSETTE_ENV] = self.path
+        os.environ[CASSETTE_MODE_ENV] = 'replay'
+        try:
+            self.assertEqual(get_env_cassette().mode, 'replay')
+            loader = DataLoader(api_dict=None, taxonomy_dict=None)
+            self.assertEqual(loader.get_response('https://api.example.com/env'), [1])
+        finally:
+            del os.environ[CASSETTE_ENV]
+            del os.environ[CASSETTE_MODE_ENV]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Unit Tests for the RetryPolicy class & DataLoader retries"""
+
+import asyncio
+import random
+import threading
+import unittest
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from messari.retry import RetryPolicy, QueryFailedError, parse_retry_after, NO_RETRY_POLICY
+
+# Retry straight away so the tests don't sleep
+FAST_POLICY = RetryPolicy(backoff_factor=0)
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Fails every path ending in /flaky once with a 503, /missing always 404s"""
+    seen = set()
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answer a GET request"""
+        if self.path.endswith('/missing'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path.endswith('/flaky') and self.path not in self.seen:
+            self.seen.add(self.path)
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep test output quiet"""
+
+
+class TestRetry(unittest.TestCase):
+    """This is a unit testing class for testing retries"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_parse_retry_after(self):
+        """Test Retry-After seconds & HTTP dates"""
+        self.assertEqual(parse_retry_after('7'), 7.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after(formatdate(0, usegmt=True)), 0.0)
+
+    def test_budget(self):
+        """Test per status budgets, the total cap & jitter bounds"""
+        policy = RetryPolicy(max_retries=4, backoff_factor=1, max_backoff=3,
+                             status_retries={429: 3, 503: 1}, rng=random.Random(1))
+        budget = policy.new_budget()
+        delays = [budget.next_delay(429) for _ in range(3)]
+        for attempt, delay in enumerate(delays):
+            self.assertTrue(0 <= delay <= min(3, 2 ** attempt))
+        self.assertIsNone(budget.next_delay(429))
+        self.assertIsNone(budget.next_delay(404))
+        self.assertEqual(budget.next_delay(503, retry_after='2'), 2.0)
+        self.assertIsNone(budget.next_delay(None))
+
+        budget = policy.new_budget()
+        self.assertIsNone(budget.next_delay(429, retry_after='3600'))
+
+    def test_get_response(self):
+        """Test a transient 503 is retried & a 404 isn't"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, retry_policy=FAST_POLICY)
+        self.assertEqual(loader.get_response(f'{self.url}/a/flaky'), {'ok': True})
+        with self.assertRaises(QueryFailedError) as context:
+            loader.get_response(f'{self.url}/missing')
+        self.assertEqual(context.exception.status_code, 404)
+
+        loader.set_retry_policy(NO_RETRY_POLICY)
+        self.assertRaises(QueryFailedError, loader.get_response, f'{self.url}/b/flaky')
+
+    def test_fan_out_isolation(self):
+        """Test a failed item is skipped instead of failing the batch"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, retry_policy=FAST_POLICY)
+
+        def get_item(item):
+            return loader.get_response(f'{self.url}/{item}')['ok']
+
+        results = loader.fan_out(get_item, ['c/flaky', 'missing', 'd'])
+        self.assertEqual(results, {'c/flaky': True, 'd': True})
+        self.assertEqual(list(loader.failed_items.keys()), ['missing'])
+
+        loader.set_fail_fast(True)
+        self.assertRaises(QueryFailedError, loader.fan_out, get_item, ['missing', 'd'])
+
+    def test_fan_out_nested(self):
+        """Test nested fan outs keep their own failures"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, retry_policy=FAST_POLICY)
+        inner_failed = {}
+
+        def get_item(item):
+            return loader.get_response(f'{self.url}/{item}')['ok']
+
+        def get_group(group):
+            return loader.fan_out(get_item, [group, f'{group}/missing'], failed=inner_failed)
+
+        outer_failed = {}
+        results = loader.fan_out(get_group, ['d', 'x/missing'], failed=outer_failed)
+        self.assertEqual(results, {'d': {'d': True}})
+        self.assertEqual(set(inner_failed), {'d/missing', 'x/missing', 'x/missing/missing'})
+        self.assertEqual(list(outer_failed), ['x/missing'])
+        self.assertEqual(loader.failed_items, outer_failed)
+
+    def test_async(self):
+        """Test AsyncDataLoader retries & isolates failed items"""
+        async def run():
+            async with AsyncDataLoader(api_dict=None, taxonomy_dict=None,
+                                       retry_policy=FAST_POLICY) as loader:
+                async def get_item(item):
+                    return (await loader.get_response(f'{self.url}/{item}'))['ok']
+
+                results = await loader.fan_out(get_item, ['e/flaky', 'missing'])
+                self.assertEqual(results, {'e/flaky': True})
+                self.assertIsInstance(loader.failed_items['missing'], QueryFailedError)
+
+                failed = [{}, {}]
+                await asyncio.gather(loader.fan_out(get_item, ['d', 'missing'], failed[0]),
+                                     loader.fan_out(get_item, ['d', 'x/missing'], failed[1]))
+                self.assertEqual([list(group) for group in failed], [['missing'], ['x/missing']])
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Unit Tests for the SingleFlight & AsyncSingleFlight classes"""
+
+import asyncio
+import threading
+import time
+import unittest
+from messari.deadline import DeadlineExceededError, deadline
+from messari.singleflight import SingleFlight, AsyncSingleFlight
+from messari.dataloader import DataLoader
+
+
+class TestSingleFlight(unittest.TestCase):
+    """This is a unit testing class for testing request coalescing"""
+
+    def test_threads(self):
+        """Test concurrent identical calls run once & get their own copy"""
+        single_flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'data': [1, 2]}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(single_flight.do('a', fetch)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'data': [1, 2]}] * 5)
+        self.assertEqual(len({id(result) for result in results}), 5)
+        self.assertEqual(single_flight.calls, {})
+
+    def test_errors(self):
+        """Test waiters get the leader's error & later calls run again"""
+        single_flight = SingleFlight()
+        errors = []
+
+        def fail():
+            time.sleep(0.05)
+            raise ValueError('upstream')
+
+        def call():
+            try:
+                single_flight.do('a', fail)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(single_flight.do('a', lambda: 1), 1)
+
+    def test_deadlines(self):
+        """Test waiters keep to their own deadline & don't share the leader's"""
+        single_flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.4)
+            return {'data': 1}
+
+        def lead():
+            with self.assertRaises(DeadlineExceededError):
+                with deadline(0.2) as budget:
+                    single_flight.do('a', lambda: (fetch(), budget.check())[0], budget)
+
+        leader = threading.Thread(target=lead)
+        leader.start()
+        time.sleep(0.05)
+        # The waiter has no deadline, it retries once the leader gives up
+        self.assertEqual(single_flight.do('a', fetch), {'data': 1})
+        leader.join()
+        self.assertEqual(len(calls), 2)
+
+        thread = threading.Thread(target=single_flight.do, args=('b', fetch))
+        thread.start()
+        time.sleep(0.05)
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceededError):
+            with deadline(0.1) as budget:
+                single_flight.do('b', fetch, budget)
+        self.assertLess(time.monotonic() - start, 0.3)
+        thread.join()
+
+    def test_async_deadlines(self):
+        """Test async waiters keep to their own deadline & don't share the leader's"""
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.3)
+            return {'data': 1}
+
+        async def lead():
+            with deadline(0.1) as budget:
+                async def fetch_checked():
+                    result = await fetch()
+                    budget.check()
+                    return result
+                with self.assertRaises(DeadlineExceededError):
+                    await single_flight.do('a', fetch_checked, budget)
+
+        async def wait_short():
+            await asyncio.sleep(0.01)
+            with deadline(0.05) as budget:
+                with self.assertRaises(DeadlineExceededError):
+                    await single_flight.do('a', fetch, budget)
+
+        async def run():
+            task = asyncio.ensure_future(lead())
+            await asyncio.sleep(0.01)
+            results = await asyncio.gather(single_flight.do('a', fetch), wait_short())
+            await task
+            return results[0]
+
+        self.assertEqual(asyncio.run(run()), {'data': 1})
+        self.assertEqual(len(calls), 2)
+
+    def test_async(self):
+        """Test concurrent identical coroutines are awaited once"""
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {'data': 1}
+
+        async def run():
+            return await asyncio.gather(*(single_flight.do('a', fetch) for _ in range(5)))
+
+        results = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'data': 1}] * 5)
+
+    def test_loader(self):
+        """Test DataLoader coalescing can be turned off"""
+        loader = DataLoader(api_dict=None, taxonomy_dict=None, coalesce=False)
+        self.assertIsNone(loader.single_flight)
+        loader.set_coalesce(True)
+        self.assertIsInstance(loader.single_flight, SingleFlight)
+
+
+if __name__ == "__main__":
+    unittest.main()
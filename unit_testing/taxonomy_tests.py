@@ -0,0 +1,146 @@
+"""Unit Tests for the Taxonomy & TaxonomyRegistry classes"""
+
+import json
+import os
+import tempfile
+import unittest
+from messari.taxonomy import Taxonomy, TaxonomyRegistry, get_taxonomy
+from messari.dataloader import DataLoader
+from messari.asyncdataloader import AsyncDataLoader
+from messari.cache import MemoryCache
+from messari.deepdao.deepdao import DeepDAO, PEOPLE_URL, DASHBOARD_URL
+from messari.fixtureserver import FixtureServer
+
+MAPPING = {'uniswap': 'uniswap', 'uni': 'uniswap', 'yearn-finance': 'yearn-finance',
+           'yfi': 'yearn-finance', 'aave': 'aave-v2'}
+
+
+class TestTaxonomy(unittest.TestCase):
+    """This is a unit testing class for testing taxonomy translations"""
+
+    def test_indexes(self):
+        """Test forward, case insensitive & reverse lookups"""
+        taxonomy = Taxonomy(MAPPING)
+        self.assertEqual(dict(taxonomy), MAPPING)
+        self.assertEqual(taxonomy.translate('UNI'), 'uniswap')
+        self.assertEqual(taxonomy.translate('Yearn_Finance'), 'yearn-finance')
+        self.assertEqual(taxonomy.translate('unknown'), 'unknown')
+        self.assertEqual(taxonomy.to_messari('aave-v2'), 'aave')
+        self.assertEqual(taxonomy.to_messari('uniswap'), 'uniswap')
+        self.assertIsNone(taxonomy.to_messari('unknown'))
+        self.assertEqual(taxonomy.aliases('yearn-finance'), ['yearn-finance', 'yfi'])
+
+    def test_registry(self):
+        """Test mapping files are read once & reloads reach every holder"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'messari_to_test.json')
+            with open(path, 'w', encoding='utf-8') as mapping_file:
+                json.dump(MAPPING, mapping_file)
+            registry = TaxonomyRegistry()
+            taxonomy = registry.get(path)
+            self.assertIs(registry.get(path), taxonomy)
+            self.assertEqual(registry.reload(changed_only=True), [])
+
+            with open(path, 'w', encoding='utf-8') as mapping_file:
+                json.dump({'comp': 'compound'}, mapping_file)
+            os.utime(path, (0, 0))
+            self.assertEqual(registry.reload(changed_only=True), [path])
+            self.assertEqual(taxonomy.translate('COMP'), 'compound')
+            self.assertEqual(taxonomy.translate('uni'), 'uni')
+
+    def test_failed_reload(self):
+        """Test a mapping file that can't be read keeps its previous mapping"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'messari_to_test.json')
+            with open(path, 'w', encoding='utf-8') as mapping_file:
+                json.dump(MAPPING, mapping_file)
+            registry = TaxonomyRegistry()
+            taxonomy = registry.get(path)
+
+            with open(path, 'w', encoding='utf-8') as mapping_file:
+                mapping_file.write('{"comp": ')
+            with self.assertLogs(level='ERROR'):
+                self.assertEqual(registry.reload(path), [])
+            self.assertEqual(taxonomy.translate('uni'), MAPPING['uni'])
+
+            os.remove(path)
+            with self.assertLogs(level='ERROR'):
+                self.assertEqual(registry.reload(changed_only=True), [])
+            self.assertEqual(taxonomy.translate('uni'), MAPPING['uni'])
+
+    def test_missing_file(self):
+        """Test a missing mapping file gives an empty taxonomy"""
+        registry = TaxonomyRegistry()
+        with self.assertLogs(level='ERROR'):
+            self.assertEqual(len(registry.get('messari_to_missing.json')), 0)
+
+    def test_shared(self):
+        """Test the shipped mappings are shared between calls"""
+        self.assertIs(get_taxonomy('messari_to_dl.json'), get_taxonomy('messari_to_dl.json'))
+        self.assertGreater(len(get_taxonomy('messari_to_dl.json')), 0)
+
+    def test_loaders(self):
+        """Test both tiers translate & reverse translate with a plain dictionary"""
+        for tier in (DataLoader, AsyncDataLoader):
+            loader = tier(api_dict=None, taxonomy_dict=MAPPING)
+            self.assertEqual(loader.translate(['UNI', 'aave', 'bitcoin']),
+                             ['uniswap', 'aave-v2', 'bitcoin'])
+            self.assertEqual(loader.reverse_translate(['aave-v2', 'bitcoin']),
+                             ['aave', 'bitcoin'])
+            loader = tier(api_dict=None, taxonomy_dict=None)
+            self.assertEqual(loader.translate('bitcoin'), ['bitcoin'])
+
+
+class TestDeepDAOTaxonomy(unittest.TestCase):
+    """This is a unit testing class for testing the lazy DeepDAO lookup tables"""
+
+    def setUp(self):
+        self.server = FixtureServer()
+        self.server.start()
+        self.server.add_response(f'{PEOPLE_URL}?limit=100000&offset=0&sortBy=daoAmount',
+                                 [{'address': '0xa', 'name': 'alice'},
+                                  {'address': '0xb', 'name': None}])
+        self.server.add_response(DASHBOARD_URL, {'daosSummary': [
+            {'organizationId': 'id-1', 'daoName': 'Uniswap', 'daosArr': []}]})
+        self.cache = MemoryCache()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def make_deepdao(self) -> DeepDAO:
+        deepdao = DeepDAO(taxonomy_cache=self.cache)
+        deepdao.set_transport(self.server.get_adapter())
+        deepdao.set_coalesce(False)
+        return deepdao
+
+    def test_lazy(self):
+        """Test the tables are only fetched when used, each group on its own"""
+        deepdao = self.make_deepdao()
+        self.assertEqual(self.server.requests, [])
+        self.assertEqual(deepdao.id_tax, {'Uniswap': 'id-1'})
+        self.assertEqual(deepdao.name_tax, {'id-1': 'Uniswap'})
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(deepdao.people_tax, {'0xa': 'alice', '0xb': None})
+        self.assertEqual(deepdao.get_member_list(), ['alice'])
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_persisted(self):
+        """Test later instances reuse the persisted tables until they are refreshed"""
+        self.make_deepdao().get_dao_list()
+        deepdao = self.make_deepdao()
+        self.assertEqual(deepdao.get_dao_list(), ['Uniswap'])
+        self.assertEqual(len(self.server.requests), 1)
+        deepdao.refresh_taxonomy()
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_expired(self):
+        """Test tables past their TTL are rebuilt"""
+        deepdao = DeepDAO(taxonomy_cache=self.cache, taxonomy_ttl=0)
+        deepdao.set_transport(self.server.get_adapter())
+        deepdao.get_dao_list()
+        self.make_deepdao().get_dao_list()
+        self.assertEqual(len(self.server.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,370 @@
+"""Unit Tests for the chunked Messari metric timeseries"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from urllib.parse import urlencode
+import pandas as pd
+from messari.fixtureserver import FixtureServer
+from messari.messari import Messari, AsyncMessari, TimeseriesStore
+from messari.messari.helpers import split_timeseries_payload, merge_timeseries, \
+    timeseries_to_dataframe, metric_timeseries_to_dataframe, metrics_timeseries_to_dataframe
+from messari.fred import helpers as fred_helpers
+from messari.retry import RetryPolicy
+
+TIMESERIES_URL = 'https://data.messari.io/api/v1/assets/{asset}/metrics/price/time-series'
+METRIC_URL = 'https://data.messari.io/api/v1/assets/{asset}/metrics/{metric}/time-series'
+
+
+def make_response(asset: str, start: str, end: str) -> dict:
+    """Builds a daily price timeseries response for asset between start & end"""
+    days = pd.date_range(start, end, freq='D')
+    values = [[int(day.value // 10**6), float(i), float(i) + 1, float(i) - 1, float(i), 1.0]
+              for i, day in enumerate(days)]
+    return {'status': {}, 'data': {
+        'slug': asset, 'symbol': asset[:3].upper(),
+        'parameters': {'asset_key': asset, 'start': start, 'end': end, 'interval': '1d',
+                       'columns': ['timestamp', 'open', 'high', 'low', 'close', 'volume']},
+        'values': values}}
+
+
+def make_metric_response(asset: str, metric: str, start: str, end: str) -> dict:
+    """Builds a daily single value timeseries response of metric for asset"""
+    days = pd.date_range(start, end, freq='D')
+    return {'status': {}, 'data': {
+        'slug': asset, 'symbol': asset[:3].upper(),
+        'parameters': {'asset_key': asset, 'start': start, 'end': end, 'interval': '1d',
+                       'columns': ['timestamp', metric.replace('.', '_')]},
+        'values': [[int(day.value // 10**6), float(i)] for i, day in enumerate(days)]}}
+
+
+class LocalAsyncMessari(AsyncMessari):
+    """AsyncMessari sending its requests to a FixtureServer"""
+    def __init__(self, server: FixtureServer):
+        AsyncMessari.__init__(self, 'key')
+        self.server = server
+
+    async def get_response(self, endpoint_url: str, params: dict = None, headers: dict = None):
+        return await AsyncMessari.get_response(self, self.server.local_url(endpoint_url),
+                                               params=params, headers=headers)
+
+
+class TestTimeseriesWindows(unittest.TestCase):
+    """This is a unit testing class for testing timeseries window helpers"""
+
+    def test_split(self):
+        """Test ranges are split into windows of at most 2016 points with no gap"""
+        payloads = split_timeseries_payload('2020-01-01', '2021-01-01', '5m')
+        self.assertEqual(len(payloads), 53)
+        self.assertEqual(payloads[0], {'interval': '5m', 'start': '2020-01-01T00:00:00Z',
+                                       'end': '2020-01-07T23:55:00Z'})
+        self.assertEqual(payloads[1]['start'], '2020-01-08T00:00:00Z')
+        self.assertEqual(payloads[-1]['end'], '2021-01-01T00:00:00Z')
+        self.assertEqual(split_timeseries_payload('2021-01-01', '2021-02-01'),
+                         [{'interval': '1d', 'start': '2021-01-01', 'end': '2021-02-01'}])
+        self.assertEqual(split_timeseries_payload(interval='1h'), [{'interval': '1h'}])
+        self.assertRaises(ValueError, split_timeseries_payload, '2021-01-01')
+
+    def test_merge(self):
+        """Test overlapping windows are de-duplicated & sorted"""
+        merged = merge_timeseries([{'values': [[2, 'b'], [1, 'a']], 'parameters_end': 'x'},
+                                   {'values': [[2, 'B'], [3, 'c']], 'parameters_end': 'y'},
+                                   {'values': None}])
+        self.assertEqual(merged['values'], [[1, 'a'], [2, 'B'], [3, 'c']])
+        self.assertEqual(merged['parameters_end'], 'x')
+
+
+class TestTimeseriesFrame(unittest.TestCase):
+    """This is a unit testing class for testing the timeseries DataFrame builders"""
+
+    def setUp(self):
+        self.response = {
+            'bitcoin': {'parameters_columns': ['timestamp', 'close', 'volume'],
+                        'values': [[86400000, 1.0, None], [0, 2.0, 3.0]]},
+            'ethereum': {'parameters_columns': ['timestamp', 'close', 'volume'],
+                         'values': None},
+            'solana': {'parameters_columns': ['timestamp', 'close', 'volume'],
+                       'values': [[172800000, 4.0, 5.0]]}}
+
+    def test_align(self):
+        """Test assets are aligned on the union of timestamps & missing ones left out"""
+        timeseries_df = timeseries_to_dataframe(self.response)
+        self.assertEqual(list(timeseries_df.columns),
+                         [('bitcoin', 'close'), ('bitcoin', 'volume'),
+                          ('solana', 'close'), ('solana', 'volume')])
+        self.assertEqual(list(timeseries_df.index),
+                         list(pd.to_datetime([0, 86400000, 172800000], unit='ms')))
+        self.assertEqual(timeseries_df.index.name, 'timestamp')
+        self.assertEqual(timeseries_df[('bitcoin', 'close')].tolist()[:2], [2.0, 1.0])
+        self.assertTrue(pd.isna(timeseries_df.loc['1970-01-01', ('solana', 'close')]))
+        # FRED shares the same builder
+        self.assertIs(fred_helpers.timeseries_to_dataframe, timeseries_to_dataframe)
+
+    def test_metric(self):
+        """Test non price metrics have one column per asset"""
+        timeseries_df = metric_timeseries_to_dataframe(self.response, 'sply.circ')
+        self.assertEqual(list(timeseries_df.columns), ['bitcoin', 'solana'])
+        self.assertEqual(timeseries_df['solana'].iloc[-1], 4.0)
+        self.assertTrue(timeseries_to_dataframe({'ethereum': self.response['ethereum']}).empty)
+        self.assertTrue(metric_timeseries_to_dataframe({}, 'sply.circ').empty)
+
+    def test_dtypes(self):
+        """Test columns keep the dtype concatenating one DataFrame per asset gives them"""
+        response = {
+            'bitcoin': {'parameters_columns': ['timestamp', 'count', 'close', 'active'],
+                        'values': [[0, 1, 1.5, True], [86400000, 2, None, False],
+                                   [172800000, 3, 2.5]]},
+            'solana': {'parameters_columns': ['timestamp', 'count', 'label'],
+                       'values': [[0, 5, 'a'], [172800000, 6, None]]}}
+        timeseries_df = timeseries_to_dataframe(response)
+        expected = pd.concat(
+            [pd.DataFrame.from_records(value['values'], columns=value['parameters_columns'])
+             .set_index('timestamp') for value in response.values()],
+            keys=list(response), axis=1, sort=True)
+        expected.index = pd.to_datetime(expected.index, unit='ms')
+        pd.testing.assert_frame_equal(timeseries_df, expected, check_names=False)
+        self.assertEqual(timeseries_df[('bitcoin', 'count')].dtype, 'int64')
+        self.assertTrue(pd.isna(timeseries_df[('bitcoin', 'active')].iloc[-1]))
+        self.assertTrue(pd.isna(timeseries_df[('solana', 'count')].iloc[1]))
+
+
+class TestChunkedTimeseries(unittest.TestCase):
+    """This is a unit testing class for testing long range timeseries requests"""
+
+    def setUp(self):
+        self.server = FixtureServer()
+        self.server.start()
+        self.assets = ['bitcoin', 'ethereum']
+        self.payloads = split_timeseries_payload('2010-01-01', '2022-01-01', '1d')
+        for asset in self.assets:
+            for payload in self.payloads:
+                url = f"{TIMESERIES_URL.format(asset=asset)}?{urlencode(payload)}"
+                self.server.add_response(url, make_response(asset, payload['start'],
+                                                            payload['end']))
+
+    def tearDown(self):
+        self.server.stop()
+
+    def check_frame(self, timeseries_df: pd.DataFrame):
+        days = len(pd.date_range('2010-01-01', '2022-01-01', freq='D'))
+        self.assertEqual(len(timeseries_df), days)
+        self.assertTrue(timeseries_df.index.is_unique)
+        self.assertTrue(timeseries_df.index.is_monotonic_increasing)
+        self.assertEqual(list(timeseries_df.columns.get_level_values(0).unique()), self.assets)
+
+    def test_sync(self):
+        """Test a 12 year range is fetched in windows & stitched into one frame"""
+        messari = Messari('key')
+        messari.set_transport(self.server.get_adapter())
+        messari.set_retry_policy(RetryPolicy(max_retries=0))
+        messari.set_rate_limit(TIMESERIES_URL, 1000)
+        timeseries_df = messari.get_metric_timeseries(self.assets, 'price', start='2010-01-01',
+                                                      end='2022-01-01')
+        self.assertEqual(len(self.payloads), 3)
+        self.assertEqual(len(self.server.requests), 6)
+        self.check_frame(timeseries_df)
+
+    def test_async(self):
+        """Test the async tier stitches windows the same way"""
+        async def fetch():
+            async with LocalAsyncMessari(self.server) as messari:
+                messari.set_retry_policy(RetryPolicy(max_retries=0))
+                messari.set_rate_limit(TIMESERIES_URL, 1000)
+                return await messari.get_metric_timeseries(self.assets, 'price',
+                                                           start='2010-01-01', end='2022-01-01')
+
+        self.check_frame(asyncio.run(fetch()))
+
+    def test_failed_window(self):
+        """Test an asset a window failed for is dropped rather than returned with a gap"""
+        server = FixtureServer()
+        server.start()
+        try:
+            for asset in self.assets:
+                for i, payload in enumerate(self.payloads):
+                    if asset == 'ethereum' and i == 1:
+                        continue
+                    url = f"{TIMESERIES_URL.format(asset=asset)}?{urlencode(payload)}"
+                    server.add_response(url, make_response(asset, payload['start'],
+                                                           payload['end']))
+            messari = Messari('key')
+            messari.set_transport(server.get_adapter())
+            messari.set_retry_policy(RetryPolicy(max_retries=0))
+            messari.set_rate_limit(TIMESERIES_URL, 1000)
+            with self.assertLogs(level='WARNING') as logs:
+                response_data = messari.get_metric_timeseries(
+                    self.assets, 'price', start='2010-01-01', end='2022-01-01',
+                    to_dataframe=False)
+        finally:
+            server.stop()
+        self.assertEqual(list(response_data), ['bitcoin'])
+        self.assertTrue(any('1 of its 3 windows failed' in line for line in logs.output))
+
+
+class TestTimeseriesStore(unittest.TestCase):
+    """This is a unit testing class for testing the incremental timeseries store"""
+
+    def setUp(self):
+        self.server = FixtureServer()
+        self.server.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'timeseries.db')
+
+    def tearDown(self):
+        self.server.stop()
+        self.directory.cleanup()
+
+    def add_range(self, asset: str, start: str, end: str):
+        for payload in split_timeseries_payload(start, end, '1d'):
+            url = f"{TIMESERIES_URL.format(asset=asset)}?{urlencode(payload)}"
+            self.server.add_response(url, make_response(asset, payload['start'],
+                                                        payload['end']))
+
+    def make_messari(self) -> Messari:
+        messari = Messari('key')
+        messari.set_transport(self.server.get_adapter())
+        messari.set_retry_policy(RetryPolicy(max_retries=0))
+        messari.set_rate_limit(TIMESERIES_URL, 1000)
+        messari.set_timeseries_store(TimeseriesStore(self.path))
+        return messari
+
+    def test_incremental(self):
+        """Test stored ranges are served from disk & only the missing tail is fetched"""
+        self.add_range('bitcoin', '2015-01-01', '2021-01-01')
+        timeseries_df = self.make_messari().get_metric_timeseries(
+            'bitcoin', 'price', start='2015-01-01', end='2021-01-01')
+        self.assertEqual(len(timeseries_df), len(pd.date_range('2015-01-01', '2021-01-01')))
+        self.assertEqual(len(self.server.requests), 2)
+
+        # A new process reads the same file & has nothing to fetch
+        messari = self.make_messari()
+        timeseries_df = messari.get_metric_timeseries('bitcoin', 'price', start='2016-01-01',
+                                                      end='2017-01-01')
+        self.assertEqual(len(timeseries_df), 367)
+        self.assertEqual(timeseries_df.index[0], pd.Timestamp('2016-01-01'))
+        self.assertEqual(len(self.server.requests), 2)
+
+        # A daily refresh only asks for the new day
+        self.add_range('bitcoin', '2021-01-02', '2021-01-02')
+        timeseries_df = messari.get_metric_timeseries('bitcoin', 'price', start='2015-01-01',
+                                                      end='2021-01-02')
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertIn('start=2021-01-02', self.server.requests[-1])
+        self.assertEqual(timeseries_df.index[-1], pd.Timestamp('2021-01-02'))
+        self.assertTrue(timeseries_df.index.is_unique)
+
+    def test_missing_end(self):
+        """Test a start without an end raises before the store builds any window"""
+        messari = self.make_messari()
+        self.assertRaises(ValueError, messari.get_metric_timeseries, 'bitcoin', 'price',
+                          start='2022-01-01')
+        self.assertEqual(self.server.requests, [])
+
+    def test_head(self):
+        """Test a range starting earlier only fetches the missing head"""
+        self.add_range('ethereum', '2020-01-01', '2020-12-31')
+        self.add_range('ethereum', '2019-01-01', '2019-12-31')
+        messari = self.make_messari()
+        messari.get_metric_timeseries('ethereum', 'price', start='2020-01-01', end='2020-12-31')
+        timeseries_df = messari.get_metric_timeseries('ethereum', 'price', start='2019-01-01',
+                                                      end='2020-06-30')
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertIn('end=2019-12-31', self.server.requests[-1])
+        self.assertEqual(len(timeseries_df), len(pd.date_range('2019-01-01', '2020-06-30')))
+        self.assertEqual(messari.timeseries_store.get_coverage('ethereum', 'price', '1d'),
+                         (1546300800000, 1609372800000))
+
+    def test_async(self):
+        """Test the async tier reads & fills the same store"""
+        self.add_range('bitcoin', '2020-01-01', '2020-06-30')
+        self.make_messari().get_metric_timeseries('bitcoin', 'price', start='2020-01-01',
+                                                  end='2020-06-30')
+
+        async def fetch():
+            async with LocalAsyncMessari(self.server) as messari:
+                messari.set_timeseries_store(TimeseriesStore(self.path))
+                return await messari.get_metric_timeseries('bitcoin', 'price',
+                                                           start='2020-03-01', end='2020-04-01')
+
+        self.assertEqual(len(asyncio.run(fetch())), 32)
+        self.assertEqual(len(self.server.requests), 1)
+
+
+class TestMetricsTimeseries(unittest.TestCase):
+    """This is a unit testing class for testing multi metric timeseries batches"""
+
+    def setUp(self):
+        self.server = FixtureServer()
+        self.server.start()
+        self.assets = ['bitcoin', 'ethereum']
+        self.metrics = ['price', 'real.vol', 'sply.circ']
+        payload = {'interval': '1d', 'start': '2021-01-01', 'end': '2021-01-10'}
+        for asset in self.assets:
+            for metric in self.metrics:
+                url = f"{METRIC_URL.format(asset=asset, metric=metric)}?{urlencode(payload)}"
+                if metric == 'price':
+                    response = make_response(asset, '2021-01-01', '2021-01-10')
+                else:
+                    # Ethereum's supply only starts on the 5th
+                    first = '2021-01-05' if (asset, metric) == ('ethereum', 'sply.circ') \
+                        else '2021-01-01'
+                    response = make_metric_response(asset, metric, first, '2021-01-10')
+                self.server.add_response(url, response)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def make_messari(self) -> Messari:
+        messari = Messari('key')
+        messari.set_transport(self.server.get_adapter())
+        messari.set_retry_policy(RetryPolicy(max_retries=0))
+        messari.set_rate_limit(TIMESERIES_URL, 1000)
+        return messari
+
+    def test_wide(self):
+        """Test every asset & metric lands in one frame aligned on timestamps"""
+        timeseries_df = self.make_messari().get_metrics_timeseries(
+            self.assets, self.metrics[1:], start='2021-01-01', end='2021-01-10')
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(list(timeseries_df.columns),
+                         [('bitcoin', 'real.vol'), ('bitcoin', 'sply.circ'),
+                          ('ethereum', 'real.vol'), ('ethereum', 'sply.circ')])
+        self.assertEqual(len(timeseries_df), 10)
+        self.assertEqual(timeseries_df[('ethereum', 'sply.circ')].isna().sum(), 4)
+        self.assertEqual(timeseries_df.loc['2021-01-05', ('ethereum', 'sply.circ')], 0.0)
+
+    def test_fields(self):
+        """Test metrics with several values keep a field level"""
+        timeseries_df = self.make_messari().get_metrics_timeseries(
+            self.assets, self.metrics, start='2021-01-01', end='2021-01-10')
+        self.assertEqual(timeseries_df.shape, (10, 14))
+        self.assertEqual(timeseries_df.columns.names, ['asset', 'metric', 'field'])
+        self.assertEqual(timeseries_df[('bitcoin', 'price', 'close')].iloc[-1], 9.0)
+
+    def test_long(self):
+        """Test the long frame has one row per point & field"""
+        timeseries_df = self.make_messari().get_metrics_timeseries(
+            self.assets, self.metrics, start='2021-01-01', end='2021-01-10', wide=False)
+        self.assertEqual(list(timeseries_df.columns),
+                         ['timestamp', 'asset', 'metric', 'field', 'value'])
+        self.assertEqual(len(timeseries_df), 2 * 10 * 5 + 10 + 10 + 10 + 6)
+        response = self.make_messari().get_metrics_timeseries(
+            self.assets, self.metrics, start='2021-01-01', end='2021-01-10', to_dataframe=False)
+        self.assertEqual(len(response['sply.circ']['ethereum']['values']), 6)
+        self.assertTrue(metrics_timeseries_to_dataframe({}).empty)
+
+    def test_async(self):
+        """Test the async tier batches every asset & metric"""
+        async def fetch():
+            async with LocalAsyncMessari(self.server) as messari:
+                messari.set_retry_policy(RetryPolicy(max_retries=0))
+                messari.set_rate_limit(TIMESERIES_URL, 1000)
+                return await messari.get_metrics_timeseries(
+                    self.assets, self.metrics, start='2021-01-01', end='2021-01-10')
+
+        self.assertEqual(asyncio.run(fetch()).shape, (10, 14))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 """Unit Tests for the TokenTerminal class"""
 
 import unittest
+from messari.replay import CASSETTE_MODE_ENV
 from messari.tokenterminal import TokenTerminal
 from typing import List
 import os
@@ -8,6 +9,9 @@ import sys
 import pandas as pd
 
 API_KEY= os.getenv("TOKEN_TERMINAL_API_KEY")
+if API_KEY is None and os.getenv(CASSETTE_MODE_ENV) == 'replay':
+    # Recorded responses are matched without credentials
+    API_KEY = 'replay'
 if API_KEY is None:
     print("Please define TOKEN_TERMINAL_API_KEY in your runtime enviornment")
     sys.exit()
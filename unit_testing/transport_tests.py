@@ -0,0 +1,124 @@
+"""Unit Tests for the TransportRegistry class"""
+
+import asyncio
+import unittest
+from urllib.parse import urlsplit
+from messari.asyncdataloader import AsyncDataLoader
+from messari.dataloader import DataLoader
+from messari.fixtureserver import FixtureServer
+from messari.ratelimit import RateLimiter
+from messari.retry import RetryPolicy
+from messari.transport import TransportRegistry, PooledAdapter
+
+UPSTREAM_URL = 'https://api.llama.fi/protocols'
+
+
+class TestTransport(unittest.TestCase):
+    """This is a unit testing class for testing the shared connection pool"""
+
+    def setUp(self):
+        self.server = FixtureServer()
+        self.server.start()
+        self.server.add_response(UPSTREAM_URL, [{'slug': 'aave'}])
+        # Requests go straight to the server, through the shared adapter
+        self.url = f'{self.server.url}/api.llama.fi/protocols'
+        self.transport = TransportRegistry()
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+
+    def make_loader(self, **kwargs) -> DataLoader:
+        return DataLoader(api_dict=None, taxonomy_dict=None, rate_limiter=RateLimiter(),
+                          retry_policy=RetryPolicy(max_retries=0), coalesce=False,
+                          transport=self.transport, **kwargs)
+
+    def get_pool(self):
+        parts = urlsplit(self.server.url)
+        return self.transport.get_pools().connection_from_host(
+            parts.hostname, parts.port, scheme='http')
+
+    def get_open_pools(self) -> list:
+        poolmanager = self.transport.get_pools()
+        return [poolmanager.pools[key] for key in poolmanager.pools.keys()]
+
+    def count_connections(self) -> int:
+        return sum(pool.num_connections for pool in self.get_open_pools())
+
+    def test_shared_pool(self):
+        """Test loaders reuse the same connections & closing one loader keeps them open"""
+        first, second = self.make_loader(), self.make_loader()
+        self.assertIsInstance(first.session.get_adapter(self.url), PooledAdapter)
+        self.assertIs(first.session.get_adapter(self.url).poolmanager,
+                      second.session.get_adapter(self.url).poolmanager)
+        for _ in range(3):
+            first.get_response(self.url)
+        first.session.close()
+        second.get_response(self.url)
+        self.assertEqual(self.count_connections(), 1)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_pool_size(self):
+        """Test pools are sized per host & grow with the loaders' workers"""
+        self.make_loader(max_workers=24)
+        self.assertEqual(self.transport.pool_maxsize, 24)
+        self.transport.set_pool_size(self.server.url, 3)
+        self.assertEqual(self.get_pool().pool.maxsize, 3)
+
+    def test_reserve(self):
+        """Test growing the pools leaves the pools of live loaders open"""
+        first = self.make_loader()
+        first.get_response(self.url)
+        old_pool, = self.get_open_pools()
+        self.make_loader(max_workers=64)
+        self.assertIsNotNone(old_pool.pool)
+        first.get_response(self.url)
+        self.assertEqual(sorted(pool.pool.maxsize for pool in self.get_open_pools()), [16, 64])
+        self.assertEqual(self.count_connections(), 2)
+
+    def test_close(self):
+        """Test the pools are closed with the last adapter using them"""
+        first, second = self.make_loader(), self.make_loader()
+        first.set_transport(self.server.get_adapter())
+        second.get_response(self.url)
+        pool, = self.get_open_pools()
+        del first
+        self.assertIsNotNone(pool.pool)
+        second.session.close()
+        self.assertIsNone(pool.pool)
+        self.assertIsNone(self.transport.pools)
+
+    def test_timeout(self):
+        """Test requests sent without a timeout get the registry's"""
+        self.server.latency = 0.5
+        self.transport.set_timeout((1.0, 0.05))
+        with self.assertRaises(SystemError):
+            self.make_loader().get_response(self.url)
+
+    def test_headers(self):
+        """Test compression & keep-alive negotiation headers"""
+        session = self.make_loader().session
+        self.assertIn('gzip', session.headers['Accept-Encoding'])
+        self.assertEqual(session.headers['Connection'], 'keep-alive')
+        self.transport.configure(keep_alive=False, compress=False)
+        session = self.make_loader().session
+        self.assertEqual(session.headers['Accept-Encoding'], 'identity')
+        self.assertEqual(session.headers['Connection'], 'close')
+        self.assertTrue(self.transport.get_connector_kwargs(10)['force_close'])
+
+    def test_async(self):
+        """Test the async tier is configured by the same registry"""
+        async def fetch():
+            async with AsyncDataLoader(api_dict=None, taxonomy_dict=None,
+                                       rate_limiter=RateLimiter(),
+                                       transport=self.transport) as loader:
+                session = loader.get_session()
+                self.assertEqual(session.timeout.sock_read, 60.0)
+                self.assertIn('gzip', session.headers['Accept-Encoding'])
+                return await loader.get_response(self.url)
+
+        self.assertEqual(asyncio.run(fetch()), [{'slug': 'aave'}])
+
+
+if __name__ == "__main__":
+    unittest.main()